@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import lru_cache, cached_property
 import os
 
 class Settings(BaseSettings):
@@ -9,6 +9,12 @@ class Settings(BaseSettings):
     firecrawl_api_key: str = ""
     claude_api_key: str = ""  # For backward compatibility with .env
 
+    # Provider base URLs - point these at fake_providers (python -m fake_providers) for offline load testing
+    openai_base_url: str = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    perplexity_base_url: str = os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai")
+    firecrawl_api_url: str = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev")
+    screenshot_api_url: str = os.getenv("SCREENSHOT_API_URL", "https://shot.screenshotapi.net/screenshot")
+
     # Test Mode - explicitly read from environment
     test_mode: bool = os.getenv("TEST_MODE", "false").lower() == "true"
 
@@ -16,6 +22,39 @@ class Settings(BaseSettings):
     upload_dir: str = "./uploads"
     resumes_dir: str = "./resumes"
 
+    # Rendered export cache (DOCX/PDF bytes kept in memory per worker)
+    export_cache_max_mb: int = int(os.getenv("EXPORT_CACHE_MAX_MB", "64"))
+
+    # Company news index: stored articles are re-fetched incrementally after this many hours
+    news_refresh_hours: float = float(os.getenv("NEWS_REFRESH_HOURS", "6"))
+
+    # Virus scanning: long-lived clamd daemon (UNIX socket or TCP host); when neither
+    # is set, uploads are scanned with clamscan if installed, else basic validation
+    clamd_socket: str = os.getenv("CLAMD_SOCKET", "")
+    clamd_host: str = os.getenv("CLAMD_HOST", "")
+    clamd_port: int = int(os.getenv("CLAMD_PORT", "3310"))
+    clamd_pool_size: int = int(os.getenv("CLAMD_POOL_SIZE", "4"))
+    clamd_timeout_seconds: float = float(os.getenv("CLAMD_TIMEOUT_SECONDS", "10"))
+
+    # View tracking (last_viewed_at / view_count) is buffered in memory and written this often
+    touch_flush_seconds: float = float(os.getenv("TOUCH_FLUSH_SECONDS", "5"))
+
+    # Responses at least this large are sent brotli/gzip-compressed when the client accepts it
+    compression_min_bytes: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+    # Event-loop watchdog: logs the stack of anything blocking the loop this long;
+    # strict mode makes shutdown raise if anything did (set it in test runs)
+    loop_monitor_enabled: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    loop_block_threshold_ms: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+    loop_monitor_strict: bool = os.getenv("LOOP_MONITOR_STRICT", "false").lower() == "true"
+
+    # Request profiling (GET /api/admin/profiles): requests sending X-Profile-Token equal to
+    # PROFILING_TOKEN (empty = header disabled), plus a random PROFILING_SAMPLE_RATE share
+    profiling_token: str = os.getenv("PROFILING_TOKEN", "")
+    profiling_sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    profiling_interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    profiling_max_stored: int = int(os.getenv("PROFILING_MAX_STORED", "50"))
+
     # App Settings
     app_name: str = "ResumeAI"
     app_version: str = "1.0.0"
@@ -35,12 +74,15 @@ class Settings(BaseSettings):
         env_file = ".env"
         extra = "ignore"  # Ignore extra fields from .env
 
-    @property
+    @cached_property
     def database_url(self) -> str:
         """
         Get database URL with proper async driver
         Railway provides DATABASE_URL as postgres:// or postgresql://
         We need to convert it to postgresql+asyncpg:// for async support
+
+        Resolved once per Settings instance, so the [CONFIG] lines are
+        printed at startup only instead of on every access.
         """
         railway_db = os.getenv("DATABASE_URL")
 
@@ -2,14 +2,17 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
+from app.utils import json_codec
 
 settings = get_settings()
 
-# Create async engine
+# Create async engine (JSON/JSONB columns are encoded and decoded with orjson)
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    future=True
+    future=True,
+    json_serializer=json_codec.dumps,
+    json_deserializer=json_codec.loads
 )
 
 # Create session factory
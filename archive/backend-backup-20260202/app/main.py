@@ -1,23 +1,27 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from app.config import get_settings
 from app.database import init_db
 from app.routes import resumes, tailoring, auth, admin, interview_prep, star_stories, resume_analysis, certifications, saved_comparisons, jobs, career_path
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.waf import WAFMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.rate_limit import get_rate_limiter
 from app.utils.logger import logger
+from app.utils.json_codec import ORJSONResponse
 
 settings = get_settings()
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+app = FastAPI(title=settings.app_name, version=settings.app_version, default_response_class=ORJSONResponse)
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Rate limiting is enforced per route via app.middleware.rate_limit dependencies
+# (shared token buckets keyed by X-User-ID + IP, weighted by estimated LLM cost)
+
+# Request context - added first (innermost) so it runs in the route handler's task,
+# letting the event-loop watchdog name the request that blocked the loop
+app.add_middleware(RequestContextMiddleware)
 
 # Web Application Firewall - Block malicious requests
 app.add_middleware(WAFMiddleware)
@@ -25,6 +29,13 @@ app.add_middleware(WAFMiddleware)
 # Security Headers - CSP, HSTS, X-Frame-Options, etc.
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Compression - brotli/gzip for JSON responses above COMPRESSION_MIN_BYTES (streams pass through)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
+# Profiling - opt-in per-request sampling profiles (X-Profile-Token or PROFILING_SAMPLE_RATE),
+# outermost of our own middleware so the whole request is timed
+app.add_middleware(ProfilingMiddleware)
+
 # CORS - Explicit origins for security (MUST be added LAST so it runs FIRST)
 allowed_origins = [origin.strip() for origin in settings.allowed_origins.split(",")]
 logger.info(f"CORS allowed origins: {allowed_origins}")
@@ -35,7 +46,7 @@ app.add_middleware(
     allow_origins=allowed_origins,  # Explicit origins from config
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "X-API-Key", "Authorization", "X-TOTP-Code", "X-User-ID"],
+    allow_headers=["Content-Type", "X-API-Key", "Authorization", "X-TOTP-Code", "X-User-ID", "If-None-Match", "X-Profile-Token"],
     expose_headers=["*"],
     max_age=3600,
 )
@@ -45,8 +56,38 @@ app.add_middleware(
 async def startup_event():
     logger.info("Starting ResumeAI Backend...")
     await init_db()
+
+    # Drop rate-limit buckets that have been idle for a day, now and every RATE_LIMIT_PRUNE_INTERVAL
+    get_rate_limiter().start()
+
+    # Event-loop lag watchdog (lag percentiles and blocking calls: GET /api/admin/metrics)
+    if settings.loop_monitor_enabled:
+        from app.utils.loop_monitor import get_loop_monitor
+        get_loop_monitor().start()
+
+    # Request profiler: task tracking, idle sampler thread and DB/LLM/scrape/render span hooks,
+    # installed only while profiling is enabled (PROFILING_TOKEN, sampling rate above 0)
+    from app.database import engine
+    from app.utils.profiler import get_request_profiler
+    get_request_profiler().start(engine)
     logger.info(f"Backend ready at http://{settings.backend_host}:{settings.backend_port}")
 
+# Shutdown: stop export worker processes, finish queued file removals, flush view tracking,
+# then stop the loop watchdog (raises BlockingCallError here in LOOP_MONITOR_STRICT mode)
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.resume_export_service import shutdown_export_process_pool
+    from app.services.touch_buffer import flush_touch_buffers
+    from app.utils.file_reaper import get_file_reaper
+    from app.utils.loop_monitor import get_loop_monitor
+    from app.utils.profiler import get_request_profiler
+    shutdown_export_process_pool()
+    await get_file_reaper().stop()
+    await flush_touch_buffers()
+    await get_request_profiler().stop()
+    await get_rate_limiter().stop()
+    await get_loop_monitor().stop()
+
 # Health check endpoint (minimal response to prevent information disclosure)
 @app.get("/health")
 async def health_check():
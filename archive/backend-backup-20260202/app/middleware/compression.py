@@ -0,0 +1,171 @@
+"""
+Response Compression Middleware
+Brotli / gzip encoding of complete responses above a size threshold
+
+- The encoding is negotiated from Accept-Encoding (q-values honoured),
+  preferring brotli when the optional brotli package is installed
+- Only bodies of compressible types are encoded, once complete.
+  Streamed progress (NDJSON, SSE) and binary exports pass through
+  untouched, so they still arrive incrementally
+- Strong ETags get a per-encoding suffix (see app.utils.http_cache)
+"""
+
+import gzip
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.http_cache import encoded_etag
+from app.utils.logger import get_logger
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = get_logger()
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+# Sent incrementally on purpose; never buffered
+STREAMING_TYPES = (
+    "text/event-stream",
+    "application/x-ndjson",
+)
+
+
+def _parse_accept_encoding(header: str) -> List[Tuple[str, float]]:
+    encodings = []
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            encodings.append((name.strip().lower(), q))
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = True) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+    offered = dict(_parse_accept_encoding(accept_encoding))
+    wildcard = offered.get("*")
+    supported = ["br", "gzip"] if brotli_available else ["gzip"]
+
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = offered.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses of at least minimum_size bytes with brotli or gzip"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        logger.info(
+            f"Compression middleware initialized (min {minimum_size} bytes, "
+            f"brotli: {'on' if brotli is not None else 'not installed'})"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), brotli is not None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressingResponder(self, encoding, send).run(scope, receive)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+
+class _CompressingResponder:
+    """Holds back http.response.start until it knows whether the body is compressed"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.body: Optional[List[bytes]] = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive):
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _compressible_type(self, headers: Headers) -> bool:
+        status = self.start["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(STREAMING_TYPES)
+
+    async def send_wrapper(self, message: Message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.start is None:
+            await self.send(message)
+            return
+
+        if self.body is None:
+            if not self._compressible_type(Headers(raw=self.start["headers"])):
+                # Binary downloads and streamed progress: send unchanged, chunk by chunk
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.body = []
+
+        # Buffer until the body is complete (BaseHTTPMiddleware re-chunks even single-body responses)
+        self.body.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+
+        body = b"".join(self.body)
+        self.passthrough = True
+        headers = MutableHeaders(raw=self.start["headers"])
+
+        if len(body) >= self.middleware.minimum_size:
+            body = self.middleware.compress(body, self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": body, "more_body": False})
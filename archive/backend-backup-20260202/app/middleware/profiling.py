@@ -0,0 +1,49 @@
+"""
+Profiling Middleware - opt-in sampling profiles of single requests
+
+A request is profiled when X-Profile-Token matches PROFILING_TOKEN or when
+the sampling rate picks it (see app.utils.profiler). Profiled responses
+carry X-Profile-Id; the profile is then available from
+GET /api/admin/profiles/{id}.
+"""
+
+from app.utils.profiler import get_request_profiler
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+
+
+class ProfilingMiddleware:
+    """Wraps profiled requests in a RequestProfile (pure ASGI, so streams are untouched)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = get_request_profiler()
+        token = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == PROFILE_TOKEN_HEADER),
+            None
+        )
+        trigger = profiler.should_profile(token)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile, context_token = profiler.begin(scope["method"], scope["path"], trigger)
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.end(profile, context_token, status)
@@ -0,0 +1,385 @@
+"""
+Rate Limiting
+Central, cost-weighted token-bucket limiter shared by all API workers
+
+Every limited request is checked against two buckets:
+- a per-endpoint bucket ("5/minute", "10/hour", ...) counting requests
+- a shared "llm" budget bucket, charged by the estimated LLM cost of the operation
+
+Each of them exists twice: keyed by X-User-ID plus client IP, and keyed by
+client IP alone with RATE_LIMIT_IP_MULTIPLIER times the capacity.
+X-User-ID is chosen by the client, so the per-IP buckets are what stop a
+caller from getting fresh buckets by rotating it. The client IP is taken
+from X-Forwarded-For as appended by our own proxies
+(RATE_LIMIT_TRUSTED_PROXIES entries from the right), never from
+client-supplied entries.
+
+All buckets of a request are checked before any is charged, so a request
+rejected by one bucket costs nothing from the others, and rejected requests
+write no bucket state at all. State lives in the `rate_limit_buckets` table
+so limits hold across workers (idle rows are pruned by a background task);
+if the table is unavailable the limiter falls back to per-process memory,
+bounded as an LRU.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+_PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# Estimated LLM cost of each operation in cost units (1 unit ~= $0.01)
+OPERATION_COSTS: Dict[str, int] = {
+    "extract_job": 1,      # Firecrawl extract, optional GPT fallback
+    "upload_resume": 2,    # GPT-4.1-mini resume parsing
+    "analyze_resume": 3,   # GPT-4.1-mini full resume analysis
+    "tailor_resume": 10,   # Perplexity research + GPT-4o tailoring
+    "tailor_batch": 10,    # Charged per job URL in the batch
+    "intelligence_bundle": 2,  # One structured GPT call per prep and content type (cached)
+}
+
+# Shared LLM budget per user+IP, in cost units
+LLM_BUDGET = os.getenv("RATE_LIMIT_LLM_BUDGET", "200/hour")
+
+# Per-IP buckets allow this many times the per-user limit (several users can share a NAT)
+IP_MULTIPLIER = float(os.getenv("RATE_LIMIT_IP_MULTIPLIER", "5"))
+
+# Reverse proxies in front of the app that append to X-Forwarded-For (Railway: 1; 0 = ignore the header)
+TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+
+# Seconds between deletions of idle rows from the shared bucket table
+PRUNE_INTERVAL = float(os.getenv("RATE_LIMIT_PRUNE_INTERVAL", "3600"))
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket definition: `capacity` tokens, fully refilled every `period` seconds"""
+    name: str
+    capacity: float
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, name: str, rate: str) -> "RateLimit":
+        """Parse a slowapi-style rate string such as "10/hour" or "5/minute" """
+        try:
+            amount, period = rate.split("/")
+            return cls(name=name, capacity=float(amount), period=float(_PERIODS[period.strip().rstrip("s")]))
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate limit '{rate}'. Expected e.g. '10/hour'")
+
+    def scaled(self, factor: float) -> "RateLimit":
+        """Same refill period with `factor` times the capacity"""
+        return RateLimit(name=self.name, capacity=self.capacity * factor, period=self.period)
+
+
+@dataclass(frozen=True)
+class Charge:
+    """`cost` tokens to take from the bucket `key` governed by `limit`"""
+    key: str
+    limit: RateLimit
+    cost: float
+
+
+def _refill(tokens: float, updated_at: float, now: float, limit: RateLimit) -> float:
+    """Apply token-bucket refill since updated_at"""
+    elapsed = max(0.0, now - updated_at)
+    return min(limit.capacity, tokens + elapsed * limit.refill_rate)
+
+
+def _settle(charges: List[Charge], available: List[float]) -> Tuple[bool, List[float]]:
+    """All-or-nothing: charge every bucket if each holds enough tokens, otherwise none"""
+    allowed = all(tokens >= charge.cost for tokens, charge in zip(available, charges))
+    if allowed:
+        return True, [tokens - charge.cost for tokens, charge in zip(available, charges)]
+    return False, list(available)
+
+
+def _retry_after(tokens: float, cost: float, limit: RateLimit) -> int:
+    """Seconds until the bucket holds enough tokens for cost"""
+    if cost > limit.capacity:
+        return int(limit.period)
+    return max(1, math.ceil((cost - tokens) / limit.refill_rate))
+
+
+class MemoryBucketStore:
+    """
+    Per-process bucket store (fallback when the shared table is unavailable)
+
+    Holds at most `max_buckets` buckets, evicting the least recently charged
+    one. Only allowed requests create or update buckets: a rejected request
+    leaves the state as it was (refilling later gives the same result).
+    """
+
+    MAX_BUCKETS = 50_000
+
+    def __init__(self, max_buckets: int = MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take_all(self, charges: List[Charge], now: float) -> Tuple[bool, List[float]]:
+        async with self._lock:
+            available = []
+            for charge in charges:
+                tokens, updated_at = self._buckets.get(charge.key, (charge.limit.capacity, now))
+                available.append(_refill(tokens, updated_at, now, charge.limit))
+
+            allowed, remaining = _settle(charges, available)
+            if allowed:
+                for charge, tokens in zip(charges, remaining):
+                    self._buckets[charge.key] = (tokens, now)
+                    self._buckets.move_to_end(charge.key)
+                while len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+
+            return allowed, remaining
+
+
+class SQLBucketStore:
+    """Bucket store backed by the application database (shared across workers)"""
+
+    async def take_all(self, charges: List[Charge], now: float) -> Tuple[bool, List[float]]:
+        try:
+            return await self._take_all(charges, now)
+        except IntegrityError:
+            # Another worker created a bucket between our SELECT and INSERT
+            return await self._take_all(charges, now)
+
+    async def _take_all(self, charges: List[Charge], now: float) -> Tuple[bool, List[float]]:
+        from app.database import AsyncSessionLocal
+        from app.models.rate_limit import RateLimitBucket
+
+        async with AsyncSessionLocal() as session:
+            async with session.begin():
+                # Lock every bucket of the request in key order (no deadlocks between workers)
+                result = await session.execute(
+                    select(RateLimitBucket)
+                    .where(RateLimitBucket.key.in_([charge.key for charge in charges]))
+                    .order_by(RateLimitBucket.key)
+                    .with_for_update()
+                )
+                buckets = {bucket.key: bucket for bucket in result.scalars()}
+
+                available = []
+                for charge in charges:
+                    bucket = buckets.get(charge.key)
+                    if bucket is None:
+                        available.append(charge.limit.capacity)
+                    else:
+                        available.append(_refill(bucket.tokens, bucket.updated_at, now, charge.limit))
+
+                allowed, remaining = _settle(charges, available)
+                if not allowed:
+                    # Nothing was charged: write no rows (missing buckets are simply full)
+                    return allowed, remaining
+
+                for charge, tokens in zip(charges, remaining):
+                    bucket = buckets.get(charge.key)
+                    if bucket is None:
+                        session.add(RateLimitBucket(key=charge.key, tokens=tokens, updated_at=now))
+                    else:
+                        bucket.tokens = tokens
+                        bucket.updated_at = now
+
+            return allowed, remaining
+
+    async def prune(self, idle_seconds: float = 86400) -> int:
+        """Delete buckets idle for longer than idle_seconds"""
+        from app.database import AsyncSessionLocal
+        from app.models.rate_limit import RateLimitBucket
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(RateLimitBucket).where(RateLimitBucket.updated_at < time.time() - idle_seconds)
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+
+class RateLimiter:
+    """Cost-weighted rate limiter with a shared SQL backend and in-memory fallback"""
+
+    def __init__(self):
+        backend = os.getenv("RATE_LIMIT_BACKEND", "sql").lower()
+        self.enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.memory_store = MemoryBucketStore()
+        self.shared_store: Optional[SQLBucketStore] = SQLBucketStore() if backend == "sql" else None
+        self.llm_budget = RateLimit.parse("llm", LLM_BUDGET)
+        self.ip_multiplier = IP_MULTIPLIER
+        self.trusted_proxies = TRUSTED_PROXIES
+        self.prune_interval = PRUNE_INTERVAL
+        self._pruner: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"Rate limiter initialized (enabled: {self.enabled}, backend: {backend}, "
+            f"llm budget: {LLM_BUDGET}, per-IP x{IP_MULTIPLIER:g}, trusted proxies: {TRUSTED_PROXIES})"
+        )
+
+    def start(self):
+        """Start pruning idle rows from the shared bucket table every prune_interval seconds"""
+        if self.shared_store is not None and (self._pruner is None or self._pruner.done()):
+            self._pruner = asyncio.create_task(self._prune_periodically())
+
+    async def stop(self):
+        """Stop the pruning task"""
+        if self._pruner is not None:
+            self._pruner.cancel()
+            try:
+                await self._pruner
+            except asyncio.CancelledError:
+                pass
+            self._pruner = None
+
+    async def _prune_periodically(self):
+        while True:
+            try:
+                pruned = await self.shared_store.prune()
+                logger.info(f"Pruned {pruned} idle rate-limit buckets")
+            except Exception as e:
+                logger.warning(f"Rate-limit bucket pruning skipped: {e}")
+            await asyncio.sleep(self.prune_interval)
+
+    def get_client_ip(self, request: Request) -> str:
+        """
+        Client IP as seen by our outermost trusted proxy
+
+        Each proxy appends the address it received the connection from, so
+        only the last `trusted_proxies` X-Forwarded-For entries are ours;
+        anything left of them was sent by the client and is ignored.
+        """
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for and self.trusted_proxies > 0:
+            hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+            if hops:
+                return hops[-min(self.trusted_proxies, len(hops))]
+        if request.client:
+            return request.client.host
+        return "0.0.0.0"
+
+    def get_client_key(self, request: Request) -> str:
+        """Build the per-user bucket identity from X-User-ID plus client IP"""
+        user_id = request.headers.get("X-User-ID") or "anonymous"
+        return f"{user_id[:128]}|{self.get_client_ip(request)}"
+
+    async def _take_all(self, charges: List[Charge]) -> Tuple[bool, List[float]]:
+        if self.shared_store is not None:
+            try:
+                return await self.shared_store.take_all(charges, time.time())
+            except Exception as e:
+                logger.warning(f"Shared rate-limit store unavailable, using in-memory fallback: {e}")
+        return await self.memory_store.take_all(charges, time.monotonic())
+
+    async def check(
+        self,
+        request: Request,
+        limit: RateLimit,
+        cost: float = 0,
+        response: Optional[Response] = None
+    ) -> None:
+        """
+        Consume one request from `limit` and `cost` units from the LLM budget,
+        per user+IP and per IP
+
+        Nothing is consumed unless every bucket has room.
+
+        Raises:
+            HTTPException: 429 with a Retry-After header when any bucket is empty
+        """
+        if not self.enabled:
+            return
+
+        client_ip = self.get_client_ip(request)
+        identity = self.get_client_key(request)
+
+        charges = [
+            Charge(f"{limit.name}:{identity}", limit, 1),
+            Charge(f"{limit.name}:ip:{client_ip}", limit.scaled(self.ip_multiplier), 1),
+        ]
+        if cost > 0:
+            charges += [
+                Charge(f"{self.llm_budget.name}:{identity}", self.llm_budget, cost),
+                Charge(f"{self.llm_budget.name}:ip:{client_ip}", self.llm_budget.scaled(self.ip_multiplier), cost),
+            ]
+
+        allowed, remaining = await self._take_all(charges)
+        if not allowed:
+            self._reject(charges, remaining, request)
+
+        if response is not None:
+            if cost > 0:
+                response.headers["X-RateLimit-Budget-Remaining"] = str(int(min(remaining[2], remaining[3])))
+            response.headers["X-RateLimit-Limit"] = str(int(limit.capacity))
+            response.headers["X-RateLimit-Remaining"] = str(int(min(remaining[0], remaining[1])))
+
+    def _reject(self, charges: List[Charge], available: List[float], request: Request):
+        # Wait for the slowest of the buckets that are short
+        short = [(charge, tokens) for charge, tokens in zip(charges, available) if tokens < charge.cost]
+        retry_after = max(_retry_after(tokens, charge.cost, charge.limit) for charge, tokens in short)
+        names = ", ".join(sorted({charge.key.split(":", 1)[0] for charge, _ in short}))
+        logger.warning(
+            f"Rate limit '{names}' exceeded for {request.url.path} "
+            f"(retry after {retry_after}s)"
+        )
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. Please retry in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+# Singleton instance
+_rate_limiter_instance: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get singleton RateLimiter instance"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = RateLimiter()
+    return _rate_limiter_instance
+
+
+def rate_limit(operation: str, rate: str, cost: float = None):
+    """
+    Build a FastAPI dependency enforcing `rate` per user+IP (and per IP) and charging the LLM budget
+
+    Usage:
+        @router.post("/tailor")
+        async def tailor(..., _: None = Depends(rate_limit("tailor_resume", "10/hour"))):
+
+    Args:
+        operation: Bucket name; also the OPERATION_COSTS key used to charge the LLM budget
+        rate: Per-endpoint request limit, e.g. "10/hour"
+        cost: Explicit cost units (defaults to OPERATION_COSTS[operation])
+    """
+    limit = RateLimit.parse(operation, rate)
+    charge = cost if cost is not None else OPERATION_COSTS.get(operation, 0)
+
+    async def dependency(request: Request, response: Response) -> None:
+        await get_rate_limiter().check(request, limit, cost=charge, response=response)
+
+    return dependency
@@ -0,0 +1,39 @@
+"""
+Request Context Middleware - which request each task is serving
+
+Pure ASGI and added first (innermost), so it runs in the same task as the
+route handler. Code running on another thread (the event-loop watchdog)
+can then name the request behind the loop's current task.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+# Task serving each in-flight request -> "METHOD /path"
+_task_routes: Dict[asyncio.Task, str] = {}
+
+
+def route_for_task(task: Optional[asyncio.Task]) -> Optional[str]:
+    """Request served by a task, if it is a request task (safe to call from any thread)"""
+    if task is None:
+        return None
+    return _task_routes.get(task)
+
+
+class RequestContextMiddleware:
+    """Records the running request for the current task"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        _task_routes[task] = f"{scope['method']} {scope['path']}"
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _task_routes.pop(task, None)
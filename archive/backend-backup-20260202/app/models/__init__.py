@@ -8,6 +8,8 @@ from app.models.star_story import StarStory
 from app.models.saved_comparison import SavedComparison, TailoredResumeEdit
 from app.models.practice_question_response import PracticeQuestionResponse
 from app.models.analysis_cache import AnalysisCache
+from app.models.rate_limit import RateLimitBucket
+from app.models.company_news import CompanyNewsArticle, CompanyNewsWatermark
 
 __all__ = [
     "User",
@@ -21,4 +23,7 @@ __all__ = [
     "TailoredResumeEdit",
     "PracticeQuestionResponse",
     "AnalysisCache",
+    "RateLimitBucket",
+    "CompanyNewsArticle",
+    "CompanyNewsWatermark",
 ]
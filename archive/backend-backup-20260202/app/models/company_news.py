@@ -0,0 +1,46 @@
+"""
+Company News Index - Locally stored news articles per company
+
+Articles fetched by NewsAggregatorService are kept per company and indexed
+by published date, so later requests read the date window from the database
+and only fetch items newer than the company's watermark.
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, JSON, Index, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+
+class CompanyNewsArticle(Base):
+    """One news article stored for a company"""
+    __tablename__ = "company_news_articles"
+    __table_args__ = (
+        # Window queries: WHERE company_key = ? AND published_date >= ? ORDER BY published_date DESC
+        Index("idx_company_news_company_published", "company_key", "published_date"),
+        UniqueConstraint("company_key", "dedup_key", name="uq_company_news_dedup"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    company_key = Column(String(255), nullable=False)     # Normalized company name
+    dedup_key = Column(String(512), nullable=False)       # Canonical URL, or title prefix when there is no URL
+
+    title = Column(Text, nullable=False)
+    summary = Column(Text)
+    source = Column(String(255))
+    url = Column(Text)
+    published_date = Column(Date, nullable=False)
+    category = Column(String(50))
+    base_relevance = Column(Integer, default=5)            # Source-based score before role/recency boosts
+    role_hits = Column(JSON)                               # {"cybersecurity": 2, ...} computed at ingest
+
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CompanyNewsWatermark(Base):
+    """Refresh state of a company's stored news"""
+    __tablename__ = "company_news_watermarks"
+
+    company_key = Column(String(255), primary_key=True)
+    newest_published = Column(Date)       # Most recent published_date stored
+    covered_from = Column(Date)           # Oldest date the stored window is complete from
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
@@ -12,10 +12,17 @@ class InterviewPrep(Base):
     # Complete interview prep data (JSON structure matching the schema)
     prep_data = Column(JSON, nullable=False)
 
+    # Generated common-questions set ({"questions": [...]}); single questions are regenerated in place
+    common_questions = Column(JSON, nullable=True)
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # View tracking (written in batches by the touch buffer)
+    last_viewed_at = Column(DateTime, nullable=True)
+    view_count = Column(Integer, default=0)
+
     # Soft delete
     is_deleted = Column(Boolean, default=False, index=True)
     deleted_at = Column(DateTime, nullable=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Float
+from app.database import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token-bucket state shared by every API worker
+
+    One row per (limit name, user, IP). `tokens` is the balance at
+    `updated_at` (unix seconds); the refill since then is applied lazily on
+    the next request, so idle buckets are never written to.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Floa
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+from app.utils.json_codec import JSONDocument
 
 class BaseResume(Base):
     __tablename__ = "base_resumes"
@@ -21,8 +22,8 @@ class BaseResume(Base):
 
     # Parsed sections
     summary = Column(Text)
-    skills = Column(Text)  # JSON string
-    experience = Column(Text)  # JSON string of job entries
+    skills = Column(JSONDocument)  # List of skills
+    experience = Column(JSONDocument)  # List of job entries
     education = Column(Text)
     certifications = Column(Text)
 
@@ -49,8 +50,8 @@ class TailoredResume(Base):
 
     # Tailored sections
     tailored_summary = Column(Text)
-    tailored_skills = Column(Text)  # JSON string
-    tailored_experience = Column(Text)  # JSON string
+    tailored_skills = Column(JSONDocument)  # List of competencies
+    tailored_experience = Column(JSONDocument)  # List of job entries
     alignment_statement = Column(Text)  # Company values alignment
 
     # Quality metrics
@@ -63,6 +64,7 @@ class TailoredResume(Base):
 
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Index for sorting by date
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # ETag source
 
     # Soft delete fields (audit trail)
     is_deleted = Column(Boolean, default=False, index=True)  # Index for filtering
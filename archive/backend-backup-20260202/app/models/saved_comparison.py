@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Bool
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+from app.utils.json_codec import JSONDocument
 
 class SavedComparison(Base):
     """
@@ -17,19 +18,21 @@ class SavedComparison(Base):
     # User-defined metadata
     title = Column(String, nullable=True)  # Optional custom title (e.g., "Google SWE Application")
     notes = Column(Text, nullable=True)  # User notes about this comparison
-    tags = Column(Text, nullable=True)  # JSON array of tags (e.g., ["FAANG", "Senior", "Applied"])
+    tags = Column(JSONDocument, nullable=True)  # Array of tags (e.g., ["FAANG", "Senior", "Applied"])
 
     # AI Analysis Data (persisted from analysis endpoints)
-    analysis_data = Column(Text, nullable=True)  # JSON: AI change analysis with section explanations
-    keywords_data = Column(Text, nullable=True)  # JSON: Keyword extraction and matching results
-    match_score_data = Column(Text, nullable=True)  # JSON: Overall match score and detailed breakdown
+    analysis_data = Column(JSONDocument, nullable=True)  # AI change analysis with section explanations
+    keywords_data = Column(JSONDocument, nullable=True)  # Keyword extraction and matching results
+    match_score_data = Column(JSONDocument, nullable=True)  # Overall match score and detailed breakdown
 
     # Status tracking
     is_pinned = Column(Boolean, default=False, index=True)  # Pin to top of list
 
     # Metadata
     saved_at = Column(DateTime, default=datetime.utcnow, index=True)  # When was it saved
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # ETag source
     last_viewed_at = Column(DateTime, nullable=True)  # Last time user viewed this comparison
+    view_count = Column(Integer, default=0)  # Written in batches by the touch buffer
 
     # Soft delete
     is_deleted = Column(Boolean, default=False, index=True)
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from typing import List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.database import get_db
@@ -56,6 +56,10 @@ class UserDeactivateRequest(BaseModel):
     reason: str
 
 
+class ProfilingSampleRateRequest(BaseModel):
+    sample_rate: float = Field(ge=0.0, le=1.0)
+
+
 @router.get("/stats", response_model=SystemStatsResponse, dependencies=[Depends(check_admin_ip)])
 async def get_system_stats(db: Session = Depends(get_db)):
     """
@@ -303,3 +307,98 @@ async def get_audit_logs(
     except Exception as e:
         logger.error(f"Error exporting audit logs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to export audit logs")
+
+
+@router.get("/metrics", dependencies=[Depends(check_admin_ip)])
+async def get_runtime_metrics():
+    """
+    Runtime metrics (admin only)
+
+    Protected by IP allowlist.
+
+    - event_loop: lag percentiles over the recent window, plus the route,
+      location and duration of recent calls that blocked the loop
+    - export_cache: rendered-export cache size and hit/miss counts
+    """
+    from app.services.export_cache import get_export_cache
+    from app.utils.loop_monitor import get_loop_monitor
+
+    return {
+        "event_loop": get_loop_monitor().stats(),
+        "export_cache": get_export_cache().stats(),
+    }
+
+
+@router.get("/profiles", dependencies=[Depends(check_admin_ip)])
+async def list_request_profiles():
+    """
+    List stored request profiles, newest first (admin only)
+
+    Protected by IP allowlist.
+
+    A request is profiled when it sends X-Profile-Token matching
+    PROFILING_TOKEN, or when the sampling rate picks it. Each entry has the
+    request, its duration, sample count and per-stage (db, llm, scrape,
+    render, http) span totals.
+    """
+    from app.utils.profiler import get_request_profiler
+
+    profiler = get_request_profiler()
+    profiles = profiler.list()
+    return {
+        "profiles": profiles,
+        "total": len(profiles),
+        "sample_rate": profiler.sample_rate,
+        "header_enabled": bool(profiler.token),
+    }
+
+
+@router.post("/profiles/sampling", dependencies=[Depends(check_admin_ip)])
+async def set_profiling_sample_rate(request: ProfilingSampleRateRequest):
+    """
+    Change the share of requests profiled at random (admin only)
+
+    Protected by IP allowlist. Applies to this worker until restart
+    (PROFILING_SAMPLE_RATE is the startup value). 0 turns sampling off, and
+    with no PROFILING_TOKEN also removes the profiler's hooks.
+    """
+    from app.utils.profiler import get_request_profiler
+
+    profiler = get_request_profiler()
+    profiler.set_sample_rate(request.sample_rate)
+    logger.info(f"Admin set request profiling sample rate to {request.sample_rate}")
+    return {"sample_rate": profiler.sample_rate}
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(check_admin_ip)])
+async def get_request_profile(profile_id: str):
+    """
+    Get one request profile: summary, stage spans and speedscope profile (admin only)
+
+    Protected by IP allowlist.
+    """
+    from app.utils.profiler import get_request_profiler
+
+    profile = get_request_profiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile.to_dict()
+
+
+@router.get("/profiles/{profile_id}/speedscope", dependencies=[Depends(check_admin_ip)])
+async def download_request_profile(profile_id: str):
+    """
+    Download a request profile as a speedscope file (admin only)
+
+    Protected by IP allowlist. Open it at https://www.speedscope.app.
+    """
+    from app.utils.json_codec import ORJSONResponse
+    from app.utils.profiler import get_request_profiler
+
+    profile = get_request_profiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return ORJSONResponse(
+        profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.speedscope.json"'}
+    )
@@ -2,7 +2,7 @@
 Career Path Designer API Routes
 Orchestrates research -> synthesis -> validation -> storage
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from typing import List
@@ -24,6 +24,8 @@ from app.schemas.career_plan import (
 from app.services.career_path_research_service import CareerPathResearchService
 from app.services.career_path_synthesis_service import CareerPathSynthesisService
 from app.services.job_store import job_store
+from app.services.deletion_service import soft_delete_career_plan
+from app.utils.http_cache import row_etag, not_modified, set_etag
 
 
 router = APIRouter(prefix="/api/career-path", tags=["career-path"])
@@ -203,28 +205,43 @@ async def generate_career_plan(
 @router.get("/{plan_id}")
 async def get_career_plan(
     plan_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ) -> GenerateResponse:
     """
     Retrieve a previously generated career plan
+
+    Sends a strong ETag (plan id + updated_at); a matching If-None-Match
+    gets 304 without the plan being loaded and validated.
     """
 
     session_user_id = get_session_user_id()
 
     try:
-        result = await db.execute(
-            select(CareerPlanModel).where(
+        version = await db.execute(
+            select(CareerPlanModel.id, CareerPlanModel.updated_at).where(
                 CareerPlanModel.id == plan_id,
                 CareerPlanModel.session_user_id == session_user_id,
                 CareerPlanModel.is_deleted == False
             )
         )
+        version_row = version.first()
 
-        plan = result.scalar_one_or_none()
-
-        if not plan:
+        if not version_row:
             raise HTTPException(status_code=404, detail="Career plan not found")
 
+        etag = row_etag("career_plan", version_row.id, version_row.updated_at)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            return cached
+
+        result = await db.execute(
+            select(CareerPlanModel).where(CareerPlanModel.id == version_row.id)
+        )
+        plan = result.scalar_one()
+
+        set_etag(response, etag)
         return GenerateResponse(
             success=True,
             plan=CareerPlan(**plan.plan_json),
@@ -442,7 +459,7 @@ async def generate_tasks_for_role(request: dict):
         industry_context = f" in the {industry} industry" if industry else ""
         query = f"What are the top 3-5 most common daily tasks and responsibilities for a {role_title}{industry_context}? List them as a brief, concrete tasks that someone in this role performs regularly."
 
-        response = perplexity.client.chat.completions.create(
+        response = await perplexity.client.chat.completions.create(
             model="llama-3.1-sonar-small-128k-online",
             messages=[
                 {
@@ -688,18 +705,7 @@ async def delete_career_plan(
     session_user_id = get_session_user_id()
 
     try:
-        await db.execute(
-            update(CareerPlanModel)
-            .where(
-                CareerPlanModel.id == plan_id,
-                CareerPlanModel.session_user_id == session_user_id
-            )
-            .values(
-                is_deleted=True,
-                deleted_at=datetime.utcnow(),
-                deleted_by=session_user_id
-            )
-        )
+        await soft_delete_career_plan(db, plan_id, session_user_id)
         await db.commit()
 
         return {"success": True, "message": "Career plan deleted"}
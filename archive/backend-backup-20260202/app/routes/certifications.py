@@ -13,10 +13,9 @@ from typing import List
 
 from app.database import get_db
 from app.models import InterviewPrep, Job, TailoredResume
-from app.services.certification_service import CertificationService
+from app.services.certification_service import get_certification_service
 
 router = APIRouter()
-cert_service = CertificationService()
 
 class RecommendCertificationsRequest(BaseModel):
     interview_prep_id: int
@@ -78,7 +77,7 @@ async def recommend_certifications(
 
     # Generate recommendations
     try:
-        recommendations = await cert_service.recommend_certifications(
+        recommendations = await get_certification_service().recommend_certifications(
             job_title=job.title,
             company_name=job.company or "Target Company",
             industry=industry,
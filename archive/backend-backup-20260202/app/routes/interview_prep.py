@@ -1,42 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_, func
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
-from typing import List, Optional, Dict
-from app.database import get_db
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
+from app.database import get_db, AsyncSessionLocal
+from app.middleware.rate_limit import rate_limit
 from app.models.interview_prep import InterviewPrep
 from app.models.resume import TailoredResume, BaseResume
 from app.models.job import Job
 from app.models.company import CompanyResearch
-from app.services.openai_interview_prep import OpenAIInterviewPrep
-from app.services.openai_common_questions import OpenAICommonQuestions
+from app.services.openai_interview_prep import OpenAIInterviewPrep, PREP_SECTIONS
+from app.services.openai_common_questions import OpenAICommonQuestions, COMMON_QUESTIONS_BY_ID
 from app.services.company_research_service import CompanyResearchService
 from app.services.news_aggregator_service import NewsAggregatorService
 from app.services.interview_questions_scraper import InterviewQuestionsScraperService
 from app.services.interview_intelligence_service import InterviewIntelligenceService
+from app.services.prep_analysis_cache import (
+    READINESS, VALUES_ALIGNMENT, TECH_STACK, COMMON_QUESTIONS_SET, PREP_ANALYSIS_TYPES, INTELLIGENCE_CONTENT_TYPES,
+    prep_input_hash, prep_section_type, intelligence_bundle_type, get_prep_cached, save_prep_cached, invalidate_prep_cache
+)
 from app.services.practice_questions_service import PracticeQuestionsService
-from app.services.interview_questions_generator import InterviewQuestionsGenerator
+from app.services.deletion_service import soft_delete_interview_prep
+from app.services.touch_buffer import get_touch_buffer
+from app.utils import json_codec
+from app.utils.http_cache import row_etag, not_modified, cache_headers
+from app.utils.json_codec import json_value, ORJSONResponse
+from app.services.interview_questions_generator import InterviewQuestionsGenerator, tech_stack_is_cacheable
 from app.models.practice_question_response import PracticeQuestionResponse
 from datetime import datetime
 import json
 
 router = APIRouter(prefix="/api/interview-prep", tags=["interview_prep"])
 
-@router.post("/generate/{tailored_resume_id}")
-async def generate_interview_prep(
-    tailored_resume_id: int,
-    db: AsyncSession = Depends(get_db)
-):
-    """
-    Generate interview prep for a tailored resume.
-
-    This endpoint:
-    1. Fetches the tailored resume and associated job + company research
-    2. Calls OpenAI to generate structured interview prep data
-    3. Stores the result in the database
-    4. Returns the interview prep data
-    """
+async def _load_prep_inputs(db: AsyncSession, tailored_resume_id: int) -> Tuple[TailoredResume, Job, str, Dict]:
+    """Tailored resume, job, JD text and company research dict used to generate a prep"""
 
     # Fetch tailored resume
     result = await db.execute(
@@ -71,6 +70,105 @@ async def generate_interview_prep(
             detail="Company research not found. Please generate a tailored resume first."
         )
 
+    # Build job description text
+    job_description = f"""
+Job Title: {job.title}
+Company: {job.company}
+Location: {job.location or 'Not specified'}
+Posted: {job.posted_date or 'Unknown'}
+Salary: {job.salary or 'Not specified'}
+
+Job Description:
+{job.description or 'No description available'}
+
+Requirements:
+{job.requirements or 'No requirements listed'}
+"""
+
+    # Build company research dict
+    company_data = {
+        'industry': company_research.industry or 'Unknown',
+        'mission_values': company_research.mission_values or '',
+        'initiatives': company_research.initiatives or '',
+        'team_culture': company_research.team_culture or '',
+        'compliance': company_research.compliance or '',
+        'tech_stack': company_research.tech_stack or '',
+        'sources': company_research.sources or []
+    }
+
+    return tailored_resume, job, job_description, company_data
+
+
+async def _generate_prep_sections(
+    db: AsyncSession,
+    tailored_resume_id: int,
+    job: Job,
+    job_description: str,
+    company_data: Dict,
+    sections: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Dict, bool]]:
+    """
+    Yield (section, data, cached) for each prep section as it becomes available
+
+    Sections cached for the same job and research are yielded first; the
+    rest are generated concurrently and cached as they complete (added to
+    the session, committed by the caller), so a failed run only repeats the
+    sections that did not finish.
+    """
+    names = sections or list(PREP_SECTIONS)
+    hashes = {
+        name: prep_input_hash(prep_section_type(name), job_description, company_data)
+        for name in names
+    }
+
+    missing = []
+    for name in names:
+        cached = None
+        if use_cache:
+            cached = await get_prep_cached(db, tailored_resume_id, prep_section_type(name), input_hash=hashes[name])
+        if cached is not None:
+            yield name, cached, True
+        else:
+            missing.append(name)
+
+    if not missing:
+        return
+
+    ai_service = OpenAIInterviewPrep()
+    print(f"Generating {len(missing)} interview prep sections for job: {job.company} - {job.title}")
+    prep_context = await ai_service.build_prep_context(
+        job_description=job_description,
+        company_research=company_data,
+        company_name=job.company,
+        job_title=job.title
+    )
+
+    async for name, data in ai_service.iter_prep_sections(prep_context, missing):
+        await save_prep_cached(
+            db, tailored_resume_id, prep_section_type(name), data,
+            input_hash=hashes[name], commit=False
+        )
+        yield name, data, False
+
+
+@router.post("/generate/{tailored_resume_id}")
+async def generate_interview_prep(
+    tailored_resume_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate interview prep for a tailored resume.
+
+    This endpoint:
+    1. Fetches the tailored resume and associated job + company research
+    2. Calls OpenAI to generate each prep section concurrently (cached per section)
+    3. Stores the result in the database
+    4. Returns the interview prep data
+    """
+
+    tailored_resume, job, job_description, company_data = await _load_prep_inputs(db, tailored_resume_id)
+
     # Check if interview prep already exists
     result = await db.execute(
         select(InterviewPrep).where(
@@ -93,41 +191,17 @@ async def generate_interview_prep(
 
     # Generate new interview prep using OpenAI
     try:
-        ai_service = OpenAIInterviewPrep()
-
-        # Build job description text
-        job_description = f"""
-Job Title: {job.title}
-Company: {job.company}
-Location: {job.location or 'Not specified'}
-Posted: {job.posted_date or 'Unknown'}
-Salary: {job.salary or 'Not specified'}
-
-Job Description:
-{job.description or 'No description available'}
-
-Requirements:
-{job.requirements or 'No requirements listed'}
-"""
-
-        # Build company research dict
-        company_data = {
-            'industry': company_research.industry or 'Unknown',
-            'mission_values': company_research.mission_values or '',
-            'initiatives': company_research.initiatives or '',
-            'team_culture': company_research.team_culture or '',
-            'compliance': company_research.compliance or '',
-            'tech_stack': company_research.tech_stack or '',
-            'sources': company_research.sources or []
-        }
+        sections = {}
+        try:
+            async for section, data, _ in _generate_prep_sections(
+                db, tailored_resume_id, job, job_description, company_data
+            ):
+                sections[section] = data
+        finally:
+            # Keep the sections that did finish for the next attempt
+            await db.commit()
 
-        print(f"Generating interview prep for job: {job.company} - {job.title}")
-        prep_data = await ai_service.generate_interview_prep(
-            job_description=job_description,
-            company_research=company_data,
-            company_name=job.company,
-            job_title=job.title
-        )
+        prep_data = {section: sections[section] for section in PREP_SECTIONS}
 
         # Save to database
         interview_prep = InterviewPrep(
@@ -160,6 +234,152 @@ Requirements:
         )
 
 
+@router.post("/generate/{tailored_resume_id}/stream")
+async def generate_interview_prep_stream(
+    tailored_resume_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate interview prep, streaming each section as soon as it is ready.
+
+    Response is NDJSON, one event per line:
+    - {"type": "section", "section": "...", "data": {...}, "cached": bool}
+    - {"type": "complete", "interview_prep_id": 123, "cached": bool}
+    - {"type": "error", "error": "..."}
+    An existing prep is streamed section by section as well.
+    """
+    await _load_prep_inputs(db, tailored_resume_id)  # 404s before the stream starts
+
+    return StreamingResponse(
+        _stream_interview_prep(tailored_resume_id),
+        media_type="application/x-ndjson"
+    )
+
+
+async def _stream_interview_prep(tailored_resume_id: int):
+    """NDJSON events for generate_interview_prep_stream"""
+
+    def event(payload: Dict[str, Any]) -> bytes:
+        return json_codec.dumps_bytes(payload) + b"\n"
+
+    # The request's session is closed once streaming starts; use our own
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(InterviewPrep).where(
+                    InterviewPrep.tailored_resume_id == tailored_resume_id,
+                    InterviewPrep.is_deleted == False
+                )
+            )
+            existing_prep = result.scalar_one_or_none()
+
+            if existing_prep:
+                for section, data in existing_prep.prep_data.items():
+                    yield event({"type": "section", "section": section, "data": data, "cached": True})
+                yield event({"type": "complete", "interview_prep_id": existing_prep.id, "cached": True})
+                return
+
+            tailored_resume, job, job_description, company_data = await _load_prep_inputs(db, tailored_resume_id)
+
+            sections = {}
+            try:
+                async for section, data, cached in _generate_prep_sections(
+                    db, tailored_resume_id, job, job_description, company_data
+                ):
+                    sections[section] = data
+                    yield event({"type": "section", "section": section, "data": data, "cached": cached})
+            finally:
+                await db.commit()
+
+            interview_prep = InterviewPrep(
+                tailored_resume_id=tailored_resume_id,
+                prep_data={section: sections[section] for section in PREP_SECTIONS},
+                created_at=datetime.utcnow()
+            )
+            db.add(interview_prep)
+            await db.commit()
+            await db.refresh(interview_prep)
+
+            print(f"✓ Interview prep generated and saved with ID {interview_prep.id}")
+            yield event({"type": "complete", "interview_prep_id": interview_prep.id, "cached": False})
+
+        except Exception as e:
+            print(f"Failed to generate interview prep: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            yield event({"type": "error", "error": f"Failed to generate interview prep: {str(e)}"})
+
+
+@router.post("/{prep_id}/sections/{section}/regenerate")
+async def regenerate_prep_section(
+    prep_id: int,
+    section: str,
+    x_user_id: str = Header(None, alias="X-User-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Regenerate a single section of an interview prep and store it in place.
+    """
+    if section not in PREP_SECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown section. Must be one of: {', '.join(PREP_SECTIONS)}"
+        )
+
+    if not x_user_id:
+        raise HTTPException(status_code=400, detail="X-User-ID header is required")
+
+    result = await db.execute(
+        select(InterviewPrep)
+        .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
+        .where(
+            and_(
+                InterviewPrep.id == prep_id,
+                InterviewPrep.is_deleted == False,
+                TailoredResume.session_user_id == x_user_id,
+                TailoredResume.is_deleted == False
+            )
+        )
+    )
+    interview_prep = result.scalar_one_or_none()
+
+    if not interview_prep:
+        raise HTTPException(status_code=404, detail="Interview prep not found")
+
+    tailored_resume, job, job_description, company_data = await _load_prep_inputs(
+        db, interview_prep.tailored_resume_id
+    )
+
+    try:
+        async for _, data, _ in _generate_prep_sections(
+            db, interview_prep.tailored_resume_id, job, job_description, company_data,
+            sections=[section], use_cache=False
+        ):
+            # Replace the JSON value (not mutate it) so the change is flushed
+            interview_prep.prep_data = {**interview_prep.prep_data, section: data}
+            interview_prep.updated_at = datetime.utcnow()
+
+        await db.commit()
+
+        print(f"✓ Regenerated {section} for interview prep {prep_id}")
+
+        return {
+            "success": True,
+            "section": section,
+            "data": interview_prep.prep_data[section]
+        }
+
+    except Exception as e:
+        await db.rollback()
+        print(f"Failed to regenerate {section}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to regenerate {section}: {str(e)}"
+        )
+
+
 @router.get("/list")
 async def list_interview_preps(
     x_user_id: str = Header(None, alias="X-User-ID"),
@@ -217,33 +437,49 @@ async def list_interview_preps(
 @router.get("/{tailored_resume_id}")
 async def get_interview_prep(
     tailored_resume_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get existing interview prep for a tailored resume.
     Returns 404 if no prep exists yet.
+
+    Sends a strong ETag (prep id + updated_at); a matching If-None-Match
+    gets 304 without prep_data being loaded.
     """
 
-    result = await db.execute(
-        select(InterviewPrep).where(
+    version = await db.execute(
+        select(InterviewPrep.id, InterviewPrep.updated_at).where(
             InterviewPrep.tailored_resume_id == tailored_resume_id,
             InterviewPrep.is_deleted == False
         )
     )
-    interview_prep = result.scalar_one_or_none()
+    version_row = version.first()
 
-    if not interview_prep:
+    if not version_row:
         raise HTTPException(
             status_code=404,
             detail="Interview prep not found. Generate it first using POST /generate/{tailored_resume_id}"
         )
 
-    return {
+    # Record the view (written in batches by the touch buffer)
+    get_touch_buffer(InterviewPrep).touch(version_row.id)
+
+    etag = row_etag("interview_prep", version_row.id, version_row.updated_at)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(InterviewPrep).where(InterviewPrep.id == version_row.id))
+    interview_prep = result.scalar_one()
+
+    # prep_data is already decoded JSON: encode it once with orjson, skipping jsonable_encoder
+    return ORJSONResponse({
         "success": True,
         "interview_prep_id": interview_prep.id,
         "prep_data": interview_prep.prep_data,
         "created_at": interview_prep.created_at.isoformat()
-    }
+    }, headers=cache_headers(etag))
 
 
 @router.delete("/{interview_prep_id}")
@@ -252,20 +488,19 @@ async def delete_interview_prep(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Soft delete an interview prep record.
+    Soft delete an interview prep record (and its practice responses).
     """
 
-    result = await db.execute(
-        select(InterviewPrep).where(InterviewPrep.id == interview_prep_id)
-    )
-    interview_prep = result.scalar_one_or_none()
+    deletion = await soft_delete_interview_prep(db, interview_prep_id)
 
-    if not interview_prep:
+    if deletion.tailored_resume_id is None:
         raise HTTPException(status_code=404, detail="Interview prep not found")
 
-    # Soft delete
-    interview_prep.is_deleted = True
-    interview_prep.deleted_at = datetime.utcnow()
+    # Results derived from this prep are no longer valid
+    await invalidate_prep_cache(
+        db, deletion.tailored_resume_id,
+        *PREP_ANALYSIS_TYPES, *(prep_section_type(section) for section in PREP_SECTIONS)
+    )
 
     await db.commit()
 
@@ -318,7 +553,7 @@ async def generate_star_story(
 
         # Parse experiences
         try:
-            experiences = json.loads(base_resume.experience) if isinstance(base_resume.experience, str) else base_resume.experience
+            experiences = json_value(base_resume.experience, [])
         except:
             experiences = []
 
@@ -493,7 +728,7 @@ Remember: This story should take 3-5 minutes to tell verbally. Make it detailed,
         from app.config import get_settings
         settings = get_settings()
 
-        client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        client = openai.AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
         response = await client.chat.completions.create(
             model="gpt-4-turbo-preview",
@@ -722,86 +957,72 @@ class CommonQuestionsRequest(BaseModel):
     interview_prep_id: int
 
 
-@router.post("/common-questions/generate")
-async def generate_common_questions(
-    request: CommonQuestionsRequest,
-    x_user_id: str = Header(None, alias="X-User-ID"),
-    db: AsyncSession = Depends(get_db)
-):
+async def _load_common_question_inputs(
+    db: AsyncSession,
+    interview_prep_id: int,
+    x_user_id: str
+) -> Tuple[InterviewPrep, TailoredResume, Job, str, str]:
     """
-    Generate tailored responses for 10 common interview questions.
-
-    This endpoint:
-    1. Fetches the interview prep and associated data
-    2. Fetches the resume and job description
-    3. Uses OpenAI to generate personalized answers for 10 questions
-    4. Returns structured data with tailored answers
+    Load an owned interview prep and build the resume / job description text for common questions
 
-    Each question includes:
-    - Why it's hard (explanation)
-    - Common mistakes (bullet list)
-    - Exceptional answer builder (detailed guidance)
-    - What to say (short and long versions)
+    Returns:
+        (interview_prep, tailored_resume, job, resume_text, job_description)
     """
-    try:
-        if not x_user_id:
-            raise HTTPException(status_code=400, detail="X-User-ID header is required")
-
-        # Fetch interview prep with user validation
-        result = await db.execute(
-            select(InterviewPrep, TailoredResume)
-            .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
-            .where(
-                and_(
-                    InterviewPrep.id == request.interview_prep_id,
-                    InterviewPrep.is_deleted == False,
-                    TailoredResume.session_user_id == x_user_id,
-                    TailoredResume.is_deleted == False
-                )
+    # Fetch interview prep with user validation
+    result = await db.execute(
+        select(InterviewPrep, TailoredResume)
+        .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
+        .where(
+            and_(
+                InterviewPrep.id == interview_prep_id,
+                InterviewPrep.is_deleted == False,
+                TailoredResume.session_user_id == x_user_id,
+                TailoredResume.is_deleted == False
             )
         )
-        result_row = result.first()
+    )
+    result_row = result.first()
 
-        if not result_row:
-            raise HTTPException(status_code=404, detail="Interview prep not found")
+    if not result_row:
+        raise HTTPException(status_code=404, detail="Interview prep not found")
 
-        interview_prep, tailored_resume = result_row
+    interview_prep, tailored_resume = result_row
 
-        # Fetch base resume for full experience
-        result = await db.execute(
-            select(BaseResume).where(BaseResume.id == tailored_resume.base_resume_id)
-        )
-        base_resume = result.scalar_one_or_none()
+    # Fetch base resume for full experience
+    result = await db.execute(
+        select(BaseResume).where(BaseResume.id == tailored_resume.base_resume_id)
+    )
+    base_resume = result.scalar_one_or_none()
 
-        if not base_resume:
-            raise HTTPException(status_code=404, detail="Base resume not found")
+    if not base_resume:
+        raise HTTPException(status_code=404, detail="Base resume not found")
 
-        # Fetch job
-        result = await db.execute(
-            select(Job).where(Job.id == tailored_resume.job_id)
-        )
-        job = result.scalar_one_or_none()
+    # Fetch job
+    result = await db.execute(
+        select(Job).where(Job.id == tailored_resume.job_id)
+    )
+    job = result.scalar_one_or_none()
 
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        # Build resume text
-        resume_text = f"""
+    # Build resume text
+    resume_text = f"""
 PROFESSIONAL SUMMARY:
 {base_resume.summary or 'N/A'}
 
 SKILLS:
-{', '.join(json.loads(base_resume.skills) if isinstance(base_resume.skills, str) else base_resume.skills or [])}
+{', '.join(json_value(base_resume.skills, []))}
 
 EXPERIENCE:
 """
-        experience_data = json.loads(base_resume.experience) if isinstance(base_resume.experience, str) else base_resume.experience or []
-        for exp in experience_data:
-            resume_text += f"\n{exp.get('header', exp.get('title', 'Position'))} | {exp.get('dates', 'Dates')}\n"
-            resume_text += "\n".join([f"- {bullet}" for bullet in exp.get('bullets', [])])
-            resume_text += "\n"
+    experience_data = json_value(base_resume.experience, [])
+    for exp in experience_data:
+        resume_text += f"\n{exp.get('header', exp.get('title', 'Position'))} | {exp.get('dates', 'Dates')}\n"
+        resume_text += "\n".join([f"- {bullet}" for bullet in exp.get('bullets', [])])
+        resume_text += "\n"
 
-        resume_text += f"""
+    resume_text += f"""
 EDUCATION:
 {base_resume.education or 'N/A'}
 
@@ -809,14 +1030,74 @@ CERTIFICATIONS:
 {base_resume.certifications or 'N/A'}
 """
 
-        # Build job description
-        job_description = f"""
+    # Build job description
+    job_description = f"""
 {job.title} at {job.company}
 Location: {job.location or 'Not specified'}
 
 {job.description}
 """
 
+    return interview_prep, tailored_resume, job, resume_text, job_description
+
+
+async def _stored_common_questions(
+    db: AsyncSession,
+    interview_prep_id: int,
+    tailored_resume_id: int,
+    for_update: bool = False
+) -> Optional[Dict[str, Any]]:
+    """The prep's stored common-questions set (falls back to sets cached before the column existed)"""
+    query = select(InterviewPrep.common_questions).where(InterviewPrep.id == interview_prep_id)
+    if for_update:
+        query = query.with_for_update()
+    stored = (await db.execute(query)).scalar_one_or_none()
+    if stored is None:
+        stored = await get_prep_cached(db, tailored_resume_id, COMMON_QUESTIONS_SET)
+    return stored
+
+
+async def _save_common_questions(db: AsyncSession, interview_prep_id: int, common_questions: Dict[str, Any]):
+    """Store the common-questions set on the prep row and commit"""
+    await db.execute(
+        update(InterviewPrep)
+        .where(InterviewPrep.id == interview_prep_id)
+        # updated_at versions prep_data (the prep's ETag); this set is served separately
+        .values(common_questions=common_questions, updated_at=InterviewPrep.updated_at)
+    )
+    await db.commit()
+
+
+@router.post("/common-questions/generate")
+async def generate_common_questions(
+    request: CommonQuestionsRequest,
+    x_user_id: str = Header(None, alias="X-User-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate tailored responses for 10 common interview questions.
+
+    This endpoint:
+    1. Fetches the interview prep and associated data
+    2. Fetches the resume and job description
+    3. Uses OpenAI to generate personalized answers for 10 questions
+    4. Stores the set for the prep (individual questions are regenerated in place)
+    5. Returns structured data with tailored answers
+
+    Each question includes:
+    - Why it's hard (explanation)
+    - Common mistakes (bullet list)
+    - Exceptional answer builder (detailed guidance)
+    - What to say (short and long versions)
+    """
+    try:
+        if not x_user_id:
+            raise HTTPException(status_code=400, detail="X-User-ID header is required")
+
+        interview_prep, tailored_resume, job, resume_text, job_description = await _load_common_question_inputs(
+            db, request.interview_prep_id, x_user_id
+        )
+
         # Generate common questions using OpenAI
         ai_service = OpenAICommonQuestions()
 
@@ -828,6 +1109,8 @@ Location: {job.location or 'Not specified'}
             prep_data=interview_prep.prep_data
         )
 
+        await _save_common_questions(db, interview_prep.id, result_data)
+
         print(f"✓ Generated common questions for interview prep {request.interview_prep_id}")
 
         return {
@@ -847,6 +1130,44 @@ Location: {job.location or 'Not specified'}
         )
 
 
+@router.get("/common-questions/{interview_prep_id}")
+async def get_common_questions(
+    interview_prep_id: int,
+    x_user_id: str = Header(None, alias="X-User-ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the stored common questions set for an interview prep (404 if never generated)"""
+    if not x_user_id:
+        raise HTTPException(status_code=400, detail="X-User-ID header is required")
+
+    result = await db.execute(
+        select(InterviewPrep.tailored_resume_id, InterviewPrep.common_questions)
+        .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
+        .where(
+            and_(
+                InterviewPrep.id == interview_prep_id,
+                InterviewPrep.is_deleted == False,
+                TailoredResume.session_user_id == x_user_id,
+                TailoredResume.is_deleted == False
+            )
+        )
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Interview prep not found")
+
+    stored = row.common_questions
+    if stored is None:
+        stored = await get_prep_cached(db, row.tailored_resume_id, COMMON_QUESTIONS_SET)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Common questions not generated yet")
+
+    return {
+        "success": True,
+        "data": stored
+    }
+
+
 class RegenerateQuestionRequest(BaseModel):
     interview_prep_id: int
     question_id: str  # e.g., "q1", "q2"
@@ -862,98 +1183,45 @@ async def regenerate_single_question(
     Regenerate a single common interview question.
 
     This allows the user to get a fresh answer if they're not satisfied
-    with the initially generated response.
+    with the initially generated response. Only that question is sent to
+    OpenAI, and the stored question set is patched in place.
     """
     try:
         if not x_user_id:
             raise HTTPException(status_code=400, detail="X-User-ID header is required")
 
-        # Fetch interview prep with user validation
-        result = await db.execute(
-            select(InterviewPrep, TailoredResume)
-            .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
-            .where(
-                and_(
-                    InterviewPrep.id == request.interview_prep_id,
-                    InterviewPrep.is_deleted == False,
-                    TailoredResume.session_user_id == x_user_id,
-                    TailoredResume.is_deleted == False
-                )
-            )
-        )
-        result_row = result.first()
-
-        if not result_row:
-            raise HTTPException(status_code=404, detail="Interview prep not found")
-
-        interview_prep, tailored_resume = result_row
+        if request.question_id not in COMMON_QUESTIONS_BY_ID:
+            raise HTTPException(status_code=404, detail=f"Question {request.question_id} not found")
 
-        # Fetch base resume
-        result = await db.execute(
-            select(BaseResume).where(BaseResume.id == tailored_resume.base_resume_id)
+        interview_prep, tailored_resume, job, resume_text, job_description = await _load_common_question_inputs(
+            db, request.interview_prep_id, x_user_id
         )
-        base_resume = result.scalar_one_or_none()
-        if not base_resume:
-            raise HTTPException(status_code=404, detail="Base resume not found")
 
-        # Fetch job
-        result = await db.execute(
-            select(Job).where(Job.id == tailored_resume.job_id)
+        stored = await _stored_common_questions(db, interview_prep.id, tailored_resume.id)
+        previous_answer = next(
+            (q for q in (stored or {}).get('questions', []) if q.get('id') == request.question_id),
+            None
         )
-        job = result.scalar_one_or_none()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        # Build resume text
-        resume_text = f"""
-PROFESSIONAL SUMMARY:
-{base_resume.summary or 'N/A'}
 
-SKILLS:
-{', '.join(json.loads(base_resume.skills) if isinstance(base_resume.skills, str) else base_resume.skills or [])}
-
-EXPERIENCE:
-"""
-        experience_data = json.loads(base_resume.experience) if isinstance(base_resume.experience, str) else base_resume.experience or []
-        for exp in experience_data:
-            resume_text += f"\n{exp.get('header', exp.get('title', 'Position'))} | {exp.get('dates', 'Dates')}\n"
-            resume_text += "\n".join([f"- {bullet}" for bullet in exp.get('bullets', [])])
-            resume_text += "\n"
-
-        resume_text += f"""
-EDUCATION:
-{base_resume.education or 'N/A'}
-
-CERTIFICATIONS:
-{base_resume.certifications or 'N/A'}
-"""
-
-        job_description = f"""
-{job.title} at {job.company}
-Location: {job.location or 'Not specified'}
-
-{job.description}
-"""
-
-        # Regenerate all questions
         ai_service = OpenAICommonQuestions()
-        result_data = await ai_service.generate_common_questions(
+        regenerated_question = await ai_service.generate_single_question(
+            question_id=request.question_id,
             resume_text=resume_text,
             job_description=job_description,
             company_name=job.company,
             job_title=job.title,
-            prep_data=interview_prep.prep_data
+            prep_data=interview_prep.prep_data,
+            previous_answer=previous_answer
         )
 
-        # Extract only the requested question
-        regenerated_question = None
-        for q in result_data.get('questions', []):
-            if q.get('id') == request.question_id:
-                regenerated_question = q
-                break
-
-        if not regenerated_question:
-            raise HTTPException(status_code=404, detail=f"Question {request.question_id} not found")
+        # Patch the stored set in place; re-read it under a row lock so questions regenerated
+        # meanwhile are kept. With no set stored yet, the question starts one.
+        stored = await _stored_common_questions(db, interview_prep.id, tailored_resume.id, for_update=True) or {}
+        questions = [q for q in stored.get('questions', []) if q.get('id') != request.question_id]
+        questions.append(regenerated_question)
+        order = {question_id: index for index, question_id in enumerate(COMMON_QUESTIONS_BY_ID)}
+        questions.sort(key=lambda q: order.get(q.get('id'), len(order)))
+        await _save_common_questions(db, interview_prep.id, {**stored, "questions": questions})
 
         print(f"✓ Regenerated question {request.question_id} for interview prep {request.interview_prep_id}")
 
@@ -1412,6 +1680,7 @@ async def save_practice_response(
             existing_response.last_practiced_at = datetime.utcnow()
             existing_response.updated_at = datetime.utcnow()
 
+            await _record_practice_for_readiness(db, request.interview_prep_id)
             await db.commit()
             await db.refresh(existing_response)
 
@@ -1438,6 +1707,7 @@ async def save_practice_response(
             )
 
             db.add(new_response)
+            await _record_practice_for_readiness(db, request.interview_prep_id)
             await db.commit()
             await db.refresh(new_response)
 
@@ -1580,11 +1850,15 @@ async def generate_behavioral_technical_questions(
        - Candidate's skills from resume
        - Job requirements
 
+    Tech stack research and behavioral generation run concurrently; the
+    structured tech stack is cached per prep and reused on later runs.
+
     Returns:
     - company_tech_stack: Real technologies the company uses
     - behavioral: 10 questions with STAR prompts and guidance
     - technical: 10 questions with skill leverage tips
     - tech_stack_analysis: How candidate skills match company needs
+    - timings: Per-step timings of the generation graph
     """
     try:
         if not x_user_id:
@@ -1633,7 +1907,7 @@ async def generate_behavioral_technical_questions(
         candidate_skills = []
         if base_resume.skills:
             try:
-                skills_data = json.loads(base_resume.skills) if isinstance(base_resume.skills, str) else base_resume.skills
+                skills_data = json_value(base_resume.skills, [])
                 candidate_skills = skills_data if isinstance(skills_data, list) else []
             except:
                 candidate_skills = []
@@ -1641,7 +1915,7 @@ async def generate_behavioral_technical_questions(
         candidate_experience = []
         if base_resume.experience:
             try:
-                exp_data = json.loads(base_resume.experience) if isinstance(base_resume.experience, str) else base_resume.experience
+                exp_data = json_value(base_resume.experience, [])
                 candidate_experience = exp_data if isinstance(exp_data, list) else []
             except:
                 candidate_experience = []
@@ -1671,10 +1945,21 @@ Requirements:
 {job.requirements or 'No specific requirements listed'}
 """
 
+        # Tech stack gathered during company research, and the structured stack
+        # from an earlier run for the same company and job
+        result = await db.execute(
+            select(CompanyResearch.tech_stack).where(CompanyResearch.job_id == job.id)
+        )
+        tech_stack_research = result.scalars().first() or None
+        tech_stack_hash = prep_input_hash(TECH_STACK, job.company, job_description, tech_stack_research)
+        cached_tech_stack = await get_prep_cached(
+            db, tailored_resume.id, TECH_STACK, input_hash=tech_stack_hash
+        )
+
         # Initialize the question generator service
         generator = InterviewQuestionsGenerator()
 
-        # Generate full question set
+        # Generate full question set (tech stack research runs alongside behavioral questions)
         questions_data = await generator.generate_full_interview_questions(
             job_description=job_description,
             job_title=job.title,
@@ -1685,9 +1970,18 @@ Requirements:
             candidate_skills=candidate_skills,
             candidate_experience=candidate_experience,
             company_values=company_values,
-            industry=company_profile.get('industry')
+            industry=company_profile.get('industry'),
+            company_tech_stack=cached_tech_stack,
+            tech_stack_research=tech_stack_research
         )
 
+        # Fallback (job-description) or empty stacks are not cached, so research is retried next time
+        if cached_tech_stack is None and tech_stack_is_cacheable(questions_data["company_tech_stack"]):
+            await save_prep_cached(
+                db, tailored_resume.id, TECH_STACK, questions_data["company_tech_stack"],
+                input_hash=tech_stack_hash
+            )
+
         return {
             "success": True,
             "data": questions_data
@@ -1711,6 +2005,98 @@ Requirements:
 # ============================================================================
 
 
+def _readiness_state(sections_completed: List[str], practice: Dict) -> Dict:
+    """Stored readiness: its inputs plus the response in the mobile app's format"""
+    service = InterviewIntelligenceService()
+    readiness = service.compute_interview_readiness(
+        prep_data={},
+        sections_completed=sections_completed,
+        practice_stats=practice
+    )
+
+    # Transform to match mobile app expected format
+    confidence_level = int(readiness.get('readiness_score', 7) * 10)  # Convert 0-10 to 0-100
+    completed = set(sections_completed)
+    if practice.get("questions_practiced"):
+        completed.add("practice_questions")
+    strengths = [
+        f"Completed {len(completed)} of 7 prep sections",
+        f"Progress: {readiness.get('progress_percentage', 0)}%",
+        f"Time invested: ~{readiness.get('time_invested_minutes', 0)} minutes"
+    ]
+    if practice.get("questions_practiced"):
+        strengths.append(f"Practiced {practice['questions_practiced']} questions")
+
+    return {
+        "sections_completed": sections_completed,
+        "practice": practice,
+        "data": {
+            "confidence_level": confidence_level,
+            "preparation_level": readiness.get('status', 'In Progress'),
+            "strengths": strengths,
+            "areas_for_improvement": readiness.get('critical_gaps', []),
+            "recommendations": [action.get('action', '') for action in readiness.get('next_actions', [])]
+        }
+    }
+
+
+async def _practice_stats(db: AsyncSession, interview_prep_id: int) -> Dict:
+    """Practice totals for a prep, aggregated in SQL"""
+    result = await db.execute(
+        select(
+            func.count(PracticeQuestionResponse.id),
+            func.coalesce(func.sum(PracticeQuestionResponse.times_practiced), 0),
+            func.coalesce(func.sum(PracticeQuestionResponse.practice_duration_seconds), 0)
+        ).where(
+            and_(
+                PracticeQuestionResponse.interview_prep_id == interview_prep_id,
+                PracticeQuestionResponse.is_deleted == False
+            )
+        )
+    )
+    questions, sessions, seconds = result.one()
+    return {
+        "questions_practiced": int(questions),
+        "practice_sessions": int(sessions),
+        "practice_seconds": int(seconds)
+    }
+
+
+async def _record_practice_for_readiness(db: AsyncSession, interview_prep_id: int):
+    """
+    Bring the prep's stored readiness score up to date after a practice save
+
+    Runs in the caller's transaction, after the practice response is added or
+    changed. The prep row is locked first, so concurrent saves for the same
+    prep run one after another and each re-aggregates the practice totals
+    including the others' committed rows (no lost increments). Without a
+    stored score there is nothing to update; the next readiness read computes
+    it from the aggregates.
+    """
+    tailored_resume_id = (await db.execute(
+        select(InterviewPrep.tailored_resume_id)
+        .where(InterviewPrep.id == interview_prep_id)
+        .with_for_update()
+    )).scalar_one_or_none()
+    if tailored_resume_id is None:
+        return
+
+    state = await get_prep_cached(db, tailored_resume_id, READINESS)
+    if state is None:
+        return
+
+    # One indexed aggregate over this prep's responses, this transaction's changes included
+    practice = await _practice_stats(db, interview_prep_id)
+
+    sections_completed = state["sections_completed"]
+    await save_prep_cached(
+        db, tailored_resume_id, READINESS,
+        _readiness_state(sections_completed, practice),
+        input_hash=prep_input_hash(READINESS, sections_completed),
+        commit=False
+    )
+
+
 @router.get("/{prep_id}/readiness-score")
 async def get_readiness_score(
     prep_id: int,
@@ -1747,49 +2133,21 @@ async def get_readiness_score(
             raise HTTPException(status_code=404, detail="Interview prep not found")
 
         interview_prep, tailored_resume = result_row
-        prep_data = interview_prep.prep_data
 
-        # Calculate readiness based on prep data completeness
-        service = InterviewIntelligenceService()
-
-        # Determine which sections are complete based on prep_data
-        sections_completed = []
-        if prep_data.get('company_profile'):
-            sections_completed.append('company_profile')
-        if prep_data.get('role_analysis'):
-            sections_completed.append('role_analysis')
-        if prep_data.get('values_and_culture'):
-            sections_completed.append('values_culture')
-        if prep_data.get('strategy_and_news'):
-            sections_completed.append('strategy_news')
-        if prep_data.get('interview_preparation'):
-            sections_completed.append('interview_prep_checklist')
-        if prep_data.get('questions_to_ask_interviewer'):
-            sections_completed.append('questions_to_ask')
-        if prep_data.get('candidate_positioning'):
-            sections_completed.append('practice_questions')
-
-        readiness = await service.calculate_interview_readiness(
-            prep_data=prep_data,
-            sections_completed=sections_completed
-        )
+        # Sections with content decide the score; a stored score for the same
+        # sections is current, since practice saves keep it up to date
+        sections_completed = InterviewIntelligenceService.readiness_sections(interview_prep.prep_data)
+        input_hash = prep_input_hash(READINESS, sections_completed)
+        state = await get_prep_cached(db, tailored_resume.id, READINESS, input_hash=input_hash)
 
-        # Transform to match mobile app expected format
-        confidence_level = int(readiness.get('readiness_score', 7) * 10)  # Convert 0-10 to 0-100
+        if state is None:
+            practice = await _practice_stats(db, prep_id)
+            state = _readiness_state(sections_completed, practice)
+            await save_prep_cached(db, tailored_resume.id, READINESS, state, input_hash=input_hash)
 
         return {
             "success": True,
-            "data": {
-                "confidence_level": confidence_level,
-                "preparation_level": readiness.get('status', 'In Progress'),
-                "strengths": [
-                    f"Completed {len(sections_completed)} of 7 prep sections",
-                    f"Progress: {readiness.get('progress_percentage', 0)}%",
-                    f"Time invested: ~{readiness.get('time_invested_minutes', 0)} minutes"
-                ],
-                "areas_for_improvement": readiness.get('critical_gaps', []),
-                "recommendations": [action.get('action', '') for action in readiness.get('next_actions', [])]
-            }
+            "data": state["data"]
         }
 
     except HTTPException:
@@ -1851,6 +2209,16 @@ async def get_values_alignment(
         # Build job description
         job_description = f"{job.title} at {job.company}\n{job.description or ''}"
 
+        input_hash = prep_input_hash(
+            VALUES_ALIGNMENT, stated_values, candidate_background, job_description, job.company
+        )
+        cached = await get_prep_cached(db, tailored_resume.id, VALUES_ALIGNMENT, input_hash=input_hash)
+        if cached is not None:
+            return {
+                "success": True,
+                "data": cached
+            }
+
         # Generate values alignment
         service = InterviewIntelligenceService()
         alignment = await service.generate_values_alignment_scorecard(
@@ -1879,15 +2247,20 @@ async def get_values_alignment(
                     "suggestion": vm.get('star_story_prompt', '')
                 })
 
+        data = {
+            "alignment_score": int(alignment.get('overall_culture_fit', 7.5) * 10),
+            "matched_values": value_matches,
+            "value_gaps": value_gaps,
+            "cultural_fit_insights": f"Based on your background, you align well with {job.company}'s values. " +
+                f"Top strengths: {', '.join(alignment.get('top_strengths', []))}"
+        }
+        if alignment.get('value_matches'):
+            # An empty scorecard is the service's fallback after a failed call; retry on next view
+            await save_prep_cached(db, tailored_resume.id, VALUES_ALIGNMENT, data, input_hash=input_hash)
+
         return {
             "success": True,
-            "data": {
-                "alignment_score": int(alignment.get('overall_culture_fit', 7.5) * 10),
-                "matched_values": value_matches,
-                "value_gaps": value_gaps,
-                "cultural_fit_insights": f"Based on your background, you align well with {job.company}'s values. " +
-                    f"Top strengths: {', '.join(alignment.get('top_strengths', []))}"
-            }
+            "data": data
         }
 
     except HTTPException:
@@ -1902,6 +2275,104 @@ async def get_values_alignment(
         )
 
 
+@router.get("/{prep_id}/intelligence")
+async def get_intelligence_bundle(
+    prep_id: int,
+    content_type: str = "strategy",
+    x_user_id: str = Header(None, alias="X-User-ID"),
+    db: AsyncSession = Depends(get_db),
+    _rate_limit: None = Depends(rate_limit("intelligence_bundle", "20/minute"))  # 20 bundles per minute per user+IP
+):
+    """
+    Relevance scores, talking points and job alignment for a prep in one request.
+
+    Computed with a single structured LLM call and cached per prep and
+    content type; each entry is keyed by a hash of the prep data and job, so
+    it refreshes when either changes.
+
+    Query params:
+    - content_type: "strategy" scores strategic themes, "news" scores recent events
+
+    Returns:
+    - scored_items (as /score-relevance)
+    - talking_points (as /generate-talking-points)
+    - job_alignment (as /analyze-job-alignment)
+    """
+    if content_type not in INTELLIGENCE_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid content_type. Allowed: {', '.join(INTELLIGENCE_CONTENT_TYPES)}"
+        )
+
+    if not x_user_id:
+        raise HTTPException(status_code=400, detail="X-User-ID header is required")
+
+    try:
+        result = await db.execute(
+            select(InterviewPrep, TailoredResume, Job)
+            .join(TailoredResume, InterviewPrep.tailored_resume_id == TailoredResume.id)
+            .join(Job, TailoredResume.job_id == Job.id)
+            .where(
+                and_(
+                    InterviewPrep.id == prep_id,
+                    InterviewPrep.is_deleted == False,
+                    TailoredResume.session_user_id == x_user_id,
+                    TailoredResume.is_deleted == False
+                )
+            )
+        )
+        result_row = result.first()
+
+        if not result_row:
+            raise HTTPException(status_code=404, detail="Interview prep not found")
+
+        interview_prep, tailored_resume, job = result_row
+        prep_data = interview_prep.prep_data
+        job_description = f"{job.title} at {job.company}\n{job.description or ''}"
+
+        bundle_type = intelligence_bundle_type(content_type)
+        input_hash = prep_input_hash(bundle_type, prep_data, job_description)
+        bundle = await get_prep_cached(db, tailored_resume.id, bundle_type, input_hash)
+        cached = bundle is not None
+
+        if not cached:
+            strategy_and_news = prep_data.get('strategy_and_news', {})
+            content_items = strategy_and_news.get('recent_events' if content_type == "news" else 'strategic_themes', [])
+            company_research = {
+                "company_profile": prep_data.get('company_profile', {}),
+                "values_and_culture": prep_data.get('values_and_culture', {}),
+                "strategy_and_news": strategy_and_news,
+            }
+
+            service = InterviewIntelligenceService()
+            bundle = await service.generate_intelligence_bundle(
+                content_items=content_items,
+                company_research=company_research,
+                job_description=job_description,
+                job_title=job.title,
+                company_name=job.company,
+                content_type=content_type
+            )
+            await save_prep_cached(db, tailored_resume.id, bundle_type, bundle, input_hash)
+
+        return {
+            "success": True,
+            "data": bundle,
+            "cached": cached
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Failed to get intelligence bundle: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get intelligence bundle: {str(e)}"
+        )
+
+
 @router.get("/{prep_id}/company-research")
 async def get_company_research_for_prep(
     prep_id: int,
@@ -1960,7 +2431,7 @@ async def get_company_research_for_prep(
         competitors = []
         if company_research and company_research.initiatives:
             try:
-                initiatives = json.loads(company_research.initiatives) if isinstance(company_research.initiatives, str) else company_research.initiatives
+                initiatives = json_value(company_research.initiatives, [])
                 # Look for competitor mentions in initiatives
                 for initiative in initiatives[:3]:
                     competitors.append({
@@ -2441,6 +2912,7 @@ async def save_star_story_for_question(
             existing_response.updated_at = datetime.utcnow()
             existing_response.times_practiced = (existing_response.times_practiced or 0) + 1
             existing_response.last_practiced_at = datetime.utcnow()
+            await _record_practice_for_readiness(db, request.interview_prep_id)
             await db.commit()
             await db.refresh(existing_response)
 
@@ -2463,6 +2935,7 @@ async def save_star_story_for_question(
                 last_practiced_at=datetime.utcnow()
             )
             db.add(new_response)
+            await _record_practice_for_readiness(db, request.interview_prep_id)
             await db.commit()
             await db.refresh(new_response)
 
@@ -8,24 +8,20 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from app.services.firecrawl_client import FirecrawlClient
 from app.utils.url_validator import URLValidator
+from app.middleware.rate_limit import rate_limit
 
 router = APIRouter()
 
-# Rate limiter
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-limiter = Limiter(key_func=get_remote_address)
-
 
 class ExtractJobRequest(BaseModel):
     job_url: str
 
 
 @router.post("/extract")
-@limiter.limit("20/minute")  # Rate limit: 20 extractions per minute per IP
 async def extract_job_details(
     request: Request,
-    extract_request: ExtractJobRequest
+    extract_request: ExtractJobRequest,
+    _rate_limit: None = Depends(rate_limit("extract_job", "20/minute"))  # 20 extractions per minute per user+IP
 ):
     """
     Extract job details (company, title, description) from a job URL
@@ -33,7 +29,7 @@ async def extract_job_details(
     This endpoint is used by the frontend to pre-populate job fields
     before actually tailoring the resume.
 
-    Rate limited to 20 requests per minute per IP.
+    Rate limited to 20 requests per minute per user+IP.
     """
 
     try:
@@ -13,7 +13,7 @@ Optimizations:
 - asyncio.gather() for parallel AI calls (50-70% faster first run)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
@@ -25,12 +25,18 @@ import asyncio
 
 from app.database import get_db
 from app.models import TailoredResume, Job, BaseResume, AnalysisCache
-from app.services.resume_analysis_service import ResumeAnalysisService
-from app.services.resume_export_service import ResumeExportService
+from app.utils.json_codec import json_value
+from app.services.resume_analysis_service import get_resume_analysis_service
+from app.services.resume_export_service import (
+    get_resume_export_service, render_export, render_export_in_pool
+)
+from app.services.export_cache import (
+    get_export_cache, content_key, not_modified_response, export_response, MEDIA_TYPES
+)
+from app.middleware.rate_limit import rate_limit
+from app.utils.zip_stream import ZipStreamWriter
 
 router = APIRouter()
-analysis_service = ResumeAnalysisService()
-export_service = ResumeExportService()
 
 # Cache TTL in days
 CACHE_TTL_DAYS = 30
@@ -53,6 +59,46 @@ class ExportResumeRequest(BaseModel):
     tailored_resume_id: int
     format: str  # "pdf" or "docx"
 
+class BulkExportRequest(BaseModel):
+    tailored_resume_ids: List[int]  # Max MAX_BULK_EXPORT ids
+    format: str  # "pdf" or "docx"
+
+
+# Maximum number of resumes in one bulk export ZIP
+MAX_BULK_EXPORT = 50
+
+
+def build_export_data(tailored_resume: TailoredResume, base_resume: BaseResume) -> Dict[str, Any]:
+    """Reconstruct export resume data from tailored fields + base resume"""
+    try:
+        return {
+            "summary": tailored_resume.tailored_summary or "",
+            "skills": json_value(tailored_resume.tailored_skills, []),
+            "experience": json_value(tailored_resume.tailored_experience, []),
+            "education": base_resume.education or "",
+            "certifications": base_resume.certifications or "",
+            "alignment_statement": tailored_resume.alignment_statement or "",
+            # Add contact info in format expected by export service
+            "contact": {
+                "email": base_resume.candidate_email or "",
+                "phone": base_resume.candidate_phone or "",
+                "location": base_resume.candidate_location or "",
+                "linkedin": base_resume.candidate_linkedin or ""
+            }
+        }
+    except json.JSONDecodeError as e:
+        print(f"Error parsing tailored resume data: {e}")
+        raise HTTPException(status_code=500, detail="Invalid tailored resume data format")
+
+
+def export_key(file_format: str, resume_data: Dict[str, Any], candidate_name: str, target_role: str) -> str:
+    """Export cache key for one rendered resume"""
+    return content_key(file_format, {
+        "resume_data": resume_data,
+        "candidate_name": candidate_name,
+        "target_role": target_role
+    })
+
 
 async def get_cached_analysis(
     db: AsyncSession,
@@ -137,8 +183,8 @@ async def get_resume_data(
     try:
         original_resume_data = {
             "summary": base_resume.summary or "",
-            "skills": json.loads(base_resume.skills) if base_resume.skills else [],
-            "experience": json.loads(base_resume.experience) if base_resume.experience else [],
+            "skills": json_value(base_resume.skills, []),
+            "experience": json_value(base_resume.experience, []),
             "education": base_resume.education or "",
             "certifications": base_resume.certifications or ""
         }
@@ -149,8 +195,8 @@ async def get_resume_data(
     try:
         tailored_resume_data = {
             "summary": tailored_resume.tailored_summary or "",
-            "skills": json.loads(tailored_resume.tailored_skills) if tailored_resume.tailored_skills else [],
-            "experience": json.loads(tailored_resume.tailored_experience) if tailored_resume.tailored_experience else [],
+            "skills": json_value(tailored_resume.tailored_skills, []),
+            "experience": json_value(tailored_resume.tailored_experience, []),
             "education": base_resume.education or "",
             "certifications": base_resume.certifications or ""
         }
@@ -226,7 +272,7 @@ async def analyze_all(
     task_names = []
 
     if "changes" not in cached_results:
-        tasks.append(analysis_service.analyze_resume_changes(
+        tasks.append(get_resume_analysis_service().analyze_resume_changes(
             original_resume=original_resume,
             tailored_resume=tailored_resume_data,
             job_description=job.description or "",
@@ -235,7 +281,7 @@ async def analyze_all(
         task_names.append("changes")
 
     if "keywords" not in cached_results:
-        tasks.append(analysis_service.analyze_keywords(
+        tasks.append(get_resume_analysis_service().analyze_keywords(
             original_resume=original_resume,
             tailored_resume=tailored_resume_data,
             job_description=job.description or ""
@@ -243,7 +289,7 @@ async def analyze_all(
         task_names.append("keywords")
 
     if "match_score" not in cached_results:
-        tasks.append(analysis_service.calculate_match_score(
+        tasks.append(get_resume_analysis_service().calculate_match_score(
             tailored_resume=tailored_resume_data,
             job_description=job.description or "",
             job_title=job.title or "Unknown Position"
@@ -315,7 +361,7 @@ async def analyze_resume_changes(
 
     # Analyze changes
     try:
-        analysis = await analysis_service.analyze_resume_changes(
+        analysis = await get_resume_analysis_service().analyze_resume_changes(
             original_resume=original_resume,
             tailored_resume=tailored_resume_data,
             job_description=job.description or "",
@@ -360,7 +406,7 @@ async def analyze_keywords(
 
     # Analyze keywords
     try:
-        keyword_analysis = await analysis_service.analyze_keywords(
+        keyword_analysis = await get_resume_analysis_service().analyze_keywords(
             original_resume=original_resume,
             tailored_resume=tailored_resume_data,
             job_description=job.description or ""
@@ -404,7 +450,7 @@ async def calculate_match_score(
 
     # Calculate match score
     try:
-        match_score = await analysis_service.calculate_match_score(
+        match_score = await get_resume_analysis_service().calculate_match_score(
             tailored_resume=tailored_resume_data,
             job_description=job.description or "",
             job_title=job.title or "Unknown Position"
@@ -460,12 +506,16 @@ async def clear_analysis_cache(
 @router.post("/export")
 async def export_resume(
     request: ExportResumeRequest,
+    http_request: Request,
     x_user_id: str = Header(None, alias="X-User-ID"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Export tailored resume as PDF or DOCX
     Returns file with proper filename: UserName_TargetRole_TailoredResume.ext
+
+    Rendered files are cached by content hash; repeat exports are streamed
+    from the cache and a matching If-None-Match returns 304.
     """
     if not x_user_id:
         raise HTTPException(status_code=401, detail="User ID required")
@@ -491,26 +541,7 @@ async def export_resume(
 
     tailored_resume, job, base_resume = row
 
-    # Reconstruct resume data from tailored fields + base resume
-    try:
-        resume_data = {
-            "summary": tailored_resume.tailored_summary or "",
-            "skills": json.loads(tailored_resume.tailored_skills) if tailored_resume.tailored_skills else [],
-            "experience": json.loads(tailored_resume.tailored_experience) if tailored_resume.tailored_experience else [],
-            "education": base_resume.education or "",
-            "certifications": base_resume.certifications or "",
-            "alignment_statement": tailored_resume.alignment_statement or "",
-            # Add contact info in format expected by export service
-            "contact": {
-                "email": base_resume.candidate_email or "",
-                "phone": base_resume.candidate_phone or "",
-                "location": base_resume.candidate_location or "",
-                "linkedin": base_resume.candidate_linkedin or ""
-            }
-        }
-    except json.JSONDecodeError as e:
-        print(f"Error parsing tailored resume data: {e}")
-        raise HTTPException(status_code=500, detail="Invalid tailored resume data format")
+    resume_data = build_export_data(tailored_resume, base_resume)
 
     # Get candidate name from base resume (fallback to session user ID if not available)
     candidate_name = base_resume.candidate_name or f"User{x_user_id[-8:]}"
@@ -518,27 +549,125 @@ async def export_resume(
     print(f"Exporting resume for: {candidate_name} - {job.title}")
     print(f"Contact info: Email={resume_data['contact']['email']}, Phone={resume_data['contact']['phone']}")
 
-    # Generate file
+    key = export_key(request.format, resume_data, candidate_name, job.title)
+
+    not_modified = not_modified_response(http_request, key)
+    if not_modified is not None:
+        return not_modified
+
+    # Generate file (or reuse the cached render)
     try:
-        if request.format == "pdf":
-            file_buffer = export_service.generate_pdf(resume_data, candidate_name, job.title)
-            media_type = "application/pdf"
-        else:  # docx
-            file_buffer = export_service.generate_docx(resume_data, candidate_name, job.title)
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-
-        # Generate filename
-        filename = export_service.generate_filename(candidate_name, job.title, request.format)
-
-        # Return file
-        return StreamingResponse(
-            file_buffer,
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
+        file_bytes, _ = await get_export_cache().get_or_render(
+            key,
+            lambda: render_export(request.format, resume_data, candidate_name, job.title)
         )
-
     except Exception as e:
         print(f"Error exporting resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    filename = get_resume_export_service().generate_filename(candidate_name, job.title, request.format)
+
+    return export_response(file_bytes, key, MEDIA_TYPES[request.format], filename)
+
+
+@router.post("/export/bulk")
+async def export_resumes_bulk(
+    request: BulkExportRequest,
+    x_user_id: str = Header(None, alias="X-User-ID"),
+    db: AsyncSession = Depends(get_db),
+    _rate_limit: None = Depends(rate_limit("bulk_export", "10/hour"))
+):
+    """
+    Export many tailored resumes as one ZIP archive
+
+    Resumes are rendered in parallel on the export process pool (cached
+    renders are reused) and each ZIP entry is streamed as soon as its
+    render finishes, so the archive is never held in memory.
+    """
+    if not x_user_id:
+        raise HTTPException(status_code=401, detail="User ID required")
+
+    if request.format not in ["pdf", "docx"]:
+        raise HTTPException(status_code=400, detail="Format must be 'pdf' or 'docx'")
+
+    ids = list(dict.fromkeys(request.tailored_resume_ids))  # De-duplicate, keep order
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one tailored resume ID is required")
+    if len(ids) > MAX_BULK_EXPORT:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BULK_EXPORT} resumes per export")
+
+    result = await db.execute(
+        select(TailoredResume, Job, BaseResume)
+        .join(Job, TailoredResume.job_id == Job.id)
+        .join(BaseResume, TailoredResume.base_resume_id == BaseResume.id)
+        .filter(
+            TailoredResume.id.in_(ids),
+            TailoredResume.session_user_id == x_user_id,
+            TailoredResume.is_deleted == False
+        )
+    )
+    rows = {row[0].id: row for row in result.all()}
+
+    missing = [tid for tid in ids if tid not in rows]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tailored resumes not found or access denied: {missing}")
+
+    export_service = get_resume_export_service()
+    jobs = []
+    for tid in ids:
+        tailored_resume, job, base_resume = rows[tid]
+        resume_data = build_export_data(tailored_resume, base_resume)
+        candidate_name = base_resume.candidate_name or f"User{x_user_id[-8:]}"
+        jobs.append({
+            "key": export_key(request.format, resume_data, candidate_name, job.title),
+            "filename": export_service.generate_filename(candidate_name, job.title, request.format),
+            "args": (request.format, resume_data, candidate_name, job.title),
+        })
+
+    print(f"Bulk export: {len(jobs)} resumes as {request.format}")
+
+    return StreamingResponse(
+        _stream_export_zip(jobs, request.format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="TailoredResumes_{datetime.utcnow().strftime("%Y%m%d")}.zip"'
+        }
+    )
+
+
+async def _stream_export_zip(jobs: List[Dict[str, Any]], file_format: str):
+    """Render exports in parallel and yield ZIP bytes as each entry completes"""
+    cache = get_export_cache()
+
+    async def render(job: Dict[str, Any]):
+        data = cache.get(job["key"])
+        if data is None:
+            data = await render_export_in_pool(*job["args"])
+            cache.put(job["key"], data)
+        return job, data
+
+    tasks = [asyncio.ensure_future(render(job)) for job in jobs]
+    writer = ZipStreamWriter()
+    failed = []
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                job, data = await next_done
+            except Exception as e:
+                print(f"Bulk export render failed: {e}")
+                failed.append(str(e))
+                continue
+            # DOCX is already deflated; only compress PDFs
+            yield writer.add(job["filename"], data, compress=(file_format == "pdf"))
+
+        if failed:
+            yield writer.add(
+                "EXPORT_ERRORS.txt",
+                f"{len(failed)} of {len(jobs)} resumes could not be exported:\n" + "\n".join(failed)
+            )
+        yield writer.close()
+    finally:
+        # Client disconnected or generator closed early: stop pending renders
+        for task in tasks:
+            task.cancel()
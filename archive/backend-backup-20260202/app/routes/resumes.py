@@ -5,49 +5,34 @@ from app.database import get_db
 from app.models.resume import BaseResume
 from app.models.user import User
 from app.middleware.auth import get_current_user, get_current_user_optional, get_user_id
-from app.services.resume_parser import ResumeParser
-from app.utils.file_handler import FileHandler
+from app.services.resume_parser import get_resume_parser
+from app.utils.file_handler import get_file_handler
+from app.middleware.rate_limit import rate_limit
 from app.utils.logger import logger
+from app.utils.json_codec import json_value
 from pydantic import BaseModel
 import json
 import os
-from openai import AsyncOpenAI
+from app.config import get_settings
 
 
-def safe_json_loads(json_str: str, default=None):
-    """Safely parse JSON string with error handling"""
-    if not json_str:
-        return default if default is not None else []
-    try:
-        return json.loads(json_str)
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
-        logger.warning(f"JSON deserialization failed: {e}. Returning default value.")
-        return default if default is not None else []
-
 router = APIRouter()
-file_handler = FileHandler()
-resume_parser = ResumeParser()
-
-# Get limiter from main app (set in app.state.limiter)
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-limiter = Limiter(key_func=get_remote_address)
 
 # Pydantic models for request validation
 class AnalyzeResumeRequest(BaseModel):
     resume_id: int
 
 @router.post("/upload")
-@limiter.limit("5/minute")  # Rate limit: 5 uploads per minute per IP
 async def upload_resume(
     request: Request,
     file: UploadFile = File(...),
     user_id: str = Depends(get_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _rate_limit: None = Depends(rate_limit("upload_resume", "5/minute"))  # 5 uploads per minute per user+IP
 ):
     """Upload and parse resume (requires session user ID)
 
-    Rate limited to 5 uploads per minute per IP address to prevent abuse.
+    Rate limited to 5 uploads per minute per user+IP to prevent abuse.
     Resumes are isolated by session user ID.
     """
 
@@ -58,7 +43,7 @@ async def upload_resume(
         # Save file
         logger.info("Step 1: Saving file...")
         try:
-            file_info = await file_handler.save_upload(file, category="resumes")
+            file_info = await get_file_handler().save_upload(file, category="resumes")
             logger.info(f"File saved successfully: {file_info['file_path']}")
         except Exception as e:
             logger.error(f"File save failed: {type(e).__name__}: {str(e)}", exc_info=True)
@@ -67,12 +52,12 @@ async def upload_resume(
         # Parse resume
         logger.info("Step 2: Parsing resume...")
         try:
-            parsed_data = resume_parser.parse_file(file_info['file_path'])
+            parsed_data = get_resume_parser().parse_file(file_info['file_path'])
             logger.info(f"Resume parsed: {len(parsed_data.get('skills', []))} skills, {len(parsed_data.get('experience', []))} jobs")
         except Exception as e:
             logger.error(f"Parsing failed: {type(e).__name__}: {str(e)}", exc_info=True)
             # Cleanup file if parsing fails
-            file_handler.delete_file(file_info['file_path'])
+            get_file_handler().delete_file(file_info['file_path'])
             raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
 
         # Save to database
@@ -105,8 +90,8 @@ async def upload_resume(
                 candidate_location=parsed_data.get('candidate_location', ''),
                 candidate_linkedin=parsed_data.get('candidate_linkedin', ''),
                 summary=parsed_data.get('summary', ''),
-                skills=json.dumps(parsed_data.get('skills', [])),
-                experience=json.dumps(parsed_data.get('experience', [])),
+                skills=parsed_data.get('skills', []),
+                experience=parsed_data.get('experience', []),
                 education=education_str,
                 certifications=cert_str
             )
@@ -119,7 +104,7 @@ async def upload_resume(
         except Exception as e:
             logger.error(f"Database save failed: {type(e).__name__}: {str(e)}", exc_info=True)
             # Cleanup file if database save fails
-            file_handler.delete_file(file_info['file_path'])
+            get_file_handler().delete_file(file_info['file_path'])
             raise HTTPException(status_code=500, detail=f"Database save failed: {str(e)}")
 
         logger.info("=== UPLOAD SUCCESS ===")
@@ -173,7 +158,7 @@ async def list_resumes(
                 "id": r.id,
                 "filename": r.filename,
                 "summary": r.summary[:200] + "..." if len(r.summary) > 200 else r.summary,
-                "skills_count": len(safe_json_loads(r.skills, [])),
+                "skills_count": len(json_value(r.skills, [])),
                 "uploaded_at": r.uploaded_at.isoformat()
             }
             for r in resumes
@@ -210,8 +195,8 @@ async def get_resume(
         "candidate_location": resume.candidate_location,
         "candidate_linkedin": resume.candidate_linkedin,
         "summary": resume.summary,
-        "skills": safe_json_loads(resume.skills, []),
-        "experience": safe_json_loads(resume.experience, []),
+        "skills": json_value(resume.skills, []),
+        "experience": json_value(resume.experience, []),
         "education": resume.education,
         "certifications": resume.certifications,
         "uploaded_at": resume.uploaded_at.isoformat()
@@ -224,10 +209,13 @@ async def delete_resume(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete resume and all associated tailored resumes and files (requires ownership)"""
-    from app.models.resume import TailoredResume
+    from app.services.deletion_service import soft_delete_resume, reap_files
 
-    result = await db.execute(select(BaseResume).where(BaseResume.id == resume_id))
-    resume = result.scalar_one_or_none()
+    result = await db.execute(
+        select(BaseResume.is_deleted, BaseResume.session_user_id, BaseResume.file_path)
+        .where(BaseResume.id == resume_id)
+    )
+    resume = result.first()
 
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
@@ -243,80 +231,40 @@ async def delete_resume(
     logger.info(f"=== DELETING RESUME ID {resume_id} ===")
     logger.info(f"Base resume file: {resume.file_path}")
 
-    # Step 1: Find and delete all tailored resume files
-    tailored_result = await db.execute(
-        select(TailoredResume).where(TailoredResume.base_resume_id == resume_id)
-    )
-    tailored_resumes = tailored_result.scalars().all()
-
-    deleted_files = []
-    for tailored in tailored_resumes:
-        # Delete DOCX file if exists
-        if tailored.docx_path:
-            if file_handler.delete_file(tailored.docx_path):
-                deleted_files.append(tailored.docx_path)
-                logger.debug(f"Deleted tailored DOCX: {tailored.docx_path}")
-            else:
-                logger.warning(f"Failed to delete {tailored.docx_path}")
-
-        # Delete PDF file if exists
-        if tailored.pdf_path:
-            if file_handler.delete_file(tailored.pdf_path):
-                deleted_files.append(tailored.pdf_path)
-                logger.debug(f"Deleted tailored PDF: {tailored.pdf_path}")
-            else:
-                logger.warning(f"Failed to delete {tailored.pdf_path}")
-
-    logger.info(f"Deleted {len(deleted_files)} tailored resume files")
-
-    # Step 2: Delete base resume file from disk
-    if file_handler.delete_file(resume.file_path):
-        logger.info(f"Deleted base resume file: {resume.file_path}")
-    else:
-        logger.warning(f"Failed to delete base resume: {resume.file_path}")
-
-    # Step 3: Mark as deleted in database (soft delete with audit trail)
-    from datetime import datetime
-    resume.is_deleted = True
-    resume.deleted_at = datetime.utcnow()
-    resume.deleted_by = None  # Session-based users don't have user_id for audit
-
-    # Mark all tailored resumes as deleted too
-    for tailored in tailored_resumes:
-        tailored.is_deleted = True
-        tailored.deleted_at = datetime.utcnow()
-        tailored.deleted_by = None  # Session-based users don't have user_id for audit
-
-    db.add(resume)
-    for tailored in tailored_resumes:
-        db.add(tailored)
+    # Mark the resume and everything derived from it as deleted (soft delete with audit trail),
+    # one set-based UPDATE per table
+    deletion = await soft_delete_resume(db, resume_id)
     await db.commit()
 
+    # Files are removed in the background once the delete is committed
+    queued_files = reap_files(deletion)
+    tailored_count = deletion.counts.get("tailored_resumes", 0)
+
     # Audit log
     logger.info(f"=== RESUME SOFT-DELETED ===")
     logger.info(f"Deleted by: Session User ID {user_id}")
-    logger.info(f"Deleted at: {resume.deleted_at.isoformat()}")
-    logger.info(f"Base resume ID: {resume.id}, Tailored resumes: {len(tailored_resumes)}")
+    logger.info(f"Deleted at: {deletion.deleted_at.isoformat()}")
+    logger.info(f"Base resume ID: {resume_id}, Cascade: {deletion.counts}, Files queued: {queued_files}")
 
     return {
         "success": True,
-        "message": f"Resume and {len(tailored_resumes)} tailored versions deleted",
-        "deleted_files": len(deleted_files) + 1,
+        "message": f"Resume and {tailored_count} tailored versions deleted",
+        "deleted_files": queued_files,
         "audit": {
             "deleted_by": None,
-            "deleted_at": resume.deleted_at.isoformat(),
-            "resume_id": resume.id,
-            "tailored_count": len(tailored_resumes)
+            "deleted_at": deletion.deleted_at.isoformat(),
+            "resume_id": resume_id,
+            "tailored_count": tailored_count
         }
     }
 
 @router.post("/analyze")
-@limiter.limit("10/minute")  # Rate limit: 10 analyses per minute per IP
 async def analyze_resume(
     request: Request,
     analyze_request: AnalyzeResumeRequest,
     user_id: str = Depends(get_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _rate_limit: None = Depends(rate_limit("analyze_resume", "10/minute"))  # 10 analyses per minute per user+IP
 ):
     """
     Analyze a base resume for strengths, weaknesses, ATS compatibility, and improvement recommendations.
@@ -350,14 +298,15 @@ async def analyze_resume(
             "location": resume.candidate_location,
             "linkedin": resume.candidate_linkedin,
             "summary": resume.summary,
-            "skills": safe_json_loads(resume.skills, []),
-            "experience": safe_json_loads(resume.experience, []),
+            "skills": json_value(resume.skills, []),
+            "experience": json_value(resume.experience, []),
             "education": resume.education,
             "certifications": resume.certifications
         }
 
         # Initialize OpenAI client
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=get_settings().openai_base_url)
 
         # Construct prompt for analysis
         system_prompt = """You are an expert resume analyst and career coach with deep knowledge of:
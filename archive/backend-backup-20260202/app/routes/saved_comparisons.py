@@ -8,9 +8,9 @@ Endpoints for:
 - Managing user edits to tailored resumes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -18,6 +18,10 @@ import json
 
 from app.database import get_db
 from app.models import SavedComparison, TailoredResumeEdit, TailoredResume, BaseResume, Job
+from app.services.deletion_service import soft_delete_saved_comparison
+from app.services.touch_buffer import get_touch_buffer
+from app.utils.http_cache import row_etag, not_modified, cache_headers
+from app.utils.json_codec import json_value, ORJSONResponse
 
 router = APIRouter()
 
@@ -108,13 +112,13 @@ async def save_comparison(
         if request.notes is not None:
             existing_comparison.notes = request.notes
         if request.tags is not None:
-            existing_comparison.tags = json.dumps(request.tags)
+            existing_comparison.tags = request.tags
         if request.analysis_data is not None:
-            existing_comparison.analysis_data = json.dumps(request.analysis_data)
+            existing_comparison.analysis_data = request.analysis_data
         if request.keywords_data is not None:
-            existing_comparison.keywords_data = json.dumps(request.keywords_data)
+            existing_comparison.keywords_data = request.keywords_data
         if request.match_score_data is not None:
-            existing_comparison.match_score_data = json.dumps(request.match_score_data)
+            existing_comparison.match_score_data = request.match_score_data
 
         await db.commit()
         await db.refresh(existing_comparison)
@@ -132,10 +136,10 @@ async def save_comparison(
         session_user_id=x_user_id,
         title=request.title or f"{job.company} - {job.title}",
         notes=request.notes,
-        tags=json.dumps(request.tags) if request.tags else None,
-        analysis_data=json.dumps(request.analysis_data) if request.analysis_data else None,
-        keywords_data=json.dumps(request.keywords_data) if request.keywords_data else None,
-        match_score_data=json.dumps(request.match_score_data) if request.match_score_data else None
+        tags=request.tags or None,
+        analysis_data=request.analysis_data or None,
+        keywords_data=request.keywords_data or None,
+        match_score_data=request.match_score_data or None
     )
 
     db.add(saved_comparison)
@@ -176,6 +180,7 @@ async def get_saved_comparisons(
     )
 
     comparisons = []
+    comparison_views = get_touch_buffer(SavedComparison)
     for saved_comp, tailored_resume, job in result:
         comparisons.append(SavedComparisonListItem(
             id=saved_comp.id,
@@ -184,26 +189,75 @@ async def get_saved_comparisons(
             company=job.company,
             position=job.title,
             saved_at=saved_comp.saved_at,
-            last_viewed_at=saved_comp.last_viewed_at,
+            last_viewed_at=comparison_views.last_touched(saved_comp.id) or saved_comp.last_viewed_at,
             is_pinned=saved_comp.is_pinned,
-            tags=json.loads(saved_comp.tags) if saved_comp.tags else None
+            tags=json_value(saved_comp.tags, []) or None
         ))
 
     return comparisons
 
 
+async def _comparison_etag(db: AsyncSession, comparison_id: int, x_user_id: str) -> Optional[str]:
+    """
+    ETag of a saved comparison from row versions only (no JSON columns loaded)
+
+    Covers the comparison, its tailored resume and job (updated_at) and its
+    edits (count and newest id; edits are insert-only). Base resumes are not
+    modified after upload. None when the comparison is not visible to the user.
+    """
+    live_edits = and_(
+        TailoredResumeEdit.tailored_resume_id == SavedComparison.tailored_resume_id,
+        TailoredResumeEdit.is_deleted == False
+    )
+    edit_count = select(func.count(TailoredResumeEdit.id)).where(live_edits).scalar_subquery()
+    last_edit_id = select(func.max(TailoredResumeEdit.id)).where(live_edits).scalar_subquery()
+
+    result = await db.execute(
+        select(
+            SavedComparison.id, SavedComparison.updated_at,
+            TailoredResume.id, TailoredResume.updated_at,
+            Job.id, Job.updated_at,
+            BaseResume.id,
+            edit_count, last_edit_id
+        )
+        .join(TailoredResume, SavedComparison.tailored_resume_id == TailoredResume.id)
+        .join(BaseResume, TailoredResume.base_resume_id == BaseResume.id)
+        .join(Job, TailoredResume.job_id == Job.id)
+        .filter(
+            SavedComparison.id == comparison_id,
+            SavedComparison.session_user_id == x_user_id,
+            SavedComparison.is_deleted == False
+        )
+    )
+    row = result.first()
+    return row_etag("saved_comparison", *row) if row else None
+
+
 @router.get("/{comparison_id}")
 async def get_saved_comparison(
     comparison_id: int,
+    request: Request,
     x_user_id: str = Header(None, alias="X-User-ID"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific saved comparison with full resume data
+
+    Sends a strong ETag; a matching If-None-Match gets 304 without the
+    resume and analysis payload being loaded.
     """
     if not x_user_id:
         raise HTTPException(status_code=401, detail="User ID required")
 
+    etag = await _comparison_etag(db, comparison_id, x_user_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Saved comparison not found or access denied")
+
+    cached = not_modified(request, etag)
+    if cached is not None:
+        get_touch_buffer(SavedComparison).touch(comparison_id)
+        return cached
+
     # Get saved comparison
     result = await db.execute(
         select(SavedComparison, TailoredResume, BaseResume, Job)
@@ -223,9 +277,8 @@ async def get_saved_comparison(
 
     saved_comp, tailored_resume, base_resume, job = row
 
-    # Update last_viewed_at
-    saved_comp.last_viewed_at = datetime.utcnow()
-    await db.commit()
+    # Record the view (written in batches by the touch buffer; this read stays read-only)
+    get_touch_buffer(SavedComparison).touch(saved_comp.id)
 
     # Get any user edits
     edits_result = await db.execute(
@@ -241,7 +294,7 @@ async def get_saved_comparison(
         "comparison_id": saved_comp.id,
         "title": saved_comp.title,
         "notes": saved_comp.notes,
-        "tags": json.loads(saved_comp.tags) if saved_comp.tags else [],
+        "tags": json_value(saved_comp.tags, []),
         "is_pinned": saved_comp.is_pinned,
         "saved_at": saved_comp.saved_at,
         "job": {
@@ -252,15 +305,15 @@ async def get_saved_comparison(
         },
         "base_resume": {
             "summary": base_resume.summary,
-            "skills": json.loads(base_resume.skills) if base_resume.skills else [],
-            "experience": json.loads(base_resume.experience) if base_resume.experience else [],
+            "skills": json_value(base_resume.skills, []),
+            "experience": json_value(base_resume.experience, []),
             "education": base_resume.education,
             "certifications": base_resume.certifications
         },
         "tailored_resume": {
             "summary": tailored_resume.tailored_summary,
-            "skills": json.loads(tailored_resume.tailored_skills) if tailored_resume.tailored_skills else [],
-            "experience": json.loads(tailored_resume.tailored_experience) if tailored_resume.tailored_experience else [],
+            "skills": json_value(tailored_resume.tailored_skills, []),
+            "experience": json_value(tailored_resume.tailored_experience, []),
             "education": base_resume.education,
             "certifications": base_resume.certifications,
             "alignment_statement": tailored_resume.alignment_statement
@@ -277,12 +330,13 @@ async def get_saved_comparison(
             for edit in edits
         ],
         # AI Analysis Data (persisted from when comparison was saved)
-        "analysis": json.loads(saved_comp.analysis_data) if saved_comp.analysis_data else None,
-        "keywords": json.loads(saved_comp.keywords_data) if saved_comp.keywords_data else None,
-        "match_score": json.loads(saved_comp.match_score_data) if saved_comp.match_score_data else None
+        "analysis": json_value(saved_comp.analysis_data, {}) or None,
+        "keywords": json_value(saved_comp.keywords_data, {}) or None,
+        "match_score": json_value(saved_comp.match_score_data, {}) or None
     }
 
-    return response
+    # Fields are already decoded JSON: encode once with orjson, skipping jsonable_encoder
+    return ORJSONResponse(response, headers=cache_headers(etag))
 
 
 @router.put("/{comparison_id}")
@@ -316,7 +370,7 @@ async def update_saved_comparison(
     if request.notes is not None:
         saved_comp.notes = request.notes
     if request.tags is not None:
-        saved_comp.tags = json.dumps(request.tags)
+        saved_comp.tags = request.tags
     if request.is_pinned is not None:
         saved_comp.is_pinned = request.is_pinned
 
@@ -337,20 +391,11 @@ async def delete_saved_comparison(
     if not x_user_id:
         raise HTTPException(status_code=401, detail="User ID required")
 
-    result = await db.execute(
-        select(SavedComparison).filter(
-            SavedComparison.id == comparison_id,
-            SavedComparison.session_user_id == x_user_id,
-            SavedComparison.is_deleted == False
-        )
-    )
-    saved_comp = result.scalar_one_or_none()
+    deletion = await soft_delete_saved_comparison(db, comparison_id, x_user_id)
 
-    if not saved_comp:
+    if not deletion.found:
         raise HTTPException(status_code=404, detail="Saved comparison not found")
 
-    saved_comp.is_deleted = True
-    saved_comp.deleted_at = datetime.utcnow()
     await db.commit()
 
     return {"success": True, "message": "Comparison deleted"}
@@ -387,11 +432,11 @@ async def save_resume_edit(
     elif request.section_name == "alignment_statement":
         original_content = tailored_resume.alignment_statement
     elif request.section_name == "skills" and request.section_index is not None:
-        skills = json.loads(tailored_resume.tailored_skills) if tailored_resume.tailored_skills else []
+        skills = json_value(tailored_resume.tailored_skills, [])
         if request.section_index < len(skills):
             original_content = skills[request.section_index]
     elif request.section_name == "experience" and request.section_index is not None:
-        experience = json.loads(tailored_resume.tailored_experience) if tailored_resume.tailored_experience else []
+        experience = json_value(tailored_resume.tailored_experience, [])
         if request.section_index < len(experience):
             original_content = json.dumps(experience[request.section_index])
 
@@ -5,8 +5,8 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict
 from app.database import get_db
 from app.models.star_story import StarStory
+from app.services.deletion_service import soft_delete_star_story
 from datetime import datetime
-from openai import AsyncOpenAI
 from app.config import get_settings
 import json
 
@@ -273,23 +273,12 @@ async def delete_star_story(
         raise HTTPException(status_code=400, detail="X-User-ID header is required")
 
     try:
-        result = await db.execute(
-            select(StarStory).where(
-                and_(
-                    StarStory.id == story_id,
-                    StarStory.session_user_id == x_user_id
-                )
-            )
-        )
-        story = result.scalar_one_or_none()
+        # Soft delete
+        deletion = await soft_delete_star_story(db, story_id, x_user_id)
 
-        if not story:
+        if not deletion.found:
             raise HTTPException(status_code=404, detail="STAR story not found")
 
-        # Soft delete
-        story.is_deleted = True
-        story.deleted_at = datetime.utcnow()
-
         await db.commit()
 
         print(f"✓ STAR story {story_id} deleted")
@@ -372,7 +361,8 @@ RESULT:
 
         # Analyze using OpenAI
         settings = get_settings()
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
         prompt = f"""You are an expert interview coach. Analyze this STAR story and provide detailed feedback.
 
@@ -500,7 +490,8 @@ RESULT: {story.result}
 
         # Get suggestions using OpenAI
         settings = get_settings()
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
         prompt = f"""You are an expert interview coach. Provide specific improvement suggestions for this STAR story.
 
@@ -664,7 +655,8 @@ RESULT: {story.result}
 
         # Generate variations using OpenAI
         settings = get_settings()
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
         prompt = f"""You are an expert interview coach. Generate 3 variations of this STAR story for different interview contexts.
 
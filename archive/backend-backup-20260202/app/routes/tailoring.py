@@ -1,5 +1,4 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
@@ -9,34 +8,60 @@ from app.models.job import Job
 from app.models.company import CompanyResearch
 from app.services.perplexity_client import PerplexityClient
 from app.services.openai_tailor import OpenAITailor
-from app.services.docx_generator import DOCXGenerator
 from app.services.firecrawl_client import FirecrawlClient
 from app.utils.url_validator import URLValidator
 from app.utils.quality_scorer import QualityScorer
 from app.middleware.auth import get_user_id
+from app.middleware.rate_limit import rate_limit, get_rate_limiter, RateLimit, OPERATION_COSTS
+from app.services.export_cache import (
+    get_export_cache, content_key, not_modified_response, export_response, MEDIA_TYPES
+)
 from app.config import get_settings
-import json
+from app.utils.json_codec import json_value
+import os
 from datetime import datetime
 
 settings = get_settings()
 
 router = APIRouter()
 
-# Rate limiter for expensive AI operations
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-limiter = Limiter(key_func=get_remote_address)
+# Batch tailoring is charged per job URL, so its limit is checked inside the handler
+BATCH_TAILOR_LIMIT = RateLimit.parse("tailor_batch", "2/hour")
 
 
-def safe_json_loads(json_str: str, default=None):
-    """Safely parse JSON string with error handling"""
-    if not json_str:
-        return default if default is not None else []
-    try:
-        return json.loads(json_str)
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
-        print(f"JSON deserialization failed: {e}. Returning default value.")
-        return default if default is not None else []
+def build_docx_render_inputs(
+    candidate_name: str,
+    contact_info: dict,
+    job: Job,
+    tailored_content: dict,
+    base_resume_data: dict
+) -> dict:
+    """
+    Normalize the inputs of DOCXGenerator.render_tailored_resume
+
+    Only fields that affect the rendered document are kept, so the content
+    hash computed at tailoring time matches the one computed from the
+    stored row at download time.
+    """
+    return {
+        "candidate_name": candidate_name,
+        "contact_info": contact_info,
+        "job_details": {
+            "company": job.company or "",
+            "title": job.title or "",
+            "url": job.url or ""
+        },
+        "tailored_content": {
+            "summary": tailored_content.get("summary", "") or "",
+            "competencies": tailored_content.get("competencies", []) or [],
+            "experience": tailored_content.get("experience", []) or [],
+            "alignment_statement": tailored_content.get("alignment_statement", "") or ""
+        },
+        "base_resume_data": {
+            "education": base_resume_data.get("education", "") or "",
+            "certifications": base_resume_data.get("certifications", "") or ""
+        }
+    }
 
 from typing import List
 
@@ -59,23 +84,24 @@ class UpdateTailoredResumeRequest(BaseModel):
     alignment_statement: str = None
 
 @router.post("/tailor")
-@limiter.limit("10/hour")  # Rate limit: 10 tailoring operations per hour per IP
 async def tailor_resume(
     request: Request,
     tailor_request: TailorRequest,
     user_id: str = Depends(get_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    _rate_limit: None = Depends(rate_limit("tailor_resume", "10/hour"))  # 10 tailoring operations per hour per user+IP
 ):
     """
     Tailor a resume for a specific job
 
-    Rate limited to 10 tailoring operations per hour per IP (expensive AI operations).
+    Rate limited to 10 tailoring operations per hour per user+IP (expensive AI operations),
+    and charged against the shared LLM cost budget.
 
     Process:
     1. Fetch base resume from database
     2. Research company with Perplexity
     3. Tailor resume with Claude
-    4. Generate DOCX file
+    4. Render DOCX (cached, re-rendered from DB on download)
     5. Save to database
     """
 
@@ -123,8 +149,8 @@ async def tailor_resume(
         # Parse base resume data
         base_resume_data = {
             "summary": base_resume.summary or "",
-            "skills": safe_json_loads(base_resume.skills, []),
-            "experience": safe_json_loads(base_resume.experience, []),
+            "skills": json_value(base_resume.skills, []),
+            "experience": json_value(base_resume.experience, []),
             "education": base_resume.education or "",
             "certifications": base_resume.certifications or ""
         }
@@ -269,8 +295,9 @@ async def tailor_resume(
             print(f"OpenAI tailoring failed: {e}")
             raise HTTPException(status_code=500, detail=f"Resume tailoring failed: {str(e)}")
 
-        # Step 6: Generate DOCX
-        print("Step 6: Generating DOCX file...")
+        # Step 6: Render DOCX (kept in the export cache, not on disk)
+        print("Step 6: Rendering DOCX...")
+        from app.services.docx_generator import DOCXGenerator  # python-docx loaded on first use
         docx_gen = DOCXGenerator()
 
         # Extract candidate info from base resume
@@ -287,20 +314,24 @@ async def tailor_resume(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{timestamp}_{job.company.replace(' ', '_')}_{job.title.replace(' ', '_')}.docx"
 
+        render_inputs = build_docx_render_inputs(
+            candidate_name, contact_info, job, tailored_content, base_resume_data
+        )
+
         try:
-            docx_path = docx_gen.create_tailored_resume(
-                candidate_name=candidate_name,
-                contact_info=contact_info,
-                job_details=job_details,
-                tailored_content=tailored_content,
-                base_resume_data=base_resume_data,
-                output_filename=filename
+            # Warm the cache so the first download is served without re-rendering
+            docx_bytes, _ = await get_export_cache().get_or_render(
+                content_key("docx", render_inputs),
+                lambda: docx_gen.render_tailored_resume(**render_inputs)
             )
-            print(f"DOCX created: {docx_path}")
+            print(f"DOCX rendered: {filename} ({len(docx_bytes)} bytes)")
         except Exception as e:
             print(f"DOCX generation failed: {e}")
             raise HTTPException(status_code=500, detail=f"Document generation failed: {str(e)}")
 
+        # Only the download filename is stored; the file is re-rendered from the DB on demand
+        docx_path = filename
+
         # Step 7: Calculate quality score
         print("Step 7: Calculating quality score...")
         quality_score = QualityScorer.calculate_quality_score(
@@ -324,8 +355,8 @@ async def tailor_resume(
             job_id=job.id,
             session_user_id=user_id,  # Store session user ID for data isolation
             tailored_summary=tailored_content.get('summary', ''),
-            tailored_skills=json.dumps(tailored_content.get('competencies', [])),
-            tailored_experience=json.dumps(tailored_content.get('experience', [])),
+            tailored_skills=tailored_content.get('competencies', []),
+            tailored_experience=tailored_content.get('experience', []),
             alignment_statement=tailored_content.get('alignment_statement', ''),
             docx_path=docx_path,
             quality_score=quality_score,
@@ -391,8 +422,8 @@ async def get_tailored_resume(
         "base_resume_id": tailored.base_resume_id,
         "job_id": tailored.job_id,
         "summary": tailored.tailored_summary,
-        "competencies": safe_json_loads(tailored.tailored_skills, []),
-        "experience": safe_json_loads(tailored.tailored_experience, []),
+        "competencies": json_value(tailored.tailored_skills, []),
+        "experience": json_value(tailored.tailored_experience, []),
         "alignment_statement": tailored.alignment_statement,
         "docx_path": tailored.docx_path,
         "quality_score": tailored.quality_score,
@@ -429,10 +460,10 @@ async def update_tailored_resume(
         tailored.tailored_summary = update_request.summary
 
     if update_request.competencies is not None:
-        tailored.tailored_skills = json.dumps(update_request.competencies)
+        tailored.tailored_skills = update_request.competencies
 
     if update_request.experience is not None:
-        tailored.tailored_experience = json.dumps(update_request.experience)
+        tailored.tailored_experience = update_request.experience
 
     if update_request.alignment_statement is not None:
         tailored.alignment_statement = update_request.alignment_statement
@@ -444,8 +475,8 @@ async def update_tailored_resume(
         "success": True,
         "id": tailored.id,
         "summary": tailored.tailored_summary,
-        "competencies": safe_json_loads(tailored.tailored_skills, []),
-        "experience": safe_json_loads(tailored.tailored_experience, []),
+        "competencies": json_value(tailored.tailored_skills, []),
+        "experience": json_value(tailored.tailored_experience, []),
         "alignment_statement": tailored.alignment_statement,
         "updated_at": datetime.utcnow().isoformat()
     }
@@ -486,18 +517,30 @@ async def list_tailored_resumes(
 @router.get("/download/{tailored_id}")
 async def download_tailored_resume(
     tailored_id: int,
+    request: Request,
     user_id: str = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Download a tailored resume DOCX file (requires ownership)"""
+    """
+    Download a tailored resume DOCX file (requires ownership)
+
+    The document is rendered from the stored tailored content and served from
+    the content-addressed export cache. Responses carry an ETag, and a
+    matching If-None-Match returns 304 without rendering.
+    """
     result = await db.execute(
-        select(TailoredResume).where(TailoredResume.id == tailored_id)
+        select(TailoredResume, Job, BaseResume)
+        .join(Job, TailoredResume.job_id == Job.id)
+        .join(BaseResume, TailoredResume.base_resume_id == BaseResume.id)
+        .where(TailoredResume.id == tailored_id)
     )
-    tailored = result.scalar_one_or_none()
+    row = result.first()
 
-    if not tailored:
+    if not row:
         raise HTTPException(status_code=404, detail="Tailored resume not found")
 
+    tailored, job, base_resume = row
+
     # Check if deleted
     if tailored.is_deleted:
         raise HTTPException(status_code=404, detail="Tailored resume has been deleted")
@@ -506,32 +549,52 @@ async def download_tailored_resume(
     if tailored.session_user_id != user_id:
         raise HTTPException(status_code=403, detail="Access denied: You don't own this tailored resume")
 
-    # Check if file exists
-    import os
+    render_inputs = build_docx_render_inputs(
+        candidate_name=base_resume.candidate_name or "Candidate Name",
+        contact_info={
+            "email": base_resume.candidate_email or "",
+            "phone": base_resume.candidate_phone or "",
+            "location": base_resume.candidate_location or "",
+            "linkedin": base_resume.candidate_linkedin or ""
+        },
+        job=job,
+        tailored_content={
+            "summary": tailored.tailored_summary or "",
+            "competencies": json_value(tailored.tailored_skills, []),
+            "experience": json_value(tailored.tailored_experience, []),
+            "alignment_statement": tailored.alignment_statement or ""
+        },
+        base_resume_data={
+            "education": base_resume.education or "",
+            "certifications": base_resume.certifications or ""
+        }
+    )
+    key = content_key("docx", render_inputs)
 
-    # Convert relative path to absolute
-    docx_path = tailored.docx_path
-    if not os.path.isabs(docx_path):
-        docx_path = os.path.abspath(docx_path)
+    not_modified = not_modified_response(request, key)
+    if not_modified is not None:
+        return not_modified
 
-    if not os.path.exists(docx_path):
-        raise HTTPException(
-            status_code=404,
-            detail=f"Resume file not found. The file may have been cleaned up after deployment. Please regenerate the resume."
-        )
+    from app.services.docx_generator import DOCXGenerator  # python-docx loaded on first use
 
-    # Get filename from path
-    filename = os.path.basename(docx_path)
+    try:
+        docx_bytes, cache_hit = await get_export_cache().get_or_render(
+            key,
+            lambda: DOCXGenerator().render_tailored_resume(**render_inputs)
+        )
+    except Exception as e:
+        print(f"DOCX rendering failed for tailored resume {tailored_id}: {e}")
+        raise HTTPException(status_code=500, detail="Document generation failed")
 
-    return FileResponse(
-        path=docx_path,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=filename
+    # Older rows store an absolute path; only the file name is used now
+    filename = os.path.basename(tailored.docx_path) if tailored.docx_path else (
+        f"{job.company.replace(' ', '_')}_{job.title.replace(' ', '_')}.docx"
     )
 
+    return export_response(docx_bytes, key, MEDIA_TYPES["docx"], filename)
+
 
 @router.post("/tailor/batch")
-@limiter.limit("2/hour")  # Rate limit: 2 batch operations per hour per IP (very expensive)
 async def tailor_resume_batch(
     request: Request,
     batch_request: BatchTailorRequest,
@@ -541,7 +604,8 @@ async def tailor_resume_batch(
     """
     Tailor a resume for multiple jobs (up to 10)
 
-    Rate limited to 2 batch operations per hour per IP (can process up to 10 jobs each).
+    Rate limited to 2 batch operations per hour per user+IP (can process up to 10 jobs each).
+    Each job URL is charged against the shared LLM cost budget.
 
     Returns results for each job URL with success/failure status
     """
@@ -558,6 +622,13 @@ async def tailor_resume_batch(
             detail="At least 1 job URL required"
         )
 
+    # Rate limit: 2 batches per hour, LLM budget charged for every job in the batch
+    await get_rate_limiter().check(
+        request,
+        BATCH_TAILOR_LIMIT,
+        cost=OPERATION_COSTS["tailor_batch"] * len(batch_request.job_urls)
+    )
+
     print(f"=== BATCH TAILORING START ===")
     print(f"Base Resume ID: {batch_request.base_resume_id}")
     print(f"Job URLs: {len(batch_request.job_urls)}")
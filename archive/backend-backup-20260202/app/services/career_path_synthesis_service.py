@@ -2,10 +2,16 @@
 Career Path Synthesis Service
 Uses Perplexity AI for web-grounded, thoroughly researched career plans with real data
 Includes schema validation and JSON repair
+
+The plan is streamed and parsed section by section: each top-level section
+is validated against its part of the CareerPlan schema as soon as it is
+complete, and an invalid section is repaired with a small prompt for that
+section alone while the rest of the plan is still being generated.
 """
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from pydantic import ValidationError
+from functools import lru_cache
+from typing import Annotated, Dict, Any, List, Optional
+from pydantic import TypeAdapter, ValidationError
+import asyncio
 import json
 import os
 
@@ -16,9 +22,33 @@ from app.schemas.career_plan import (
     ValidationError as SchemaValidationError
 )
 from app.config import get_settings
+from app.utils.streaming_json import StreamingObjectParser
 
 settings = get_settings()
 
+# Output budget for repairing or generating one section (the full plan gets 16K)
+SECTION_REPAIR_MAX_TOKENS = 4000
+
+
+@lru_cache(maxsize=None)
+def _section_adapter(section: str) -> TypeAdapter:
+    """Validator for one top-level CareerPlan field, constraints included"""
+    field = CareerPlan.model_fields[section]
+    return TypeAdapter(Annotated[field.annotation, field])
+
+
+def _schema_errors(error: ValidationError, prefix: tuple = ()) -> List[SchemaValidationError]:
+    errors = []
+    for item in error.errors():
+        field = " -> ".join(str(loc) for loc in prefix + tuple(item["loc"]))
+        errors.append(SchemaValidationError(
+            field=field,
+            error=item["msg"],
+            expected=item["type"],
+            received=item.get("input", "unknown")
+        ))
+    return errors
+
 
 class CareerPathSynthesisService:
     """
@@ -40,7 +70,8 @@ class CareerPathSynthesisService:
                 self.model = "test"
                 print("[TEST MODE] CareerPathSynthesisService using mock data")
         else:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
             # Use GPT-4.1-mini for fast, accurate career planning with 16K output limit
             self.model = "gpt-4.1-mini"
 
@@ -54,9 +85,10 @@ class CareerPathSynthesisService:
 
         Flow:
         1. Build comprehensive prompt with intake + research
-        2. Call OpenAI with strict JSON schema
-        3. Validate response against Pydantic schema
-        4. If invalid, run repair pass
+        2. Stream the plan from OpenAI in JSON mode
+        3. Validate each section against its schema as soon as it is complete;
+           repair invalid sections (and generate missing ones) concurrently
+        4. Validate the assembled plan; if still invalid, run a whole-plan repair pass
         5. Return validated plan or error
         """
 
@@ -69,10 +101,11 @@ class CareerPathSynthesisService:
 
         # Build synthesis prompt
         prompt = self._build_synthesis_prompt(intake, research_data)
+        parser = StreamingObjectParser()
 
         try:
-            # Call OpenAI with JSON mode for guaranteed valid JSON
-            response = self.client.chat.completions.create(
+            # Stream with JSON mode; sections are validated as they complete
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -86,33 +119,77 @@ class CareerPathSynthesisService:
                 ],
                 response_format={"type": "json_object"},  # Ensures valid JSON
                 temperature=0.7,
-                max_tokens=16000  # GPT-4o-mini supports up to 16K output tokens
+                max_tokens=16000,  # GPT-4o-mini supports up to 16K output tokens
+                stream=True
             )
 
-            raw_json = response.choices[0].message.content
+            plan_data: Dict[str, Any] = {}
+            repairs: Dict[str, asyncio.Task] = {}
+
+            try:
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    for section, value in parser.feed(chunk.choices[0].delta.content):
+                        plan_data[section] = value
+                        errors = self._validate_section(section, value)
+                        if errors:
+                            # Repair this section while the rest of the plan streams
+                            print(f"⚠ Section '{section}' failed validation ({len(errors)} errors), repairing")
+                            repairs[section] = asyncio.create_task(
+                                self._repair_section(section, value, errors, intake)
+                            )
+            except BaseException:
+                # Stream failed, JSON was malformed or the request was cancelled:
+                # repairs already started would only spend tokens on a discarded plan
+                for repair in repairs.values():
+                    repair.cancel()
+                raise
+
+            raw_json = parser.text
             print(f"✓ OpenAI returned {len(raw_json)} characters")
-
-            # OpenAI JSON mode guarantees valid JSON - no cleaning needed
-            plan_data = json.loads(raw_json)
+            if not parser.members:
+                parser.close()  # Nothing usable: raises ValueError
+            if not parser.done:
+                # Truncated output: keep the complete sections, generate the rest below
+                print(f"⚠ Plan JSON incomplete after {len(parser.members)} sections")
 
             # Fix: Move research_sources to root level if OpenAI placed it inside resume_assets
-            if "resume_assets" in plan_data and "research_sources" in plan_data.get("resume_assets", {}):
+            if isinstance(plan_data.get("resume_assets"), dict) and "research_sources" in plan_data["resume_assets"]:
                 if "research_sources" not in plan_data:
                     plan_data["research_sources"] = plan_data["resume_assets"]["research_sources"]
                     del plan_data["resume_assets"]["research_sources"]
                     print("✓ Moved research_sources from resume_assets to root level")
 
+            # Required sections that never arrived are generated on their own
+            for section, field in CareerPlan.model_fields.items():
+                if section not in plan_data and field.is_required() and section not in repairs:
+                    print(f"⚠ Section '{section}' missing, generating")
+                    repairs[section] = asyncio.create_task(
+                        self._repair_section(section, None, [], intake, plan_data)
+                    )
+
+            if repairs:
+                repaired_sections = await asyncio.gather(*repairs.values())
+                for section, value in zip(repairs, repaired_sections):
+                    if value is not None:
+                        plan_data[section] = value
+                print(f"✓ Repaired {sum(v is not None for v in repaired_sections)}/{len(repairs)} sections")
+
             validation_result = self._validate_plan(plan_data)
 
             if validation_result.valid:
                 print("✓ Plan passed schema validation")
-                return {
+                result = {
                     "success": True,
                     "plan": plan_data,
                     "validation": validation_result
                 }
+                if repairs:
+                    result["repaired"] = True
+                return result
 
-            # Validation failed - attempt repair
+            # Targeted repair was not enough - fall back to a whole-plan repair
             print(f"⚠ Plan validation failed with {len(validation_result.errors)} errors")
             # Log first 5 errors for debugging
             for i, e in enumerate(validation_result.errors[:5]):
@@ -148,7 +225,8 @@ class CareerPathSynthesisService:
                     ]
                 }
 
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, ValueError) as e:
+            raw_json = parser.text
             print(f"✗ JSON decode error: {e}")
             print(f"✗ Problematic JSON (first 500 chars):")
             print(raw_json[:500] if len(raw_json) > 500 else raw_json)
@@ -694,19 +772,9 @@ CRITICAL: Your response must be a single valid JSON object starting with { and e
 
         except ValidationError as e:
             # Extract validation errors
-            errors = []
-            for error in e.errors():
-                field = " -> ".join(str(loc) for loc in error["loc"])
-                errors.append(SchemaValidationError(
-                    field=field,
-                    error=error["msg"],
-                    expected=error["type"],
-                    received=error.get("input", "unknown")
-                ))
-
             return ValidationResult(
                 valid=False,
-                errors=errors,
+                errors=_schema_errors(e),
                 repaired=False
             )
 
@@ -722,6 +790,94 @@ CRITICAL: Your response must be a single valid JSON object starting with { and e
                 repaired=False
             )
 
+    def _validate_section(self, section: str, value: Any) -> List[SchemaValidationError]:
+        """Validation errors for one top-level section (empty when valid or not in the schema)"""
+        if section not in CareerPlan.model_fields:
+            return []
+        try:
+            _section_adapter(section).validate_python(value)
+            return []
+        except ValidationError as e:
+            return _schema_errors(e, prefix=(section,))
+
+    async def _repair_section(
+        self,
+        section: str,
+        value: Any,
+        errors: List[SchemaValidationError],
+        intake: IntakeRequest,
+        plan_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        Repair (or, when value is None, generate) a single plan section
+
+        Only the section, its validation errors and its JSON schema are sent,
+        so the call costs a fraction of a whole-plan repair. Returns the
+        valid section, or None when the repair did not validate.
+        """
+
+        schema = json.dumps(_section_adapter(section).json_schema(), separators=(",", ":"))
+
+        if value is None:
+            context = {
+                "current_role": intake.current_role_title,
+                "target_role": intake.target_role_interest,
+                "profile_summary": (plan_data or {}).get("profile_summary"),
+            }
+            task = f"""Generate the "{section}" section of a career plan.
+
+CONTEXT:
+{json.dumps(context, indent=2)}"""
+        else:
+            error_summary = "\n".join([
+                f"- Field '{e.field}': {e.error} (expected: {e.expected}, got: {e.received})"
+                for e in errors[:25]
+            ])
+            task = f"""The "{section}" section of a career plan failed schema validation with these errors:
+
+{error_summary}
+
+INVALID SECTION:
+{json.dumps(value, indent=2)}
+
+Fix ALL validation errors. Keep all existing data where possible."""
+
+        repair_prompt = f"""{task}
+
+JSON SCHEMA FOR THE SECTION:
+{schema}
+
+Return ONLY a JSON object of the form {{"{section}": <section value>}}."""
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a JSON repair specialist. Fix validation errors precisely."
+                    },
+                    {
+                        "role": "user",
+                        "content": repair_prompt
+                    }
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,  # Lower temperature for precise repairs
+                max_tokens=SECTION_REPAIR_MAX_TOKENS
+            )
+
+            repaired = json.loads(response.choices[0].message.content).get(section)
+            remaining = self._validate_section(section, repaired)
+            if remaining:
+                print(f"✗ Section '{section}' still invalid after repair ({len(remaining)} errors)")
+                return None
+            return repaired
+
+        except Exception as e:
+            print(f"✗ Section repair failed for '{section}': {e}")
+            return None
+
     async def _repair_plan(
         self,
         invalid_plan: Dict[str, Any],
@@ -760,7 +916,7 @@ Requirements:
 Return the fixed JSON now:"""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -6,13 +6,14 @@ using GPT-4.1-mini based on target role, industry, and current skills.
 """
 
 import os
-from openai import AsyncOpenAI
 import json
 from typing import Dict, Any, List
+from app.config import get_settings
 
 class CertificationService:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=get_settings().openai_base_url)
         self.model = "gpt-4.1-mini"
 
     async def recommend_certifications(
@@ -142,3 +143,15 @@ CRITICAL REQUIREMENTS:
         except Exception as e:
             print(f"Error generating certification recommendations: {e}")
             raise Exception(f"Failed to generate recommendations: {str(e)}")
+
+
+# Singleton instance (created on first use, not at import time)
+_certification_service_instance = None
+
+
+def get_certification_service() -> CertificationService:
+    """Get singleton CertificationService instance"""
+    global _certification_service_instance
+    if _certification_service_instance is None:
+        _certification_service_instance = CertificationService()
+    return _certification_service_instance
@@ -0,0 +1,238 @@
+"""
+Company News Store - persisted per-company news index
+
+Keeps every article NewsAggregatorService has fetched for a company, with a
+watermark recording the newest published date stored and how far back the
+stored window is complete. Reads are date-window queries on
+(company_key, published_date); refreshes only need items newer than the
+watermark.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.utils.near_duplicates import canonical_url
+
+# Keywords that boost relevance for different roles (matched once, at ingest)
+ROLE_KEYWORDS = {
+    "cybersecurity": ["security", "breach", "vulnerability", "cyber", "privacy", "threat"],
+    "program manager": ["initiative", "program", "launch", "project", "expansion"],
+    "engineering": ["technology", "platform", "api", "developer", "infrastructure"],
+    "data": ["data", "analytics", "ai", "machine learning", "ml"],
+}
+
+# Upper bound on rows read for one window (90 days of news is far below this)
+MAX_WINDOW_ARTICLES = 500
+
+# Last path segments of index pages (newsrooms, blogs) that list many articles under one URL
+LISTING_PAGE_SEGMENTS = {"news", "newsroom", "press", "press-releases", "media", "blog", "stories"}
+
+
+def company_news_key(company_name: str) -> str:
+    """Normalized company name used to key stored news ("JPMorgan Chase & Co." -> "jpmorgan chase and co")"""
+    key = company_name.lower().replace("&", " and ")
+    return re.sub(r"[^a-z0-9]+", " ", key).strip()[:255]
+
+
+def role_keyword_hits(title: str, summary: str) -> Dict[str, int]:
+    """Number of each role's keywords present in the article text"""
+    text = f"{title} {summary}".lower()
+    hits = {}
+    for role, keywords in ROLE_KEYWORDS.items():
+        count = sum(1 for keyword in keywords if keyword in text)
+        if count:
+            hits[role] = count
+    return hits
+
+
+def _is_listing_page(url: str) -> bool:
+    """True for a canonical URL of a site root or newsroom/blog index rather than one article"""
+    path = url.partition("/")[2].split("?")[0]
+    return not path or path.rsplit("/", 1)[-1].lower() in LISTING_PAGE_SEGMENTS
+
+
+def article_dedup_key(article: Dict, shared_urls: Set[str] = frozenset()) -> str:
+    """
+    Key identifying one stored article of a company
+
+    The canonical URL when it points at a single article. Articles scraped
+    from a newsroom page all carry that page's URL, so for listing pages (and
+    any URL several differently titled articles share) the normalized title
+    is added; articles without a URL are keyed on the title alone.
+    """
+    url = canonical_url(article.get("url", ""))
+    title = article.get("title", "")
+    if not url:
+        return ("title:" + title.lower()[:200])[:512]
+    if url in shared_urls or _is_listing_page(url):
+        return f"{url}#title:{re.sub(r'[^a-z0-9]+', ' ', title.lower()).strip()[:200]}"[:512]
+    return url[:512]
+
+
+def _shared_urls(articles: List[Dict]) -> Set[str]:
+    """Canonical URLs carried by more than one distinct title in a batch"""
+    titles: Dict[str, Set[str]] = {}
+    for article in articles:
+        url = canonical_url(article.get("url", ""))
+        if url:
+            titles.setdefault(url, set()).add(article.get("title", "").strip().lower())
+    return {url for url, seen in titles.items() if len(seen) > 1}
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        # Matches the aggregator, which dates undated articles today
+        return datetime.utcnow().date()
+
+
+class CompanyNewsStore:
+    """Database-backed news index, one window per company"""
+
+    def __init__(self):
+        self.refresh_interval = timedelta(hours=get_settings().news_refresh_hours)
+
+    async def get_watermark(self, company_key: str):
+        from app.database import AsyncSessionLocal
+        from app.models.company_news import CompanyNewsWatermark
+
+        async with AsyncSessionLocal() as session:
+            return await session.get(CompanyNewsWatermark, company_key)
+
+    def fetch_since(self, watermark, cutoff: date) -> Optional[date]:
+        """
+        Date to fetch from, given the stored watermark
+
+        Returns None when the whole window must be fetched (nothing stored, or
+        the stored window does not reach back to cutoff), otherwise the newest
+        stored date (fetched again with a day of overlap for late-indexed items).
+        """
+        if watermark is None or watermark.covered_from is None or watermark.covered_from > cutoff:
+            return None
+        return watermark.newest_published or cutoff
+
+    def is_fresh(self, watermark, cutoff: date) -> bool:
+        """True when the stored window covers cutoff and was refreshed recently"""
+        return (
+            self.fetch_since(watermark, cutoff) is not None
+            and watermark.refreshed_at is not None
+            and datetime.utcnow() - watermark.refreshed_at < self.refresh_interval
+        )
+
+    async def store(
+        self,
+        company_key: str,
+        articles: List[Dict],
+        covered_from: Optional[date] = None
+    ) -> int:
+        """
+        Insert articles not already stored and advance the watermark
+
+        Args:
+            company_key: Key from company_news_key()
+            articles: Articles in the aggregator's format
+            covered_from: Start of the window this fetch covered in full (full fetches only)
+
+        Returns:
+            Number of new articles stored
+        """
+        from app.database import AsyncSessionLocal
+        from app.models.company_news import CompanyNewsArticle, CompanyNewsWatermark
+
+        rows: Dict[str, CompanyNewsArticle] = {}
+        shared_urls = _shared_urls(articles)
+        for article in articles:
+            dedup_key = article_dedup_key(article, shared_urls)
+            rows.setdefault(dedup_key, CompanyNewsArticle(
+                company_key=company_key,
+                dedup_key=dedup_key,
+                title=article.get("title", ""),
+                summary=article.get("summary", ""),
+                source=article.get("source", ""),
+                url=article.get("url", ""),
+                published_date=_parse_date(article.get("published_date")),
+                category=article.get("category", "news"),
+                base_relevance=article.get("relevance_score", 5),
+                role_hits=role_keyword_hits(article.get("title", ""), article.get("summary", "")),
+            ))
+
+        async with AsyncSessionLocal() as session:
+            if rows:
+                existing = await session.execute(
+                    select(CompanyNewsArticle.dedup_key).where(
+                        CompanyNewsArticle.company_key == company_key,
+                        CompanyNewsArticle.dedup_key.in_(list(rows))
+                    )
+                )
+                for dedup_key in existing.scalars():
+                    rows.pop(dedup_key, None)
+
+            session.add_all(rows.values())
+
+            watermark = await session.get(CompanyNewsWatermark, company_key)
+            if watermark is None:
+                watermark = CompanyNewsWatermark(company_key=company_key)
+                session.add(watermark)
+
+            newest = max((row.published_date for row in rows.values()), default=None)
+            if newest and (watermark.newest_published is None or newest > watermark.newest_published):
+                watermark.newest_published = newest
+            if covered_from and (watermark.covered_from is None or covered_from < watermark.covered_from):
+                watermark.covered_from = covered_from
+            watermark.refreshed_at = datetime.utcnow()
+
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Another worker stored the same refresh concurrently; its rows are equivalent
+                await session.rollback()
+                return 0
+
+        return len(rows)
+
+    async def window(self, company_key: str, cutoff: date) -> List[Dict]:
+        """Stored articles published on or after cutoff, newest first"""
+        from app.database import AsyncSessionLocal
+        from app.models.company_news import CompanyNewsArticle
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(CompanyNewsArticle)
+                .where(
+                    CompanyNewsArticle.company_key == company_key,
+                    CompanyNewsArticle.published_date >= cutoff
+                )
+                .order_by(CompanyNewsArticle.published_date.desc(), CompanyNewsArticle.id.desc())
+                .limit(MAX_WINDOW_ARTICLES)
+            )
+            return [
+                {
+                    "title": row.title,
+                    "summary": row.summary or "",
+                    "source": row.source or "News source",
+                    "url": row.url or "",
+                    "published_date": row.published_date.strftime("%Y-%m-%d"),
+                    "relevance_score": row.base_relevance if row.base_relevance is not None else 5,
+                    "category": row.category or "news",
+                    "impact_summary": "",
+                    "role_hits": row.role_hits or {},
+                }
+                for row in result.scalars()
+            ]
+
+
+_company_news_store = None
+
+
+def get_company_news_store() -> CompanyNewsStore:
+    """Get singleton CompanyNewsStore instance"""
+    global _company_news_store
+    if _company_news_store is None:
+        _company_news_store = CompanyNewsStore()
+    return _company_news_store
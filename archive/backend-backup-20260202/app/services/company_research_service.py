@@ -4,10 +4,111 @@ Uses Perplexity and Firecrawl to gather authentic, sourced information
 """
 
 import json
-from typing import Dict, List, Optional
+import os
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from app.services.perplexity_client import PerplexityClient
 from app.services.firecrawl_client import FirecrawlClient
+from app.utils.near_duplicates import NearDuplicateIndex, deduplicate
+from app.utils.phrase_scanner import PhraseMatch, PhraseScanner, SentenceIndex
+from app.config import get_settings
+
+# Value phrases and values-section markers; extend via COMPANY_VALUES_FILE
+VALUES_DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "company_values.json"
+
+# List item patterns used inside a values section
+_NUMBERED_VALUE = re.compile(r'^\s*\d+[\.\)]\s+([A-Z][^:\n]{2,50})')
+_NUMBERED_PREFIX = re.compile(r'^\s*\d+[\.\)]')
+_BULLET_VALUE = re.compile(r'^\s*[-\*•]\s+([A-Z][^:\n]{2,50})')
+_BULLET_PREFIX = re.compile(r'^\s*[-\*•]')
+_COLON_VALUE = re.compile(r'^\s*\**([A-Z][^:\n]{2,40}):\s*(.{10,200})')
+
+# "Our values are: ...", "We value: ...", "Guided by principles such as: ..." in one pass
+# The leading lookahead lets the regex engine skip to candidate first letters
+_EXPLICIT_VALUE_STATEMENT = re.compile(
+    r'(?=[ocwgb])(?:'
+    r'(?:our|core|company)\s+(?:values|principles)\s+(?:are|include):\s*([^\.]{10,300})'
+    r'|(?:we|company)\s+(?:value|believe in|stand for):\s*([^\.]{10,300})'
+    r'|(?:guided by|committed to|built on)\s+(?:values|principles)\s+(?:of|like|such as):\s*([^\.]{10,300})'
+    r')',
+    re.IGNORECASE
+)
+_VALUE_LIST_SPLIT = re.compile(r',\s*(?:and\s+)?|\s+and\s+')
+
+
+def load_value_dictionary() -> Dict[str, List[str]]:
+    """
+    Load common value phrases and values-section markers
+
+    Reads app/data/company_values.json, then merges COMPANY_VALUES_FILE (same
+    format) if that environment variable is set.
+    """
+    common_values: List[str] = []
+    section_markers: List[str] = []
+
+    paths = [VALUES_DATA_FILE]
+    if os.getenv("COMPANY_VALUES_FILE"):
+        paths.append(Path(os.getenv("COMPANY_VALUES_FILE")))
+
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not load company values file {path}: {e}")
+            continue
+
+        groups = data.get("common_values", {})
+        for phrases in (groups.values() if isinstance(groups, dict) else [groups]):
+            common_values.extend(p for p in phrases if p not in common_values)
+        section_markers.extend(m.lower() for m in data.get("section_markers", []) if m.lower() not in section_markers)
+
+    return {"common_values": common_values, "section_markers": section_markers}
+
+
+# Scanner built once per process from the value dictionary
+_value_scanner: Optional[PhraseScanner] = None
+_section_markers: Set[str] = set()
+
+
+def get_value_scanner() -> PhraseScanner:
+    """Get the shared scanner for value phrases and section markers"""
+    global _value_scanner, _section_markers
+    if _value_scanner is None:
+        dictionary = load_value_dictionary()
+        _section_markers = set(dictionary["section_markers"])
+        # Markers and value phrases share one scanner so content is walked once
+        _value_scanner = PhraseScanner(dictionary["section_markers"] + dictionary["common_values"])
+    return _value_scanner
+
+
+class ValueContentScan:
+    """
+    One pass over research content, shared by the value extraction strategies
+
+    Holds the lines, sentence boundaries, first match of every value phrase and
+    the lines that open a values section.
+    """
+
+    def __init__(self, content: str):
+        scanner = get_value_scanner()
+        self.content = content
+        self.lines = content.split("\n")
+        self.sentences = SentenceIndex(content)
+
+        line_starts = [0]
+        for line in self.lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        self.value_matches: Dict[str, PhraseMatch] = {}
+        self.marker_lines: Set[int] = set()
+        for match in scanner.scan(content):
+            if match.phrase in _section_markers:
+                self.marker_lines.add(bisect_right(line_starts, match.start) - 1)
+            elif match.phrase not in self.value_matches:
+                self.value_matches[match.phrase] = match
 
 
 class CompanyResearchService:
@@ -261,6 +362,8 @@ class CompanyResearchService:
         """
 
         initiatives = []
+        # Near-duplicate index over everything collected so far (replaces pairwise title checks)
+        seen = NearDuplicateIndex()
 
         # FIRST: Convert citations directly to initiatives
         # These are REAL articles that Perplexity found
@@ -273,14 +376,16 @@ class CompanyResearchService:
                 # Extract date from URL or content
                 date = self._extract_date_from_citation(citation)
 
-                initiatives.append({
+                initiative = {
                     "title": title,
                     "description": text[:300] if text else "Strategic initiative sourced from company research",
                     "source": title,  # Use article title as source
                     "url": url,  # REAL clickable URL
                     "date": date,  # Real date
                     "relevance_to_role": ""
-                })
+                }
+                initiatives.append(initiative)
+                seen.add(self._initiative_text(initiative), self._initiative_key(initiative))
 
         # SECOND: Parse content for additional context
         lines = content.split("\n")
@@ -296,8 +401,7 @@ class CompanyResearchService:
             ]):
                 if current_initiative:
                     # Only add if we don't already have it from citations
-                    if not self._initiative_exists(current_initiative, initiatives):
-                        initiatives.append(current_initiative)
+                    self._add_if_new(current_initiative, initiatives, seen)
 
                 current_initiative = {
                     "title": line.strip("- *#"),
@@ -310,8 +414,8 @@ class CompanyResearchService:
             elif current_initiative and line:
                 current_initiative["description"] += " " + line
 
-        if current_initiative and not self._initiative_exists(current_initiative, initiatives):
-            initiatives.append(current_initiative)
+        if current_initiative:
+            self._add_if_new(current_initiative, initiatives, seen)
 
         # Match remaining initiatives to citations
         for initiative in initiatives:
@@ -360,13 +464,32 @@ class CompanyResearchService:
         # Default to current year
         return datetime.utcnow().strftime("%Y-%m-%d")
 
-    def _initiative_exists(self, initiative: Dict, existing: List[Dict]) -> bool:
-        """Check if initiative already exists in list"""
-        title = initiative.get("title", "").lower()[:50]
-        for existing_init in existing:
-            if existing_init.get("title", "").lower()[:50] == title:
-                return True
-        return False
+    @staticmethod
+    def _initiative_text(initiative: Dict) -> str:
+        return f"{initiative.get('title', '')} {initiative.get('description', '')}"
+
+    @staticmethod
+    def _initiative_key(initiative: Dict) -> Optional[str]:
+        """Exact-match key (normalized title); None for untitled initiatives, which match on text only"""
+        return initiative.get("title", "").strip().lower()[:50] or None
+
+    @staticmethod
+    def _initiative_rank(initiative: Dict) -> tuple:
+        """Representative preference: has a URL, company source, dated, longer description"""
+        return (
+            bool(initiative.get("url")),
+            initiative.get("source") == "Company Press Release",
+            bool(initiative.get("date")),
+            len(initiative.get("description", "")),
+        )
+
+    def _add_if_new(self, initiative: Dict, initiatives: List[Dict], seen: NearDuplicateIndex):
+        """Append initiative unless it near-duplicates one already collected"""
+        text = self._initiative_text(initiative)
+        key = self._initiative_key(initiative)
+        if seen.find(text, key) is None:
+            seen.add(text, key)
+            initiatives.append(initiative)
 
     def _extract_recent_developments(self, perplexity_result: Dict) -> List[str]:
         """Extract recent developments as bullet points"""
@@ -433,18 +556,13 @@ class CompanyResearchService:
         return initiatives[:3]  # Top 3 from each source
 
     def _deduplicate_initiatives(self, initiatives: List[Dict]) -> List[Dict]:
-        """Remove duplicate initiatives"""
-
-        seen_titles = set()
-        unique = []
-
-        for init in initiatives:
-            title_key = init["title"].lower()[:50]  # First 50 chars
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique.append(init)
-
-        return unique
+        """Remove duplicate initiatives (same title or near-identical text), keeping the best-sourced"""
+        return deduplicate(
+            initiatives,
+            text=self._initiative_text,
+            rank=self._initiative_rank,
+            exact_key=self._initiative_key
+        )
 
     def _list_sources(
         self,
@@ -764,9 +882,12 @@ class CompanyResearchService:
         if not primary_values_url and citations:
             primary_values_url = citations[0].get("url", "")
 
+        # Scan the content once for all strategies
+        scan = ValueContentScan(content)
+
         # STRATEGY 1: Extract from structured lists (most reliable)
         # Look for numbered or bulleted value lists
-        structured_values = self._extract_structured_values(content, primary_values_url)
+        structured_values = self._extract_structured_values(content, primary_values_url, scan)
         values.extend(structured_values)
         print(f"✓ Found {len(structured_values)} values from structured lists")
 
@@ -777,7 +898,7 @@ class CompanyResearchService:
         print(f"✓ Found {len(explicit_values)} values from explicit statements")
 
         # STRATEGY 3: Search for common company values (existing logic)
-        common_values_found = self._search_common_values(content, primary_values_url)
+        common_values_found = self._search_common_values(content, primary_values_url, scan)
         values.extend(common_values_found)
         print(f"✓ Found {len(common_values_found)} values from common keywords")
 
@@ -800,41 +921,46 @@ class CompanyResearchService:
         print(f"✅ Final extracted {len(unique_values)} unique company values")
         return unique_values
 
-    def _extract_structured_values(self, content: str, primary_url: str) -> List[Dict]:
+    def _extract_structured_values(
+        self,
+        content: str,
+        primary_url: str,
+        scan: Optional[ValueContentScan] = None
+    ) -> List[Dict]:
         """Extract values from numbered or bulleted lists"""
-        import re
+        scan = scan or ValueContentScan(content)
 
         values = []
-        lines = content.split("\n")
+        lines = scan.lines
 
         # Look for sections that contain value lists
         in_values_section = False
 
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-
-            # Detect start of values section
-            if any(keyword in line_lower for keyword in [
-                "our values", "core values", "company values", "guiding principles",
-                "our principles", "what we value", "cultural values", "values are"
-            ]):
+            # Detect start of values section (marker lines found in the content scan)
+            if i in scan.marker_lines:
                 in_values_section = True
                 print(f"Found values section: {line[:100]}")
                 continue
 
+            if not in_values_section:
+                continue
+
+            line_lower = line.lower().strip()
+
             # Stop if we hit a new section
-            if in_values_section and line.strip().startswith("#") and i > 0:
+            if line.strip().startswith("#") and i > 0:
                 section_keywords = ["value", "principle", "culture", "mission"]
                 if not any(kw in line_lower for kw in section_keywords):
                     in_values_section = False
 
             # Extract from numbered lists: "1. Innovation" or "1) Innovation"
-            numbered_match = re.match(r'^\s*\d+[\.\)]\s+([A-Z][^:\n]{2,50})', line)
+            numbered_match = _NUMBERED_VALUE.match(line)
             if numbered_match and in_values_section:
                 value_name = numbered_match.group(1).strip()
                 # Get description (next 1-2 lines if available)
                 description = ""
-                if i + 1 < len(lines) and not re.match(r'^\s*\d+[\.\)]', lines[i + 1]):
+                if i + 1 < len(lines) and not _NUMBERED_PREFIX.match(lines[i + 1]):
                     description = lines[i + 1].strip()[:200]
 
                 values.append({
@@ -846,11 +972,11 @@ class CompanyResearchService:
                 })
 
             # Extract from bulleted lists: "- Innovation" or "* Innovation"
-            bullet_match = re.match(r'^\s*[-\*•]\s+([A-Z][^:\n]{2,50})', line)
+            bullet_match = _BULLET_VALUE.match(line)
             if bullet_match and in_values_section:
                 value_name = bullet_match.group(1).strip()
                 description = ""
-                if i + 1 < len(lines) and not re.match(r'^\s*[-\*•]', lines[i + 1]):
+                if i + 1 < len(lines) and not _BULLET_PREFIX.match(lines[i + 1]):
                     description = lines[i + 1].strip()[:200]
 
                 values.append({
@@ -862,7 +988,7 @@ class CompanyResearchService:
                 })
 
             # Extract from colon format: "Innovation: We embrace..."
-            colon_match = re.match(r'^\s*\**([A-Z][^:\n]{2,40}):\s*(.{10,200})', line)
+            colon_match = _COLON_VALUE.match(line)
             if colon_match and in_values_section:
                 value_name = colon_match.group(1).strip()
                 description = colon_match.group(2).strip()
@@ -879,108 +1005,67 @@ class CompanyResearchService:
 
     def _extract_explicit_value_statements(self, content: str, primary_url: str) -> List[Dict]:
         """Extract values from explicit statements like 'Our values are X, Y, Z'"""
-        import re
-
         values = []
 
-        # Patterns for explicit value statements
-        patterns = [
-            r'(?:our|core|company)\s+(?:values|principles)\s+(?:are|include):\s*([^\.]{10,300})',
-            r'(?:we|company)\s+(?:value|believe in|stand for):\s*([^\.]{10,300})',
-            r'(?:guided by|committed to|built on)\s+(?:values|principles)\s+(?:of|like|such as):\s*([^\.]{10,300})',
-        ]
+        # All statement patterns in one compiled alternation (one pass over content)
+        for match in _EXPLICIT_VALUE_STATEMENT.finditer(content):
+            value_text = next(group for group in match.groups() if group is not None).strip()
 
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                value_text = match.group(1).strip()
-
-                # Split by commas or "and" to get individual values
-                # Example: "integrity, innovation, and collaboration"
-                value_parts = re.split(r',\s*(?:and\s+)?|\s+and\s+', value_text)
-
-                for part in value_parts:
-                    part = part.strip().strip('.,;:')
-                    # Capitalize first letter of each word
-                    if 3 < len(part) < 50 and part[0].isupper():
-                        values.append({
-                            "name": part.title(),
-                            "description": f"Stated company value",
-                            "source_snippet": value_text[:150],
-                            "url": primary_url,
-                            "source": "Company Statement"
-                        })
+            # Split by commas or "and" to get individual values
+            # Example: "integrity, innovation, and collaboration"
+            value_parts = _VALUE_LIST_SPLIT.split(value_text)
+
+            for part in value_parts:
+                part = part.strip().strip('.,;:')
+                # Capitalize first letter of each word
+                if 3 < len(part) < 50 and part[0].isupper():
+                    values.append({
+                        "name": part.title(),
+                        "description": f"Stated company value",
+                        "source_snippet": value_text[:150],
+                        "url": primary_url,
+                        "source": "Company Statement"
+                    })
 
         return values
 
-    def _search_common_values(self, content: str, primary_url: str) -> List[Dict]:
-        """Search for common company values in content (original strategy)"""
+    def _search_common_values(
+        self,
+        content: str,
+        primary_url: str,
+        scan: Optional[ValueContentScan] = None
+    ) -> List[Dict]:
+        """
+        Search for common company values in content
+
+        Value phrases come from the value dictionary (app/data/company_values.json)
+        and are matched in a single PhraseScanner pass.
+        """
+        scan = scan or ValueContentScan(content)
 
         values = []
 
-        # Expanded list of common company values
-        common_values = [
-            # Customer-focused
-            "Customer Obsession", "Customer First", "Customer Centricity", "Customer Focus",
-            # Innovation
-            "Innovation", "Think Big", "Creativity", "Pioneering",
-            # Integrity & Ethics
-            "Integrity", "Honesty", "Trust", "Ethics", "Do the Right Thing",
-            # Excellence
-            "Excellence", "Quality", "High Standards", "Best in Class",
-            # Collaboration
-            "Collaboration", "Teamwork", "Together", "Partnership", "One Team",
-            # Diversity
-            "Diversity", "Inclusion", "Belonging", "Equity",
-            # Accountability
-            "Accountability", "Ownership", "Results-Driven", "Deliver Results",
-            # Respect
-            "Respect", "Dignity", "Empathy",
-            # Transparency
-            "Transparency", "Openness", "Authenticity",
-            # Sustainability
-            "Sustainability", "Environmental Responsibility", "Social Responsibility",
-            # Empowerment
-            "Empowerment", "Enable", "Empower", "Employee First",
-            # Agility
-            "Agility", "Adaptability", "Flexibility", "Resilience",
-            # Learning
-            "Learning", "Growth Mindset", "Continuous Improvement", "Curiosity",
-            # Safety
-            "Safety", "Security", "Safety First",
-            # Impact
-            "Impact", "Make a Difference", "Purpose-Driven",
-            # Speed
-            "Bias for Action", "Move Fast", "Speed", "Urgency",
-            # Other
-            "Passion", "Enthusiasm", "Fun", "Enjoy the Journey"
-        ]
+        # Dictionary order, first occurrence of each phrase
+        for value in get_value_scanner().phrases:
+            match = scan.value_matches.get(value)
+            if match is None:
+                continue
 
-        content_lower = content.lower()
+            # Find context around this value
+            start = max(0, match.start - 100)
+            end = min(len(content), match.start + 200)
+            snippet = content[start:end].strip()
 
-        for value in common_values:
-            if value.lower() in content_lower:
-                # Find context around this value
-                value_index = content_lower.find(value.lower())
-                start = max(0, value_index - 100)
-                end = min(len(content), value_index + 200)
-                snippet = content[start:end].strip()
-
-                # Extract a more meaningful description from the snippet
-                sentences = snippet.split(". ")
-                description = ""
-                for sentence in sentences:
-                    if value.lower() in sentence.lower():
-                        description = sentence.strip()[:200]
-                        break
+            # The sentence containing the match is the description
+            description = scan.sentences.sentence_at(match.start)[:200]
 
-                values.append({
-                    "name": value,
-                    "description": description if description else "Mentioned in company research",
-                    "source_snippet": snippet[:150],
-                    "url": primary_url,
-                    "source": "Company Research"
-                })
+            values.append({
+                "name": value,
+                "description": description if description else "Mentioned in company research",
+                "source_snippet": snippet[:150],
+                "url": primary_url,
+                "source": "Company Research"
+            })
 
         return values
 
@@ -992,7 +1077,7 @@ class CompanyResearchService:
             from openai import OpenAI
             import json
 
-            openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), base_url=get_settings().openai_base_url)
 
             # Truncate content to avoid token limits
             content_snippet = content[:4000]
@@ -0,0 +1,201 @@
+"""
+Deletion Service - set-based soft deletes with cascades to dependent records
+
+Each delete is a fixed number of UPDATE ... WHERE statements (children are
+matched with subqueries on the parent id), so its cost does not grow with
+the number of tailored resumes, preps or comparisons hanging off a record.
+No rows are loaded into the session. Files referenced by deleted rows are
+collected with UPDATE ... RETURNING and handed to the file reaper after the
+caller commits.
+
+Functions do not commit; the caller commits and then calls reap_files().
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analysis_cache import AnalysisCache
+from app.models.career_plan import CareerPlan
+from app.models.interview_prep import InterviewPrep
+from app.models.practice_question_response import PracticeQuestionResponse
+from app.models.resume import BaseResume, TailoredResume
+from app.models.saved_comparison import SavedComparison, TailoredResumeEdit
+from app.models.star_story import StarStory
+from app.utils.file_reaper import get_file_reaper
+
+
+class DeletionResult:
+    """Counts and file paths from one delete"""
+
+    def __init__(self, deleted_at: datetime):
+        self.deleted_at = deleted_at
+        self.counts: Dict[str, int] = {}
+        self.files: List[str] = []
+        # Set by soft_delete_interview_prep
+        self.tailored_resume_id: Optional[int] = None
+
+    def add(self, table: str, count: int):
+        self.counts[table] = self.counts.get(table, 0) + count
+
+    @property
+    def found(self) -> bool:
+        return any(self.counts.values())
+
+
+async def _cascade_tailored_resumes(db: AsyncSession, tailored_ids, deleted_at: datetime, result: DeletionResult):
+    """Soft delete everything that hangs off the tailored resumes selected by tailored_ids (a subquery)"""
+    prep_ids = select(InterviewPrep.id).where(InterviewPrep.tailored_resume_id.in_(tailored_ids))
+
+    # Practice responses before preps, so the prep subquery still sees them
+    responses = await db.execute(
+        update(PracticeQuestionResponse)
+        .where(PracticeQuestionResponse.interview_prep_id.in_(prep_ids), PracticeQuestionResponse.is_deleted == False)
+        .values(is_deleted=True, deleted_at=deleted_at)
+        .execution_options(synchronize_session=False)
+    )
+    result.add("practice_question_responses", responses.rowcount)
+
+    for model, table in (
+        (InterviewPrep, "interview_preps"),
+        (SavedComparison, "saved_comparisons"),
+        (TailoredResumeEdit, "tailored_resume_edits"),
+    ):
+        rows = await db.execute(
+            update(model)
+            .where(model.tailored_resume_id.in_(tailored_ids), model.is_deleted == False)
+            .values(is_deleted=True, deleted_at=deleted_at)
+            .execution_options(synchronize_session=False)
+        )
+        result.add(table, rows.rowcount)
+
+    # Cached analyses have no soft delete; they are derived data
+    cache = await db.execute(
+        delete(AnalysisCache)
+        .where(AnalysisCache.tailored_resume_id.in_(tailored_ids))
+        .execution_options(synchronize_session=False)
+    )
+    result.add("analysis_cache", cache.rowcount)
+
+
+async def soft_delete_resume(db: AsyncSession, resume_id: int) -> DeletionResult:
+    """
+    Soft delete a base resume, its tailored resumes and their preps, comparisons,
+    edits, practice responses and cached analyses
+
+    Ownership must already be checked. The files of the base resume and its
+    tailored resumes are collected in result.files.
+    """
+    deleted_at = datetime.utcnow()
+    result = DeletionResult(deleted_at)
+
+    tailored = await db.execute(
+        update(TailoredResume)
+        .where(TailoredResume.base_resume_id == resume_id, TailoredResume.is_deleted == False)
+        .values(is_deleted=True, deleted_at=deleted_at, deleted_by=None)
+        .returning(TailoredResume.docx_path, TailoredResume.pdf_path)
+        .execution_options(synchronize_session=False)
+    )
+    tailored_rows = tailored.all()
+    result.add("tailored_resumes", len(tailored_rows))
+    for docx_path, pdf_path in tailored_rows:
+        result.files.extend(path for path in (docx_path, pdf_path) if path)
+
+    # All tailored resumes of the base resume, including ones deleted earlier
+    tailored_ids = select(TailoredResume.id).where(TailoredResume.base_resume_id == resume_id)
+    await _cascade_tailored_resumes(db, tailored_ids, deleted_at, result)
+
+    # deleted_by stays NULL: session-based users don't have user_id for audit
+    base = await db.execute(
+        update(BaseResume)
+        .where(BaseResume.id == resume_id, BaseResume.is_deleted == False)
+        .values(is_deleted=True, deleted_at=deleted_at, deleted_by=None)
+        .returning(BaseResume.file_path)
+        .execution_options(synchronize_session=False)
+    )
+    base_paths = [row[0] for row in base.all()]
+    result.add("base_resumes", len(base_paths))
+    result.files.extend(path for path in base_paths if path)
+
+    return result
+
+
+async def soft_delete_interview_prep(db: AsyncSession, interview_prep_id: int) -> DeletionResult:
+    """Soft delete an interview prep and its practice responses (result.tailored_resume_id is the prep's)"""
+    deleted_at = datetime.utcnow()
+    result = DeletionResult(deleted_at)
+
+    responses = await db.execute(
+        update(PracticeQuestionResponse)
+        .where(
+            PracticeQuestionResponse.interview_prep_id == interview_prep_id,
+            PracticeQuestionResponse.is_deleted == False
+        )
+        .values(is_deleted=True, deleted_at=deleted_at)
+        .execution_options(synchronize_session=False)
+    )
+    result.add("practice_question_responses", responses.rowcount)
+
+    prep = await db.execute(
+        update(InterviewPrep)
+        .where(InterviewPrep.id == interview_prep_id)
+        .values(is_deleted=True, deleted_at=deleted_at)
+        .returning(InterviewPrep.tailored_resume_id)
+        .execution_options(synchronize_session=False)
+    )
+    result.tailored_resume_id = prep.scalar_one_or_none()
+    result.add("interview_preps", 0 if result.tailored_resume_id is None else 1)
+    return result
+
+
+async def soft_delete_star_story(db: AsyncSession, story_id: int, session_user_id: str) -> DeletionResult:
+    """Soft delete a STAR story owned by session_user_id"""
+    deleted_at = datetime.utcnow()
+    result = DeletionResult(deleted_at)
+    rows = await db.execute(
+        update(StarStory)
+        .where(StarStory.id == story_id, StarStory.session_user_id == session_user_id)
+        .values(is_deleted=True, deleted_at=deleted_at)
+        .execution_options(synchronize_session=False)
+    )
+    result.add("star_stories", rows.rowcount)
+    return result
+
+
+async def soft_delete_saved_comparison(db: AsyncSession, comparison_id: int, session_user_id: str) -> DeletionResult:
+    """Soft delete a saved comparison owned by session_user_id (already-deleted ones are not found)"""
+    deleted_at = datetime.utcnow()
+    result = DeletionResult(deleted_at)
+    rows = await db.execute(
+        update(SavedComparison)
+        .where(
+            SavedComparison.id == comparison_id,
+            SavedComparison.session_user_id == session_user_id,
+            SavedComparison.is_deleted == False
+        )
+        .values(is_deleted=True, deleted_at=deleted_at)
+        .execution_options(synchronize_session=False)
+    )
+    result.add("saved_comparisons", rows.rowcount)
+    return result
+
+
+async def soft_delete_career_plan(db: AsyncSession, plan_id: int, session_user_id: str) -> DeletionResult:
+    """Soft delete a career plan owned by session_user_id"""
+    deleted_at = datetime.utcnow()
+    result = DeletionResult(deleted_at)
+    rows = await db.execute(
+        update(CareerPlan)
+        .where(CareerPlan.id == plan_id, CareerPlan.session_user_id == session_user_id)
+        .values(is_deleted=True, deleted_at=deleted_at, deleted_by=session_user_id)
+        .execution_options(synchronize_session=False)
+    )
+    result.add("career_plans", rows.rowcount)
+    return result
+
+
+def reap_files(result: DeletionResult) -> int:
+    """Queue the deleted records' files for background removal (call after commit)"""
+    return get_file_reaper().enqueue(result.files)
@@ -3,10 +3,12 @@ from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+import io
 import os
 import re
 from datetime import datetime
 from app.config import get_settings
+from app.services.docx_template_engine import COMPANY_COLORS, get_docx_template_engine, theme_for_company
 
 settings = get_settings()
 
@@ -15,12 +17,8 @@ class DOCXGenerator:
 
     def __init__(self):
         self.company_colors = {
-            "jpmorgan": RGBColor(0, 51, 102),  # Navy blue
-            "oracle": RGBColor(255, 0, 0),  # Oracle red
-            "microsoft": RGBColor(0, 103, 184),  # Microsoft blue
-            "amazon": RGBColor(255, 153, 0),  # Amazon orange
-            "google": RGBColor(66, 133, 244),  # Google blue
-            "default": RGBColor(0, 51, 102)  # Navy blue default
+            key: RGBColor.from_string(hex_color)
+            for key, hex_color in COMPANY_COLORS.items()
         }
 
     def get_company_color(self, company_name: str) -> RGBColor:
@@ -84,7 +82,112 @@ class DOCXGenerator:
         Returns:
             Path to generated DOCX file
         """
+        docx_bytes = self.render_tailored_resume(
+            candidate_name, contact_info, job_details, tailored_content, base_resume_data
+        )
+
+        # Save document
+        os.makedirs(settings.resumes_dir, exist_ok=True)
+        output_path = os.path.join(settings.resumes_dir, output_filename)
+        with open(output_path, "wb") as f:
+            f.write(docx_bytes)
+
+        return output_path
+
+    def render_tailored_resume(
+        self,
+        candidate_name: str,
+        contact_info: dict,
+        job_details: dict,
+        tailored_content: dict,
+        base_resume_data: dict
+    ) -> bytes:
+        """
+        Render a tailored resume to DOCX bytes
+
+        Uses the cached template engine; falls back to building the document
+        run by run with python-docx if template rendering fails.
+        """
+        try:
+            return self._render_from_template(
+                candidate_name, contact_info, job_details, tailored_content, base_resume_data
+            )
+        except Exception as e:
+            print(f"WARNING: Template rendering failed, using python-docx builder: {e}")
+            return self._render_with_python_docx(
+                candidate_name, contact_info, job_details, tailored_content, base_resume_data
+            )
+
+    def _render_from_template(
+        self,
+        candidate_name: str,
+        contact_info: dict,
+        job_details: dict,
+        tailored_content: dict,
+        base_resume_data: dict
+    ) -> bytes:
+        """Render by cloning pre-styled paragraphs from the cached base document"""
+        company = job_details.get('company', '')
+        doc = get_docx_template_engine().new_document(theme=theme_for_company(company))
+
+        # Target Position Box
+        doc.add(
+            "target_box",
+            title=job_details.get('title', 'Position'),
+            company_line=f"{job_details.get('company', 'Company')} | {contact_info.get('location', 'Location')}"
+        )
+        if job_details.get('url'):
+            doc.add_hyperlink(job_details['url'], "Apply Here")
+        doc.add_spacer()
+
+        # Header - Name and Contact
+        doc.add(
+            "name_contact",
+            name=candidate_name,
+            contact=f"{contact_info.get('email', '')} | {contact_info.get('phone', '')} | {contact_info.get('location', '')}"
+        )
+        doc.add_spacer()
 
+        # Professional Summary
+        doc.add("heading", text="PROFESSIONAL SUMMARY")
+        doc.add("body", text=tailored_content.get('summary', ''))
+
+        # Core Competencies
+        doc.add("heading", text="CORE COMPETENCIES")
+        competencies = tailored_content.get('competencies', [])
+        if competencies:
+            doc.add_grid(competencies, cols=3)
+
+        # Professional Experience
+        doc.add("heading", text="PROFESSIONAL EXPERIENCE")
+        for exp in tailored_content.get('experience', []):
+            doc.add("job_header", text=exp.get('header', ''))
+            doc.add_bullets([b for b in exp.get('bullets', []) if _is_real_bullet(b)])
+            doc.add_spacer()
+
+        if base_resume_data.get('education'):
+            doc.add("heading", text="EDUCATION")
+            doc.add("body", text=base_resume_data['education'])
+
+        if base_resume_data.get('certifications'):
+            doc.add("heading", text="CERTIFICATIONS & TRAINING")
+            doc.add("body", text=base_resume_data['certifications'])
+
+        if tailored_content.get('alignment_statement'):
+            doc.add("heading", text=f"ALIGNMENT WITH {job_details.get('company', 'COMPANY').upper()} MISSION")
+            doc.add("body_small", text=tailored_content['alignment_statement'])
+
+        return doc.to_bytes()
+
+    def _render_with_python_docx(
+        self,
+        candidate_name: str,
+        contact_info: dict,
+        job_details: dict,
+        tailored_content: dict,
+        base_resume_data: dict
+    ) -> bytes:
+        """Build the document run by run with python-docx (fallback path)"""
         doc = Document()
 
         # Set margins
@@ -166,9 +269,7 @@ class DOCXGenerator:
 
             # Bullets
             for bullet in exp.get('bullets', []):
-                # Skip empty bullets and bullets containing only separators/whitespace
-                # This regex catches any combination of whitespace and separator characters
-                if bullet and bullet.strip() and not re.match(r'^[\s\|\/•\-–—]+$', bullet.strip()):
+                if _is_real_bullet(bullet):
                     bullet_para = doc.add_paragraph(bullet, style='List Bullet')
                     bullet_para.paragraph_format.line_spacing = 1.15
                     bullet_para.paragraph_format.space_after = Pt(6)
@@ -195,12 +296,9 @@ class DOCXGenerator:
             for run in align_para.runs:
                 run.font.size = Pt(10)
 
-        # Save document
-        os.makedirs(settings.resumes_dir, exist_ok=True)
-        output_path = os.path.join(settings.resumes_dir, output_filename)
-        doc.save(output_path)
-
-        return output_path
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
 
     def _add_section_heading(self, doc, text: str, color: RGBColor):
         """Add a section heading with color"""
@@ -211,3 +309,8 @@ class DOCXGenerator:
         heading_run.font.color.rgb = color
         heading.paragraph_format.space_before = Pt(12)
         heading.paragraph_format.space_after = Pt(6)
+
+
+def _is_real_bullet(bullet) -> bool:
+    """Skip empty bullets and bullets containing only separators/whitespace"""
+    return bool(bullet and bullet.strip() and not re.match(r'^[\s\|\/•\-–—]+$', bullet.strip()))
@@ -0,0 +1,425 @@
+"""
+DOCX Template Engine - Fast resume rendering from a cached, pre-styled base document
+
+The styled base .docx is built once with python-docx, then parsed into:
+- a base zip holding every static part (styles, numbering, theme, ...) already compressed
+- a document.xml skeleton (section properties / margins only)
+- pre-styled prototype paragraphs and tables keyed by name, with {{placeholders}}
+
+Rendering a resume clones prototypes, fills placeholders and appends only
+word/document.xml and its relationships to a copy of the base zip. No
+python-docx objects are created per document and the large style parts are
+never re-serialized or re-compressed.
+
+Company colour themes are precomputed variants of the heading prototypes.
+"""
+
+import copy
+import io
+import re
+import threading
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+HYPERLINK_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS_PART = "word/_rels/document.xml.rels"
+
+# Company brand colours (hex RGB); each becomes a precomputed heading theme
+COMPANY_COLORS: Dict[str, str] = {
+    "jpmorgan": "003366",   # Navy blue
+    "oracle": "FF0000",     # Oracle red
+    "microsoft": "0067B8",  # Microsoft blue
+    "amazon": "FF9900",     # Amazon orange
+    "google": "4285F4",     # Google blue
+    "default": "003366",    # Navy blue default
+}
+
+# Prototypes whose colour changes with the company theme
+THEMED_PROTOTYPES = ("heading", "heading_compact")
+
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Characters that are not allowed in XML 1.0 (LLM output occasionally contains them)
+_INVALID_XML_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Relationship id on the prototype hyperlink; each document gets its own
+_LINK_RID_PLACEHOLDER = "rIdTemplateLink"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+def theme_for_company(company_name: str) -> str:
+    """Return the colour theme key for a company name"""
+    company_lower = (company_name or "").lower()
+    for key in COMPANY_COLORS:
+        if key != "default" and key in company_lower:
+            return key
+    return "default"
+
+
+def _build_base_template() -> Tuple[bytes, List[str]]:
+    """
+    Build the styled base .docx with one prototype block per name
+
+    Returns:
+        (docx_bytes, prototype_names) - body elements appear in prototype_names order
+    """
+    from docx import Document
+    from docx.shared import Pt, RGBColor, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(0.75)
+        section.bottom_margin = Inches(0.75)
+        section.left_margin = Inches(0.75)
+        section.right_margin = Inches(0.75)
+
+    default_color = RGBColor.from_string(COMPANY_COLORS["default"])
+    names = []
+
+    def proto(name, paragraph):
+        names.append(name)
+        return paragraph
+
+    # Target position box (tailored layout)
+    box = proto("target_box", doc.add_paragraph())
+    box.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = box.add_run("TARGET POSITION\n")
+    run.bold = True
+    run.font.size = Pt(11)
+    run = box.add_run("{{title}}\n")
+    run.bold = True
+    run.font.size = Pt(12)
+    run = box.add_run("{{company_line}}\n")
+    run.font.size = Pt(11)
+
+    # Centered hyperlink
+    link = proto("link", doc.add_paragraph())
+    link.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), _LINK_RID_PLACEHOLDER)
+    link_run = OxmlElement("w:r")
+    rPr = OxmlElement("w:rPr")
+    color = OxmlElement("w:color")
+    color.set(qn("w:val"), "0563C1")
+    rPr.append(color)
+    underline = OxmlElement("w:u")
+    underline.set(qn("w:val"), "single")
+    rPr.append(underline)
+    link_run.append(rPr)
+    link_text = OxmlElement("w:t")
+    link_text.text = "{{text}}"
+    link_run.append(link_text)
+    hyperlink.append(link_run)
+    link._p.append(hyperlink)
+
+    proto("spacer", doc.add_paragraph())
+
+    # Name + contact in one paragraph (tailored layout)
+    header = proto("name_contact", doc.add_paragraph())
+    header.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = header.add_run("{{name}}\n")
+    run.bold = True
+    run.font.size = Pt(18)
+    run = header.add_run("{{contact}}")
+    run.font.size = Pt(10)
+
+    # Name and contact as separate Calibri paragraphs (export layout)
+    name = proto("name", doc.add_paragraph())
+    name.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = name.add_run("{{text}}")
+    run.font.size = Pt(18)
+    run.font.bold = True
+    run.font.name = "Calibri"
+
+    contact = proto("contact", doc.add_paragraph())
+    contact.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    run = contact.add_run("{{text}}")
+    run.font.size = Pt(10)
+    run.font.name = "Calibri"
+
+    # Section headings
+    heading = proto("heading", doc.add_paragraph())
+    run = heading.add_run("{{text}}")
+    run.bold = True
+    run.font.size = Pt(12)
+    run.font.color.rgb = default_color
+    heading.paragraph_format.space_before = Pt(12)
+    heading.paragraph_format.space_after = Pt(6)
+
+    heading_compact = proto("heading_compact", doc.add_paragraph())
+    run = heading_compact.add_run("{{text}}")
+    run.font.size = Pt(12)
+    run.font.bold = True
+    run.font.color.rgb = default_color
+
+    # Body text
+    body = proto("body", doc.add_paragraph("{{text}}"))
+    body.paragraph_format.line_spacing = 1.15
+
+    proto("body_plain", doc.add_paragraph("{{text}}", style="Normal"))
+
+    body_small = proto("body_small", doc.add_paragraph("{{text}}"))
+    body_small.paragraph_format.line_spacing = 1.15
+    for run in body_small.runs:
+        run.font.size = Pt(10)
+
+    # Experience
+    job_header = proto("job_header", doc.add_paragraph())
+    run = job_header.add_run("{{text}}")
+    run.bold = True
+    run.font.size = Pt(11)
+
+    job_meta = proto("job_meta", doc.add_paragraph())
+    run = job_meta.add_run("{{text}}")
+    run.font.italic = True
+
+    bullet = proto("bullet", doc.add_paragraph("{{text}}", style="List Bullet"))
+    bullet.paragraph_format.line_spacing = 1.15
+    bullet.paragraph_format.space_after = Pt(6)
+
+    proto("bullet_plain", doc.add_paragraph("{{text}}", style="List Bullet"))
+
+    # 3-column competencies grid: a single prototype row is cloned per 3 items
+    table = doc.add_table(rows=1, cols=3)
+    table.style = "Table Grid"
+    for cell in table.rows[0].cells:
+        cell.text = "• {{text}}"
+        cell.paragraphs[0].runs[0].font.size = Pt(10)
+    names.append("competency_table")
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue(), names
+
+
+class DocxTemplate:
+    """Parsed, immutable base document shared by all renders"""
+
+    def __init__(self, docx_bytes: bytes, prototype_names: List[str]):
+        with zipfile.ZipFile(io.BytesIO(docx_bytes)) as source:
+            document_xml = source.read(DOCUMENT_PART)
+            rels_xml = source.read(DOCUMENT_RELS_PART)
+
+            # Base zip: every static part, compressed once
+            base = io.BytesIO()
+            with zipfile.ZipFile(base, "w", zipfile.ZIP_DEFLATED) as target:
+                for info in source.infolist():
+                    if info.filename in (DOCUMENT_PART, DOCUMENT_RELS_PART):
+                        continue
+                    target.writestr(info.filename, source.read(info.filename))
+            self.base_zip = base.getvalue()
+
+        # Document skeleton keeps only sectPr (page size and margins)
+        self.skeleton = etree.fromstring(document_xml)
+        body = self.skeleton.find(_w("body"))
+        blocks = [child for child in body if child.tag != _w("sectPr")]
+        if len(blocks) != len(prototype_names):
+            raise ValueError(
+                f"Template has {len(blocks)} prototype blocks, expected {len(prototype_names)}"
+            )
+
+        self.prototypes: Dict[str, etree._Element] = {}
+        for name, element in zip(prototype_names, blocks):
+            body.remove(element)
+            self.prototypes[name] = element
+
+        self.rels = etree.fromstring(rels_xml)
+        self._next_rel_id = 1 + max(
+            (int(rel.get("Id")[3:]) for rel in self.rels if rel.get("Id", "").startswith("rId") and rel.get("Id")[3:].isdigit()),
+            default=0
+        )
+
+        # Precomputed colour variants of themed prototypes
+        self.themed: Dict[str, Dict[str, etree._Element]] = {}
+        for theme, hex_color in COMPANY_COLORS.items():
+            variants = {}
+            for name in THEMED_PROTOTYPES:
+                variant = copy.deepcopy(self.prototypes[name])
+                for color in variant.iter(_w("color")):
+                    color.set(_w("val"), hex_color)
+                variants[name] = variant
+            self.themed[theme] = variants
+
+    def prototype(self, name: str, theme: str = "default") -> etree._Element:
+        if name in THEMED_PROTOTYPES:
+            return self.themed.get(theme, self.themed["default"])[name]
+        return self.prototypes[name]
+
+
+class RenderedDocument:
+    """Builder for one document; appends filled clones of template prototypes"""
+
+    def __init__(self, template: DocxTemplate, theme: str = "default"):
+        self.template = template
+        self.theme = theme if theme in COMPANY_COLORS else "default"
+        self._root = copy.deepcopy(template.skeleton)
+        self._body = self._root.find(_w("body"))
+        self._sect_pr = self._body.find(_w("sectPr"))
+        self._rels = None
+        self._next_rel_id = template._next_rel_id
+
+    # ------------------------------------------------------------------
+    # Public block API
+    # ------------------------------------------------------------------
+
+    def add(self, prototype: str, **values) -> "RenderedDocument":
+        """Append a clone of `prototype` with {{placeholders}} filled from values"""
+        element = copy.deepcopy(self.template.prototype(prototype, self.theme))
+        _fill(element, values)
+        self._append(element)
+        return self
+
+    def add_spacer(self) -> "RenderedDocument":
+        return self.add("spacer")
+
+    def add_bullets(self, bullets: List[str], prototype: str = "bullet") -> "RenderedDocument":
+        for bullet in bullets:
+            self.add(prototype, text=bullet)
+        return self
+
+    def add_hyperlink(self, url: str, text: str) -> "RenderedDocument":
+        """Append a centered clickable link"""
+        rel_id = self._add_relationship(url)
+        element = copy.deepcopy(self.template.prototype("link"))
+        for hyperlink in element.iter(_w("hyperlink")):
+            hyperlink.set(f"{{{R_NS}}}id", rel_id)
+        _fill(element, {"text": text})
+        self._append(element)
+        return self
+
+    def add_grid(self, items: List[str], cols: int = 3) -> "RenderedDocument":
+        """Append the competencies table with `cols` items per row"""
+        table = copy.deepcopy(self.template.prototype("competency_table"))
+        row_proto = table.find(_w("tr"))
+        table.remove(row_proto)
+
+        for start in range(0, len(items), cols):
+            row = copy.deepcopy(row_proto)
+            cells = row.findall(_w("tc"))
+            for offset, cell in enumerate(cells):
+                idx = start + offset
+                if idx < len(items):
+                    _fill(cell, {"text": items[idx]})
+                else:
+                    # Empty trailing cell: keep the paragraph, drop the run
+                    for paragraph in cell.findall(_w("p")):
+                        for run in paragraph.findall(_w("r")):
+                            paragraph.remove(run)
+            table.append(row)
+
+        self._append(table)
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Serialize the document as .docx bytes"""
+        document_xml = etree.tostring(self._root, xml_declaration=True, encoding="UTF-8", standalone=True)
+        rels = self._rels if self._rels is not None else self.template.rels
+        rels_xml = etree.tostring(rels, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+        buffer = io.BytesIO(self.template.base_zip)
+        buffer.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(DOCUMENT_PART, document_xml)
+            archive.writestr(DOCUMENT_RELS_PART, rels_xml)
+        return buffer.getvalue()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _append(self, element):
+        self._sect_pr.addprevious(element)
+
+    def _add_relationship(self, url: str) -> str:
+        if self._rels is None:
+            self._rels = copy.deepcopy(self.template.rels)
+        rel_id = f"rId{self._next_rel_id}"
+        self._next_rel_id += 1
+        rel = etree.SubElement(self._rels, f"{{{REL_NS}}}Relationship")
+        rel.set("Id", rel_id)
+        rel.set("Type", HYPERLINK_REL_TYPE)
+        rel.set("Target", url)
+        rel.set("TargetMode", "External")
+        return rel_id
+
+
+def _fill(element, values: Dict[str, str]):
+    """Replace {{placeholders}} in every w:t under element, expanding \\n and \\t like python-docx"""
+    for text_node in list(element.iter(_w("t"))):
+        original = text_node.text or ""
+        if "{{" not in original:
+            continue
+
+        filled = _PLACEHOLDER_RE.sub(lambda m: _clean(values.get(m.group(1), "")), original)
+
+        if "\n" not in filled and "\t" not in filled:
+            _set_text(text_node, filled)
+            continue
+
+        # Split into w:t / w:br / w:tab siblings
+        parent = text_node.getparent()
+        position = parent.index(text_node)
+        parent.remove(text_node)
+        for piece in re.split(r"(\n|\t)", filled):
+            if piece == "\n":
+                node = etree.Element(_w("br"))
+            elif piece == "\t":
+                node = etree.Element(_w("tab"))
+            elif piece:
+                node = etree.Element(_w("t"))
+                _set_text(node, piece)
+            else:
+                continue
+            parent.insert(position, node)
+            position += 1
+
+
+def _set_text(text_node, text: str):
+    text_node.text = text
+    if text != text.strip():
+        text_node.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+
+
+def _clean(value) -> str:
+    text = "" if value is None else str(value)
+    return _INVALID_XML_CHARS_RE.sub("", text)
+
+
+class DocxTemplateEngine:
+    """Renders documents from the cached base template"""
+
+    def __init__(self):
+        docx_bytes, names = _build_base_template()
+        self.template = DocxTemplate(docx_bytes, names)
+
+    def new_document(self, company_name: Optional[str] = None, theme: Optional[str] = None) -> RenderedDocument:
+        """Start a document themed for company_name (or an explicit theme key)"""
+        return RenderedDocument(self.template, theme or theme_for_company(company_name or ""))
+
+
+# Singleton instance (base template is parsed once per process)
+_docx_template_engine_instance: Optional[DocxTemplateEngine] = None
+_docx_template_engine_lock = threading.Lock()
+
+
+def get_docx_template_engine() -> DocxTemplateEngine:
+    """Get singleton DocxTemplateEngine instance"""
+    global _docx_template_engine_instance
+    if _docx_template_engine_instance is None:
+        with _docx_template_engine_lock:
+            if _docx_template_engine_instance is None:
+                _docx_template_engine_instance = DocxTemplateEngine()
+    return _docx_template_engine_instance
@@ -0,0 +1,187 @@
+"""
+Export Cache
+Size-bounded, content-addressed cache of rendered resume files (DOCX/PDF)
+
+Exports are rendered on demand from database content instead of being read
+from disk paths that do not survive a redeploy. Each rendered artifact is
+keyed by a SHA-256 of everything that affects its bytes (format, renderer
+version and the resume content), so:
+- edits to a tailored resume produce a new key automatically (no invalidation)
+- the key doubles as a strong ETag for conditional downloads
+- identical content exported twice is rendered once
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.utils.profiler import profile_span
+
+# Bump when the DOCX/PDF layout changes so cached renders are not reused
+RENDER_VERSION = "1"
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+
+def content_key(kind: str, payload: dict) -> str:
+    """Content address for a render: SHA-256 over kind, renderer version and canonical JSON payload"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256()
+    digest.update(f"{kind}:{RENDER_VERSION}:".encode("utf-8"))
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def etag_for(key: str) -> str:
+    """Strong ETag for a content key"""
+    return f'"{key}"'
+
+
+def iter_bytes(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield data in chunks for StreamingResponse"""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+
+class ExportCache:
+    """In-process LRU of rendered exports, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # In-flight renders by key, shared by every request waiting for that key
+        self._renders: Dict[str, "asyncio.Task[bytes]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return  # Larger than the whole cache, serve uncached
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._entries[key] = data
+            self._size += len(data)
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    async def get_or_render(self, key: str, render: Callable[[], bytes]) -> Tuple[bytes, bool]:
+        """
+        Return cached bytes for key, rendering in a worker thread on a miss
+
+        Concurrent requests for the same key share a single render: the first
+        starts it as a task, later ones await the same task (even when the
+        result is too large to cache, or fails). The task is shielded, so a
+        cancelled request does not abort the render for the others.
+
+        Returns:
+            (data, cache_hit) - cache_hit is False only for the request that rendered
+        """
+        data = self.get(key)
+        if data is not None:
+            return data, True
+
+        task = self._renders.get(key)
+        started = task is None
+        if started:
+            task = self._renders[key] = asyncio.ensure_future(self._render(key, render))
+            task.add_done_callback(lambda done: self._render_done(key, done))
+        data = await asyncio.shield(task)
+        return data, not started
+
+    async def _render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        with profile_span("render", "export"):
+            data = await asyncio.to_thread(render)
+        self.put(key, data)
+        return data
+
+    def _render_done(self, key: str, task: "asyncio.Task[bytes]") -> None:
+        # Later requests read the cache (or, after a failure, render again)
+        if self._renders.get(key) is task:
+            del self._renders[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here too, for failures every waiter gave up on
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _cache_headers(key: str) -> dict:
+    return {
+        "ETag": etag_for(key),
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def not_modified_response(request: Request, key: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client already holds this content, else None
+
+    Call before rendering: the key is derived from content, so a matching
+    If-None-Match needs no render at all.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if etag_for(key) in tags or "*" in tags:
+        return Response(status_code=304, headers=_cache_headers(key))
+    return None
+
+
+def export_response(data: bytes, key: str, media_type: str, filename: str) -> StreamingResponse:
+    """Stream rendered export bytes with ETag, Content-Length and attachment filename"""
+    headers = _cache_headers(key)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    headers["Content-Length"] = str(len(data))
+    return StreamingResponse(iter_bytes(data), media_type=media_type, headers=headers)
+
+
+# Singleton instance
+_export_cache_instance: Optional[ExportCache] = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get singleton ExportCache instance"""
+    global _export_cache_instance
+    if _export_cache_instance is None:
+        _export_cache_instance = ExportCache(max_bytes=get_settings().export_cache_max_mb * 1024 * 1024)
+    return _export_cache_instance
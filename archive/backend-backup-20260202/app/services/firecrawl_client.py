@@ -81,7 +81,7 @@ class FirecrawlClient:
                     "or set TEST_MODE=true to use mock data."
                 )
 
-            app = FirecrawlApp(api_key=firecrawl_api_key)
+            app = FirecrawlApp(api_key=firecrawl_api_key, api_url=settings.firecrawl_api_url)
 
             print("Scraping job page with Firecrawl...")
 
@@ -185,7 +185,7 @@ class FirecrawlClient:
 
                 # Use OpenAI to extract company and title from the scraped markdown
                 from openai import OpenAI
-                openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+                openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), base_url=settings.openai_base_url)
 
                 extraction_prompt = f"""Extract the company name and job title from this job posting.
 
@@ -321,7 +321,7 @@ Do not include any other text, only the JSON."""
             if not firecrawl_api_key:
                 raise ValueError("FIRECRAWL_API_KEY not found")
 
-            app = FirecrawlApp(api_key=firecrawl_api_key)
+            app = FirecrawlApp(api_key=firecrawl_api_key, api_url=settings.firecrawl_api_url)
 
             print(f"Scraping page: {url}")
 
@@ -3,10 +3,10 @@ Interview Intelligence Service - Sales Navigator-inspired features
 Provides relevance scoring, talking points, and job alignment for interview prep
 """
 
+import asyncio
 import json
 from typing import Dict, List, Optional
 from datetime import datetime
-from openai import AsyncOpenAI
 from app.config import get_settings
 
 
@@ -17,8 +17,15 @@ class InterviewIntelligenceService:
     """
 
     def __init__(self):
-        settings = get_settings()
-        self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self._openai_client = None
+
+    @property
+    def openai_client(self):
+        """OpenAI client, created on first LLM call (readiness scoring needs none)"""
+        if self._openai_client is None:
+            from openai import AsyncOpenAI
+            self._openai_client = AsyncOpenAI(api_key=get_settings().openai_api_key, base_url=get_settings().openai_base_url)
+        return self._openai_client
 
     async def score_relevance(
         self,
@@ -303,10 +310,168 @@ Focus on the TOP 5-7 most important requirements from the job description."""
                 "interview_strategy": "Connect your experience to the company's strategic initiatives."
             }
 
+    async def generate_intelligence_bundle(
+        self,
+        content_items: List[Dict],
+        company_research: Dict,
+        job_description: str,
+        job_title: str,
+        company_name: str,
+        content_type: str = "strategy"
+    ) -> Dict:
+        """
+        Relevance scores, talking points and job alignment in one structured call
+
+        The three analyses share the same job and company context, so it is sent
+        once. Sections missing from the response are filled by the individual
+        methods, run in parallel.
+
+        Returns:
+        {
+            "scored_items": [...],      # as score_relevance
+            "talking_points": {...},    # as generate_talking_points
+            "job_alignment": {...}      # as analyze_job_alignment
+        }
+        """
+
+        print(f"Generating intelligence bundle for {job_title} at {company_name} ({len(content_items)} items)...")
+
+        prompt = f"""You are an interview preparation expert. Using the context below, produce three analyses for a candidate interviewing for this role.
+
+JOB: {job_title} at {company_name}
+
+JOB DESCRIPTION:
+{job_description[:2000]}
+
+COMPANY RESEARCH:
+{json.dumps(company_research, indent=2)[:2000]}
+
+CONTENT TO SCORE ({content_type.upper()}):
+{json.dumps(content_items[:10], indent=2)}
+
+1. scored_items: for each content item, score how relevant it is to the job.
+   - relevance_score (0-10): 9-10 Critical (core responsibilities), 7-8 High, 5-6 Medium, 0-4 Low
+   - priority: "Critical", "High", or "Medium" (DO NOT use "Context")
+   - why_it_matters: 1 sentence, specific to THIS role
+   - job_alignment: job requirements or responsibilities it connects to
+   - talking_point: how to reference it in the interview (30-50 words)
+   - example_statements: 2 statements mentioning THIS item (20-30 words each)
+   - questions_to_ask: 2 questions about THIS item (15-25 words each)
+
+2. talking_points: how to use the company research in the interview, with example statements, questions to ask and dos/donts.
+
+3. job_alignment: map the TOP 5-7 job requirements to company initiatives.
+
+Return ONLY a JSON object with this structure:
+{{
+  "scored_items": [
+    {{
+      "original_item": {{...}},
+      "relevance_score": 9.5,
+      "priority": "Critical",
+      "why_it_matters": "...",
+      "job_alignment": ["Requirement 1"],
+      "talking_point": "...",
+      "example_statements": ["...", "..."],
+      "questions_to_ask": ["...", "..."]
+    }}
+  ],
+  "talking_points": {{
+    "how_to_use_in_interview": "2-3 sentence explanation of when and how to bring this up",
+    "example_statements": ["...", "..."],
+    "questions_to_ask": ["...", "..."],
+    "dos_and_donts": {{"dos": ["..."], "donts": ["..."]}},
+    "prep_time_minutes": 15
+  }},
+  "job_alignment": {{
+    "requirement_mapping": [
+      {{
+        "requirement": "Specific requirement from job description",
+        "company_evidence": ["Initiative or strategy that relates"],
+        "how_to_discuss": "1-sentence advice",
+        "match_strength": 9
+      }}
+    ],
+    "overall_alignment_score": 8.5,
+    "top_alignment_areas": ["..."],
+    "gaps_to_address": ["..."],
+    "interview_strategy": "2-3 sentence strategy"
+  }}
+}}"""
+
+        bundle = {}
+        try:
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert interview preparation coach. You score which company information matters most for a role, write actionable talking points, and map job requirements to company initiatives."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=7000
+            )
+            bundle = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            print(f"⚠️ Intelligence bundle call failed: {e}")
+
+        # Fill any missing or malformed section with its dedicated call, in parallel
+        fallbacks = {}
+        if not isinstance(bundle.get("scored_items"), list) or (content_items and not bundle.get("scored_items")):
+            fallbacks["scored_items"] = self.score_relevance(content_items, job_description, job_title, content_type)
+        if not isinstance(bundle.get("talking_points"), dict) or "example_statements" not in bundle["talking_points"]:
+            fallbacks["talking_points"] = self.generate_talking_points(company_research, job_description, job_title, company_name)
+        if not isinstance(bundle.get("job_alignment"), dict) or "requirement_mapping" not in bundle["job_alignment"]:
+            fallbacks["job_alignment"] = self.analyze_job_alignment(company_research, job_description, job_title, company_name)
+
+        if fallbacks:
+            print(f"Filling bundle sections separately: {', '.join(fallbacks)}")
+            results = await asyncio.gather(*fallbacks.values())
+            bundle.update(zip(fallbacks.keys(), results))
+
+        print(f"✓ Intelligence bundle: {len(bundle['scored_items'])} scored items, "
+              f"{len(bundle['job_alignment'].get('requirement_mapping', []))} mapped requirements")
+        return {
+            "scored_items": bundle["scored_items"],
+            "talking_points": bundle["talking_points"],
+            "job_alignment": bundle["job_alignment"],
+        }
+
+    @staticmethod
+    def readiness_sections(prep_data: Dict) -> List[str]:
+        """Section IDs considered complete for a stored prep (sections with generated content)"""
+        section_keys = [
+            ("company_profile", "company_profile"),
+            ("role_analysis", "role_analysis"),
+            ("values_and_culture", "values_culture"),
+            ("strategy_and_news", "strategy_news"),
+            ("interview_preparation", "interview_prep_checklist"),
+            ("questions_to_ask_interviewer", "questions_to_ask"),
+            ("candidate_positioning", "practice_questions"),
+        ]
+        return [section for key, section in section_keys if prep_data.get(key)]
+
     async def calculate_interview_readiness(
         self,
         prep_data: Dict,
-        sections_completed: List[str]
+        sections_completed: List[str],
+        practice_stats: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Calculate overall interview readiness score (like Sales Navigator's account score)
+
+        Deterministic; see compute_interview_readiness.
+        """
+        return self.compute_interview_readiness(prep_data, sections_completed, practice_stats)
+
+    def compute_interview_readiness(
+        self,
+        prep_data: Dict,
+        sections_completed: List[str],
+        practice_stats: Optional[Dict] = None
     ) -> Dict:
         """
         Calculate overall interview readiness score (like Sales Navigator's account score)
@@ -314,6 +479,8 @@ Focus on the TOP 5-7 most important requirements from the job description."""
         Args:
             prep_data: Full interview prep data
             sections_completed: List of section IDs that user has reviewed
+            practice_stats: Optional {"questions_practiced", "practice_sessions", "practice_seconds"};
+                practiced questions complete the practice section and add to time invested
 
         Returns:
         {
@@ -345,6 +512,10 @@ Focus on the TOP 5-7 most important requirements from the job description."""
             "practice_questions": 0.10
         }
 
+        practice_stats = practice_stats or {}
+        if practice_stats.get("questions_practiced") and "practice_questions" not in sections_completed:
+            sections_completed = list(sections_completed) + ["practice_questions"]
+
         # Calculate progress
         total_sections = len(section_weights)
         completed_count = len(sections_completed)
@@ -409,6 +580,7 @@ Focus on the TOP 5-7 most important requirements from the job description."""
         }
 
         time_invested = sum(time_per_section.get(s, 10) for s in sections_completed)
+        time_invested += int(practice_stats.get("practice_seconds", 0) or 0) // 60
 
         result = {
             "readiness_score": round(weighted_score, 1),
@@ -10,14 +10,33 @@ Produces:
 - 10 technical questions based on company tech stack vs. candidate skills
 """
 
-from openai import OpenAI
 from app.config import get_settings
 from app.services.perplexity_client import PerplexityClient
+from app.utils.task_graph import TaskGraph
 import json
 import os
 
 settings = get_settings()
 
+TECH_STACK_CATEGORIES = (
+    "tech_stack", "tools_and_platforms", "frameworks", "cloud_infrastructure",
+    "security_tools", "methodologies", "certifications_valued"
+)
+
+
+def tech_stack_is_cacheable(tech_stack: dict) -> bool:
+    """
+    Whether a tech stack is worth caching
+
+    Only stacks structured from company research are kept. The job-description
+    fallback (research failed) and an all-empty stack are not, so the next
+    request tries the research again instead of reusing the fallback for the
+    whole cache lifetime.
+    """
+    if not tech_stack or tech_stack.get("source") == "job_description":
+        return False
+    return any(tech_stack.get(category) for category in TECH_STACK_CATEGORIES)
+
 
 class InterviewQuestionsGenerator:
     """Generates behavioral and technical interview questions with STAR story support"""
@@ -31,7 +50,8 @@ class InterviewQuestionsGenerator:
             )
 
         try:
-            self.client = OpenAI(api_key=openai_api_key)
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=openai_api_key, base_url=settings.openai_base_url)
             self.perplexity_client = PerplexityClient()
         except Exception as e:
             raise ValueError(
@@ -43,11 +63,15 @@ class InterviewQuestionsGenerator:
         self,
         company_name: str,
         job_description: str,
-        industry: str = None
+        industry: str = None,
+        known_research: str = None
     ) -> dict:
         """
         Research company's actual tech stack using Perplexity
 
+        When known_research is given (tech stack text already gathered during
+        company research), it is structured directly and Perplexity is skipped.
+
         Returns:
             {
                 "tech_stack": ["Python", "AWS", "Kubernetes", ...],
@@ -56,7 +80,8 @@ class InterviewQuestionsGenerator:
                 "cloud_infrastructure": ["AWS", "GCP", "Azure", ...],
                 "security_tools": ["Splunk", "CrowdStrike", ...],
                 "methodologies": ["Agile", "DevOps", "CI/CD", ...],
-                "sources": [{"title": "...", "url": "..."}]
+                "sources": [{"title": "...", "url": "..."}],
+                "source": "research" | "job_description"  # job_description = fallback
             }
         """
         query = f"""Research {company_name}'s technology stack and tools. Find:
@@ -73,11 +98,18 @@ Focus on technologies mentioned in job postings, engineering blogs, and tech tal
 Include specific tool names and versions if available.
 Cite sources with URLs."""
 
+        if known_research and known_research.strip():
+            print(f"✓ Reusing stored tech stack research for {company_name}")
+            return await self._parse_tech_stack_from_research(known_research, [], job_description)
+
         try:
             result = await self.perplexity_client.research_with_citations(query)
+            if result.get('error') or not result.get('content', '').strip():
+                # research_with_citations reports failures in the result instead of raising
+                raise RuntimeError(result.get('error') or "empty research result")
 
             # Parse the result to extract tech stack
-            tech_data = self._parse_tech_stack_from_research(
+            tech_data = await self._parse_tech_stack_from_research(
                 result.get('content', ''),
                 result.get('citations', []),
                 job_description
@@ -88,9 +120,9 @@ Cite sources with URLs."""
         except Exception as e:
             print(f"Tech stack research failed: {e}")
             # Return extracted from job description as fallback
-            return self._extract_tech_from_job_description(job_description)
+            return await self._extract_tech_from_job_description(job_description)
 
-    def _parse_tech_stack_from_research(
+    async def _parse_tech_stack_from_research(
         self,
         content: str,
         citations: list,
@@ -121,7 +153,7 @@ Extract and return a JSON object with these fields:
 Only include items explicitly mentioned. Return valid JSON only."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 max_tokens=1000,
                 temperature=0.3,
@@ -134,13 +166,14 @@ Only include items explicitly mentioned. Return valid JSON only."""
 
             tech_data = json.loads(response.choices[0].message.content)
             tech_data['sources'] = citations
+            tech_data['source'] = "research"
             return tech_data
 
         except Exception as e:
             print(f"Tech stack parsing failed: {e}")
-            return self._extract_tech_from_job_description(job_description)
+            return await self._extract_tech_from_job_description(job_description)
 
-    def _extract_tech_from_job_description(self, job_description: str) -> dict:
+    async def _extract_tech_from_job_description(self, job_description: str) -> dict:
         """Fallback: Extract tech stack from job description"""
 
         prompt = f"""Extract technology requirements from this job description.
@@ -162,7 +195,7 @@ Return a JSON object:
 Only include items explicitly mentioned in the job description."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 max_tokens=800,
                 temperature=0.2,
@@ -173,7 +206,9 @@ Only include items explicitly mentioned in the job description."""
                 ]
             )
 
-            return json.loads(response.choices[0].message.content)
+            tech_data = json.loads(response.choices[0].message.content)
+            tech_data['source'] = "job_description"
+            return tech_data
 
         except Exception as e:
             print(f"JD tech extraction failed: {e}")
@@ -185,7 +220,8 @@ Only include items explicitly mentioned in the job description."""
                 "security_tools": [],
                 "methodologies": [],
                 "certifications_valued": [],
-                "sources": []
+                "sources": [],
+                "source": "job_description"
             }
 
     async def generate_behavioral_questions(
@@ -298,7 +334,7 @@ REQUIREMENTS:
 - Job alignment must reference actual job requirements"""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 max_tokens=4000,
                 temperature=0.7,
@@ -388,7 +424,7 @@ REQUIREMENTS:
         # Format company tech stack
         tech_stack_text = ""
         for category, items in company_tech_stack.items():
-            if items and category != 'sources':
+            if isinstance(items, list) and items and category != 'sources':
                 tech_stack_text += f"\n{category.replace('_', ' ').title()}: {', '.join(items[:10])}"
 
         must_have_text = ", ".join(must_have_skills[:10]) if must_have_skills else ""
@@ -476,7 +512,7 @@ REQUIREMENTS:
 - Questions should be the type actually asked at {company_name} or similar companies"""
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 max_tokens=4500,
                 temperature=0.7,
@@ -505,57 +541,73 @@ REQUIREMENTS:
         candidate_skills: list,
         candidate_experience: list,
         company_values: list = None,
-        industry: str = None
+        industry: str = None,
+        company_tech_stack: dict = None,
+        tech_stack_research: str = None
     ) -> dict:
         """
         Generate complete interview question set (behavioral + technical)
 
-        This is the main entry point that:
-        1. Researches company tech stack via Perplexity
-        2. Generates 10 behavioral questions with STAR prompts
-        3. Generates 10 technical questions with skill alignment
+        This is the main entry point. Steps run as a dependency graph:
+        1. Research company tech stack via Perplexity (skipped when company_tech_stack
+           is given; uses tech_stack_research instead of Perplexity when given)
+        2. Generate 10 behavioral questions with STAR prompts - independent of 1, runs alongside it
+        3. Generate 10 technical questions with skill alignment - after 1
 
-        Returns combined result with both question sets
+        Returns combined result with both question sets and per-step timings
         """
 
-        print(f"🔍 Researching {company_name}'s tech stack via Perplexity...")
-
-        # Step 1: Research company tech stack
-        company_tech_stack = await self.research_company_tech_stack(
-            company_name=company_name,
-            job_description=job_description,
-            industry=industry
-        )
-
-        print(f"✓ Found tech stack: {len(company_tech_stack.get('tech_stack', []))} technologies")
-
-        # Step 2: Generate behavioral questions
-        print(f"📝 Generating 10 behavioral questions...")
-        behavioral_result = await self.generate_behavioral_questions(
-            job_description=job_description,
-            job_title=job_title,
-            company_name=company_name,
-            core_responsibilities=core_responsibilities,
-            company_values=company_values,
-            industry=industry
-        )
-
-        print(f"✓ Generated {len(behavioral_result.get('questions', []))} behavioral questions")
-
-        # Step 3: Generate technical questions
-        print(f"🔧 Generating 10 technical questions...")
-        technical_result = await self.generate_technical_questions(
-            job_description=job_description,
-            job_title=job_title,
-            company_name=company_name,
-            company_tech_stack=company_tech_stack,
-            candidate_skills=candidate_skills,
-            candidate_experience=candidate_experience,
-            must_have_skills=must_have_skills,
-            nice_to_have_skills=nice_to_have_skills
-        )
-
-        print(f"✓ Generated {len(technical_result.get('questions', []))} technical questions")
+        async def tech_stack():
+            if company_tech_stack is not None:
+                print(f"✓ Using cached tech stack for {company_name}")
+                return company_tech_stack
+            print(f"🔍 Researching {company_name}'s tech stack via Perplexity...")
+            result = await self.research_company_tech_stack(
+                company_name=company_name,
+                job_description=job_description,
+                industry=industry,
+                known_research=tech_stack_research
+            )
+            print(f"✓ Found tech stack: {len(result.get('tech_stack', []))} technologies")
+            return result
+
+        async def behavioral():
+            print(f"📝 Generating 10 behavioral questions...")
+            result = await self.generate_behavioral_questions(
+                job_description=job_description,
+                job_title=job_title,
+                company_name=company_name,
+                core_responsibilities=core_responsibilities,
+                company_values=company_values,
+                industry=industry
+            )
+            print(f"✓ Generated {len(result.get('questions', []))} behavioral questions")
+            return result
+
+        async def technical(tech_stack: dict):
+            print(f"🔧 Generating 10 technical questions...")
+            result = await self.generate_technical_questions(
+                job_description=job_description,
+                job_title=job_title,
+                company_name=company_name,
+                company_tech_stack=tech_stack,
+                candidate_skills=candidate_skills,
+                candidate_experience=candidate_experience,
+                must_have_skills=must_have_skills,
+                nice_to_have_skills=nice_to_have_skills
+            )
+            print(f"✓ Generated {len(result.get('questions', []))} technical questions")
+            return result
+
+        graph = TaskGraph()
+        graph.add("tech_stack", tech_stack)
+        graph.add("behavioral", behavioral)
+        graph.add("technical", technical, after=["tech_stack"])
+        results, timings = await graph.run()
+
+        company_tech_stack = results["tech_stack"]
+        behavioral_result = results["behavioral"]
+        technical_result = results["technical"]
 
         # Combine results
         return {
@@ -570,5 +622,6 @@ REQUIREMENTS:
                 "technical_count": len(technical_result.get('questions', [])),
                 "skill_matches": len(technical_result.get('tech_stack_analysis', {}).get('candidate_matching_skills', [])),
                 "skill_gaps": len(technical_result.get('tech_stack_analysis', {}).get('skill_gaps', []))
-            }
+            },
+            "timings": timings
         }
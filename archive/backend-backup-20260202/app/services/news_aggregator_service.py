@@ -9,6 +9,27 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from app.services.firecrawl_client import FirecrawlClient
 from app.services.perplexity_client import PerplexityClient
+from app.services.company_news_store import ROLE_KEYWORDS, company_news_key, get_company_news_store, role_keyword_hits
+from app.utils.near_duplicates import canonical_url, deduplicate
+
+# Preferred representative when the same story appears on several sites:
+# the company itself and wire services/major outlets that others syndicate from
+SOURCE_PRIORITY = {
+    "Company Press Release": 3,
+    "Reuters": 3,
+    "Bloomberg": 3,
+    "Wall Street Journal": 3,
+    "Financial Times": 3,
+    "CNBC": 2,
+    "TechCrunch": 2,
+    "The Verge": 2,
+    "Ars Technica": 2,
+    "Wired": 2,
+    "Forbes": 2,
+    "Business Insider": 2,
+    "News source": 0,
+    "Unknown source": 0,
+}
 
 
 class NewsAggregatorService:
@@ -58,25 +79,21 @@ class NewsAggregatorService:
         print(f"Aggregating news for: {company_name} (last {days_back} days)")
 
         try:
-            # Use Perplexity to search for recent news
-            news_query = self._build_news_query(company_name, industry, job_title, days_back)
-            news_results = await self._search_news_perplexity(news_query, company_name)
-
-            # Try to fetch company blog/newsroom directly
-            company_news = await self._fetch_company_newsroom(company_name, days_back)
-
-            # Combine and structure results
-            all_news = self._combine_news_sources(news_results, company_news)
-
-            # Filter by date range
             cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-            filtered_news = self._filter_by_date(all_news, cutoff_date)
 
-            # Rank by relevance
-            ranked_news = self._rank_by_relevance(filtered_news, job_title)
+            try:
+                ranked_news = await self._indexed_news(company_name, industry, job_title, days_back, cutoff_date)
+            except Exception as e:
+                # News index unavailable (e.g. table not migrated yet): fetch the full window directly
+                print(f"⚠️ News index unavailable ({e}), fetching without it")
+                all_news = await self._fetch_news(company_name, industry, job_title, days_back)
+                filtered_news = self._filter_by_date(all_news, cutoff_date)
+                ranked_news = self._rank_by_relevance(filtered_news, job_title)
 
             # Add impact summaries
             final_news = self._add_impact_summaries(ranked_news[:15], job_title)
+            for article in final_news:
+                article.pop("role_hits", None)
 
             return {
                 "news_articles": final_news,
@@ -91,6 +108,84 @@ class NewsAggregatorService:
             print(f"Error aggregating news: {e}")
             return self._get_fallback_news(company_name)
 
+    async def _fetch_news(
+        self,
+        company_name: str,
+        industry: Optional[str],
+        job_title: Optional[str],
+        days_back: int,
+        raise_errors: bool = False
+    ) -> List[Dict]:
+        """
+        Fetch news published in the last days_back days from Perplexity and the company newsroom
+
+        With raise_errors, a failed Perplexity search raises instead of
+        returning no articles, so callers can tell "no news" from "no answer".
+        """
+
+        # Use Perplexity to search for recent news
+        news_query = self._build_news_query(company_name, industry, job_title, days_back)
+        news_results = await self._search_news_perplexity(news_query, company_name, raise_errors=raise_errors)
+
+        # Try to fetch company blog/newsroom directly
+        company_news = await self._fetch_company_newsroom(company_name, days_back)
+
+        # Combine and structure results
+        return self._combine_news_sources(news_results, company_news)
+
+    async def _indexed_news(
+        self,
+        company_name: str,
+        industry: Optional[str],
+        job_title: Optional[str],
+        days_back: int,
+        cutoff_date: datetime
+    ) -> List[Dict]:
+        """
+        Ranked news for the window, served from the company news index
+
+        Fetches only what the index is missing: nothing if it was refreshed
+        recently, items newer than the watermark if it covers the window,
+        otherwise the whole window.
+
+        The index is keyed by company only. industry and job_title shape the
+        fetch query, so a refresh triggered by one role also serves the others;
+        role relevance is applied when ranking, from keyword hits stored per
+        article at ingest.
+        """
+        store = get_company_news_store()
+        company_key = company_news_key(company_name)
+        cutoff = cutoff_date.date()
+
+        watermark = await store.get_watermark(company_key)
+        if store.is_fresh(watermark, cutoff):
+            print(f"✓ News index for {company_name} is fresh, skipping fetch")
+        else:
+            since = store.fetch_since(watermark, cutoff)
+            try:
+                if since is None:
+                    fetched = await self._fetch_news(company_name, industry, job_title, days_back, raise_errors=True)
+                    fetched = self._filter_by_date(fetched, cutoff_date)
+                else:
+                    # One day of overlap picks up articles indexed late by the sources
+                    fetch_days = max(1, (datetime.utcnow().date() - since).days + 1)
+                    print(f"Incremental news refresh for {company_name}: last {fetch_days} days")
+                    fetched = await self._fetch_news(company_name, industry, job_title, fetch_days, raise_errors=True)
+                    fetched = self._filter_by_date(fetched, datetime.combine(since, datetime.min.time()))
+            except Exception as e:
+                # Serve what is stored; the watermark is left as is so the next request retries
+                print(f"⚠️ News refresh for {company_name} failed ({e}), serving stored articles")
+            else:
+                # Stored even when nothing new was found: advances refreshed_at (and
+                # covered_from on full fetches) so quiet companies are not re-fetched every time
+                stored = await store.store(company_key, fetched, covered_from=cutoff if since is None else None)
+                print(f"✓ Stored {stored} new articles for {company_name}")
+
+        # Date filter is the indexed window query; syndicated copies across refreshes are merged here
+        window = await store.window(company_key, cutoff)
+        window = deduplicate(window, text=self._dedup_text, rank=self._source_rank)
+        return self._rank_by_relevance(window, job_title)
+
     def _build_news_query(
         self,
         company_name: str,
@@ -139,7 +234,8 @@ class NewsAggregatorService:
     async def _search_news_perplexity(
         self,
         query: str,
-        company_name: str
+        company_name: str,
+        raise_errors: bool = False
     ) -> List[Dict]:
         """
         Search for news using Perplexity (PRIMARY SOURCE)
@@ -148,11 +244,15 @@ class NewsAggregatorService:
         - Actual URLs users can click
         - Real publication dates
         - Real source names (Bloomberg, Reuters, etc.)
+
+        A failed search returns [] unless raise_errors is set.
         """
 
         try:
             print("🔍 Searching Perplexity for real news articles...")
             result = await self.perplexity.research_with_citations(query)
+            if result.get("error"):
+                raise RuntimeError(f"Perplexity search error: {result['error']}")
 
             # Extract citations first (these are REAL articles)
             citations = result.get("citations", [])
@@ -188,6 +288,8 @@ class NewsAggregatorService:
 
         except Exception as e:
             print(f"⚠️ Perplexity news search failed: {e}")
+            if raise_errors:
+                raise
             return []
 
     def _parse_news_from_perplexity(
@@ -395,19 +497,19 @@ class NewsAggregatorService:
     ) -> List[Dict]:
         """Combine news from multiple sources and deduplicate"""
 
-        all_news = news_results + company_news
-
-        # Deduplicate by title
-        seen_titles = set()
-        unique_news = []
-
-        for article in all_news:
-            title_key = article["title"].lower()[:50]  # First 50 chars
-            if title_key not in seen_titles and len(article["title"]) > 10:
-                seen_titles.add(title_key)
-                unique_news.append(article)
+        all_news = [
+            article for article in news_results + company_news
+            if len(article["title"]) > 10
+        ]
 
-        return unique_news
+        # Syndicated copies of the same story cluster together; keep the best-sourced one.
+        # Keyed by title prefix, not URL: newsroom articles all carry the newsroom page URL.
+        return deduplicate(
+            all_news,
+            text=self._dedup_text,
+            rank=self._source_rank,
+            exact_key=lambda article: article["title"].lower()[:50]
+        )
 
     def _filter_by_date(
         self,
@@ -436,27 +538,19 @@ class NewsAggregatorService:
     ) -> List[Dict]:
         """Rank articles by relevance to job role"""
 
-        # Keywords that boost relevance for different roles
-        role_keywords = {
-            "cybersecurity": ["security", "breach", "vulnerability", "cyber", "privacy", "threat"],
-            "program manager": ["initiative", "program", "launch", "project", "expansion"],
-            "engineering": ["technology", "platform", "api", "developer", "infrastructure"],
-            "data": ["data", "analytics", "ai", "machine learning", "ml"],
-        }
+        title_lower = job_title.lower() if job_title else ""
+        roles = [role for role in ROLE_KEYWORDS if role in title_lower]
 
         for article in articles:
             score = article.get("relevance_score", 5)
 
-            # Boost score if job-related keywords found
-            if job_title:
-                title_lower = job_title.lower()
-                text = (article["title"] + " " + article["summary"]).lower()
-
-                for role, keywords in role_keywords.items():
-                    if role in title_lower:
-                        for keyword in keywords:
-                            if keyword in text:
-                                score += 1
+            # Boost score if job-related keywords found (hits are precomputed for indexed articles)
+            if roles:
+                hits = article.get("role_hits")
+                if hits is None:
+                    hits = role_keyword_hits(article["title"], article["summary"])
+                for role in roles:
+                    score += hits.get(role, 0)
 
             # Boost recent articles
             try:
@@ -548,20 +642,26 @@ class NewsAggregatorService:
         return datetime.utcnow().strftime("%Y-%m-%d")
 
     def _deduplicate_by_url(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles by URL"""
-
-        seen_urls = set()
-        unique = []
+        """Remove duplicate articles: same canonical URL or near-identical text"""
+        return deduplicate(
+            articles,
+            text=self._dedup_text,
+            rank=self._source_rank,
+            exact_key=lambda article: canonical_url(article.get("url", ""))
+        )
 
-        for article in articles:
-            url = article.get("url", "")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique.append(article)
-            elif not url:  # Keep articles without URLs (shouldn't happen with Perplexity)
-                unique.append(article)
-
-        return unique
+    @staticmethod
+    def _dedup_text(article: Dict) -> str:
+        return f"{article.get('title', '')} {article.get('summary', '')}"
+
+    @staticmethod
+    def _source_rank(article: Dict) -> tuple:
+        """Representative preference: known source, then has a URL, then longer summary"""
+        return (
+            SOURCE_PRIORITY.get(article.get("source", ""), 1),
+            bool(article.get("url")),
+            len(article.get("summary", "")),
+        )
 
     def _get_fallback_news(self, company_name: str) -> Dict:
         """Fallback data if news aggregation fails"""
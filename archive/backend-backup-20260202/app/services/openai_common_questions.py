@@ -9,38 +9,144 @@ Sources consulted for best practices:
 """
 
 import os
-from openai import AsyncOpenAI
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from app.config import get_settings
+
+# The 10 common questions, with answer guidance and the prep sections relevant to each.
+# generate_common_questions answers all of them in one call; generate_single_question
+# answers one, sending only that question's guidance and prep context.
+COMMON_QUESTIONS: List[Dict[str, Any]] = [
+    {
+        "id": "q1",
+        "question": "Tell me about yourself.",
+        "guidance": [
+            "Framework: Present/Past/Future",
+            "Must connect current role → past experience → future goals with THIS job",
+            "Keep to ~2 minutes (150-200 words for long version)",
+            "Focus on professional journey, not personal life",
+        ],
+        "prep_sections": ["role_analysis", "candidate_positioning"],
+    },
+    {
+        "id": "q2",
+        "question": "What are your weaknesses?",
+        "guidance": [
+            'Must be a REAL weakness (not "I work too hard")',
+            "Show self-awareness and growth",
+            "Include what you're doing to improve",
+            "Connect to role requirements (show it won't impact job performance)",
+        ],
+        "prep_sections": ["role_analysis", "candidate_positioning"],
+    },
+    {
+        "id": "q3",
+        "question": "Why do you want to work here?",
+        "guidance": [
+            "Reference specific company initiatives from the research",
+            "Connect to candidate's values and career goals",
+            "Show you've done your homework",
+            'Make it about their mission, not just "it\'s a good opportunity"',
+        ],
+        "prep_sections": ["company_profile", "values_and_culture", "strategy_and_news"],
+    },
+    {
+        "id": "q4",
+        "question": "Tell me about a time you failed.",
+        "guidance": [
+            "STAR method (focus 60% on Action, 15% on Result with lesson learned)",
+            "Choose relevant failure (related to this job's competencies)",
+            "Show vulnerability but also growth",
+            "Quantify the impact if possible",
+        ],
+        "prep_sections": ["role_analysis", "values_and_culture"],
+    },
+    {
+        "id": "q5",
+        "question": "What's your biggest achievement?",
+        "guidance": [
+            "STAR method with heavy emphasis on measurable Result",
+            "Choose achievement relevant to this role",
+            "Include specific metrics (%, $, scale)",
+            "Show how you can replicate success here",
+        ],
+        "prep_sections": ["role_analysis", "candidate_positioning"],
+    },
+    {
+        "id": "q6",
+        "question": "Why should we hire you?",
+        "guidance": [
+            "Focus on the MATCH (their needs + your skills)",
+            "Reference specific JD requirements",
+            'Make "vision statements" (paint picture of you succeeding)',
+            "3-4 unique selling points with evidence",
+        ],
+        "prep_sections": ["role_analysis", "candidate_positioning"],
+    },
+    {
+        "id": "q7",
+        "question": "Where do you see yourself in 5 years?",
+        "guidance": [
+            "Connect to company's growth trajectory",
+            "Show ambition but realism",
+            "Align with career paths available at this company",
+            'Demonstrate commitment (not "I want your boss\'s job")',
+        ],
+        "prep_sections": ["company_profile", "strategy_and_news", "role_analysis"],
+    },
+    {
+        "id": "q8",
+        "question": "Tell me about a conflict at work.",
+        "guidance": [
+            "STAR method with focus on resolution approach",
+            "Show emotional intelligence and communication skills",
+            "Emphasize positive outcome",
+            "Demonstrate maturity and professionalism",
+        ],
+        "prep_sections": ["values_and_culture", "role_analysis"],
+    },
+    {
+        "id": "q9",
+        "question": "Describe a time you led something.",
+        "guidance": [
+            "STAR method emphasizing leadership style",
+            "Quantify team size, scope, impact",
+            "Show ability to inspire and delegate",
+            "Connect to leadership expectations of THIS role",
+        ],
+        "prep_sections": ["role_analysis", "values_and_culture"],
+    },
+    {
+        "id": "q10",
+        "question": "Do you have any questions for us?",
+        "guidance": [
+            "Provide 6-10 HIGH-QUALITY questions the candidate can ask",
+            "Include at least 2 technical/role-specific questions",
+            "Include at least 2 culture/process questions",
+            "Prioritize by relevance to company and role",
+            "Show you've researched the company",
+        ],
+        "prep_sections": ["company_profile", "strategy_and_news", "questions_to_ask_interviewer"],
+    },
+]
 
-class OpenAICommonQuestions:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4.1-mini"
+COMMON_QUESTIONS_BY_ID: Dict[str, Dict[str, Any]] = {q["id"]: q for q in COMMON_QUESTIONS}
 
-    async def generate_common_questions(
-        self,
-        resume_text: str,
-        job_description: str,
-        company_name: str,
-        job_title: str,
-        prep_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Generate tailored responses for 10 common interview questions
+# One answer is ~1/10 of the full set's output
+SINGLE_QUESTION_MAX_TOKENS = 2000
+
+
+def _render_question(number: int, spec: Dict[str, Any]) -> str:
+    """Question text and guidance as listed in the prompt"""
+    label = f"{number}. "
+    indent = " " * len(label)
+    lines = [f'{label}"{spec["question"]}"']
+    lines += [f"{indent}- {item}" for item in spec["guidance"]]
+    return "\n".join(lines)
 
-        Args:
-            resume_text: Structured resume text with experience, skills, etc.
-            job_description: Full job description text
-            company_name: Name of company
-            job_title: Position title
-            prep_data: Interview prep data with company research, role analysis, etc.
 
-        Returns:
-            Dictionary with 10 tailored interview question responses
-        """
 
-        system_prompt = """You are an expert interview coach with deep knowledge of behavioral interviewing,
+COMMON_QUESTIONS_SYSTEM_PROMPT = """You are an expert interview coach with deep knowledge of behavioral interviewing,
 STAR method, and proven frameworks for answering common interview questions. Your expertise comes from:
 
 - Indeed's Present/Past/Future framework for "Tell me about yourself"
@@ -65,6 +171,41 @@ CRITICAL: Your answers must NOT be generic. Every answer must reference:
 If specific metrics aren't available, create credible placeholder formats like "[X%] reduction"
 that the candidate can customize with their actual numbers."""
 
+
+class OpenAICommonQuestions:
+    def __init__(self):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=get_settings().openai_base_url)
+        self.model = "gpt-4.1-mini"
+
+    async def generate_common_questions(
+        self,
+        resume_text: str,
+        job_description: str,
+        company_name: str,
+        job_title: str,
+        prep_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generate tailored responses for 10 common interview questions
+
+        Args:
+            resume_text: Structured resume text with experience, skills, etc.
+            job_description: Full job description text
+            company_name: Name of company
+            job_title: Position title
+            prep_data: Interview prep data with company research, role analysis, etc.
+
+        Returns:
+            Dictionary with 10 tailored interview question responses
+        """
+
+        system_prompt = COMMON_QUESTIONS_SYSTEM_PROMPT
+
+        questions_block = "\n\n".join(
+            _render_question(number, spec) for number, spec in enumerate(COMMON_QUESTIONS, 1)
+        )
+
         user_prompt = f"""Generate tailored responses for these 10 common interview questions.
 
 CANDIDATE RESUME:
@@ -95,66 +236,7 @@ For EACH of the 10 questions below, provide:
 
 THE 10 QUESTIONS (use exactly these):
 
-1. "Tell me about yourself."
-   - Framework: Present/Past/Future
-   - Must connect current role → past experience → future goals with THIS job
-   - Keep to ~2 minutes (150-200 words for long version)
-   - Focus on professional journey, not personal life
-
-2. "What are your weaknesses?"
-   - Must be a REAL weakness (not "I work too hard")
-   - Show self-awareness and growth
-   - Include what you're doing to improve
-   - Connect to role requirements (show it won't impact job performance)
-
-3. "Why do you want to work here?"
-   - Reference specific company initiatives from the research
-   - Connect to candidate's values and career goals
-   - Show you've done your homework
-   - Make it about their mission, not just "it's a good opportunity"
-
-4. "Tell me about a time you failed."
-   - STAR method (focus 60% on Action, 15% on Result with lesson learned)
-   - Choose relevant failure (related to this job's competencies)
-   - Show vulnerability but also growth
-   - Quantify the impact if possible
-
-5. "What's your biggest achievement?"
-   - STAR method with heavy emphasis on measurable Result
-   - Choose achievement relevant to this role
-   - Include specific metrics (%, $, scale)
-   - Show how you can replicate success here
-
-6. "Why should we hire you?"
-   - Focus on the MATCH (their needs + your skills)
-   - Reference specific JD requirements
-   - Make "vision statements" (paint picture of you succeeding)
-   - 3-4 unique selling points with evidence
-
-7. "Where do you see yourself in 5 years?"
-   - Connect to company's growth trajectory
-   - Show ambition but realism
-   - Align with career paths available at this company
-   - Demonstrate commitment (not "I want your boss's job")
-
-8. "Tell me about a conflict at work."
-   - STAR method with focus on resolution approach
-   - Show emotional intelligence and communication skills
-   - Emphasize positive outcome
-   - Demonstrate maturity and professionalism
-
-9. "Describe a time you led something."
-   - STAR method emphasizing leadership style
-   - Quantify team size, scope, impact
-   - Show ability to inspire and delegate
-   - Connect to leadership expectations of THIS role
-
-10. "Do you have any questions for us?"
-    - Provide 6-10 HIGH-QUALITY questions the candidate can ask
-    - Include at least 2 technical/role-specific questions
-    - Include at least 2 culture/process questions
-    - Prioritize by relevance to company and role
-    - Show you've researched the company
+{questions_block}
 
 RESPONSE FORMAT:
 Return a JSON object with this exact structure:
@@ -229,3 +311,119 @@ Generate all 10 now. Return valid JSON only."""
         except Exception as e:
             print(f"Error generating common questions: {e}")
             raise Exception(f"Failed to generate common questions: {str(e)}")
+
+    async def generate_single_question(
+        self,
+        question_id: str,
+        resume_text: str,
+        job_description: str,
+        company_name: str,
+        job_title: str,
+        prep_data: Dict[str, Any],
+        previous_answer: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a tailored response for one of the common interview questions
+
+        Only that question's guidance and the prep sections relevant to it are
+        sent, so regenerating one answer costs a fraction of a full set.
+
+        Args:
+            question_id: Question id from COMMON_QUESTIONS ("q1" ... "q10")
+            previous_answer: The answer being replaced; the new one takes a different angle
+
+        Returns:
+            One question object in the same shape as generate_common_questions' items
+
+        Raises:
+            KeyError: Unknown question_id
+        """
+        spec = COMMON_QUESTIONS_BY_ID[question_id]
+        number = COMMON_QUESTIONS.index(spec) + 1
+        prep_context = {
+            section: prep_data[section]
+            for section in spec["prep_sections"]
+            if (prep_data or {}).get(section)
+        }
+
+        previous = ""
+        if previous_answer:
+            previous_text = (previous_answer.get("what_to_say") or {}).get("short")
+            if previous_text:
+                previous = f"""
+PREVIOUS ANSWER (the candidate wants a fresh take - use a different angle, examples and phrasing):
+{previous_text}
+"""
+
+        user_prompt = f"""Generate a tailored response for this common interview question.
+
+CANDIDATE RESUME:
+{resume_text}
+
+JOB INFORMATION:
+Company: {company_name}
+Role: {job_title}
+Description:
+{job_description}
+
+COMPANY RESEARCH & ROLE ANALYSIS:
+{json.dumps(prep_context, indent=2)}
+
+THE QUESTION (use exactly this):
+
+{_render_question(number, spec)}
+{previous}
+Provide:
+
+1. question: The exact question text
+2. why_hard: 2-4 sentences explaining why this question is challenging (plain English, not generic)
+3. common_mistakes: 4-8 specific mistakes candidates make (bullet points)
+4. exceptional_answer_builder: structure, customization_checklist, strong_phrases (arrays of strings)
+5. what_to_say: short (60-120 words), long (150-250 words), placeholders_used (array)
+
+RESPONSE FORMAT:
+Return a JSON object with this exact structure:
+
+{{
+  "id": "{question_id}",
+  "question": "{spec['question']}",
+  "why_hard": "...",
+  "common_mistakes": ["..."],
+  "exceptional_answer_builder": {{
+    "structure": ["..."],
+    "customization_checklist": ["..."],
+    "strong_phrases": ["..."]
+  }},
+  "what_to_say": {{
+    "short": "...",
+    "long": "...",
+    "placeholders_used": ["..."]
+  }}
+}}
+
+Use ONLY information from the candidate's resume and JD provided. Make "what_to_say" sound
+NATURAL and SPEAKABLE. Return valid JSON only."""
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": COMMON_QUESTIONS_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.7,
+                max_tokens=SINGLE_QUESTION_MAX_TOKENS,
+                response_format={"type": "json_object"}
+            )
+
+            result = json.loads(response.choices[0].message.content)
+            # Tolerate the full-set shape ({"questions": [...]})
+            if isinstance(result.get("questions"), list) and result["questions"]:
+                result = result["questions"][0]
+            result["id"] = question_id
+            result["question"] = spec["question"]
+            return result
+
+        except Exception as e:
+            print(f"Error generating common question {question_id}: {e}")
+            raise Exception(f"Failed to generate common question {question_id}: {str(e)}")
@@ -1,12 +1,209 @@
-from openai import OpenAI
 from app.config import get_settings
 from app.services.company_research_service import CompanyResearchService
 from app.services.news_aggregator_service import NewsAggregatorService
+from typing import AsyncIterator, Iterable, Optional, Tuple
+import asyncio
 import json
 import os
 
 settings = get_settings()
 
+# Interview prep sections, in page order. Each section is generated by its own
+# call with its own schema, so sections run concurrently and can be
+# regenerated one at a time.
+PREP_SECTIONS = {
+    "company_profile": {
+        "max_tokens": 600,
+        "schema": """{
+  "name": "string",
+  "industry": "string",
+  "locations": ["string"],
+  "size_estimate": "string",
+  "overview_paragraph": "string"
+}""",
+        "rules": "",
+    },
+    "values_and_culture": {
+        "max_tokens": 1200,
+        "schema": """{
+  "stated_values": [
+    {
+      "name": "string",
+      "source_snippet": "string",
+      "url": "string"
+    }
+  ],
+  "practical_implications": [
+    "string"
+  ]
+}""",
+        "rules": """- If "=== REAL COMPANY VALUES (FROM PERPLEXITY WEB RESEARCH) ===" section is present above:
+  - Use ONLY those exact values in stated_values
+  - Copy the value names and descriptions exactly as provided
+  - Include the source URLs provided
+  - DO NOT add or infer additional values
+- If NO real values section is present:
+  - Then infer 3-5 values from the company research text""",
+    },
+    "strategy_and_news": {
+        "max_tokens": 1800,
+        "schema": """{
+  "recent_events": [
+    {
+      "date": "string",
+      "title": "string",
+      "summary": "string",
+      "source": "string",
+      "url": "string",
+      "impact_summary": "string"
+    }
+  ],
+  "strategic_themes": [
+    {
+      "theme": "string",
+      "rationale": "string"
+    }
+  ],
+  "technology_focus": [
+    {
+      "technology": "string",
+      "description": "string",
+      "relevance_to_role": "string"
+    }
+  ]
+}""",
+        "rules": """- If "=== REAL COMPANY NEWS (FROM PERPLEXITY WEB RESEARCH) ===" is present above, use those news items
+  in recent_events with their URLs, source names and dates exactly as provided. DO NOT make up news articles.
+- If "=== REAL STRATEGIC INITIATIVES (FROM PERPLEXITY WEB RESEARCH) ===" is present above, use those
+  initiatives to inform strategic_themes, include their URLs in recent_events and extract technology_focus.
+- technology_focus: list specific technologies the company is investing in.
+- recent_events: MUST have 3-5 items (extract or infer)
+- strategic_themes: MUST have 2-4 items (extract or infer)
+
+If company information is limited for strategy/news:
+- Infer recent events from industry trends (e.g., "AI adoption", "Cloud migration", "Security investment")
+- Infer strategic themes from job requirements and market position
+
+**DO NOT return empty arrays for these critical fields.**""",
+    },
+    "role_analysis": {
+        "max_tokens": 900,
+        "schema": """{
+  "job_title": "string",
+  "seniority_level": "string",
+  "core_responsibilities": [
+    "string"
+  ],
+  "must_have_skills": [
+    "string"
+  ],
+  "nice_to_have_skills": [
+    "string"
+  ],
+  "success_signals_6_12_months": "string"
+}""",
+        "rules": "",
+    },
+    "interview_preparation": {
+        "max_tokens": 900,
+        "schema": """{
+  "research_tasks": [
+    "string"
+  ],
+  "practice_questions_for_candidate": [
+    "string"
+  ],
+  "day_of_checklist": [
+    "string"
+  ]
+}""",
+        "rules": "",
+    },
+    "candidate_positioning": {
+        "max_tokens": 1500,
+        "schema": """{
+  "resume_focus_areas": [
+    "string"
+  ],
+  "story_prompts": [
+    {
+      "title": "string",
+      "description": "string",
+      "star_hint": {
+        "situation": "string",
+        "task": "string",
+        "action": "string",
+        "result": "string"
+      }
+    }
+  ],
+  "keyword_map": [
+    {
+      "company_term": "string",
+      "candidate_equivalent": "string",
+      "context": "string"
+    }
+  ]
+}""",
+        "rules": "",
+    },
+    "questions_to_ask_interviewer": {
+        "max_tokens": 800,
+        "schema": """{
+  "product": [
+    "string"
+  ],
+  "team": [
+    "string"
+  ],
+  "culture": [
+    "string"
+  ],
+  "performance": [
+    "string"
+  ],
+  "strategy": [
+    "string"
+  ]
+}""",
+        "rules": "",
+    },
+}
+
+# Shared by every section call; only the final section message differs, so the
+# long prefix (instructions + JD + company research) is reused across calls
+PREP_SYSTEM_PROMPT = """You are an AI assistant for a tailored resume web application.
+
+In this app, a user first generates a tailored resume for a specific job.
+From that screen, the user presses a button labeled something like
+"View Interview Prep," which navigates them to a dedicated Interview Prep
+page for that job and company.
+
+Your ONLY task is to generate the structured data that will populate one
+section of this Interview Prep page.
+
+You will be given:
+- A job description (JD) for a specific role.
+- Company information (may be unstructured research text with multiple sections).
+- **REAL COMPANY VALUES** from Perplexity web research (if available, marked with === REAL COMPANY VALUES ===)
+- **REAL COMPANY NEWS** from Perplexity web research (if available, marked with === REAL COMPANY NEWS ===)
+- **REAL STRATEGIC INITIATIVES** from Perplexity web research (if available, marked with === REAL STRATEGIC INITIATIVES ===)
+- The name and JSON schema of the section to generate.
+
+You must:
+- Analyze the JD and company information.
+- **USE REAL DATA** from Perplexity when provided (don't infer if real data exists).
+- Produce a single valid JSON object that matches the section's JSON schema.
+- Write all content so it can be rendered directly on the Interview Prep page.
+
+Important rules:
+- Respond with JSON only, no markdown, no comments, no prose.
+- Do not add or remove keys from the section schema.
+- Be concise and avoid repetition; write in clear, plain language optimized for on-screen scanning.
+- Focus on actionable, interview-oriented information.
+
+Return ONLY a single valid JSON object. Do not include any explanations or extra text."""
+
 class OpenAIInterviewPrep:
     """AI service for interview prep generation using OpenAI GPT-4o"""
 
@@ -19,7 +216,8 @@ class OpenAIInterviewPrep:
             )
 
         try:
-            self.client = OpenAI(api_key=openai_api_key)
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(api_key=openai_api_key, base_url=settings.openai_base_url)
             self.company_research_service = CompanyResearchService()
             self.news_aggregator_service = NewsAggregatorService()
         except Exception as e:
@@ -38,6 +236,8 @@ class OpenAIInterviewPrep:
         """
         Generate interview prep data using OpenAI GPT-4o with Perplexity-powered values research
 
+        All sections are generated concurrently (see iter_prep_sections).
+
         Args:
             job_description: Full job description text
             company_research: {mission_values, initiatives, team_culture, compliance, tech_stack, industry, sources}
@@ -47,50 +247,37 @@ class OpenAIInterviewPrep:
         Returns:
             Complete interview prep JSON matching the schema
         """
+        prep_context = await self.build_prep_context(job_description, company_research, company_name, job_title)
+
+        sections = {}
+        async for section, data in self.iter_prep_sections(prep_context):
+            sections[section] = data
+
+        # Page order, independent of completion order
+        return {section: sections[section] for section in PREP_SECTIONS}
+
+    async def build_prep_context(
+        self,
+        job_description: str,
+        company_research: dict,
+        company_name: str = None,
+        job_title: str = None
+    ) -> str:
+        """
+        Shared prompt context for all prep sections: the JD plus company research,
+        enriched with real values, news and strategies from Perplexity
+        """
 
-        # STEP 1: Fetch REAL company values using Perplexity
         perplexity_values = None
-        if company_name:
-            try:
-                print(f"🔍 Fetching real company values from Perplexity for: {company_name}")
-                perplexity_values = await self.company_research_service.research_company_values_culture(
-                    company_name=company_name,
-                    industry=company_research.get('industry'),
-                    job_title=job_title
-                )
-                print(f"✓ Perplexity returned {len(perplexity_values.get('stated_values', []))} real values")
-            except Exception as e:
-                print(f"⚠️ Perplexity values research failed: {e}, will use GPT inference")
-                perplexity_values = None
-
-        # STEP 2: Fetch REAL company news and strategies using Perplexity
         perplexity_news = None
         perplexity_strategies = None
         if company_name:
-            try:
-                print(f"🔍 Fetching real company news from Perplexity for: {company_name}")
-                perplexity_news = await self.news_aggregator_service.aggregate_company_news(
-                    company_name=company_name,
-                    industry=company_research.get('industry'),
-                    job_title=job_title,
-                    days_back=90
-                )
-                print(f"✓ Perplexity returned {len(perplexity_news.get('news_articles', []))} real news articles")
-            except Exception as e:
-                print(f"⚠️ Perplexity news fetch failed: {e}, will use GPT inference")
-                perplexity_news = None
-
-            try:
-                print(f"🔍 Fetching real company strategies from Perplexity for: {company_name}")
-                perplexity_strategies = await self.company_research_service.research_company_strategies(
-                    company_name=company_name,
-                    industry=company_research.get('industry'),
-                    job_title=job_title
-                )
-                print(f"✓ Perplexity returned {len(perplexity_strategies.get('strategic_initiatives', []))} strategic initiatives")
-            except Exception as e:
-                print(f"⚠️ Perplexity strategies fetch failed: {e}, will use GPT inference")
-                perplexity_strategies = None
+            # The three lookups are independent - run them concurrently
+            perplexity_values, perplexity_news, perplexity_strategies = await asyncio.gather(
+                self._fetch_values(company_name, company_research, job_title),
+                self._fetch_news(company_name, company_research, job_title),
+                self._fetch_strategies(company_name, company_research, job_title)
+            )
 
         # Build real values section if Perplexity data available
         real_values_section = ""
@@ -172,268 +359,150 @@ Sources:
 {json.dumps(company_research.get('sources', []), indent=2)}
 """
 
-        # System prompt for interview prep generation
-        system_prompt = """You are an AI assistant for a tailored resume web application.
-
-In this app, a user first generates a tailored resume for a specific job.
-From that screen, the user presses a button labeled something like
-"View Interview Prep," which navigates them to a dedicated Interview Prep
-page for that job and company.
-
-Your ONLY task is to generate the structured data that will populate this
-Interview Prep page.
-
-You will be given:
-- A job description (JD) for a specific role.
-- Company information (may be unstructured research text with multiple sections).
-- **REAL COMPANY VALUES** from Perplexity web research (if available, marked with === REAL COMPANY VALUES ===)
-- **REAL COMPANY NEWS** from Perplexity web research (if available, marked with === REAL COMPANY NEWS ===)
-- **REAL STRATEGIC INITIATIVES** from Perplexity web research (if available, marked with === REAL STRATEGIC INITIATIVES ===)
-
-CRITICAL INSTRUCTIONS FOR VALUES & CULTURE:
-
-**IF "=== REAL COMPANY VALUES (FROM PERPLEXITY WEB RESEARCH) ===" IS PROVIDED:**
-- You MUST use ONLY those values in the values_and_culture.stated_values section
-- DO NOT infer, guess, or make up additional values
-- Copy the value names and descriptions exactly as provided
-- Include the source URLs provided
-- These are REAL values from the company's official website
-
-**IF NO REAL VALUES ARE PROVIDED:**
-- Then you may infer values from the company research text
-
-CRITICAL INSTRUCTIONS FOR STRATEGY & NEWS:
-
-**IF "=== REAL COMPANY NEWS (FROM PERPLEXITY WEB RESEARCH) ===" IS PROVIDED:**
-- You MUST use those news items in strategy_and_news.recent_events
-- INCLUDE the URLs exactly as provided - these are clickable links
-- INCLUDE the source name and date
-- DO NOT make up news articles
+        user_prompt = f"""Here is the job description (JD):
 
-**IF "=== REAL STRATEGIC INITIATIVES (FROM PERPLEXITY WEB RESEARCH) ===" IS PROVIDED:**
-- Use those initiatives to inform strategic_themes
-- INCLUDE the URLs for initiatives in recent_events
-- Extract technology_focus from the provided data
+{job_description}
 
-**IF NO REAL NEWS/STRATEGIES ARE PROVIDED:**
-- Then infer from the company research text
-- Use industry trends if company-specific news is unavailable
+Here is the company information (about page, careers/values, recent news, etc.):
 
-You must:
-- Analyze the JD and company information.
-- **USE REAL DATA** from Perplexity when provided (don't infer if real data exists).
-- Produce a single valid JSON object that matches the JSON schema below.
-- Write all content so it can be rendered directly on the Interview Prep page.
+{company_info}"""
 
-Important rules:
-- Respond with JSON only, no markdown, no comments, no prose.
-- Do not add or remove top-level keys.
-- **For values_and_culture.stated_values: USE REAL VALUES if provided. Only infer if no real values given.**
-- **For strategy_and_news.recent_events: USE REAL NEWS if provided. Include URLs! Only infer if no real news given.**
-- **For strategy_and_news.strategic_themes: Extract from real initiatives if provided.**
-- **For strategy_and_news.technology_focus: List specific technologies the company is investing in.**
-- Be concise and avoid repetition; write in clear, plain language optimized for on-screen scanning.
-- Focus on actionable, interview-oriented information.
+        return user_prompt
 
-JSON schema (structure and key names MUST be followed exactly):
-
-{
-  "company_profile": {
-    "name": "string",
-    "industry": "string",
-    "locations": ["string"],
-    "size_estimate": "string",
-    "overview_paragraph": "string"
-  },
-  "values_and_culture": {
-    "stated_values": [
-      {
-        "name": "string",
-        "source_snippet": "string",
-        "url": "string"
-      }
-    ],
-    "practical_implications": [
-      "string"
-    ]
-  },
-  "strategy_and_news": {
-    "recent_events": [
-      {
-        "date": "string",
-        "title": "string",
-        "summary": "string",
-        "source": "string",
-        "url": "string",
-        "impact_summary": "string"
-      }
-    ],
-    "strategic_themes": [
-      {
-        "theme": "string",
-        "rationale": "string"
-      }
-    ],
-    "technology_focus": [
-      {
-        "technology": "string",
-        "description": "string",
-        "relevance_to_role": "string"
-      }
-    ]
-  },
-  "role_analysis": {
-    "job_title": "string",
-    "seniority_level": "string",
-    "core_responsibilities": [
-      "string"
-    ],
-    "must_have_skills": [
-      "string"
-    ],
-    "nice_to_have_skills": [
-      "string"
-    ],
-    "success_signals_6_12_months": "string"
-  },
-  "interview_preparation": {
-    "research_tasks": [
-      "string"
-    ],
-    "practice_questions_for_candidate": [
-      "string"
-    ],
-    "day_of_checklist": [
-      "string"
-    ]
-  },
-  "candidate_positioning": {
-    "resume_focus_areas": [
-      "string"
-    ],
-    "story_prompts": [
-      {
-        "title": "string",
-        "description": "string",
-        "star_hint": {
-          "situation": "string",
-          "task": "string",
-          "action": "string",
-          "result": "string"
-        }
-      }
-    ],
-    "keyword_map": [
-      {
-        "company_term": "string",
-        "candidate_equivalent": "string",
-        "context": "string"
-      }
-    ]
-  },
-  "questions_to_ask_interviewer": {
-    "product": [
-      "string"
-    ],
-    "team": [
-      "string"
-    ],
-    "culture": [
-      "string"
-    ],
-    "performance": [
-      "string"
-    ],
-    "strategy": [
-      "string"
-    ]
-  }
-}
+    async def _fetch_values(self, company_name: str, company_research: dict, job_title: str) -> Optional[dict]:
+        """Fetch REAL company values using Perplexity"""
+        try:
+            print(f"🔍 Fetching real company values from Perplexity for: {company_name}")
+            perplexity_values = await self.company_research_service.research_company_values_culture(
+                company_name=company_name,
+                industry=company_research.get('industry'),
+                job_title=job_title
+            )
+            print(f"✓ Perplexity returned {len(perplexity_values.get('stated_values', []))} real values")
+            return perplexity_values
+        except Exception as e:
+            print(f"⚠️ Perplexity values research failed: {e}, will use GPT inference")
+            return None
 
-Return ONLY a single valid JSON object. Do not include any explanations or extra text."""
+    async def _fetch_news(self, company_name: str, company_research: dict, job_title: str) -> Optional[dict]:
+        """Fetch REAL company news using Perplexity"""
+        try:
+            print(f"🔍 Fetching real company news from Perplexity for: {company_name}")
+            perplexity_news = await self.news_aggregator_service.aggregate_company_news(
+                company_name=company_name,
+                industry=company_research.get('industry'),
+                job_title=job_title,
+                days_back=90
+            )
+            print(f"✓ Perplexity returned {len(perplexity_news.get('news_articles', []))} real news articles")
+            return perplexity_news
+        except Exception as e:
+            print(f"⚠️ Perplexity news fetch failed: {e}, will use GPT inference")
+            return None
 
-        user_prompt = f"""Here is the job description (JD):
+    async def _fetch_strategies(self, company_name: str, company_research: dict, job_title: str) -> Optional[dict]:
+        """Fetch REAL company strategies using Perplexity"""
+        try:
+            print(f"🔍 Fetching real company strategies from Perplexity for: {company_name}")
+            perplexity_strategies = await self.company_research_service.research_company_strategies(
+                company_name=company_name,
+                industry=company_research.get('industry'),
+                job_title=job_title
+            )
+            print(f"✓ Perplexity returned {len(perplexity_strategies.get('strategic_initiatives', []))} strategic initiatives")
+            return perplexity_strategies
+        except Exception as e:
+            print(f"⚠️ Perplexity strategies fetch failed: {e}, will use GPT inference")
+            return None
 
-{job_description}
+    async def iter_prep_sections(
+        self,
+        prep_context: str,
+        sections: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Generate sections concurrently, yielding (section, data) as each completes
 
-Here is the company information (about page, careers/values, recent news, etc.):
+        Args:
+            prep_context: Context from build_prep_context
+            sections: Section names to generate (default: all of PREP_SECTIONS)
 
-{company_info}
+        Raises:
+            ValueError: If any section fails (sections already yielded stay valid)
+        """
+        names = list(sections) if sections is not None else list(PREP_SECTIONS)
+        tasks = [asyncio.ensure_future(self.generate_prep_section(name, prep_context)) for name in names]
 
-Using the information above, fill out the JSON schema defined in the
-system prompt. The JSON will populate a dedicated Interview Prep page.
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
-**CRITICAL REQUIREMENTS FOR VALUES & CULTURE:**
-- If "=== REAL COMPANY VALUES (FROM PERPLEXITY WEB RESEARCH) ===" section is present above:
-  - Use ONLY those exact values in values_and_culture.stated_values
-  - Include the source URLs provided
-  - DO NOT add or infer additional values
-- If NO real values section is present:
-  - Then infer 3-5 values from the company research text
+    async def generate_prep_section(self, section: str, prep_context: str) -> Tuple[str, dict]:
+        """
+        Generate one interview prep section
 
-**CRITICAL REQUIREMENTS FOR OTHER SECTIONS:**
-1. strategy_and_news.recent_events: MUST have 3-5 items (extract or infer)
-2. strategy_and_news.strategic_themes: MUST have 2-4 items (extract or infer)
+        Returns:
+            (section, data) where data matches the section's schema
+        """
+        spec = PREP_SECTIONS.get(section)
+        if spec is None:
+            raise ValueError(f"Unknown interview prep section: {section}")
 
-If company information is limited for strategy/news:
-- Infer recent events from industry trends (e.g., "AI adoption", "Cloud migration", "Security investment")
-- Infer strategic themes from job requirements and market position
+        section_prompt = f"""Using the information above, generate the "{section}" section of the
+Interview Prep page.
 
-**DO NOT return empty arrays for these critical sections.**
+JSON schema for the section (structure and key names MUST be followed exactly):
 
-Return ONLY a single valid JSON object. Do not include any explanations
-or extra text."""
+{spec['schema']}
+"""
+        if spec["rules"]:
+            section_prompt += f"""
+**CRITICAL REQUIREMENTS FOR THIS SECTION:**
+{spec['rules']}
+"""
+        section_prompt += """
+Return ONLY a single valid JSON object matching the section schema. Do not include
+any explanations or extra text."""
 
         try:
-            # Use gpt-4.1-mini (user has API key for this model)
-            models_to_try = ["gpt-4.1-mini"]
-
-            response = None
-            for model_name in models_to_try:
-                try:
-                    print(f"Attempting to generate interview prep with model: {model_name}")
-                    response = self.client.chat.completions.create(
-                        model=model_name,
-                        max_tokens=4000,
-                        temperature=0.7,
-                        response_format={"type": "json_object"},  # Force JSON response
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": system_prompt
-                            },
-                            {
-                                "role": "user",
-                                "content": user_prompt
-                            }
-                        ]
-                    )
-                    print(f"✓ Successfully generated interview prep with model: {model_name}")
-                    break  # Success! Exit the loop
-                except Exception as model_error:
-                    print(f"✗ Model {model_name} failed: {str(model_error)}")
-                    if model_name == models_to_try[-1]:
-                        # This was the last model, re-raise the error
-                        print(f"All models failed. Last error: {str(model_error)}")
-                        raise
-                    # Otherwise continue to next model
-                    continue
-
-            # Extract the response content
+            response = await self.client.chat.completions.create(
+                model="gpt-4.1-mini",
+                max_tokens=spec["max_tokens"],
+                temperature=0.7,
+                response_format={"type": "json_object"},  # Force JSON response
+                messages=[
+                    {
+                        "role": "system",
+                        "content": PREP_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prep_context
+                    },
+                    {
+                        "role": "user",
+                        "content": section_prompt
+                    }
+                ]
+            )
             content = response.choices[0].message.content
+            data = json.loads(content)
 
-            # Try to parse as JSON
-            try:
-                prep_data = json.loads(content)
-                return prep_data
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Failed to parse OpenAI response for {section} as JSON: {e}")
+            raise ValueError(f"Failed to parse interview prep section {section}: {e}")
+        except Exception as e:
+            print(f"OpenAI API error generating {section}: {str(e)}")
+            raise ValueError(f"Failed to generate interview prep section {section}: {str(e)}")
 
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"Failed to parse OpenAI response as JSON: {e}")
-                print(f"Response: {content}")
-                raise ValueError(f"Failed to parse interview prep response: {e}")
+        # Accept the section wrapped in its own key as well
+        if isinstance(data, dict) and isinstance(data.get(section), dict) and len(data) == 1:
+            data = data[section]
+        if not isinstance(data, dict):
+            raise ValueError(f"Interview prep section {section} is not a JSON object")
 
-        except Exception as e:
-            print(f"OpenAI API error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise ValueError(f"Failed to generate interview prep: {str(e)}")
+        print(f"✓ Generated interview prep section: {section}")
+        return section, data
@@ -1,4 +1,3 @@
-from openai import OpenAI
 from app.config import get_settings
 import json
 import os
@@ -20,7 +19,8 @@ class OpenAITailor:
             )
 
         try:
-            self.client = OpenAI(api_key=openai_api_key)
+            from openai import OpenAI
+            self.client = OpenAI(api_key=openai_api_key, base_url=settings.openai_base_url)
         except Exception as e:
             raise ValueError(
                 f"Failed to initialize OpenAI client: {str(e)}. "
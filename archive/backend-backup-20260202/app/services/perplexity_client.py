@@ -1,4 +1,3 @@
-from openai import OpenAI
 from app.config import get_settings
 
 settings = get_settings()
@@ -15,9 +14,11 @@ class PerplexityClient:
             )
 
         try:
-            self.client = OpenAI(
+            # Async client: research calls are awaited (and gathered) without blocking the event loop
+            from openai import AsyncOpenAI
+            self.client = AsyncOpenAI(
                 api_key=settings.perplexity_api_key,
-                base_url="https://api.perplexity.ai"
+                base_url=settings.perplexity_base_url
             )
         except Exception as e:
             raise ValueError(
@@ -124,7 +125,7 @@ Format your response with clear section headers and bullet points. Include speci
 
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="sonar",
                 messages=[
                     {
@@ -203,7 +204,7 @@ Format your response with clear section headers and bullet points. Include speci
             # Use Perplexity's sonar model for web search with citations
             # Note: Perplexity automatically returns citations in the response
             # Model updated to latest: https://docs.perplexity.ai/guides/model-cards
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="sonar",  # Latest Perplexity model with web search
                 messages=[
                     {
@@ -296,7 +297,7 @@ Format your response with clear section headers and bullet points. Include speci
             return {"error": "No job URL or description provided"}
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="sonar",
                 messages=[
                     {
@@ -2,11 +2,22 @@
 Service for generating job-specific practice questions and AI-generated STAR stories
 """
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
 import os
 import json
+from app.config import get_settings
+
+# OpenAI client is created on first use so importing this module stays cheap
+_client = None
+
+
+def get_openai_client():
+    """Get shared OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=get_settings().openai_base_url)
+    return _client
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 class PracticeQuestionsService:
     """Generate job-specific practice questions and STAR stories"""
@@ -80,7 +91,7 @@ Example format:
 """
 
         try:
-            response = client.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert interview coach who generates highly specific, role-tailored interview questions. Return only valid JSON."},
@@ -177,7 +188,7 @@ Example format:
 """
 
         try:
-            response = client.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are an expert interview coach who creates compelling STAR stories. Return only valid JSON."},
@@ -0,0 +1,139 @@
+"""
+Prep Analysis Cache - per-prep memoization of derived interview intelligence
+
+Results derived from an interview prep (intelligence bundle, readiness,
+values alignment) are stored in analysis_cache under the prep's tailored
+resume, together with a hash of the inputs they were computed from. A read
+only hits when the hash matches, so any change to the prep (or the job,
+resume or practice data fed in) invalidates the entry.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, and_, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analysis_cache import AnalysisCache
+
+PREP_CACHE_TTL_DAYS = 30
+
+# Bump when a cached result's shape or the way it is computed changes
+PREP_CACHE_VERSION = 1
+
+# analysis_cache.analysis_type values owned by this module
+INTELLIGENCE_BUNDLE = "prep_intelligence"
+READINESS = "prep_readiness"
+VALUES_ALIGNMENT = "prep_values_alignment"
+TECH_STACK = "prep_tech_stack"
+# Common-questions sets cached here before they moved to interview_preps.common_questions;
+# still read as a fallback and cleared with the prep
+COMMON_QUESTIONS_SET = "prep_common_questions"
+
+# The intelligence bundle is cached once per content type it scores, so
+# alternating strategy/news requests do not evict each other
+INTELLIGENCE_CONTENT_TYPES = ("strategy", "news")
+
+
+def intelligence_bundle_type(content_type: str) -> str:
+    """analysis_type under which the intelligence bundle for one content type is cached"""
+    return f"{INTELLIGENCE_BUNDLE}_{content_type}"
+
+
+PREP_ANALYSIS_TYPES = (
+    INTELLIGENCE_BUNDLE,  # single-entry bundles cached before the per-type split
+    *(intelligence_bundle_type(content_type) for content_type in INTELLIGENCE_CONTENT_TYPES),
+    READINESS, VALUES_ALIGNMENT, TECH_STACK, COMMON_QUESTIONS_SET,
+)
+
+# Generated prep sections are cached one entry per section
+PREP_SECTION_PREFIX = "prep_section_"
+
+
+def prep_section_type(section: str) -> str:
+    """analysis_type under which one generated prep section is cached"""
+    return f"{PREP_SECTION_PREFIX}{section}"
+
+
+def prep_input_hash(analysis_type: str, *inputs: Any) -> str:
+    """SHA-256 over the analysis type and canonical JSON of its inputs"""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    digest = hashlib.sha256(f"{analysis_type}:{PREP_CACHE_VERSION}:".encode("utf-8"))
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+async def get_prep_cached(
+    db: AsyncSession,
+    tailored_resume_id: int,
+    analysis_type: str,
+    input_hash: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Cached result for this prep, or None
+
+    With input_hash, the entry must have been computed from the same inputs.
+    Without it, any unexpired entry is returned (for results kept up to date
+    incrementally).
+    """
+    entry = await _get_entry(db, tailored_resume_id, analysis_type)
+    if entry is None or entry.expires_at <= datetime.utcnow():
+        return None
+
+    data = entry.result_data or {}
+    if input_hash is not None and data.get("input_hash") != input_hash:
+        print(f"○ Prep cache STALE for {analysis_type} (tailored_resume_id={tailored_resume_id})")
+        return None
+
+    print(f"✓ Prep cache HIT for {analysis_type} (tailored_resume_id={tailored_resume_id})")
+    return data.get("result")
+
+
+async def save_prep_cached(
+    db: AsyncSession,
+    tailored_resume_id: int,
+    analysis_type: str,
+    result: Dict[str, Any],
+    input_hash: Optional[str] = None,
+    commit: bool = True
+):
+    """Store (or replace) the cached result for this prep"""
+    entry = await _get_entry(db, tailored_resume_id, analysis_type)
+    result_data = {"input_hash": input_hash, "result": result}
+
+    if entry is None:
+        db.add(AnalysisCache.create_with_ttl(
+            tailored_resume_id=tailored_resume_id,
+            analysis_type=analysis_type,
+            result_data=result_data,
+            ttl_days=PREP_CACHE_TTL_DAYS
+        ))
+    else:
+        # Replace the JSON value (not mutate it) so the change is flushed
+        entry.result_data = result_data
+        entry.expires_at = datetime.utcnow() + timedelta(days=PREP_CACHE_TTL_DAYS)
+
+    if commit:
+        await db.commit()
+
+
+async def invalidate_prep_cache(db: AsyncSession, tailored_resume_id: int, *analysis_types: str):
+    """Drop cached results for this prep (all types when none are given); caller commits"""
+    conditions = [AnalysisCache.tailored_resume_id == tailored_resume_id]
+    if analysis_types:
+        conditions.append(AnalysisCache.analysis_type.in_(analysis_types))
+    await db.execute(delete(AnalysisCache).where(and_(*conditions)))
+
+
+async def _get_entry(db: AsyncSession, tailored_resume_id: int, analysis_type: str) -> Optional[AnalysisCache]:
+    result = await db.execute(
+        select(AnalysisCache).where(
+            and_(
+                AnalysisCache.tailored_resume_id == tailored_resume_id,
+                AnalysisCache.analysis_type == analysis_type
+            )
+        )
+    )
+    return result.scalars().first()
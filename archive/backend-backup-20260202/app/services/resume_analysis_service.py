@@ -1,19 +1,38 @@
 """
 Resume Analysis Service - AI-powered resume change analysis
 
-Analyzes differences between original and tailored resumes,
-identifies keywords, and calculates match scores using GPT-4.1-mini
+Analyzes differences between original and tailored resumes using GPT-4.1-mini.
+Keyword analysis and match scores come from the local KeywordMatcher by
+default (KEYWORD_ANALYSIS_MODE=local); "hybrid" sends the LLM a keyword
+pre-pass instead of full resumes, "llm" restores the full GPT calls.
 """
 
 import os
-from openai import AsyncOpenAI
 import json
 from typing import Dict, Any, List
 
+from app.utils.keyword_matcher import get_keyword_matcher
+from app.config import get_settings
+
+KEYWORD_ANALYSIS_MODES = ("local", "hybrid", "llm")
+
+
 class ResumeAnalysisService:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self._client = None
         self.model = "gpt-4.1-mini"
+        self.keyword_mode = os.getenv("KEYWORD_ANALYSIS_MODE", "local").lower()
+        if self.keyword_mode not in KEYWORD_ANALYSIS_MODES:
+            print(f"WARNING: Unknown KEYWORD_ANALYSIS_MODE '{self.keyword_mode}', using 'local'")
+            self.keyword_mode = "local"
+
+    @property
+    def client(self):
+        """OpenAI client, created on first LLM call (local keyword analysis needs none)"""
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=get_settings().openai_base_url)
+        return self._client
 
     async def analyze_resume_changes(
         self,
@@ -158,9 +177,18 @@ CRITICAL REQUIREMENTS:
         """
         Identify and categorize all new keywords added to tailored resume
         """
+        matcher = get_keyword_matcher()
 
-        original_text = json.dumps(original_resume)
-        tailored_text = json.dumps(tailored_resume)
+        if self.keyword_mode == "local":
+            return matcher.analyze_keywords(original_resume, tailored_resume, job_description)
+
+        if self.keyword_mode == "hybrid":
+            # Pre-pass: give the LLM the keyword overlap instead of both full resumes
+            original_text = json.dumps(matcher.prompt_context(original_resume, job_description))
+            tailored_text = json.dumps(matcher.prompt_context(tailored_resume, job_description))
+        else:
+            original_text = json.dumps(original_resume)
+            tailored_text = json.dumps(tailored_resume)
 
         system_prompt = """You are an ATS (Applicant Tracking System) and keyword optimization expert.
 Your job is to identify new keywords added to a tailored resume and categorize them
@@ -237,8 +265,19 @@ CRITICAL REQUIREMENTS:
         """
         Calculate 0-100 match score with detailed breakdown
         """
+        matcher = get_keyword_matcher()
 
-        resume_text = json.dumps(tailored_resume, indent=2)
+        if self.keyword_mode == "local":
+            return matcher.match_score(tailored_resume, job_description, job_title)
+
+        if self.keyword_mode == "hybrid":
+            # Pre-pass: matched/missing job keywords plus the summary instead of the full resume
+            resume_text = json.dumps({
+                "summary": tailored_resume.get("summary", ""),
+                "keywords": matcher.prompt_context(tailored_resume, job_description)
+            }, indent=2)
+        else:
+            resume_text = json.dumps(tailored_resume, indent=2)
 
         system_prompt = """You are an expert recruiter and ATS specialist.
 Your job is to calculate how well a tailored resume matches a job description,
@@ -319,3 +358,15 @@ CRITICAL REQUIREMENTS:
         except Exception as e:
             print(f"Error calculating match score: {e}")
             raise Exception(f"Failed to calculate match score: {str(e)}")
+
+
+# Singleton instance (created on first use, not at import time)
+_resume_analysis_service_instance = None
+
+
+def get_resume_analysis_service() -> ResumeAnalysisService:
+    """Get singleton ResumeAnalysisService instance"""
+    global _resume_analysis_service_instance
+    if _resume_analysis_service_instance is None:
+        _resume_analysis_service_instance = ResumeAnalysisService()
+    return _resume_analysis_service_instance
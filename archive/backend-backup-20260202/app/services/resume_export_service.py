@@ -6,17 +6,14 @@ UserName_TargetRole_TailoredResume.pdf
 UserName_TargetRole_TailoredResume.docx
 """
 
+import asyncio
 import io
+import multiprocessing
+import os
 import re
-from typing import Dict, Any
-from docx import Document
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
 
 class ResumeExportService:
     def __init__(self):
@@ -48,7 +45,85 @@ class ResumeExportService:
     ) -> io.BytesIO:
         """
         Generate DOCX file from resume data
+
+        Uses the cached template engine; falls back to building the document
+        run by run with python-docx if template rendering fails.
         """
+        try:
+            return io.BytesIO(self._render_docx_from_template(resume_data, user_name))
+        except Exception as e:
+            print(f"WARNING: Template rendering failed, using python-docx builder: {e}")
+            return self._render_docx_with_python_docx(resume_data, user_name)
+
+    def _render_docx_from_template(self, resume_data: Dict[str, Any], user_name: str) -> bytes:
+        """Render by cloning pre-styled paragraphs from the cached base document"""
+        from app.services.docx_template_engine import get_docx_template_engine
+
+        doc = get_docx_template_engine().new_document(theme="default")
+
+        contact_info = resume_data.get('contact', {})
+        doc.add("name", text=user_name)
+        doc.add("contact", text=f"{contact_info.get('email', '')} | {contact_info.get('phone', '')} | {contact_info.get('location', '')}")
+        doc.add_spacer()
+
+        if resume_data.get('summary'):
+            doc.add("heading_compact", text='PROFESSIONAL SUMMARY')
+            doc.add("body_plain", text=resume_data['summary'])
+            doc.add_spacer()
+
+        if resume_data.get('experience'):
+            doc.add("heading_compact", text='PROFESSIONAL EXPERIENCE')
+
+            experiences = resume_data['experience']
+            if isinstance(experiences, list):
+                for exp in experiences:
+                    # Handle both formats: {header} or {title, company}
+                    if 'header' in exp:
+                        doc.add("job_header", text=exp.get('header', ''))
+                        company_text = f"{exp.get('location', '')} | {exp.get('dates', '')}"
+                    else:
+                        doc.add("job_header", text=exp.get('title', ''))
+                        company_text = f"{exp.get('company', '')} | {exp.get('location', '')} | {exp.get('dates', '')}"
+
+                    if company_text and not re.match(r'^[\s\|\/•\-–—]+$', company_text):
+                        doc.add("job_meta", text=company_text)
+
+                    doc.add_bullets(
+                        [b for b in (exp.get('bullets') or []) if b and b.strip() and not re.match(r'^[\s\|\/•\-–—]+$', b.strip())],
+                        prototype="bullet_plain"
+                    )
+                    doc.add_spacer()
+
+        if resume_data.get('skills'):
+            doc.add("heading_compact", text='CORE COMPETENCIES')
+
+            skills = resume_data['skills']
+            if isinstance(skills, list):
+                doc.add("body_plain", text=' • '.join(skills))
+            elif isinstance(skills, str):
+                doc.add("body_plain", text=skills)
+
+            doc.add_spacer()
+
+        if resume_data.get('education'):
+            doc.add("heading_compact", text='EDUCATION')
+
+            education = resume_data['education']
+            if isinstance(education, list):
+                for edu in education:
+                    doc.add("body_plain", text=f"{edu.get('degree', '')} | {edu.get('institution', '')} | {edu.get('year', '')}")
+            elif isinstance(education, str):
+                doc.add("body_plain", text=education)
+
+        return doc.to_bytes()
+
+    def _render_docx_with_python_docx(self, resume_data: Dict[str, Any], user_name: str) -> io.BytesIO:
+        """Build the document run by run with python-docx (fallback path)"""
+        # python-docx is imported on first render to keep API cold start fast
+        from docx import Document
+        from docx.shared import Pt, RGBColor, Inches
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
         doc = Document()
 
         # Set document margins
@@ -190,6 +265,13 @@ class ResumeExportService:
         """
         Generate PDF file from resume data
         """
+        # reportlab is imported on first render to keep API cold start fast
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib import colors
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer,
@@ -311,3 +393,80 @@ class ResumeExportService:
         buffer.seek(0)
 
         return buffer
+
+
+# Singleton instance (created on first use, not at import time)
+_resume_export_service_instance = None
+
+
+def get_resume_export_service() -> ResumeExportService:
+    """Get singleton ResumeExportService instance"""
+    global _resume_export_service_instance
+    if _resume_export_service_instance is None:
+        _resume_export_service_instance = ResumeExportService()
+    return _resume_export_service_instance
+
+
+def render_export(file_format: str, resume_data: Dict[str, Any], user_name: str, target_role: str) -> bytes:
+    """
+    Render one export to bytes
+
+    Module-level so it can run in the export process pool (see
+    get_export_process_pool); each worker process keeps its own service
+    singleton and cached DOCX template.
+    """
+    service = get_resume_export_service()
+    if file_format == "pdf":
+        return service.generate_pdf(resume_data, user_name, target_role).getvalue()
+    return service.generate_docx(resume_data, user_name, target_role).getvalue()
+
+
+# Process pool for CPU-bound rendering (created on first use)
+_export_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_export_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool used for bulk export rendering
+
+    Size comes from EXPORT_PROCESS_WORKERS (default: CPU count, max 4).
+    Workers are spawned rather than forked so they do not inherit the
+    event loop or open database connections.
+    """
+    global _export_process_pool
+    if _export_process_pool is None:
+        workers = int(os.getenv("EXPORT_PROCESS_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+        _export_process_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _export_process_pool
+
+
+def shutdown_export_process_pool():
+    """Stop export worker processes (called on application shutdown)"""
+    global _export_process_pool
+    if _export_process_pool is not None:
+        _export_process_pool.shutdown(wait=False, cancel_futures=True)
+        _export_process_pool = None
+
+
+async def render_export_in_pool(file_format: str, resume_data: Dict[str, Any], user_name: str, target_role: str) -> bytes:
+    """
+    Render one export on the process pool
+
+    If a worker died and the pool is broken, the pool is reset (recreated on
+    next use) and this export is rendered in a thread instead.
+    """
+    from app.utils.profiler import profile_span  # not at module level: spawned workers import this module
+
+    loop = asyncio.get_running_loop()
+    with profile_span("render", f"{file_format} export (process pool)"):
+        try:
+            return await loop.run_in_executor(
+                get_export_process_pool(), render_export, file_format, resume_data, user_name, target_role
+            )
+        except BrokenProcessPool:
+            print("WARNING: Export process pool is broken, restarting it and rendering in a thread")
+            shutdown_export_process_pool()
+            return await asyncio.to_thread(render_export, file_format, resume_data, user_name, target_role)
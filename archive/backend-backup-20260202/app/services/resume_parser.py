@@ -2,12 +2,10 @@ from pathlib import Path
 from typing import Dict, List
 import json
 import re
-from docx import Document
-import pdfplumber
 import os
-from openai import OpenAI
 from app.utils.file_encryption import FileEncryption
 import io
+from app.config import get_settings
 
 class ResumeParser:
     """Parse DOCX and PDF resumes into structured data using Claude AI"""
@@ -27,7 +25,8 @@ class ResumeParser:
         # Initialize OpenAI API
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         if self.openai_api_key:
-            self.client = OpenAI(api_key=self.openai_api_key)
+            from openai import OpenAI
+            self.client = OpenAI(api_key=self.openai_api_key, base_url=get_settings().openai_base_url)
             self.use_ai_parsing = True
         else:
             self.use_ai_parsing = False
@@ -60,6 +59,7 @@ class ResumeParser:
         decrypted_bytes = self.encryption.decrypt_file(file_path)
 
         # Parse from decrypted bytes
+        from docx import Document
         doc = Document(io.BytesIO(decrypted_bytes))
 
         # Extract all text with paragraph breaks
@@ -103,6 +103,8 @@ class ResumeParser:
         # Decrypt file before parsing (files encrypted at rest for security)
         decrypted_bytes = self.encryption.decrypt_file(file_path)
 
+        import pdfplumber
+
         full_text = ''
 
         try:
@@ -421,3 +423,15 @@ IMPORTANT:
             import traceback
             traceback.print_exc()
             raise
+
+
+# Singleton instance (created on first use, not at import time)
+_resume_parser_instance = None
+
+
+def get_resume_parser() -> ResumeParser:
+    """Get singleton ResumeParser instance"""
+    global _resume_parser_instance
+    if _resume_parser_instance is None:
+        _resume_parser_instance = ResumeParser()
+    return _resume_parser_instance
@@ -0,0 +1,170 @@
+"""
+Touch Buffer - write-behind buffering of view/activity tracking updates
+
+Recording that a row was viewed (last_viewed_at, view_count) used to turn
+every read into a write transaction. A TouchBuffer instead records touches
+in memory, coalesced per row id (latest timestamp, summed count), and a
+background task flushes them every few seconds as ONE multi-row UPDATE:
+
+    UPDATE saved_comparisons
+    SET last_viewed_at = CASE id WHEN 3 THEN ... WHEN 8 THEN ... END,
+        view_count = COALESCE(view_count, 0) + CASE id WHEN 3 THEN 2 WHEN 8 THEN 1 END
+    WHERE id IN (3, 8)
+
+Reads stay read-only. Touches not yet flushed are lost if the process dies,
+which is acceptable for activity tracking (never use this for data users edit).
+
+Usage:
+    views = get_touch_buffer(SavedComparison)   # one buffer per model
+    views.touch(comparison.id)                   # in a GET handler, no commit
+    views.last_touched(comparison.id)            # pending timestamp, for responses
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, update
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+
+# A flush is forced early once this many rows are pending
+MAX_PENDING_ROWS = 1000
+
+
+class TouchBuffer:
+    """Coalesced last-touched timestamps and counts for one table, flushed in batches"""
+
+    def __init__(
+        self,
+        model,
+        timestamp_column: str = "last_viewed_at",
+        count_column: Optional[str] = "view_count",
+        flush_interval: Optional[float] = None
+    ):
+        self.model = model
+        self.timestamp_column = timestamp_column
+        self.count_column = count_column
+        self.flush_interval = flush_interval if flush_interval is not None else get_settings().touch_flush_seconds
+        self._pending: Dict[int, Tuple[datetime, int]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.flushed_rows = 0
+        self.flushes = 0
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def touch(self, row_id: int, at: Optional[datetime] = None, count: int = 1):
+        """Record that the row was touched; written on the next flush"""
+        at = at or datetime.utcnow()
+        previous = self._pending.get(row_id)
+        if previous is not None:
+            at = max(at, previous[0])
+            count += previous[1]
+        self._pending[row_id] = (at, count)
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        elif len(self._pending) >= MAX_PENDING_ROWS:
+            asyncio.create_task(self._flush_logged())
+
+    def last_touched(self, row_id: int) -> Optional[datetime]:
+        """Pending (not yet flushed) timestamp for the row, if any"""
+        pending = self._pending.get(row_id)
+        return pending[0] if pending else None
+
+    async def _run(self):
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush_logged()
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"✗ Touch buffer flush failed for {self.name} ({len(self._pending)} rows pending): {e}")
+
+    def _update_statement(self, batch: Dict[int, Tuple[datetime, int]]):
+        model = self.model
+        id_column = model.id
+        values = {
+            self.timestamp_column: case(
+                {row_id: at for row_id, (at, _) in batch.items()}, value=id_column
+            )
+        }
+        if self.count_column:
+            count_column = getattr(model, self.count_column)
+            values[self.count_column] = func.coalesce(count_column, 0) + case(
+                {row_id: count for row_id, (_, count) in batch.items()}, value=id_column
+            )
+        # A touch is not a modification: keep onupdate columns (updated_at) unchanged
+        for column in model.__table__.columns:
+            if column.onupdate is not None and column.name not in values:
+                values[column.name] = column
+
+        return (
+            update(model)
+            .where(id_column.in_(list(batch)))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def flush(self) -> int:
+        """Write pending touches with one UPDATE; returns the number of rows written"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(self._update_statement(batch))
+                    await session.commit()
+            except Exception:
+                # Put the batch back (merged with touches recorded meanwhile) for the next flush
+                for row_id, (at, count) in batch.items():
+                    self.touch(row_id, at, count)
+                raise
+
+            self.flushes += 1
+            self.flushed_rows += len(batch)
+            return len(batch)
+
+    async def close(self):
+        """Flush what is pending and stop the background task"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+
+_touch_buffers: Dict[str, TouchBuffer] = {}
+
+
+def get_touch_buffer(model, **options) -> TouchBuffer:
+    """Get the singleton TouchBuffer for a model (options apply on first use)"""
+    buffer = _touch_buffers.get(model.__tablename__)
+    if buffer is None:
+        buffer = _touch_buffers[model.__tablename__] = TouchBuffer(model, **options)
+    return buffer
+
+
+async def flush_touch_buffers():
+    """Flush every touch buffer and stop their background tasks (shutdown)"""
+    for buffer in list(_touch_buffers.values()):
+        try:
+            await buffer.close()
+        except Exception as e:
+            print(f"✗ Touch buffer flush failed for {buffer.name} on shutdown: {e}")
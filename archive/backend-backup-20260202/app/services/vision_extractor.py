@@ -9,6 +9,7 @@ from io import BytesIO
 from typing import Dict
 import asyncio
 import os
+from app.config import get_settings
 
 
 class VisionJobExtractor:
@@ -16,7 +17,7 @@ class VisionJobExtractor:
 
     def __init__(self):
         from openai import OpenAI
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'), base_url=get_settings().openai_base_url)
 
     async def extract_from_url(self, job_url: str) -> Dict[str, str]:
         """
@@ -56,7 +57,7 @@ class VisionJobExtractor:
 
         if screenshot_api_key:
             # Using ScreenshotAPI.net (simple, has free tier)
-            api_url = "https://shot.screenshotapi.net/screenshot"
+            api_url = get_settings().screenshot_api_url
             params = {
                 'token': screenshot_api_key,
                 'url': url,
@@ -0,0 +1,281 @@
+"""
+clamd client - async INSTREAM scanning against a long-lived ClamAV daemon
+
+clamscan loads the whole signature database on every run; clamd keeps it
+loaded and scans data sent over a UNIX or TCP socket. This client speaks the
+clamd session protocol:
+
+- Each pooled connection opens an IDSESSION, so one socket serves many scans.
+- A scan is an INSTREAM command followed by length-prefixed chunks and a
+  zero-length terminator, so uploads are scanned as they arrive without
+  touching the disk.
+- Every scan has a timeout budget: the total time spent waiting on clamd
+  (connect, writes, verdict) may not exceed it.
+
+Transport and protocol failures raise ClamdError, so callers can fall back
+to another scanner.
+"""
+
+import asyncio
+import struct
+import time
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterable, Deque, Optional, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Idle sessions are dropped before clamd's own IdleTimeout (30s by default) closes them
+DEFAULT_MAX_IDLE_SECONDS = 20.0
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ClamdError(Exception):
+    """clamd could not be reached or did not answer as expected"""
+
+
+class _Connection:
+    """One clamd socket in IDSESSION mode"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 1
+        self.last_used = time.monotonic()
+
+    def is_stale(self, max_idle: float) -> bool:
+        return (
+            self.reader.at_eof()
+            or self.writer.is_closing()
+            or time.monotonic() - self.last_used > max_idle
+        )
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class _Budget:
+    """Time left for waiting on clamd during one scan"""
+
+    def __init__(self, seconds: float):
+        self.remaining = seconds
+
+    async def wait(self, awaitable, what: str):
+        if self.remaining <= 0:
+            raise ClamdError(f"clamd timeout budget exhausted before {what}")
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining)
+        except asyncio.TimeoutError:
+            raise ClamdError(f"clamd timed out during {what}")
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise ClamdError(f"clamd connection failed during {what}: {e}")
+        finally:
+            self.remaining -= time.monotonic() - started
+
+
+class ClamdStream:
+    """
+    One INSTREAM scan
+
+    Usage:
+        async with client.instream() as scan:
+            await scan.feed(chunk)          # repeatedly
+            is_safe, threat = await scan.finish()
+    """
+
+    def __init__(self, client: "ClamdClient"):
+        self._client = client
+        self._budget = _Budget(client.timeout)
+        self._conn: Optional[_Connection] = None
+        self._request_id = 0
+        self._finished = False
+        self.bytes_sent = 0
+
+    async def __aenter__(self) -> "ClamdStream":
+        self._conn = await self._client._acquire(self._budget)
+        try:
+            self._request_id = await self._client._send_command(self._conn, b"zINSTREAM\0", self._budget)
+        except ClamdError:
+            self._client._release(self._conn, reusable=False)
+            self._conn = None
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._conn is not None:
+            self._client._release(self._conn, reusable=self._finished)
+            self._conn = None
+        return False
+
+    async def feed(self, chunk: bytes):
+        """Send one chunk of the data being scanned"""
+        if not chunk:
+            return
+        conn = self._conn
+        conn.writer.write(struct.pack("!L", len(chunk)) + chunk)
+        await self._budget.wait(conn.writer.drain(), "INSTREAM write")
+        self.bytes_sent += len(chunk)
+
+    async def finish(self) -> Tuple[bool, Optional[str]]:
+        """
+        End the stream and read the verdict
+
+        Returns:
+            (is_safe, threat_name) - threat_name is the signature name when infected,
+            or clamd's error text when clamd refused the stream (e.g. size limit)
+        """
+        conn = self._conn
+        conn.writer.write(struct.pack("!L", 0))
+        await self._budget.wait(conn.writer.drain(), "INSTREAM terminator")
+        reply = await self._client._read_reply(conn, self._request_id, self._budget)
+
+        # "stream: OK", "stream: Eicar-Test-Signature FOUND", "INSTREAM size limit exceeded. ERROR"
+        if reply.endswith("FOUND"):
+            self._finished = True
+            threat = reply[:-len("FOUND")].strip()
+            if threat.startswith("stream:"):
+                threat = threat[len("stream:"):].strip()
+            return False, threat or "Unknown threat"
+        if reply.endswith("OK"):
+            self._finished = True
+            return True, None
+        # clamd ends the session after an ERROR reply; the connection is not reused
+        return False, reply
+
+
+class ClamdClient:
+    """Pooled async clamd client over a UNIX socket or TCP"""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        host: Optional[str] = None,
+        port: int = 3310,
+        pool_size: int = 4,
+        timeout: float = 10.0,
+        max_idle: float = DEFAULT_MAX_IDLE_SECONDS
+    ):
+        if not socket_path and not host:
+            raise ValueError("clamd needs a socket_path or a host")
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.pool_size = pool_size
+        self._idle: Deque[_Connection] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def address(self) -> str:
+        return self.socket_path or f"{self.host}:{self.port}"
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the client can be built outside a running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        return self._slots
+
+    async def _open(self, budget: _Budget) -> _Connection:
+        if self.socket_path:
+            opening = asyncio.open_unix_connection(self.socket_path)
+        else:
+            opening = asyncio.open_connection(self.host, self.port)
+        reader, writer = await budget.wait(opening, "connect")
+        conn = _Connection(reader, writer)
+        writer.write(b"zIDSESSION\0")
+        await budget.wait(writer.drain(), "IDSESSION")
+        return conn
+
+    async def _acquire(self, budget: _Budget) -> _Connection:
+        """A session from the pool, or a new one (at most pool_size in use at once)"""
+        await budget.wait(self._semaphore().acquire(), "waiting for a pooled connection")
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.is_stale(self.max_idle):
+                    return conn
+                conn.close()
+            return await self._open(budget)
+        except BaseException:
+            self._semaphore().release()
+            raise
+
+    def _release(self, conn: _Connection, reusable: bool):
+        if reusable and not conn.is_stale(self.max_idle):
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._semaphore().release()
+
+    async def _send_command(self, conn: _Connection, command: bytes, budget: _Budget) -> int:
+        request_id = conn.next_id
+        conn.next_id += 1
+        conn.writer.write(command)
+        await budget.wait(conn.writer.drain(), command.strip(b"z\0").decode())
+        return request_id
+
+    async def _read_reply(self, conn: _Connection, request_id: int, budget: _Budget) -> str:
+        raw = await budget.wait(conn.reader.readuntil(b"\0"), "reading reply")
+        reply = raw[:-1].decode("utf-8", errors="replace").strip()
+        # Session replies are prefixed with the request id: "3: stream: OK"
+        prefix, sep, rest = reply.partition(": ")
+        if not sep or prefix != str(request_id):
+            raise ClamdError(f"Unexpected clamd reply: {reply!r}")
+        return rest
+
+    def instream(self) -> ClamdStream:
+        """Start an INSTREAM scan (use as an async context manager)"""
+        return ClamdStream(self)
+
+    async def ping(self) -> bool:
+        """True when clamd answers PING"""
+        budget = _Budget(self.timeout)
+        try:
+            conn = await self._acquire(budget)
+        except ClamdError:
+            return False
+        reusable = False
+        try:
+            request_id = await self._send_command(conn, b"zPING\0", budget)
+            reusable = await self._read_reply(conn, request_id, budget) == "PONG"
+            return reusable
+        except ClamdError:
+            return False
+        finally:
+            self._release(conn, reusable)
+
+    async def scan_stream(self, chunks: AsyncIterable[bytes]) -> Tuple[bool, Optional[str]]:
+        """Scan data given as an async iterable of chunks"""
+        async with self.instream() as scan:
+            async for chunk in chunks:
+                await scan.feed(chunk)
+            return await scan.finish()
+
+    async def scan_file(self, file_path: Path) -> Tuple[bool, Optional[str]]:
+        """Stream a file on disk to clamd"""
+        async def chunks():
+            with open(file_path, "rb") as f:
+                while chunk := f.read(FILE_CHUNK_SIZE):
+                    yield chunk
+
+        return await self.scan_stream(chunks())
+
+    async def close(self):
+        """Close idle pooled sessions"""
+        while self._idle:
+            conn = self._idle.pop()
+            try:
+                conn.writer.write(b"zEND\0")
+            except Exception:
+                pass
+            conn.close()
+        logger.debug(f"clamd pool closed ({self.address})")
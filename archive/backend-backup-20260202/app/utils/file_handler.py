@@ -71,7 +71,9 @@ class FileHandler:
         save_dir.mkdir(exist_ok=True)
         file_path = save_dir / safe_filename
 
-        # Save file with streaming size limit
+        # Save file with streaming size limit; chunks are also streamed to the virus scanner
+        upload_scan = self.virus_scanner.upload_scan()
+        saved = False
         try:
             bytes_written = 0
             with file_path.open("wb") as buffer:
@@ -88,14 +90,23 @@ class FileHandler:
                         )
 
                     buffer.write(chunk)
+                    await upload_scan.feed(chunk)
+            saved = True
         except HTTPException:
             # Re-raise our size limit exception
             raise
         except Exception as e:
-            # Clean up partial file on error
-            if file_path.exists():
-                file_path.unlink()
             raise HTTPException(status_code=500, detail=f"File save failed: {str(e)}")
+        finally:
+            if not saved:
+                # Any failure, including cancellation (asyncio.CancelledError is a
+                # BaseException): release the clamd session and the partial file
+                await upload_scan.close()
+                if file_path.exists():
+                    file_path.unlink()
+
+        # Collect the scan verdict now (the stream is complete); it is enforced before encryption
+        is_safe, threat_name = await upload_scan.result(file_path)
 
         # Get final file size (before encryption)
         file_size = file_path.stat().st_size
@@ -136,8 +147,7 @@ class FileHandler:
                 detail=f"File extension mismatch. Extension: {file_ext}, Detected type: {kind.mime}"
             )
 
-        # Scan for viruses/malware before encryption
-        is_safe, threat_name = self.virus_scanner.scan_file(str(file_path))
+        # Reject viruses/malware before encryption
         if not is_safe:
             file_path.unlink()  # Delete infected file
             raise HTTPException(
@@ -179,3 +189,15 @@ class FileHandler:
             if file_path.is_file():
                 if file_path.stat().st_mtime < cutoff_time:
                     file_path.unlink()
+
+
+# Singleton instance (created on first use, not at import time)
+_file_handler_instance = None
+
+
+def get_file_handler() -> FileHandler:
+    """Get singleton FileHandler instance"""
+    global _file_handler_instance
+    if _file_handler_instance is None:
+        _file_handler_instance = FileHandler()
+    return _file_handler_instance
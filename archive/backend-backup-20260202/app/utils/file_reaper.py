@@ -0,0 +1,90 @@
+"""
+File Reaper - background removal of files left behind by deleted records
+
+Request handlers enqueue paths after their delete commits and return; a
+single worker task removes the files off the event loop. Removal failures
+are logged and dropped (the periodic cleanup_old_files sweep catches
+anything left over).
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+from app.utils.file_handler import get_file_handler
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class FileReaper:
+    """Queue of file paths removed by one background worker"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.reaped = 0
+        self.failed = 0
+
+    def enqueue(self, paths: Iterable[Optional[str]]) -> int:
+        """Queue paths for removal (empty values are skipped); returns how many were queued"""
+        paths = [path for path in paths if path]
+        if not paths:
+            return 0
+        if self._queue is None:
+            # Created on first use so the reaper binds to the running loop
+            self._queue = asyncio.Queue()
+        for path in paths:
+            self._queue.put_nowait(path)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return len(paths)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self):
+        file_handler = get_file_handler()
+        while True:
+            path = await self._queue.get()
+            try:
+                if await asyncio.to_thread(file_handler.delete_file, path):
+                    self.reaped += 1
+                    logger.debug(f"Reaped file: {path}")
+                else:
+                    self.failed += 1
+                    logger.warning(f"Failed to reap file: {path}")
+            finally:
+                self._queue.task_done()
+
+    async def drain(self, timeout: float = 10.0):
+        """Wait for queued removals to finish (shutdown, tests)"""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"File reaper drain timed out with {self.pending} files pending")
+
+    async def stop(self):
+        """Drain the queue and stop the worker"""
+        await self.drain()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+# Singleton instance (created on first use, not at import time)
+_file_reaper_instance = None
+
+
+def get_file_reaper() -> FileReaper:
+    """Get singleton FileReaper instance"""
+    global _file_reaper_instance
+    if _file_reaper_instance is None:
+        _file_reaper_instance = FileReaper()
+    return _file_reaper_instance
@@ -0,0 +1,77 @@
+"""
+HTTP cache validators for large JSON responses
+
+Strong ETags are derived from what a response is built from (row ids and
+updated_at timestamps), not from its body, so a conditional GET can be
+answered with 304 after a lightweight query and without loading or
+serializing the payload.
+
+When CompressionMiddleware encodes a response, it gives the ETag a suffix
+per encoding ("<tag>-br", "<tag>-gzip"). Strong validators must differ
+between representations. if_none_match strips the suffix again.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Bump when the shape of a cached response changes so clients refetch
+RESPONSE_VERSION = "1"
+
+CACHE_CONTROL = "private, no-cache"
+
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def row_etag(kind: str, *parts: Any) -> str:
+    """Strong ETag over a response kind and the ids / timestamps it is built from"""
+    canonical = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part)
+        for part in (kind, RESPONSE_VERSION, *parts)
+    )
+    return f'"{hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the content-encoded representation (weak ETags are left as-is)"""
+    if not etag.startswith('"') or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _normalize(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return f'{tag[:-len(suffix) - 1]}"'
+    return tag
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already covers etag (in any content encoding)"""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    tags = [_normalize(tag) for tag in header.split(",")]
+    return etag in tags or "*" in tags
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when the client already holds this version, else None"""
+    if if_none_match(request, etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    """Attach the validator headers to a response"""
+    response.headers.update(cache_headers(etag))
+    return response
@@ -0,0 +1,72 @@
+"""
+JSON codec - orjson-based encoding shared by the API and the database layer
+
+- ORJSONResponse is the app's default response class
+- dumps / loads are the engine's json_serializer / json_deserializer for
+  JSON/JSONB columns
+- JSONDocument is the column type for structured resume/comparison fields
+  (JSONB on PostgreSQL, JSON elsewhere)
+- json_value reads those fields: values arrive already decoded, and rows
+  written before the columns became JSON (a JSON string inside the JSON
+  value) are decoded once more
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Non-string dict keys (e.g. int indices) are accepted, as json.dumps does
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+__all__ = ["ORJSONResponse", "JSONDocument", "dumps", "dumps_bytes", "loads", "json_value"]
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not handle natively (Decimal, sets, ...)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Encode to JSON bytes"""
+    return orjson.dumps(value, default=_default, option=_DUMPS_OPTIONS)
+
+
+def dumps(value: Any) -> str:
+    """Encode to a JSON string"""
+    return dumps_bytes(value).decode("utf-8")
+
+
+def loads(data) -> Any:
+    """Decode JSON from str or bytes"""
+    return orjson.loads(data)
+
+
+def json_value(value: Any, default: Any = None) -> Any:
+    """
+    Structured value of a JSON field, or default when it is empty
+
+    Decoded values are returned as-is. Strings are legacy rows that stored
+    JSON text and are decoded (default when that fails).
+    """
+    if default is None:
+        default = []
+    if value is None or value == "":
+        return default
+    if isinstance(value, (str, bytes)):
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"JSON deserialization failed: {e}. Returning default value.")
+            return default
+    return value
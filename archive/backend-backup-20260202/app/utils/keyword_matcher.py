@@ -0,0 +1,626 @@
+"""
+Keyword Matcher - deterministic job description / resume keyword analysis
+
+Local replacement for the GPT keyword and match-score calls:
+- tokenization that keeps tech tokens intact (C++, C#, Node.js, CI/CD)
+- n-gram phrase extraction (1-3 words, no stopword edges)
+- skills taxonomy with synonyms, normalized to canonical terms and categories
+- BM25-style weighting of job description terms (IDF from a fitted corpus
+  when available, taxonomy boost otherwise)
+- weighted coverage score of the job keywords by a resume
+
+Runs in milliseconds and can also be used as a pre-pass that gives the LLM
+a short keyword list instead of the full resume JSON.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Skills taxonomy: canonical term -> (category, synonyms)
+# Categories match the keyword_groups categories used by the resume analysis UI.
+SKILLS_TAXONOMY: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    # Languages
+    "python": ("technical_skills", ("py",)),
+    "java": ("technical_skills", ()),
+    "javascript": ("technical_skills", ("js", "ecmascript")),
+    "typescript": ("technical_skills", ("ts",)),
+    "golang": ("technical_skills", ("go lang",)),  # Bare "go" is too ambiguous
+    "rust": ("technical_skills", ()),
+    "c++": ("technical_skills", ("cpp",)),
+    "c#": ("technical_skills", ("csharp", "c sharp")),
+    "ruby": ("technical_skills", ()),
+    "php": ("technical_skills", ()),
+    "kotlin": ("technical_skills", ()),
+    "swift": ("technical_skills", ()),
+    "scala": ("technical_skills", ()),
+    "sql": ("technical_skills", ("t-sql", "pl/sql", "tsql")),
+    "bash": ("technical_skills", ("shell scripting", "shell")),
+    "powershell": ("technical_skills", ()),
+    # Engineering practices
+    "machine learning": ("technical_skills", ("ml",)),
+    "deep learning": ("technical_skills", ()),
+    "artificial intelligence": ("technical_skills", ("ai",)),
+    "natural language processing": ("technical_skills", ("nlp",)),
+    "large language models": ("technical_skills", ("llm", "llms", "large language model")),
+    "computer vision": ("technical_skills", ()),
+    "data analysis": ("technical_skills", ("data analytics", "analytics")),
+    "data engineering": ("technical_skills", ("data pipelines", "etl")),
+    "data science": ("technical_skills", ()),
+    "statistics": ("technical_skills", ("statistical analysis",)),
+    "microservices": ("technical_skills", ("microservice architecture", "micro-services")),
+    "distributed systems": ("technical_skills", ()),
+    "system design": ("technical_skills", ("systems design",)),
+    "api design": ("technical_skills", ("rest api", "rest apis", "restful", "restful apis", "apis", "api")),
+    "ci/cd": ("technical_skills", ("continuous integration", "continuous delivery", "continuous deployment", "cicd")),
+    "devops": ("technical_skills", ()),
+    "devsecops": ("technical_skills", ()),
+    "infrastructure as code": ("technical_skills", ("iac",)),
+    "test automation": ("technical_skills", ("automated testing", "unit testing", "integration testing")),
+    "object-oriented programming": ("technical_skills", ("oop", "object oriented programming")),
+    "frontend development": ("technical_skills", ("front-end", "frontend", "front end")),
+    "backend development": ("technical_skills", ("back-end", "backend", "back end")),
+    "full stack": ("technical_skills", ("full-stack", "fullstack")),
+    "mobile development": ("technical_skills", ("ios", "android")),
+    "cloud security": ("technical_skills", ()),
+    "network security": ("technical_skills", ()),
+    "application security": ("technical_skills", ("appsec",)),
+    "zero trust": ("technical_skills", ("zero-trust",)),
+    "threat modeling": ("technical_skills", ("threat modelling",)),
+    "incident response": ("technical_skills", ()),
+    "vulnerability management": ("technical_skills", ("vulnerability assessment",)),
+    "penetration testing": ("technical_skills", ("pen testing", "pentesting", "ethical hacking")),
+    "identity and access management": ("technical_skills", ("iam",)),
+    "encryption": ("technical_skills", ("cryptography",)),
+    "threat intelligence": ("technical_skills", ()),
+    "security operations": ("technical_skills", ("secops", "soc")),
+    "risk management": ("industry_terms", ("risk assessment", "risk mitigation")),
+    "compliance": ("industry_terms", ("regulatory compliance",)),
+    "governance": ("industry_terms", ("grc",)),
+    # Tools & technologies
+    "aws": ("tools_technologies", ("amazon web services",)),
+    "azure": ("tools_technologies", ("microsoft azure",)),
+    "gcp": ("tools_technologies", ("google cloud", "google cloud platform")),
+    "kubernetes": ("tools_technologies", ("k8s",)),
+    "docker": ("tools_technologies", ("containers", "containerization")),
+    "terraform": ("tools_technologies", ()),
+    "ansible": ("tools_technologies", ()),
+    "jenkins": ("tools_technologies", ()),
+    "github actions": ("tools_technologies", ()),
+    "git": ("tools_technologies", ("github", "gitlab", "version control")),
+    "linux": ("tools_technologies", ("unix",)),
+    "react": ("tools_technologies", ("react.js", "reactjs")),
+    "angular": ("tools_technologies", ("angularjs",)),
+    "vue": ("tools_technologies", ("vue.js", "vuejs")),
+    "node.js": ("tools_technologies", ("node", "nodejs")),
+    "django": ("tools_technologies", ()),
+    "flask": ("tools_technologies", ()),
+    "fastapi": ("tools_technologies", ()),
+    "spring": ("tools_technologies", ("spring boot",)),
+    ".net": ("tools_technologies", ("dotnet", "asp.net")),
+    "postgresql": ("tools_technologies", ("postgres",)),
+    "mysql": ("tools_technologies", ()),
+    "mongodb": ("tools_technologies", ("mongo",)),
+    "redis": ("tools_technologies", ()),
+    "elasticsearch": ("tools_technologies", ("elastic", "opensearch")),
+    "kafka": ("tools_technologies", ("apache kafka",)),
+    "spark": ("tools_technologies", ("apache spark", "pyspark")),
+    "snowflake": ("tools_technologies", ()),
+    "tableau": ("tools_technologies", ()),
+    "power bi": ("tools_technologies", ("powerbi",)),
+    "microsoft excel": ("tools_technologies", ("ms excel", "advanced excel", "excel spreadsheets")),
+    "salesforce": ("tools_technologies", ("crm",)),
+    "jira": ("tools_technologies", ()),
+    "splunk": ("tools_technologies", ()),
+    "siem": ("tools_technologies", ("security information and event management",)),
+    "tensorflow": ("tools_technologies", ()),
+    "pytorch": ("tools_technologies", ()),
+    "pandas": ("tools_technologies", ()),
+    "graphql": ("tools_technologies", ()),
+    # Certifications
+    "cissp": ("certifications", ()),
+    "cism": ("certifications", ()),
+    "cisa": ("certifications", ()),
+    "ceh": ("certifications", ("certified ethical hacker",)),
+    "oscp": ("certifications", ()),
+    "security+": ("certifications", ("comptia security+", "security plus")),
+    "pmp": ("certifications", ("project management professional",)),
+    "csm": ("certifications", ("certified scrummaster", "certified scrum master")),
+    "aws certified": ("certifications", ("aws certification", "aws solutions architect")),
+    "azure certified": ("certifications", ("azure certification",)),
+    "cpa": ("certifications", ("certified public accountant",)),
+    "cfa": ("certifications", ()),
+    "six sigma": ("certifications", ("lean six sigma",)),
+    "itil": ("certifications", ()),
+    # Industry terms / frameworks
+    "agile": ("industry_terms", ("scrum", "kanban")),
+    "soc 2": ("industry_terms", ("soc2", "soc-2")),
+    "iso 27001": ("industry_terms", ("iso27001",)),
+    "nist": ("industry_terms", ("nist csf", "nist 800-53")),
+    "fedramp": ("industry_terms", ()),
+    "hipaa": ("industry_terms", ()),
+    "gdpr": ("industry_terms", ()),
+    "pci dss": ("industry_terms", ("pci", "pci-dss")),
+    "sox": ("industry_terms", ("sarbanes-oxley",)),
+    "saas": ("industry_terms", ("software as a service",)),
+    "b2b": ("industry_terms", ()),
+    "product management": ("industry_terms", ("product strategy", "product roadmap", "roadmap")),
+    "go-to-market": ("industry_terms", ("gtm", "go to market")),
+    "kpis": ("industry_terms", ("kpi", "okrs", "okr", "metrics")),
+    "budget management": ("industry_terms", ("budgeting", "p&l")),
+    "vendor management": ("industry_terms", ()),
+    "stakeholder management": ("industry_terms", ("stakeholders", "stakeholder engagement")),
+    "digital transformation": ("industry_terms", ()),
+    "customer success": ("industry_terms", ()),
+    "supply chain": ("industry_terms", ("logistics",)),
+    "financial modeling": ("industry_terms", ("financial modelling", "forecasting")),
+    "user experience": ("industry_terms", ("ux", "ui/ux", "user research")),
+    # Soft skills
+    "leadership": ("soft_skills", ("team leadership", "led teams", "people management", "managed teams")),
+    "communication": ("soft_skills", ("communication skills", "written communication", "verbal communication")),
+    "collaboration": ("soft_skills", ("cross-functional", "cross functional", "teamwork")),
+    "problem solving": ("soft_skills", ("problem-solving", "troubleshooting")),
+    "mentoring": ("soft_skills", ("mentorship", "coaching")),
+    "project management": ("soft_skills", ("program management",)),
+    "strategic planning": ("soft_skills", ("strategy", "strategic thinking")),
+    "critical thinking": ("soft_skills", ("analytical thinking", "analytical skills")),
+    "attention to detail": ("soft_skills", ("detail-oriented", "detail oriented")),
+    "adaptability": ("soft_skills", ("flexibility",)),
+    "negotiation": ("soft_skills", ()),
+    "presentation skills": ("soft_skills", ("public speaking", "presentations")),
+    "time management": ("soft_skills", ("prioritization",)),
+    "decision making": ("soft_skills", ("decision-making",)),
+    "customer focus": ("soft_skills", ("customer-centric", "customer obsession")),
+}
+
+CATEGORY_LABELS = {
+    "technical_skills": "technical skill",
+    "tools_technologies": "tool/technology",
+    "certifications": "certification",
+    "industry_terms": "industry term",
+    "soft_skills": "soft skill",
+}
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further had has
+have having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own per same she should
+so some such than that the their theirs them themselves then there these they this those through to too
+under until up us very via was we were what when where which while who whom why will with within without
+would you your yours yourself yourselves
+ability able across etc experience experienced including include includes including job join looking
+must new plus preferred required requirements responsibilities role skills strong team work working
+years year well using use used candidate candidates position opportunity company ideal ensure
+""".split())
+
+# Section keys in resume dicts -> display names used in keyword results
+SECTION_LABELS = {
+    "summary": "Professional Summary",
+    "skills": "Skills",
+    "competencies": "Skills",
+    "experience": "Experience",
+    "education": "Education",
+    "certifications": "Certifications",
+    "alignment_statement": "Company Alignment",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./&\-][a-z0-9+#]+)*[+#]*|\.net")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping C++, C#, Node.js, CI/CD, SOC-2 style tokens intact"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _phrase_key(phrase: str) -> Tuple[str, ...]:
+    return tuple(tokenize(phrase))
+
+
+def extract_ngrams(tokens: List[str], max_n: int = 3) -> Counter:
+    """Count 1..max_n word phrases that neither start nor end with a stopword"""
+    counts: Counter = Counter()
+    length = len(tokens)
+    for i in range(length):
+        if tokens[i] in STOPWORDS or tokens[i].isdigit():
+            continue
+        for n in range(1, max_n + 1):
+            j = i + n
+            if j > length:
+                break
+            last = tokens[j - 1]
+            if last in STOPWORDS:
+                continue
+            if n == 1 and len(last) < 2:
+                continue
+            counts[" ".join(tokens[i:j])] += 1
+    return counts
+
+
+@dataclass
+class Keyword:
+    """A weighted job description keyword"""
+    term: str               # Canonical term (taxonomy name or phrase)
+    category: str           # keyword_groups category
+    jd_frequency: int
+    weight: float
+    in_taxonomy: bool
+
+
+class KeywordMatcher:
+    """Deterministic keyword extraction, comparison and coverage scoring"""
+
+    # BM25 term-frequency saturation
+    K1 = 1.2
+    # Weight multiplier for terms found in the skills taxonomy
+    TAXONOMY_BOOST = 2.5
+
+    def __init__(self, taxonomy: Dict[str, Tuple[str, Tuple[str, ...]]] = None):
+        taxonomy = taxonomy or SKILLS_TAXONOMY
+        self.categories: Dict[str, str] = {}
+        # token tuple -> canonical term, for every canonical name and synonym
+        self.synonyms: Dict[Tuple[str, ...], str] = {}
+        for canonical, (category, aliases) in taxonomy.items():
+            self.categories[canonical] = category
+            for alias in (canonical,) + tuple(aliases):
+                key = _phrase_key(alias)
+                if key:
+                    self.synonyms.setdefault(key, canonical)
+        self.max_phrase_len = max((len(k) for k in self.synonyms), default=1)
+
+        self.document_frequencies: Counter = Counter()
+        self.corpus_size = 0
+
+    # ------------------------------------------------------------------
+    # Corpus statistics
+    # ------------------------------------------------------------------
+
+    def fit(self, documents: Iterable[str]) -> "KeywordMatcher":
+        """Learn document frequencies (for IDF) from a corpus of job descriptions"""
+        for doc in documents:
+            terms = set(self.taxonomy_terms(tokenize(doc))) | set(extract_ngrams(tokenize(doc)))
+            self.document_frequencies.update(terms)
+            self.corpus_size += 1
+        return self
+
+    def idf(self, term: str) -> float:
+        """BM25 IDF; 1.0 when no corpus has been fitted"""
+        if not self.corpus_size:
+            return 1.0
+        df = self.document_frequencies.get(term, 0)
+        return math.log(1 + (self.corpus_size - df + 0.5) / (df + 0.5))
+
+    # ------------------------------------------------------------------
+    # Extraction
+    # ------------------------------------------------------------------
+
+    def taxonomy_terms(self, tokens: List[str]) -> Counter:
+        """Count canonical taxonomy terms in tokens (longest synonym match wins)"""
+        counts: Counter = Counter()
+        i = 0
+        length = len(tokens)
+        while i < length:
+            matched = 0
+            for n in range(min(self.max_phrase_len, length - i), 0, -1):
+                canonical = self.synonyms.get(tuple(tokens[i:i + n]))
+                if canonical:
+                    counts[canonical] += 1
+                    matched = n
+                    break
+            i += matched or 1
+        return counts
+
+    def extract_keywords(self, job_description: str, top_n: int = 40) -> List[Keyword]:
+        """Weighted keywords of a job description, highest weight first"""
+        tokens = tokenize(job_description)
+        if not tokens:
+            return []
+
+        keywords: Dict[str, Keyword] = {}
+
+        for term, tf in self.taxonomy_terms(tokens).items():
+            keywords[term] = Keyword(
+                term=term,
+                category=self.categories[term],
+                jd_frequency=tf,
+                weight=self._bm25(tf, term) * self.TAXONOMY_BOOST,
+                in_taxonomy=True,
+            )
+
+        # Untaxonomized phrases only count when repeated (single mentions are mostly noise)
+        covered = {w for term in keywords for w in term.split()}
+        for phrase, tf in extract_ngrams(tokens).items():
+            if tf < 2 or phrase in keywords or self.synonyms.get(_phrase_key(phrase)):
+                continue
+            words = phrase.split()
+            if all(w in covered for w in words):
+                continue
+            # Longer phrases are more specific
+            keywords[phrase] = Keyword(
+                term=phrase,
+                category="industry_terms",
+                jd_frequency=tf,
+                weight=self._bm25(tf, phrase) * (1 + 0.5 * (len(words) - 1)),
+                in_taxonomy=False,
+            )
+
+        ranked = sorted(keywords.values(), key=lambda k: (-k.weight, k.term))
+
+        # Drop phrases contained in a higher-ranked phrase with the same frequency
+        selected: List[Keyword] = []
+        for kw in ranked:
+            if not kw.in_taxonomy and any(
+                f" {kw.term} " in f" {s.term} " and s.jd_frequency >= kw.jd_frequency
+                for s in selected if not s.in_taxonomy
+            ):
+                continue
+            selected.append(kw)
+            if len(selected) >= top_n:
+                break
+        return selected
+
+    def _bm25(self, tf: int, term: str) -> float:
+        return (tf * (self.K1 + 1)) / (tf + self.K1) * self.idf(term)
+
+    # ------------------------------------------------------------------
+    # Resume helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def resume_sections(resume: Dict) -> Dict[str, str]:
+        """Flatten a resume dict into plain text per section"""
+        sections: Dict[str, str] = {}
+        for key, value in (resume or {}).items():
+            if key == "contact":
+                continue
+            sections[key] = _flatten(value)
+        return sections
+
+    def term_index(self, text: str) -> Tuple[Counter, set]:
+        """Taxonomy term counts plus the set of n-gram phrases in text"""
+        tokens = tokenize(text)
+        return self.taxonomy_terms(tokens), set(extract_ngrams(tokens))
+
+    @staticmethod
+    def _contains(term: str, index: Tuple[Counter, set]) -> bool:
+        taxonomy_counts, phrases = index
+        return term in taxonomy_counts or term in phrases
+
+    # ------------------------------------------------------------------
+    # Analyses
+    # ------------------------------------------------------------------
+
+    def analyze_keywords(
+        self,
+        original_resume: Dict,
+        tailored_resume: Dict,
+        job_description: str
+    ) -> Dict:
+        """
+        Keywords from the job description that the tailored resume added
+
+        Same response shape as the LLM analysis (keyword_groups,
+        total_keywords_added, ats_optimization_score).
+        """
+        jd_keywords = self.extract_keywords(job_description)
+        original_index = self.term_index(" ".join(self.resume_sections(original_resume).values()))
+        tailored_sections = self.resume_sections(tailored_resume)
+        section_indexes = {name: self.term_index(text) for name, text in tailored_sections.items()}
+
+        groups: Dict[str, List[Dict]] = {}
+        total_weight = sum(k.weight for k in jd_keywords) or 1.0
+        covered_weight = 0.0
+
+        high_cutoff, medium_cutoff = _impact_cutoffs(jd_keywords)
+
+        for kw in jd_keywords:
+            locations = [name for name, idx in section_indexes.items() if self._contains(kw.term, idx)]
+            if not locations:
+                continue
+            covered_weight += kw.weight
+
+            if self._contains(kw.term, original_index):
+                continue  # Already in the original resume, not added by tailoring
+
+            first_section = locations[0]
+            groups.setdefault(kw.category, []).append({
+                "keyword": kw.term,
+                "why_added": _why_added(kw),
+                "jd_frequency": kw.jd_frequency,
+                "ats_impact": "high" if kw.weight >= high_cutoff else "medium" if kw.weight >= medium_cutoff else "low",
+                "location_in_resume": ", ".join(dict.fromkeys(SECTION_LABELS.get(s, s.title()) for s in locations)),
+                "context": self._context(kw.term, tailored_sections[first_section]),
+            })
+
+        keyword_groups = [
+            {"category": category, "keywords": items}
+            for category, items in sorted(groups.items(), key=lambda g: -len(g[1]))
+        ]
+
+        return {
+            "keyword_groups": keyword_groups,
+            "total_keywords_added": sum(len(g["keywords"]) for g in keyword_groups),
+            "ats_optimization_score": round(100 * covered_weight / total_weight),
+        }
+
+    def match_score(
+        self,
+        tailored_resume: Dict,
+        job_description: str,
+        job_title: str
+    ) -> Dict:
+        """
+        Weighted coverage of job description keywords by the tailored resume
+
+        Same response shape as the LLM match score (overall_score, grade,
+        category_scores, strengths, gaps, improvements, explanation).
+        """
+        jd_keywords = self.extract_keywords(job_description)
+        sections = self.resume_sections(tailored_resume)
+        full_index = self.term_index(" ".join(sections.values()))
+        experience_index = self.term_index(sections.get("experience", ""))
+
+        matched = [k for k in jd_keywords if self._contains(k.term, full_index)]
+        missing = [k for k in jd_keywords if not self._contains(k.term, full_index)]
+
+        skills = [k for k in jd_keywords if k.in_taxonomy]
+        skills_score = _coverage(skills, full_index, self._contains)
+        experience_score = _coverage(jd_keywords, experience_index, self._contains)
+        keyword_score = _coverage(jd_keywords, full_index, self._contains)
+        role_score = self._role_alignment(job_title, sections)
+
+        overall = round(
+            skills_score * 0.35 + experience_score * 0.25 + keyword_score * 0.25 + role_score * 0.15
+        )
+        overall = max(0, min(100, overall))
+
+        strengths = [
+            f"Covers '{k.term}' ({CATEGORY_LABELS.get(k.category, 'keyword')}, mentioned {k.jd_frequency}x in the job description)"
+            for k in matched[:5]
+        ]
+        gaps = [
+            f"Missing '{k.term}' ({CATEGORY_LABELS.get(k.category, 'keyword')}, mentioned {k.jd_frequency}x in the job description)"
+            for k in missing[:3]
+        ]
+
+        total_weight = sum(k.weight for k in jd_keywords) or 1.0
+        improvements = []
+        for k in missing[:5]:
+            gain = max(1, round(100 * k.weight / total_weight * 0.5))
+            improvements.append({
+                "suggestion": f"Add '{k.term}' where it reflects real experience (summary, skills or a relevant bullet)",
+                "priority": "high" if k.in_taxonomy and k.jd_frequency > 1 else "medium" if k.in_taxonomy else "low",
+                "potential_score_gain": gain,
+                "rationale": f"The job description mentions '{k.term}' {k.jd_frequency} time(s) and ATS filters match on it",
+            })
+
+        explanation = (
+            f"The tailored resume covers {len(matched)} of {len(jd_keywords)} weighted keywords from the "
+            f"job description ({keyword_score}% of keyword weight), including {len([k for k in matched if k.in_taxonomy])} "
+            f"recognized skills. Experience bullets cover {experience_score}% of the keyword weight and the "
+            f"role alignment with '{job_title}' scores {role_score}."
+        )
+        if missing:
+            explanation += " The highest-value missing terms are: " + ", ".join(k.term for k in missing[:5]) + "."
+
+        return {
+            "overall_score": overall,
+            "grade": _grade(overall),
+            "category_scores": {
+                "skills_match": skills_score,
+                "experience_relevance": experience_score,
+                "keyword_optimization": keyword_score,
+                "role_alignment": role_score,
+            },
+            "strengths": strengths,
+            "gaps": gaps,
+            "improvements": improvements,
+            "explanation": explanation,
+        }
+
+    def prompt_context(self, resume: Dict, job_description: str, top_n: int = 25) -> Dict:
+        """
+        Compact keyword pre-pass for LLM prompts
+
+        Returns the job's top keywords split into matched and missing for this
+        resume (as "term (Nx)" strings), so a prompt can include this summary
+        instead of the full resume JSON.
+        """
+        jd_keywords = self.extract_keywords(job_description, top_n=top_n)
+        full_index = self.term_index(" ".join(self.resume_sections(resume).values()))
+        matched, missing = [], []
+        for k in jd_keywords:
+            entry = f"{k.term} ({k.jd_frequency}x)"
+            (matched if self._contains(k.term, full_index) else missing).append(entry)
+        return {"matched": matched, "missing": missing}
+
+    # ------------------------------------------------------------------
+
+    def _role_alignment(self, job_title: str, sections: Dict[str, str]) -> int:
+        title_terms = [t for t in tokenize(job_title) if t not in STOPWORDS]
+        if not title_terms:
+            return 0
+        resume_tokens = set(tokenize(" ".join([
+            sections.get("summary", ""),
+            sections.get("experience", ""),
+        ])))
+        found = sum(1 for t in title_terms if t in resume_tokens)
+        return round(100 * found / len(title_terms))
+
+    def _context(self, term: str, text: str, width: int = 60) -> str:
+        """Snippet of text around the first occurrence of term or one of its synonyms"""
+        lowered = text.lower()
+        candidates = [term] + [" ".join(k) for k, v in self.synonyms.items() if v == term]
+        for candidate in candidates:
+            pos = lowered.find(candidate)
+            if pos >= 0:
+                start = max(0, pos - width)
+                end = min(len(text), pos + len(candidate) + width)
+                snippet = text[start:end].strip()
+                return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+        return ""
+
+
+def _flatten(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " | ".join(_flatten(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return " | ".join(_flatten(v) for v in value)
+    return str(value)
+
+
+def _coverage(keywords: List[Keyword], index, contains) -> int:
+    total = sum(k.weight for k in keywords)
+    if not total:
+        return 0
+    return round(100 * sum(k.weight for k in keywords if contains(k.term, index)) / total)
+
+
+def _impact_cutoffs(keywords: List[Keyword]) -> Tuple[float, float]:
+    """Weights separating the top third (high) and middle third (medium) of keywords"""
+    if not keywords:
+        return 0.0, 0.0
+    weights = sorted((k.weight for k in keywords), reverse=True)
+    third = max(1, len(weights) // 3)
+    return weights[min(third, len(weights)) - 1], weights[min(2 * third, len(weights)) - 1]
+
+
+def _why_added(keyword: Keyword) -> str:
+    label = CATEGORY_LABELS.get(keyword.category, "keyword")
+    times = "once" if keyword.jd_frequency == 1 else f"{keyword.jd_frequency} times"
+    if keyword.in_taxonomy:
+        return f"The job description asks for this {label} ({times}); ATS filters match on it"
+    return f"Phrase repeated {times} in the job description; mirroring it improves ATS keyword match"
+
+
+def _grade(score: int) -> str:
+    if score >= 90:
+        return "Excellent"
+    if score >= 80:
+        return "Very Good"
+    if score >= 70:
+        return "Good"
+    if score >= 60:
+        return "Fair"
+    return "Needs Improvement"
+
+
+# Singleton instance (created on first use, not at import time)
+_keyword_matcher_instance: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Get singleton KeywordMatcher instance"""
+    global _keyword_matcher_instance
+    if _keyword_matcher_instance is None:
+        _keyword_matcher_instance = KeywordMatcher()
+    return _keyword_matcher_instance
@@ -0,0 +1,234 @@
+"""
+Loop Monitor - event-loop lag watchdog and blocking-call detector
+
+Sync work inside `async def` (a sync OpenAI call, pdfplumber, bcrypt,
+reportlab) stalls every request on the loop, not just the one making it.
+Two pieces catch it:
+
+- A heartbeat task sleeps `interval` seconds in a loop and records how
+  late it woke up. That overshoot is the event-loop lag, kept in a
+  bounded window for percentiles.
+- A watchdog thread checks the heartbeat. Once it has been overdue for
+  `threshold` seconds, the thread grabs the loop thread's stack and the
+  request its current task is serving. When the heartbeat resumes, it
+  logs the stall with its full duration.
+
+With strict=True (LOOP_MONITOR_STRICT), stop() raises BlockingCallError
+if anything blocked, so a test run that exercises the app fails.
+
+Usage:
+    monitor = get_loop_monitor()
+    monitor.start()          # on the running loop (app startup)
+    monitor.stats()          # lag percentiles + recent blocking calls
+    await monitor.stop()     # app shutdown
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, List, Optional
+
+from app.config import get_settings
+from app.middleware.request_context import route_for_task
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Innermost frames kept from a blocked loop's stack (the culprit is searched in all of them)
+STACK_DEPTH = 25
+
+# Instrumentation that wraps the real call (profiler span hooks around HTTP sends);
+# never the culprit, so skipped like library frames
+INSTRUMENTATION_FILES = ("app/utils/profiler.py",)
+
+
+class BlockingCallError(RuntimeError):
+    """Raised by a strict monitor when something blocked the event loop"""
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoopMonitor:
+    """Event-loop lag percentiles plus stacks of calls that blocked the loop"""
+
+    def __init__(
+        self,
+        threshold_ms: float = 100,
+        interval_ms: float = 50,
+        window: int = 2048,
+        max_events: int = 50,
+        strict: bool = False
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.strict = strict
+        self._lags: Deque[float] = deque(maxlen=window)
+        self.events: Deque[dict] = deque(maxlen=max_events)
+        self.blocked_calls = 0
+        self.max_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Written by the heartbeat, read by the watchdog (plain attribute swaps are atomic)
+        self._beat: Optional[float] = None
+        self._capture: Optional[dict] = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._heartbeat = asyncio.create_task(self._run_heartbeat())
+        self._watchdog = threading.Thread(target=self._run_watchdog, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event-loop monitor started (blocking threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self):
+        """Stop monitoring; a strict monitor raises BlockingCallError if the loop was blocked"""
+        self._stopping.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+        if self.strict:
+            self.check()
+
+    def check(self):
+        """Raise BlockingCallError listing the blocking calls seen so far"""
+        if not self.blocked_calls:
+            return
+        lines = [
+            f"  {event['blocked_ms']:.0f} ms in {event['route'] or 'background task'}: {event['location']}"
+            for event in self.events
+        ]
+        raise BlockingCallError(
+            f"Event loop blocked {self.blocked_calls} time(s) for >= {self.threshold * 1000:.0f} ms:\n" + "\n".join(lines)
+        )
+
+    def reset(self):
+        """Forget recorded lag and blocking calls (between tests)"""
+        self._lags.clear()
+        self.events.clear()
+        self.blocked_calls = 0
+        self.max_lag = 0.0
+
+    def stats(self) -> dict:
+        lags = sorted(self._lags)
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(lags),
+            "lag_ms": {
+                "p50": round(_percentile(lags, 50) * 1000, 1),
+                "p95": round(_percentile(lags, 95) * 1000, 1),
+                "p99": round(_percentile(lags, 99) * 1000, 1),
+                "max": round(self.max_lag * 1000, 1),
+            },
+            "blocked_calls": self.blocked_calls,
+            "recent_blocking_calls": [
+                {key: value for key, value in event.items() if key != "stack"} for event in self.events
+            ],
+        }
+
+    async def _run_heartbeat(self):
+        while True:
+            beat = time.perf_counter()
+            self._beat = beat
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - beat - self.interval)
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                capture, self._capture = self._capture, None
+                if capture is not None and capture["beat"] != beat:
+                    capture = None
+                self._record_blocking_call(lag, capture)
+
+    def _record_blocking_call(self, lag: float, capture: Optional[dict]):
+        stack = capture["stack"] if capture else []
+        event = {
+            "at": time.time(),
+            "blocked_ms": round(lag * 1000, 1),
+            "route": capture["route"] if capture else None,
+            # Innermost frame outside the standard library is usually the offending call
+            "location": capture["location"] if capture else "unknown (blocked between watchdog checks)",
+            "stack": stack,
+        }
+        self.events.append(event)
+        self.blocked_calls += 1
+        logger.warning(
+            f"Event loop blocked for {event['blocked_ms']:.0f} ms "
+            f"in {event['route'] or 'background task'} at {event['location']}\n" + "".join(stack)
+        )
+
+    def _run_watchdog(self):
+        # Check a few times per threshold so a stall is caught while it is still happening
+        poll = max(0.005, self.threshold / 4)
+        while not self._stopping.wait(poll):
+            beat = self._beat
+            if beat is None or (self._capture is not None and self._capture["beat"] == beat):
+                continue
+            if time.perf_counter() - beat - self.interval >= self.threshold:
+                self._capture = self._capture_loop_stack(beat)
+
+    def _capture_loop_stack(self, beat: float) -> Optional[dict]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        summary = traceback.extract_stack(frame)
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        app_frames = [
+            entry for entry in summary
+            if not entry.filename.startswith("<")
+            and "site-packages" not in entry.filename and "/lib/python" not in entry.filename
+            and not entry.filename.replace("\\", "/").endswith(INSTRUMENTATION_FILES)
+        ]
+        culprit = (app_frames or summary)[-1]
+        return {
+            "beat": beat,
+            "route": route_for_task(task),
+            "location": f"{culprit.filename}:{culprit.lineno} in {culprit.name}",
+            "stack": traceback.format_list(summary[-STACK_DEPTH:]),
+        }
+
+
+# Singleton instance (created on first use, not at import time)
+_loop_monitor_instance = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get singleton LoopMonitor configured from settings"""
+    global _loop_monitor_instance
+    if _loop_monitor_instance is None:
+        settings = get_settings()
+        _loop_monitor_instance = LoopMonitor(
+            threshold_ms=settings.loop_block_threshold_ms,
+            strict=settings.loop_monitor_strict,
+        )
+    return _loop_monitor_instance
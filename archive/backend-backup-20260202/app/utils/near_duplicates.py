@@ -0,0 +1,197 @@
+"""
+Near-duplicate detection - MinHash signatures with LSH banding
+
+Syndicated news and re-published press releases rarely share a URL or an
+exact title, but they share most of their wording. Each text is reduced to
+a set of word shingles, summarised by a MinHash signature, and the signature
+is split into bands. Texts that collide in any band are candidates; a
+candidate is a duplicate when the Jaccard similarity of the shingle sets
+reaches the threshold. Duplicates are merged with union-find, so clustering
+n items costs roughly O(n) instead of comparing every pair.
+
+Usage:
+    unique = deduplicate(articles, text=lambda a: a["title"] + " " + a["summary"],
+                         rank=source_rank, exact_key=lambda a: canonical_url(a["url"]))
+"""
+
+import re
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from hashlib import shake_128
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Sequence, TypeVar
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+T = TypeVar("T")
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Upper bound on signature length (one 32-bit hash per permutation)
+MAX_PERMUTATIONS = 256
+
+# Query parameters that only track the referrer, never identify content
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_", "ref", "cmpid", "ocid")
+
+
+def canonical_url(url: str) -> str:
+    """URL without scheme, www., fragment, trailing slash or tracking parameters"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+def shingles(text: str, size: int = 2) -> FrozenSet[str]:
+    """Word shingles of text (single words when the text is shorter than size)"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        size = 1
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str, num_perm: int) -> array:
+    """num_perm independent 32-bit hashes of one shingle, cut from a single digest"""
+    return array("I", shake_128(shingle.encode()).digest(4 * num_perm))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate index
+
+    add() registers a text and merges it with any near-duplicate already in
+    the index; find() only looks. Items are identified by insertion order.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        num_perm: int = 64,
+        rows_per_band: int = 4,
+        shingle_size: int = 2
+    ):
+        if num_perm > MAX_PERMUTATIONS or num_perm % rows_per_band:
+            raise ValueError(f"num_perm must be a multiple of rows_per_band and at most {MAX_PERMUTATIONS}")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self._rows = rows_per_band
+
+        self._shingles: List[FrozenSet[str]] = []
+        self._parent: List[int] = []
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+        self._exact: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def _signature(self, shingle_set: FrozenSet[str]) -> List[int]:
+        # Column-wise minimum over the shingles' hash rows: one min-hash per permutation
+        num_perm = self.num_perm
+        rows = [_shingle_hashes(shingle, num_perm) for shingle in shingle_set]
+        return list(map(min, zip(*rows)))
+
+    def _bands(self, shingle_set: FrozenSet[str]) -> List[tuple]:
+        if not shingle_set:
+            return []
+        signature = self._signature(shingle_set)
+        rows = self._rows
+        return [(i, *signature[i:i + rows]) for i in range(0, len(signature), rows)]
+
+    def _root(self, item: int) -> int:
+        while self._parent[item] != item:
+            self._parent[item] = self._parent[self._parent[item]]
+            item = self._parent[item]
+        return item
+
+    def _union(self, a: int, b: int):
+        root_a, root_b = self._root(a), self._root(b)
+        if root_a != root_b:
+            # The earlier item stays the root, so clusters are ordered by first member
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def _matches(self, shingle_set: FrozenSet[str], bands: List[tuple], exact_key: Optional[Hashable]) -> List[int]:
+        found = []
+        if exact_key is not None and exact_key in self._exact:
+            found.append(self._exact[exact_key])
+        checked = set(found)
+        for band in bands:
+            for candidate in self._buckets.get(band, ()):
+                if candidate not in checked:
+                    checked.add(candidate)
+                    if jaccard(shingle_set, self._shingles[candidate]) >= self.threshold:
+                        found.append(candidate)
+        return found
+
+    def find(self, text: str, exact_key: Optional[Hashable] = None) -> Optional[int]:
+        """Id of the first item in the cluster text belongs to, or None if it is new"""
+        shingle_set = shingles(text, self.shingle_size)
+        found = self._matches(shingle_set, self._bands(shingle_set), exact_key)
+        return min(self._root(item) for item in found) if found else None
+
+    def add(self, text: str, exact_key: Optional[Hashable] = None) -> int:
+        """Register text and return its item id"""
+        shingle_set = shingles(text, self.shingle_size)
+        bands = self._bands(shingle_set)
+        found = self._matches(shingle_set, bands, exact_key)
+
+        item = len(self._shingles)
+        self._shingles.append(shingle_set)
+        self._parent.append(item)
+        for band in bands:
+            self._buckets[band].append(item)
+        if exact_key is not None:
+            self._exact.setdefault(exact_key, item)
+
+        for other in found:
+            self._union(item, other)
+        return item
+
+    def clusters(self) -> List[List[int]]:
+        """Item ids grouped by cluster, in order of each cluster's first item"""
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self._shingles)):
+            groups.setdefault(self._root(item), []).append(item)
+        return list(groups.values())
+
+
+def deduplicate(
+    items: Sequence[T],
+    text: Callable[[T], str],
+    rank: Optional[Callable[[T], Any]] = None,
+    exact_key: Optional[Callable[[T], Optional[Hashable]]] = None,
+    threshold: float = 0.5
+) -> List[T]:
+    """
+    One representative per near-duplicate cluster
+
+    The representative is the highest-ranked member (rank may return any
+    sortable value; the earliest member wins ties) and takes the position of
+    the cluster's first member. Items whose exact_key is equal (e.g. canonical
+    URL) are always clustered together; an empty key is ignored.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    for item in items:
+        key = exact_key(item) if exact_key else None
+        index.add(text(item), key or None)
+
+    unique = []
+    for cluster in index.clusters():
+        best = cluster[0]
+        if rank:
+            best = max(cluster, key=lambda i: (rank(items[i]), -i))
+        unique.append(items[best])
+    return unique
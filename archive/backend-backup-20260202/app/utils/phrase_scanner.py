@@ -0,0 +1,158 @@
+"""
+Phrase Scanner - single-pass multi-phrase search
+
+Finds every occurrence of a fixed set of phrases in one pass over the text,
+instead of one `str.find` per phrase:
+
+- Phrases are stored in a word trie.
+- The first words of all phrases are compiled into one character-trie regex,
+  so the regex engine (in C) jumps straight to the candidate positions.
+- From each candidate the word trie is followed to report every phrase
+  starting there, including overlapping ones ("Safety" and "Safety First").
+
+Matching is case-insensitive and always at word boundaries ("Fun" does not
+match inside "function"). Words of a phrase may be separated by any spacing
+or punctuation except a sentence break.
+
+SentenceIndex maps any character offset to its enclosing sentence with a
+binary search over boundaries computed once per text.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+# Words, keeping hyphenated/apostrophe forms together ("results-driven", "don't")
+_WORD = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+# Next word of a phrase: any separator except a sentence break, then a word
+_NEXT_WORD = re.compile(r"[^a-z0-9.!?\n]*([a-z0-9]+(?:['\-][a-z0-9]+)*)")
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """One occurrence of a phrase in the scanned text"""
+    phrase: str     # Phrase as registered (original casing)
+    start: int
+    end: int
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation for words, factored by shared prefixes (c(?:ulture|ustomer))"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict) -> str:
+        branches = []
+        optional = "" in node
+        for char in sorted(k for k in node if k):
+            branches.append(re.escape(char) + render(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return render(trie)
+
+
+class PhraseScanner:
+    """Multi-phrase matcher over a fixed phrase set, built once and reused"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = []
+
+        # Word trie as list of transition dicts; node 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[int]] = [[]]  # phrase ids ending at each node
+
+        seen = set()
+        for phrase in phrases:
+            words = tuple(_WORD.findall(phrase.lower()))
+            if not words or words in seen:
+                continue
+            seen.add(words)
+            self._insert(words, len(self.phrases))
+            self.phrases.append(phrase)
+
+        # Candidate first words, as whole words (same boundaries as _WORD)
+        self._first_word = re.compile(
+            r"(?<![a-z0-9])(?<![a-z0-9]['\-])(?:%s)(?![a-z0-9]|['\-][a-z0-9])"
+            % (_trie_pattern(self._goto[0]) or "(?!)")
+        )
+
+    def _insert(self, words: Tuple[str, ...], phrase_id: int):
+        node = 0
+        for word in words:
+            next_node = self._goto[node].get(word)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][word] = next_node
+                self._goto.append({})
+                self._output.append([])
+            node = next_node
+        self._output[node].append(phrase_id)
+
+    def scan(self, text: str) -> List[PhraseMatch]:
+        """All phrase occurrences in text, ordered by start position"""
+        goto, output, phrases = self._goto, self._output, self.phrases
+        lowered = text.lower()
+        matches: List[PhraseMatch] = []
+
+        for candidate in self._first_word.finditer(lowered):
+            start = candidate.start()
+            node = goto[0][candidate.group()]
+            end = candidate.end()
+            while True:
+                for phrase_id in output[node]:
+                    matches.append(PhraseMatch(phrases[phrase_id], start, end))
+                if not goto[node]:
+                    break
+                next_word = _NEXT_WORD.match(lowered, end)
+                if next_word is None or next_word.group(1) not in goto[node]:
+                    break
+                node = goto[node][next_word.group(1)]
+                end = next_word.end()
+
+        return matches
+
+    def first_matches(self, text: str) -> Dict[str, PhraseMatch]:
+        """First occurrence of each phrase found in text"""
+        first: Dict[str, PhraseMatch] = {}
+        for match in self.scan(text):
+            if match.phrase not in first:
+                first[match.phrase] = match
+        return first
+
+
+# Sentence terminator plus trailing space/quotes, or a run of newlines.
+# Led by a character class so the regex engine can skip ahead quickly.
+_SENTENCE_END = re.compile(r"[.!?\n](?:(?<=\n)\n*|[.!?]*[\s\"')\]]+)")
+
+
+class SentenceIndex:
+    """Sentence boundaries of a text, built once, queried by character offset"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._starts: List[int] = [0]
+        for match in _SENTENCE_END.finditer(text):
+            if match.end() < len(text):
+                self._starts.append(match.end())
+
+    def sentence_span(self, offset: int) -> Tuple[int, int]:
+        """(start, end) of the sentence containing offset"""
+        i = bisect_right(self._starts, offset) - 1
+        start = self._starts[max(i, 0)]
+        end = self._starts[i + 1] if i + 1 < len(self._starts) else len(self.text)
+        return start, end
+
+    def sentence_at(self, offset: int) -> str:
+        start, end = self.sentence_span(offset)
+        return self.text[start:end].strip()
@@ -0,0 +1,473 @@
+"""
+Request Profiler - opt-in sampling profiles of single requests
+
+A request is profiled when it carries X-Profile-Token matching
+PROFILING_TOKEN, or when it is picked at random by the sampling rate
+(PROFILING_SAMPLE_RATE, changeable at runtime by an admin). Everything
+else pays one header lookup.
+
+The task factory, sampler thread and span hooks are only installed while
+profiling is enabled (a token is configured or the sampling rate is above
+0); with both off the loop, the DB engine and the HTTP clients run
+untouched.
+
+While a profiled request runs:
+- a sampler thread snapshots the event-loop thread's stack every
+  PROFILING_INTERVAL_MS, keeping only samples where the loop is running
+  one of that request's tasks (the request task plus any task it
+  created, tracked by a task factory);
+- stage spans time DB queries, LLM and scraping HTTP calls and export
+  rendering (install_span_hooks, profile_span).
+
+Samples show CPU time on the loop; the spans show where the wall-clock
+time went (awaiting a provider, a query, a worker thread). Finished
+profiles are kept in memory (last PROFILING_MAX_STORED) and served as
+speedscope JSON from /api/admin/profiles.
+"""
+
+import asyncio
+import hmac
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.config import get_settings
+from app.utils.logger import get_logger
+
+logger = get_logger()
+
+# Bounds so one pathological request cannot grow a profile without limit
+MAX_STACK_DEPTH = 128
+MAX_SPANS = 5000
+
+# (filename, function, first line) from the root of the stack to the leaf
+StackKey = Tuple[Tuple[str, str, int], ...]
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def profile_span(stage: str, name: str):
+    """Time a block as a stage span of the current request's profile (no-op when not profiling)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(stage, name, start, time.perf_counter())
+
+
+def _stack_key(frame) -> StackKey:
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append((code.co_filename, code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(frames))
+
+
+class RequestProfile:
+    """Stack samples and stage spans recorded for one request"""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.created_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status: Optional[int] = None
+        self.stacks: Counter = Counter()  # StackKey -> sampled milliseconds
+        self.sample_count = 0
+        self.spans: List[dict] = []
+        self.dropped_spans = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.duration_ms is not None
+
+    def add_span(self, stage: str, name: str, start: float, end: float):
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped_spans += 1
+            return
+        self.spans.append({
+            "stage": stage,
+            "name": name,
+            "start_ms": round((start - self.started) * 1000, 2),
+            "duration_ms": round((end - start) * 1000, 2),
+        })
+
+    def finish(self, status: Optional[int]):
+        self.status = status
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 2)
+
+    def stage_totals(self) -> Dict[str, dict]:
+        """Span count and summed duration per stage (concurrent spans overlap, so sums can exceed wall time)"""
+        totals: Dict[str, dict] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span["stage"], {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + span["duration_ms"], 2)
+        return totals
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "samples": self.sample_count,
+            "sampled_ms": round(sum(self.stacks.values()), 2),
+            "stages": self.stage_totals(),
+        }
+
+    def speedscope(self) -> dict:
+        """Sampled profile in speedscope's file format (https://www.speedscope.app)"""
+        frames: List[dict] = []
+        frame_index: Dict[Tuple[str, str, int], int] = {}
+        samples, weights = [], []
+        for stack, weight in self.stacks.most_common():
+            indexes = []
+            for key in stack:
+                if key not in frame_index:
+                    frame_index[key] = len(frames)
+                    frames.append({"name": key[1], "file": key[0], "line": key[2]})
+                indexes.append(frame_index[key])
+            samples.append(indexes)
+            weights.append(round(weight, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path}",
+            "exporter": "resumeai-request-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path} (event loop)",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            **self.summary(),
+            "spans": self.spans,
+            "dropped_spans": self.dropped_spans,
+            "speedscope": self.speedscope(),
+        }
+
+
+class RequestProfiler:
+    """Decides which requests to profile, samples them and keeps the finished profiles"""
+
+    def __init__(self, token: str = "", sample_rate: float = 0.0, interval_ms: float = 5, max_profiles: int = 50):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.profiles: Deque[RequestProfile] = deque(maxlen=max_profiles)
+        self._active: Dict[str, RequestProfile] = {}
+        # Read by the sampler thread, written on the loop (dict lookups are atomic)
+        self._task_profiles: "weakref.WeakKeyDictionary[asyncio.Task, RequestProfile]" = weakref.WeakKeyDictionary()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._engine = None
+        self._previous_task_factory = None
+        self._sampler: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any request can be profiled (token configured or sampling on)"""
+        return bool(self.token) or self.sample_rate > 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the task factory, sampler thread and span hooks are installed"""
+        return self._sampler is not None
+
+    def start(self, engine=None):
+        """
+        Bind to the running loop (and the engine for DB spans); installs the
+        hooks right away only if profiling is enabled
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._engine = engine
+        if self.enabled:
+            self._activate()
+
+    def set_sample_rate(self, sample_rate: float):
+        """Change the sampling rate, installing or removing the hooks as profiling turns on or off"""
+        self.sample_rate = sample_rate
+        if self._loop is None:
+            return
+        if self.enabled:
+            self._activate()
+        else:
+            self._deactivate()
+
+    async def stop(self):
+        sampler = self._sampler
+        self._deactivate()
+        if sampler is not None:
+            await asyncio.to_thread(sampler.join, 1.0)
+
+    def _activate(self):
+        """Hook task creation and span sources and start the (idle) sampler thread"""
+        if self._sampler is not None:
+            return
+        if self._engine is not None:
+            install_span_hooks(self._engine)
+        self._previous_task_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        # A fresh event per thread, so a sampler still winding down never sees it cleared
+        self._stopping = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._run_sampler, args=(self._stopping,), name="request-profiler", daemon=True
+        )
+        self._sampler.start()
+        logger.info("Request profiler hooks installed")
+
+    def _deactivate(self):
+        if self._sampler is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._sampler = None
+        if self._loop is not None and self._loop.get_task_factory() == self._task_factory:
+            self._loop.set_task_factory(self._previous_task_factory)
+        remove_span_hooks()
+        logger.info("Request profiler hooks removed")
+
+    def should_profile(self, token: Optional[str]) -> Optional[str]:
+        """Trigger for a request ("header" or "sampled"), or None to run it unprofiled"""
+        if token and self.token and hmac.compare_digest(token, self.token):
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def begin(self, method: str, path: str, trigger: str) -> Tuple[RequestProfile, Token]:
+        """Start profiling the request running in the current task"""
+        profile = RequestProfile(method, path, trigger)
+        context_token = _current_profile.set(profile)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles[task] = profile
+        self._active[profile.id] = profile
+        self._wake.set()
+        return profile, context_token
+
+    def end(self, profile: RequestProfile, context_token: Token, status: Optional[int]):
+        profile.finish(status)
+        _current_profile.reset(context_token)
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_profiles.pop(task, None)
+        self._active.pop(profile.id, None)
+        self.profiles.append(profile)
+        logger.info(
+            f"Profiled {profile.method} {profile.path} ({profile.trigger}): {profile.duration_ms:.0f} ms, "
+            f"{profile.sample_count} samples, profile {profile.id}"
+        )
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        for profile in self.profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def list(self) -> List[dict]:
+        """Finished profiles, newest first"""
+        return [profile.summary() for profile in reversed(self.profiles)]
+
+    def _task_factory(self, loop, coro, context=None):
+        if self._previous_task_factory is not None:
+            if context is None:
+                task = self._previous_task_factory(loop, coro)
+            else:
+                task = self._previous_task_factory(loop, coro, context=context)
+        else:
+            task = asyncio.Task(coro, loop=loop, context=context)
+        # The new task runs in a copy of the creating context, so it serves the same request
+        profile = context.get(_current_profile) if context is not None else _current_profile.get()
+        if profile is not None and not profile.finished:
+            self._task_profiles[task] = profile
+        return task
+
+    def _run_sampler(self, stopping: threading.Event):
+        last = time.perf_counter()
+        while not stopping.is_set():
+            if not self._active:
+                self._wake.clear()
+                if not self._active and not stopping.is_set():
+                    self._wake.wait()
+                last = time.perf_counter()
+                continue
+            time.sleep(self.interval)
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000, now
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                continue
+            profile = self._task_profiles.get(task) if task is not None else None
+            if profile is None or profile.finished:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            profile.stacks[_stack_key(frame)] += elapsed_ms
+            profile.sample_count += 1
+
+
+# --- Stage span hooks ---------------------------------------------------------
+
+# Undoes install_span_hooks (None while no hooks are installed)
+_remove_hooks: Optional[Callable[[], None]] = None
+
+
+def _http_stage(url) -> str:
+    """Stage for an outbound request, from the provider base URLs in settings"""
+    settings = get_settings()
+    target = str(url)
+    if target.startswith((settings.openai_base_url, settings.perplexity_base_url)):
+        return "llm"
+    if target.startswith((settings.firecrawl_api_url, settings.screenshot_api_url)):
+        return "scrape"
+    return "http"
+
+
+def _http_span_name(method: str, url) -> str:
+    parts = urlsplit(str(url))
+    return f"{method} {parts.netloc}{parts.path}"
+
+
+def _statement_name(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()[:120]
+
+
+def install_span_hooks(engine):
+    """
+    Record DB, LLM/scraping HTTP and rendering spans for profiled requests
+
+    - DB: SQLAlchemy cursor-execute events on the app engine
+    - HTTP: httpx (OpenAI SDK, Perplexity) and requests (Firecrawl SDK)
+      sends, staged by the provider base URLs in settings
+    - Rendering: profile_span calls in the export paths
+
+    Installed by RequestProfiler while profiling is enabled; remove_span_hooks undoes it.
+    """
+    global _remove_hooks
+    if _remove_hooks is not None:
+        return
+
+    import httpx
+    import requests
+    from sqlalchemy import event
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profile_span_starts", []).append(time.perf_counter())
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        starts = conn.info.get("profile_span_starts")
+        if profile is not None and starts:
+            profile.add_span("db", _statement_name(statement), starts.pop(), time.perf_counter())
+
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_span_starts"):
+            connection.info["profile_span_starts"].pop()
+
+    httpx_send = httpx.Client.send
+    httpx_async_send = httpx.AsyncClient.send
+    requests_send = requests.Session.send
+
+    def send(self, request, **kwargs):
+        if _current_profile.get() is None:
+            return httpx_send(self, request, **kwargs)
+        with profile_span(_http_stage(request.url), _http_span_name(request.method, request.url)):
+            return httpx_send(self, request, **kwargs)
+
+    async def async_send(self, request, **kwargs):
+        if _current_profile.get() is None:
+            return await httpx_async_send(self, request, **kwargs)
+        with profile_span(_http_stage(request.url), _http_span_name(request.method, request.url)):
+            return await httpx_async_send(self, request, **kwargs)
+
+    def session_send(self, request, **kwargs):
+        if _current_profile.get() is None:
+            return requests_send(self, request, **kwargs)
+        with profile_span(_http_stage(request.url), _http_span_name(request.method, request.url)):
+            return requests_send(self, request, **kwargs)
+
+    listeners = [
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ]
+    for name, listener in listeners:
+        event.listen(engine.sync_engine, name, listener)
+    httpx.Client.send = send
+    httpx.AsyncClient.send = async_send
+    requests.Session.send = session_send
+
+    def remove():
+        for name, listener in listeners:
+            event.remove(engine.sync_engine, name, listener)
+        httpx.Client.send = httpx_send
+        httpx.AsyncClient.send = httpx_async_send
+        requests.Session.send = requests_send
+
+    _remove_hooks = remove
+
+
+def remove_span_hooks():
+    """Remove the hooks added by install_span_hooks (no-op when none are installed)"""
+    global _remove_hooks
+    if _remove_hooks is not None:
+        _remove_hooks()
+        _remove_hooks = None
+
+
+# Singleton instance (created on first use, not at import time)
+_request_profiler_instance = None
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get singleton RequestProfiler configured from settings"""
+    global _request_profiler_instance
+    if _request_profiler_instance is None:
+        settings = get_settings()
+        _request_profiler_instance = RequestProfiler(
+            token=settings.profiling_token,
+            sample_rate=settings.profiling_sample_rate,
+            interval_ms=settings.profiling_interval_ms,
+            max_profiles=settings.profiling_max_stored,
+        )
+    return _request_profiler_instance
@@ -1,5 +1,53 @@
-from typing import Dict, List
-import json
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+import re
+import sys
+
+
+# Component weights (must sum to 1.0). Pass `weights=` to re-score with different ones.
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    'completeness': 0.30,
+    'customization': 0.25,
+    'skills': 0.20,
+    'experience': 0.15,
+    'alignment': 0.10,
+}
+
+COMPONENTS: Tuple[str, ...] = tuple(DEFAULT_WEIGHTS)
+
+# Company-specific terms looked for in both the research text and the summary
+COMPANY_KEYWORDS: Tuple[str, ...] = ('mission', 'values', 'initiative', 'culture', 'vision')
+
+# Single pass over the text finds every company keyword (substring match, like `in`)
+_COMPANY_KEYWORD_PATTERN = re.compile("|".join(re.escape(k) for k in COMPANY_KEYWORDS))
+
+_REQUIRED_SECTIONS = (
+    ('summary', 30),
+    ('competencies', 25),
+    ('experience', 25),
+    ('alignment_statement', 20),
+)
+
+
+def _company_keywords_in(text: str) -> FrozenSet[str]:
+    """Company keywords occurring anywhere in text (text must be lowercase)"""
+    if not text:
+        return frozenset()
+    return frozenset(match.group(0) for match in _COMPANY_KEYWORD_PATTERN.finditer(text))
+
+
+def _skill_set(skills: Sequence) -> FrozenSet[str]:
+    """Lowercased, interned skill set for O(1) membership tests"""
+    return frozenset(sys.intern(s.lower()) for s in skills)
+
+
+class _BaseFeatures:
+    """Base resume features computed once and shared by every tailored resume in a batch"""
+    __slots__ = ('summary', 'summary_length', 'skills')
+
+    def __init__(self, base_resume_data: Dict):
+        self.summary = base_resume_data.get('summary', '')
+        self.summary_length = len(self.summary)
+        self.skills = _skill_set(base_resume_data.get('skills', []))
 
 
 class QualityScorer:
@@ -9,7 +57,8 @@ class QualityScorer:
     def calculate_quality_score(
         base_resume_data: Dict,
         tailored_content: Dict,
-        company_research: Dict = None
+        company_research: Dict = None,
+        weights: Dict[str, float] = None
     ) -> float:
         """
         Calculate quality score (0-100) for tailored resume
@@ -18,63 +67,111 @@ class QualityScorer:
             base_resume_data: Original resume data
             tailored_content: Tailored resume content from Claude
             company_research: Optional company research data
+            weights: Optional component weights (defaults to DEFAULT_WEIGHTS)
 
         Returns:
             float: Quality score between 0-100
         """
-        score = 0.0
-        max_score = 100.0
+        return QualityScorer.score_batch(base_resume_data, [tailored_content], company_research, weights)[0]
 
-        # 1. Content Completeness (30 points)
-        completeness_score = QualityScorer._score_completeness(tailored_content)
-        score += completeness_score * 0.3
+    @staticmethod
+    def score_batch(
+        base_resume_data: Dict,
+        tailored_contents: List[Dict],
+        company_research: Union[Dict, List[Optional[Dict]], None] = None,
+        weights: Dict[str, float] = None
+    ) -> List[float]:
+        """
+        Score many tailored resumes against one base resume in a single pass
 
-        # 2. Customization Depth (25 points)
-        customization_score = QualityScorer._score_customization(
-            base_resume_data,
-            tailored_content
-        )
-        score += customization_score * 0.25
+        Base resume features and company keyword sets are computed once.
 
-        # 3. Skills Matching (20 points)
-        skills_score = QualityScorer._score_skills(
-            base_resume_data,
-            tailored_content
-        )
-        score += skills_score * 0.20
+        Args:
+            base_resume_data: Original resume data
+            tailored_contents: Tailored resume contents to score
+            company_research: One research dict for all, or a list aligned with tailored_contents
+            weights: Optional component weights (defaults to DEFAULT_WEIGHTS)
 
-        # 4. Experience Relevance (15 points)
-        experience_score = QualityScorer._score_experience(tailored_content)
-        score += experience_score * 0.15
+        Returns:
+            List of scores (0-100) in the same order as tailored_contents
+        """
+        components = QualityScorer.component_scores(base_resume_data, tailored_contents, company_research)
+        return QualityScorer.combine(components, weights)
 
-        # 5. Company Alignment (10 points)
-        alignment_score = QualityScorer._score_alignment(
-            tailored_content,
-            company_research
-        )
-        score += alignment_score * 0.10
+    @staticmethod
+    def component_scores(
+        base_resume_data: Dict,
+        tailored_contents: List[Dict],
+        company_research: Union[Dict, List[Optional[Dict]], None] = None
+    ) -> List[Tuple[float, ...]]:
+        """
+        Per-component scores (0-100 each, in COMPONENTS order) for each tailored resume
+
+        Keep these to re-weight historical scores with combine() without re-scoring.
+        """
+        base = _BaseFeatures(base_resume_data)
+
+        if isinstance(company_research, list):
+            # Historical batches share research per company: match each distinct text once
+            by_text: Dict[str, Optional[FrozenSet[str]]] = {}
+            research_keywords = []
+            for research in company_research:
+                text = research.get('research', '') if isinstance(research, dict) and research else None
+                if text is None:
+                    research_keywords.append(None)
+                    continue
+                if text not in by_text:
+                    by_text[text] = QualityScorer._research_keywords(research)
+                research_keywords.append(by_text[text])
+        else:
+            research_keywords = [QualityScorer._research_keywords(company_research)] * len(tailored_contents)
+
+        return [
+            (
+                QualityScorer._score_completeness(tailored),
+                QualityScorer._score_customization_features(base, tailored),
+                QualityScorer._score_skills_features(base, tailored),
+                QualityScorer._score_experience(tailored),
+                QualityScorer._score_alignment_features(tailored, research),
+            )
+            for tailored, research in zip(tailored_contents, research_keywords)
+        ]
 
-        return min(max_score, max(0.0, score))
+    @staticmethod
+    def combine(components: List[Tuple[float, ...]], weights: Dict[str, float] = None) -> List[float]:
+        """Weighted sum of component scores, clamped to 0-100"""
+        weights = weights or DEFAULT_WEIGHTS
+        weight_vector = [weights.get(name, 0.0) for name in COMPONENTS]
+
+        scores = []
+        for row in components:
+            score = 0.0
+            for value, weight in zip(row, weight_vector):
+                score += value * weight
+            scores.append(min(100.0, max(0.0, score)))
+        return scores
+
+    @staticmethod
+    def _research_keywords(company_research: Optional[Dict]) -> Optional[FrozenSet[str]]:
+        """Company keywords present in the research text (None when no research was provided)"""
+        if not company_research or not isinstance(company_research, dict):
+            return None
+        return _company_keywords_in(company_research.get('research', '').lower())
 
     @staticmethod
     def _score_completeness(tailored_content: Dict) -> float:
         """Score based on presence of required sections (0-100)"""
         score = 0.0
-        required_sections = {
-            'summary': 30,
-            'competencies': 25,
-            'experience': 25,
-            'alignment_statement': 20
-        }
-
-        for section, weight in required_sections.items():
+
+        for section, weight in _REQUIRED_SECTIONS:
             content = tailored_content.get(section)
             if content:
                 if isinstance(content, str):
                     # String content - check length
-                    if len(content.strip()) > 50:
+                    length = len(content.strip())
+                    if length > 50:
                         score += weight
-                    elif len(content.strip()) > 10:
+                    elif length > 10:
                         score += weight * 0.5
                 elif isinstance(content, list):
                     # List content - check count
@@ -88,33 +185,32 @@ class QualityScorer:
     @staticmethod
     def _score_customization(base_resume_data: Dict, tailored_content: Dict) -> float:
         """Score based on customization depth (0-100)"""
+        return QualityScorer._score_customization_features(_BaseFeatures(base_resume_data), tailored_content)
+
+    @staticmethod
+    def _score_customization_features(base: _BaseFeatures, tailored_content: Dict) -> float:
         score = 0.0
 
         # Check if summary was customized
-        base_summary = base_resume_data.get('summary', '')
         tailored_summary = tailored_content.get('summary', '')
 
-        if tailored_summary and tailored_summary != base_summary:
+        if tailored_summary and tailored_summary != base.summary:
             # Summary was customized
-            if len(tailored_summary) > len(base_summary) * 0.8:
+            if len(tailored_summary) > base.summary_length * 0.8:
                 score += 40  # Good length
             else:
                 score += 20  # Too short
 
         # Check if experience was reframed
-        base_exp = base_resume_data.get('experience', [])
-        tailored_exp = tailored_content.get('experience', [])
-
-        if tailored_exp:
+        if tailored_content.get('experience', []):
             score += 30  # Experience section exists
 
         # Check if competencies were added/modified
-        base_skills = base_resume_data.get('skills', [])
-        tailored_competencies = tailored_content.get('competencies', [])
+        competency_count = len(tailored_content.get('competencies', []))
 
-        if len(tailored_competencies) >= 8:
+        if competency_count >= 8:
             score += 30  # Good number of competencies
-        elif len(tailored_competencies) > 0:
+        elif competency_count > 0:
             score += 15  # Some competencies
 
         return score
@@ -122,32 +218,34 @@ class QualityScorer:
     @staticmethod
     def _score_skills(base_resume_data: Dict, tailored_content: Dict) -> float:
         """Score based on skills/competencies (0-100)"""
+        return QualityScorer._score_skills_features(_BaseFeatures(base_resume_data), tailored_content)
+
+    @staticmethod
+    def _score_skills_features(base: _BaseFeatures, tailored_content: Dict) -> float:
         score = 0.0
 
-        base_skills = base_resume_data.get('skills', [])
         tailored_competencies = tailored_content.get('competencies', [])
 
         if not tailored_competencies:
             return 0.0
 
         # Score based on number of competencies
-        if len(tailored_competencies) >= 12:
+        count = len(tailored_competencies)
+        if count >= 12:
             score += 50
-        elif len(tailored_competencies) >= 8:
+        elif count >= 8:
             score += 35
-        elif len(tailored_competencies) >= 5:
+        elif count >= 5:
             score += 20
         else:
             score += 10
 
         # Score based on variety (not just copying base skills)
-        if base_skills:
-            base_skills_lower = [s.lower() for s in base_skills]
-            tailored_comp_lower = [c.lower() for c in tailored_competencies]
-
+        if base.skills:
+            base_skills = base.skills
             unique_competencies = sum(
-                1 for comp in tailored_comp_lower
-                if comp not in base_skills_lower
+                1 for comp in tailored_competencies
+                if comp.lower() not in base_skills
             )
 
             if unique_competencies >= 5:
@@ -179,11 +277,9 @@ class QualityScorer:
             score += 20
 
         # Score based on bullet point quality
-        total_bullets = 0
-        for job in experience:
-            if isinstance(job, dict):
-                bullets = job.get('bullets', [])
-                total_bullets += len(bullets)
+        total_bullets = sum(
+            len(job.get('bullets', [])) for job in experience if isinstance(job, dict)
+        )
 
         if total_bullets >= 15:
             score += 60
@@ -199,6 +295,12 @@ class QualityScorer:
     @staticmethod
     def _score_alignment(tailored_content: Dict, company_research: Dict = None) -> float:
         """Score based on company alignment (0-100)"""
+        return QualityScorer._score_alignment_features(
+            tailored_content, QualityScorer._research_keywords(company_research)
+        )
+
+    @staticmethod
+    def _score_alignment_features(tailored_content: Dict, research_keywords: Optional[FrozenSet[str]]) -> float:
         score = 0.0
 
         # Check alignment statement
@@ -212,20 +314,11 @@ class QualityScorer:
             else:
                 score += 20  # Short statement
 
-        # If company research was provided, check for company-specific keywords
-        if company_research and isinstance(company_research, dict):
-            research_text = company_research.get('research', '').lower()
-
-            # Check if summary mentions company-specific terms
-            summary = tailored_content.get('summary', '').lower()
-
-            # Simple keyword matching (could be more sophisticated)
-            company_keywords_found = 0
-            common_keywords = ['mission', 'values', 'initiative', 'culture', 'vision']
-
-            for keyword in common_keywords:
-                if keyword in research_text and keyword in summary:
-                    company_keywords_found += 1
+        # If company research was provided, count company-specific terms shared with the summary
+        if research_keywords is not None:
+            # Only the (at most 5) keywords found in the research can count
+            summary = tailored_content.get('summary', '').lower() if research_keywords else ''
+            company_keywords_found = sum(1 for keyword in research_keywords if keyword in summary)
 
             if company_keywords_found >= 2:
                 score += 40
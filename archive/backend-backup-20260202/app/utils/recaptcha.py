@@ -4,7 +4,6 @@ Server-side validation for Google reCAPTCHA v3 tokens
 """
 
 import os
-import httpx
 from typing import Tuple, Optional
 from app.utils.logger import get_logger
 
@@ -58,6 +57,9 @@ class RecaptchaVerifier:
             logger.warning("Invalid reCAPTCHA token format")
             return False, 0.0, "Invalid CAPTCHA token format"
 
+        # httpx is only needed when a token is actually verified
+        import httpx
+
         try:
             # Prepare verification request
             data = {
@@ -0,0 +1,133 @@
+"""
+Streaming JSON - incremental parsing of a JSON object as it arrives
+
+Large structured LLM responses are one JSON object whose top-level members
+are independent sections. StreamingObjectParser is fed the response text
+chunk by chunk and returns each top-level member as soon as its value is
+complete, so sections can be validated (and repaired) while the rest of the
+response is still being generated.
+
+Only the top level is tracked: a regex jumps between structural characters
+and each completed value is decoded once with json.loads, so the cost is
+linear in the response length.
+
+Usage:
+    parser = StreamingObjectParser()
+    for chunk in stream:
+        for key, value in parser.feed(chunk):
+            handle_section(key, value)
+    parser.close()  # raises ValueError when the object is incomplete
+"""
+
+import json
+import re
+from typing import Any, List, Tuple
+
+# Characters that change parser state outside / inside a string
+_STRUCTURAL = re.compile(r'["{}\[\],:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class StreamingObjectParser:
+    """Yields (key, value) for each top-level member of one streamed JSON object"""
+
+    # States at the top level of the object
+    _BEFORE, _KEY, _COLON, _VALUE, _AFTER_VALUE, _DONE = range(6)
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._state = self._BEFORE
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._key = None
+        self._value_start = 0
+        self.members: List[Tuple[str, Any]] = []
+
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the object has been read"""
+        return self._state == self._DONE
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._buf
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add text; returns the members completed by it, in order"""
+        self._buf += chunk
+        completed = []
+        buf = self._buf
+        pos = self._pos
+
+        while pos < len(buf) and self._state != self._DONE:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buf):
+                        # Escaped character not received yet
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._state == self._KEY and self._depth == 1:
+                    self._key = json.loads(buf[self._string_start:pos])
+                    self._state = self._COLON
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = match.start()
+            elif self._state == self._BEFORE:
+                if char != "{":
+                    raise ValueError(f"Expected a JSON object, got {char!r}")
+                self._depth = 1
+                self._state = self._KEY
+            elif char in "{[":
+                self._depth += 1
+            elif self._depth > 1:
+                if char in "}]":
+                    self._depth -= 1
+            elif char == ":" and self._state == self._COLON:
+                self._state = self._VALUE
+                self._value_start = pos
+            elif char in ",}":
+                if self._state == self._VALUE:
+                    value = json.loads(buf[self._value_start:match.start()])
+                    completed.append((self._key, value))
+                    # Recorded right away so members stays complete if a later one fails
+                    self.members.append((self._key, value))
+                elif char == "," or self._state != self._KEY:
+                    raise ValueError(f"Unexpected {char!r} at offset {match.start()}")
+                if char == "}":
+                    self._depth = 0
+                    self._state = self._DONE
+                else:
+                    self._state = self._KEY
+            else:
+                raise ValueError(f"Unexpected {char!r} at offset {match.start()}")
+
+        self._pos = pos
+        return completed
+
+    def close(self):
+        """Raise ValueError unless a complete object was read"""
+        if not self.done:
+            raise ValueError(
+                f"Incomplete JSON object ({len(self.members)} members read, "
+                f"{len(self._buf) - self._pos} characters pending)"
+            )
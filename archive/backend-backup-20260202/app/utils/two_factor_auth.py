@@ -4,7 +4,6 @@ TOTP-based two-factor authentication using PyOTP
 """
 
 import pyotp
-import qrcode
 import io
 import base64
 import secrets
@@ -53,7 +52,8 @@ class TwoFactorAuth:
             issuer_name=issuer_name
         )
 
-        # Generate QR code
+        # Generate QR code (qrcode/PIL loaded only when 2FA is being set up)
+        import qrcode
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_L,
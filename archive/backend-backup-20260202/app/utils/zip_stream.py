@@ -0,0 +1,84 @@
+"""
+Streaming ZIP writer
+
+Builds a ZIP archive incrementally and hands back the bytes written so far,
+so an archive can be sent through a StreamingResponse entry by entry
+without holding the whole archive in memory.
+
+zipfile writes to non-seekable streams using data descriptors, so the
+output is a standard archive readable by any unzip tool.
+"""
+
+import time
+import zipfile
+from typing import List
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting written chunks"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Incremental ZIP archive builder
+
+    Usage:
+        writer = ZipStreamWriter()
+        for name, data in files:
+            yield writer.add(name, data)
+        yield writer.close()
+    """
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w")
+        self._names = set()
+
+    def unique_name(self, name: str) -> str:
+        """Return name, or name with a _2, _3, ... suffix if already used"""
+        if name not in self._names:
+            return name
+        stem, dot, ext = name.rpartition(".")
+        if not dot:
+            stem, ext = name, ""
+        counter = 2
+        while True:
+            candidate = f"{stem}_{counter}.{ext}" if dot else f"{stem}_{counter}"
+            if candidate not in self._names:
+                return candidate
+            counter += 1
+
+    def add(self, name: str, data: bytes, compress: bool = True) -> bytes:
+        """
+        Add a file entry and return the archive bytes produced for it
+
+        Pass compress=False for payloads that are already compressed (DOCX).
+        """
+        name = self.unique_name(name)
+        self._names.add(name)
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data, compress_type=compression)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the final bytes"""
+        self._zip.close()
+        return self._sink.drain()
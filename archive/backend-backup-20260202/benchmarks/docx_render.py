@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+DOCX rendering throughput benchmark
+
+Compares documents per second for:
+- template engine (cached base document, cloned pre-styled paragraphs)
+- python-docx builder (blank Document(), styles set run by run)
+
+for both the tailored resume layout (DOCXGenerator) and the export layout
+(ResumeExportService).
+
+Usage (from the backend directory):
+    python benchmarks/docx_render.py
+    python benchmarks/docx_render.py --count 200 --json docx_render.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.docx_generator import DOCXGenerator
+from app.services.docx_template_engine import get_docx_template_engine
+from app.services.resume_export_service import ResumeExportService
+
+SAMPLE_EXPERIENCE = [
+    {
+        "header": f"Senior Security Engineer – Company {i}",
+        "title": f"Senior Security Engineer {i}",
+        "company": f"Company {i}",
+        "location": "Seattle, WA",
+        "dates": f"201{i} – 202{i}",
+        "bullets": [
+            f"Led zero-trust rollout across {20 + i} business units, cutting lateral-movement findings by {30 + i}%",
+            "Built detection pipelines on Splunk and AWS GuardDuty covering 4,000+ workloads",
+            "Mentored 6 engineers and ran quarterly red/blue team exercises",
+            "Automated compliance evidence collection for SOC 2 and FedRAMP Moderate",
+        ],
+    }
+    for i in range(5)
+]
+
+TAILORED_CONTENT = {
+    "summary": "Security engineer with 10+ years building cloud security programs at scale. " * 3,
+    "competencies": [
+        "Cloud Security", "Zero Trust", "Incident Response", "Threat Modeling", "SIEM", "Python",
+        "AWS", "Kubernetes", "Compliance", "Risk Management", "IAM", "DevSecOps",
+    ],
+    "experience": SAMPLE_EXPERIENCE,
+    "alignment_statement": "My focus on secure-by-default platforms aligns with the company's mission. " * 2,
+}
+
+BASE_RESUME_DATA = {
+    "education": "B.S. Computer Science, University of Washington",
+    "certifications": "CISSP\nAWS Certified Security – Specialty\nOSCP",
+}
+
+JOB_DETAILS = {"company": "Microsoft", "title": "Principal Security Engineer", "url": "https://careers.microsoft.com/job/123"}
+CONTACT_INFO = {"email": "sarah@example.com", "phone": "555-0100", "location": "Seattle, WA", "linkedin": ""}
+
+EXPORT_DATA = {
+    "contact": CONTACT_INFO,
+    "summary": TAILORED_CONTENT["summary"],
+    "experience": SAMPLE_EXPERIENCE,
+    "skills": TAILORED_CONTENT["competencies"],
+    "education": BASE_RESUME_DATA["education"],
+}
+
+
+def _measure(label: str, render, count: int) -> dict:
+    render()  # warm-up (also builds the cached template on first call)
+    start = time.perf_counter()
+    size = 0
+    for _ in range(count):
+        size = len(render())
+    elapsed = time.perf_counter() - start
+    return {
+        "path": label,
+        "documents": count,
+        "seconds": elapsed,
+        "docs_per_second": count / elapsed if elapsed else float("inf"),
+        "ms_per_doc": elapsed / count * 1000,
+        "bytes_per_doc": size,
+    }
+
+
+def run(count: int) -> dict:
+    generator = DOCXGenerator()
+    exporter = ResumeExportService()
+
+    start = time.perf_counter()
+    get_docx_template_engine()
+    template_build_ms = (time.perf_counter() - start) * 1000
+
+    tailored_args = ("Sarah Chen", CONTACT_INFO, JOB_DETAILS, TAILORED_CONTENT, BASE_RESUME_DATA)
+
+    results = [
+        _measure("tailored / template engine", lambda: generator._render_from_template(*tailored_args), count),
+        _measure("tailored / python-docx", lambda: generator._render_with_python_docx(*tailored_args), count),
+        _measure("export / template engine", lambda: exporter._render_docx_from_template(EXPORT_DATA, "Sarah Chen"), count),
+        _measure("export / python-docx", lambda: exporter._render_docx_with_python_docx(EXPORT_DATA, "Sarah Chen").getvalue(), count),
+    ]
+
+    return {
+        "count": count,
+        "template_build_ms": template_build_ms,
+        "results": results,
+        "speedup": {
+            "tailored": results[0]["docs_per_second"] / results[1]["docs_per_second"],
+            "export": results[2]["docs_per_second"] / results[3]["docs_per_second"],
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DOCX rendering throughput")
+    parser.add_argument("--count", type=int, default=100, help="Documents rendered per path")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    report = run(args.count)
+
+    print("=" * 60)
+    print("  DOCX RENDERING THROUGHPUT")
+    print("=" * 60)
+    print(f"Template build (once per process): {report['template_build_ms']:.1f} ms")
+    print()
+    for r in report["results"]:
+        print(f"  {r['path']:<30} {r['docs_per_second']:8.1f} docs/s  {r['ms_per_doc']:7.2f} ms/doc  {r['bytes_per_doc'] // 1024} KB")
+    print()
+    print(f"Speedup (tailored): {report['speedup']['tailored']:.1f}x")
+    print(f"Speedup (export):   {report['speedup']['export']:.1f}x")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
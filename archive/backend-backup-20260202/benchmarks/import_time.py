@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Import-time profiling harness for the API process
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and reports:
+- wall-clock cold start (median over several runs)
+- the slowest modules by cumulative import time
+- any heavy dependency that should only be loaded on first use
+
+Usage (from the backend directory):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --budget 1.0 --json import_time.json
+
+Exits with status 1 when the median cold start exceeds the budget or a lazy
+dependency is imported at startup, so it can be used as a CI benchmark gate.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Dependencies that must NOT be imported when the app module is loaded.
+# They are imported inside the functions that need them.
+LAZY_MODULES = [
+    "openai",
+    "docx",
+    "reportlab",
+    "pdfplumber",
+    "playwright",
+    "firecrawl",
+    "bs4",
+    "aiohttp",
+    "qrcode",
+]
+
+DEFAULT_TARGET = "app.main"
+DEFAULT_BUDGET_SECONDS = 1.0
+
+
+def _run_import(target: str) -> tuple:
+    """Import target in a fresh interpreter, return (wall_seconds, importtime_stderr)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(BACKEND_DIR),
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `-X importtime` output into a list of {module, self_us, cumulative_us, depth}"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+            raw_name = parts[2]
+        except (ValueError, IndexError):
+            continue
+        stripped = raw_name.lstrip(" ")
+        modules.append({
+            "module": stripped.strip(),
+            "self_us": self_us,
+            "cumulative_us": cumulative_us,
+            "depth": (len(raw_name) - len(stripped)) // 2,
+        })
+    return modules
+
+
+def profile(target: str = DEFAULT_TARGET, runs: int = 3, top: int = 15) -> dict:
+    """Profile cold start of target and return a JSON-serializable report"""
+    # Warm-up run so .pyc compilation is not counted as import time
+    _run_import(target)
+
+    wall_times = []
+    modules = []
+    for _ in range(runs):
+        elapsed, stderr = _run_import(target)
+        wall_times.append(elapsed)
+        modules = parse_importtime(stderr)
+
+    imported = {m["module"] for m in modules}
+    eager_heavy = sorted(name for name in LAZY_MODULES if name in imported)
+
+    app_modules = [m for m in modules if m["module"].startswith("app.")]
+    slowest = sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+    slowest_app = sorted(app_modules, key=lambda m: m["self_us"], reverse=True)[:top]
+
+    target_entry = next((m for m in modules if m["module"] == target), None)
+
+    return {
+        "target": target,
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "wall_seconds": {
+            "median": statistics.median(wall_times),
+            "min": min(wall_times),
+            "max": max(wall_times),
+        },
+        "import_seconds": (target_entry["cumulative_us"] / 1_000_000) if target_entry else None,
+        "module_count": len(modules),
+        "eager_heavy_modules": eager_heavy,
+        "slowest_cumulative": slowest,
+        "slowest_app_self": slowest_app,
+    }
+
+
+def print_report(report: dict, budget: float):
+    print("=" * 60)
+    print(f"  IMPORT-TIME PROFILE: {report['target']}")
+    print("=" * 60)
+    wall = report["wall_seconds"]
+    print(f"Cold start (wall, median of {report['runs']}): {wall['median']:.3f}s "
+          f"(min {wall['min']:.3f}s, max {wall['max']:.3f}s, budget {budget:.2f}s)")
+    if report["import_seconds"] is not None:
+        print(f"import {report['target']} (cumulative): {report['import_seconds']:.3f}s")
+    print(f"Modules imported: {report['module_count']}")
+    print()
+
+    print("Slowest modules (cumulative):")
+    for m in report["slowest_cumulative"]:
+        print(f"  {m['cumulative_us'] / 1000:8.1f} ms  {m['module']}")
+    print()
+
+    print("Slowest app modules (self):")
+    for m in report["slowest_app_self"]:
+        print(f"  {m['self_us'] / 1000:8.1f} ms  {m['module']}")
+    print()
+
+    if report["eager_heavy_modules"]:
+        print("✗ Heavy dependencies imported at startup (should be lazy):")
+        for name in report["eager_heavy_modules"]:
+            print(f"  - {name}")
+    else:
+        print("✓ No heavy dependencies imported at startup")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile API cold-start import time")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="Module to import (default: app.main)")
+    parser.add_argument("--runs", type=int, default=3, help="Number of measured runs")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules to list")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Maximum median cold start in seconds")
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = profile(args.target, runs=args.runs, top=args.top)
+    report["budget_seconds"] = args.budget
+    report["passed"] = (
+        report["wall_seconds"]["median"] <= args.budget
+        and not report["eager_heavy_modules"]
+    )
+
+    print_report(report, args.budget)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json_path}")
+
+    if not report["passed"]:
+        print("\n✗ Import-time benchmark FAILED")
+        return 1
+
+    print("\n✓ Import-time benchmark passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+JSON serialization benchmark for the largest API responses
+
+Measures read-to-bytes time for GET /api/interview-prep/{id} and
+GET /api/saved-comparisons/{id}:
+
+- before: JSON fields stored as TEXT and parsed with json.loads on every read
+  (prep_data decoded by the driver with json.loads), the response dict
+  walked by jsonable_encoder and encoded by json.dumps (JSONResponse)
+- after: JSON/JSONB columns decoded once by the driver with orjson, the
+  response encoded directly by ORJSONResponse
+
+Payloads are synthetic but sized like real generated preps and comparisons.
+
+Usage (from the backend directory):
+    python benchmarks/json_serialization.py
+    python benchmarks/json_serialization.py --count 500 --json json_serialization.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.utils import json_codec
+from app.utils.json_codec import ORJSONResponse
+
+
+def _experience(count: int) -> list:
+    return [
+        {
+            "header": f"Senior Security Engineer – Company {i}",
+            "company": f"Company {i}",
+            "location": "Seattle, WA",
+            "dates": f"201{i % 10} – 202{i % 10}",
+            "bullets": [
+                f"Led zero-trust rollout across {20 + i} business units, cutting lateral-movement findings by {30 + i}%",
+                "Built detection pipelines on Splunk and AWS GuardDuty covering 4,000+ workloads",
+                "Mentored 6 engineers and ran quarterly red/blue team exercises",
+                "Automated compliance evidence collection for SOC 2 and FedRAMP Moderate",
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def sample_prep_data() -> dict:
+    """Interview prep shaped like a generated one (all seven sections, long lists)"""
+    item = lambda n, kind: [
+        {"title": f"{kind} {i}", "description": f"{kind} detail {i} " * 12, "source": f"https://example.com/{kind}/{i}"}
+        for i in range(n)
+    ]
+    return {
+        "company_profile": {"name": "Acme", "industry": "Security", "overview_paragraph": "Acme builds things. " * 40},
+        "values_and_culture": {"stated_values": item(8, "value"), "practical_implications": ["Implication " * 10] * 8},
+        "strategy_and_news": {"strategic_themes": item(6, "theme"), "recent_events": item(20, "event")},
+        "role_analysis": {"core_responsibilities": ["Responsibility " * 8] * 12, "must_have_skills": ["Skill"] * 20,
+                          "likely_scorecard": item(8, "criterion")},
+        "interview_preparation": {"research_tasks": ["Task " * 10] * 10,
+                                  "practice_questions_for_candidate": ["Question " * 12] * 25},
+        "candidate_positioning": {"resume_focus_areas": ["Focus " * 10] * 8, "story_prompts": item(10, "story"),
+                                  "keyword_map": item(15, "keyword")},
+        "questions_to_ask_interviewer": {"product": ["Q " * 15] * 6, "team": ["Q " * 15] * 6,
+                                         "culture": ["Q " * 15] * 6, "performance": ["Q " * 15] * 6},
+    }
+
+
+def sample_comparison_fields() -> dict:
+    """Decoded values of a saved comparison's JSON fields"""
+    return {
+        "tags": ["FAANG", "Senior", "Applied"],
+        "skills": [f"Skill {i}" for i in range(40)],
+        "experience": _experience(8),
+        "tailored_skills": [f"Competency {i}" for i in range(30)],
+        "tailored_experience": _experience(8),
+        "analysis_data": {"sections": [{"section": f"s{i}", "explanation": "Because " * 30} for i in range(20)]},
+        "keywords_data": {"keywords": [{"keyword": f"kw{i}", "found": i % 2 == 0, "context": "ctx " * 10} for i in range(80)]},
+        "match_score_data": {"overall": 87, "breakdown": {f"c{i}": {"score": i, "notes": "note " * 15} for i in range(12)}},
+    }
+
+
+def comparison_response(fields: dict) -> dict:
+    return {
+        "comparison_id": 1, "title": "Google SWE Application", "notes": "notes", "tags": fields["tags"],
+        "is_pinned": False, "saved_at": datetime(2026, 1, 15, 12, 0, 0),
+        "job": {"company": "Acme", "title": "Security Engineer", "url": "https://example.com/job", "description": "JD " * 400},
+        "base_resume": {"summary": "Summary " * 40, "skills": fields["skills"], "experience": fields["experience"]},
+        "tailored_resume": {"summary": "Tailored " * 40, "skills": fields["tailored_skills"],
+                            "experience": fields["tailored_experience"]},
+        "edits": [],
+        "analysis": fields["analysis_data"], "keywords": fields["keywords_data"], "match_score": fields["match_score_data"],
+    }
+
+
+def _measure(label: str, fn, count: int) -> dict:
+    fn()  # warm-up
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        body = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "path": label,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "bytes": len(body),
+    }
+
+
+def run(count: int) -> dict:
+    prep_data = sample_prep_data()
+    prep_text = json.dumps(prep_data)  # what the database holds
+
+    def prep_before():
+        data = json.loads(prep_text)
+        content = {"success": True, "interview_prep_id": 1, "prep_data": data, "created_at": "2026-01-15T12:00:00"}
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def prep_after():
+        data = json_codec.loads(prep_text)
+        content = {"success": True, "interview_prep_id": 1, "prep_data": data, "created_at": "2026-01-15T12:00:00"}
+        return ORJSONResponse(content).body
+
+    fields = sample_comparison_fields()
+    field_texts = {name: json.dumps(value) for name, value in fields.items()}
+
+    def comparison_before():
+        decoded = {name: json.loads(text) for name, text in field_texts.items()}
+        return JSONResponse(jsonable_encoder(comparison_response(decoded))).body
+
+    def comparison_after():
+        decoded = {name: json_codec.loads(text) for name, text in field_texts.items()}
+        return ORJSONResponse(comparison_response(decoded)).body
+
+    results = [
+        _measure("interview prep: before", prep_before, count),
+        _measure("interview prep: after", prep_after, count),
+        _measure("saved comparison: before", comparison_before, count),
+        _measure("saved comparison: after", comparison_after, count),
+    ]
+    return {
+        "count": count,
+        "results": results,
+        "speedup": {
+            "interview_prep": round(results[0]["p50_ms"] / results[1]["p50_ms"], 1),
+            "saved_comparison": round(results[2]["p50_ms"] / results[3]["p50_ms"], 1),
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of large API responses")
+    parser.add_argument("--count", type=int, default=300, help="Responses encoded per path")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    report = run(args.count)
+
+    print("=" * 60)
+    print("  JSON SERIALIZATION (read -> response bytes)")
+    print("=" * 60)
+    for r in report["results"]:
+        print(f"  {r['path']:<28} p50 {r['p50_ms']:7.3f} ms  p95 {r['p95_ms']:7.3f} ms  {r['bytes'] // 1024} KB")
+    print()
+    print(f"Speedup (interview prep):   {report['speedup']['interview_prep']:.1f}x")
+    print(f"Speedup (saved comparison): {report['speedup']['saved_comparison']:.1f}x")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Keyword matcher benchmark
+
+Runs the local KeywordMatcher over stored tailored resumes and their job
+descriptions and reports:
+- latency of analyze_keywords and match_score (p50/p95/max)
+- prompt size of the hybrid pre-pass vs. the full resume JSON sent to GPT
+- score distribution, with and without IDF fitted on the job corpus
+
+Uses the database from DATABASE_URL (same as the app). When it holds fewer
+than --min-pairs tailored resumes, a synthetic corpus is generated so the
+benchmark still runs on a fresh checkout.
+
+Usage (from the backend directory):
+    python benchmarks/keyword_match.py
+    python benchmarks/keyword_match.py --limit 500 --json keyword_match.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.keyword_matcher import KeywordMatcher, SKILLS_TAXONOMY
+
+
+async def load_corpus(limit: int) -> list:
+    """Load (original_resume, tailored_resume, job_description, job_title) from the database"""
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models import TailoredResume, Job, BaseResume
+    from app.utils.json_codec import json_value
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(TailoredResume, Job, BaseResume)
+            .join(Job, TailoredResume.job_id == Job.id)
+            .join(BaseResume, TailoredResume.base_resume_id == BaseResume.id)
+            .where(Job.description.isnot(None))
+            .limit(limit)
+        )
+        corpus = []
+        for tailored, job, base in result.all():
+            original = {
+                "summary": base.summary or "",
+                "skills": json_value(base.skills, []),
+                "experience": json_value(base.experience, []),
+                "education": base.education or "",
+                "certifications": base.certifications or "",
+            }
+            tailored_data = {
+                "summary": tailored.tailored_summary or "",
+                "skills": json_value(tailored.tailored_skills, []),
+                "experience": json_value(tailored.tailored_experience, []),
+                "education": base.education or "",
+                "certifications": base.certifications or "",
+            }
+            corpus.append((original, tailored_data, job.description, job.title or ""))
+        return corpus
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> list:
+    """Generate job descriptions and resumes from the skills taxonomy"""
+    rng = random.Random(seed)
+    terms = list(SKILLS_TAXONOMY)
+    titles = ["Senior Software Engineer", "Security Engineer", "Data Scientist", "Product Manager", "DevOps Engineer"]
+    filler = (
+        "You will partner with stakeholders across the business to deliver reliable products. "
+        "The ideal candidate thrives in a fast-paced environment and owns outcomes end to end. "
+    )
+
+    corpus = []
+    for _ in range(size):
+        title = rng.choice(titles)
+        required = rng.sample(terms, 18)
+        jd = (
+            f"{title}. We are hiring a {title} to join our platform team. " + filler * 3
+            + "Requirements: " + ", ".join(required) + ". "
+            + "Nice to have: " + ", ".join(rng.sample(terms, 6)) + ". "
+            + f"As a {title} you will use {required[0]} and {required[1]} daily. " + filler * 2
+        )
+        known = rng.sample(required, 8) + rng.sample(terms, 4)
+        added = rng.sample(required, 6)
+        bullets = [
+            f"Delivered {rng.randint(2, 40)} projects using {rng.choice(known)} and {rng.choice(known)}, "
+            f"improving throughput by {rng.randint(5, 60)}% while partnering with product, design and operations"
+            for _ in range(16)
+        ]
+        original = {
+            "summary": f"Engineer with {rng.randint(3, 15)} years of experience in {known[0]} and {known[1]}.",
+            "skills": known,
+            "experience": [{"header": f"Engineer - Company {i}", "bullets": bullets[i::4]} for i in range(4)],
+            "education": "B.S. Computer Science",
+            "certifications": "",
+        }
+        tailored = {
+            "summary": f"{title} with deep expertise in {', '.join(added[:3])} and {known[0]}.",
+            "skills": known + added,
+            "experience": [
+                {"header": f"{title} - Company {i}", "bullets": bullets[i::4] + [f"Led adoption of {added[i + 2]}"]}
+                for i in range(4)
+            ],
+            "education": "B.S. Computer Science",
+            "certifications": "",
+        }
+        corpus.append((original, tailored, jd, title))
+    return corpus
+
+
+def _percentiles(samples_ms: list) -> dict:
+    ordered = sorted(samples_ms)
+    return {
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max_ms": ordered[-1],
+    }
+
+
+def run(corpus: list, matcher: KeywordMatcher) -> dict:
+    keyword_ms, score_ms, scores = [], [], []
+    full_prompt_chars, prepass_chars = 0, 0
+
+    for original, tailored, jd, title in corpus:
+        start = time.perf_counter()
+        matcher.analyze_keywords(original, tailored, jd)
+        keyword_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        result = matcher.match_score(tailored, jd, title)
+        score_ms.append((time.perf_counter() - start) * 1000)
+        scores.append(result["overall_score"])
+
+        full_prompt_chars += len(json.dumps(original)) + len(json.dumps(tailored))
+        prepass_chars += len(json.dumps(matcher.prompt_context(original, jd))) + len(json.dumps(matcher.prompt_context(tailored, jd)))
+
+    return {
+        "analyze_keywords": _percentiles(keyword_ms),
+        "match_score": _percentiles(score_ms),
+        "score_mean": statistics.mean(scores),
+        "score_stdev": statistics.pstdev(scores),
+        "prompt_chars_full": full_prompt_chars,
+        "prompt_chars_prepass": prepass_chars,
+        "prompt_reduction": 1 - prepass_chars / full_prompt_chars if full_prompt_chars else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the local keyword matcher")
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum stored resumes to load")
+    parser.add_argument("--min-pairs", type=int, default=50, help="Use a synthetic corpus below this many stored pairs")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    try:
+        corpus = asyncio.run(load_corpus(args.limit))
+        source = "database"
+    except Exception as e:
+        print(f"Could not load corpus from database ({e})")
+        corpus = []
+
+    if len(corpus) < args.min_pairs:
+        print(f"{len(corpus)} stored pairs found, using synthetic corpus of {args.min_pairs * 4}")
+        corpus = synthetic_corpus(args.min_pairs * 4)
+        source = "synthetic"
+
+    plain = run(corpus, KeywordMatcher())
+
+    start = time.perf_counter()
+    fitted_matcher = KeywordMatcher().fit(jd for _, _, jd, _ in corpus)
+    fit_ms = (time.perf_counter() - start) * 1000
+    fitted = run(corpus, fitted_matcher)
+
+    report = {"source": source, "pairs": len(corpus), "idf_fit_ms": fit_ms, "default": plain, "idf_fitted": fitted}
+
+    print("=" * 60)
+    print(f"  KEYWORD MATCHER ({source}, {len(corpus)} resume/job pairs)")
+    print("=" * 60)
+    for label, r in (("default", plain), ("idf fitted", fitted)):
+        print(f"{label}:")
+        print(f"  analyze_keywords  p50 {r['analyze_keywords']['p50_ms']:.2f} ms  p95 {r['analyze_keywords']['p95_ms']:.2f} ms")
+        print(f"  match_score       p50 {r['match_score']['p50_ms']:.2f} ms  p95 {r['match_score']['p95_ms']:.2f} ms")
+        print(f"  score mean {r['score_mean']:.1f} (stdev {r['score_stdev']:.1f})")
+    print(f"IDF fit: {fit_ms:.1f} ms")
+    print(f"Hybrid prompt size: {plain['prompt_chars_prepass']:,} vs {plain['prompt_chars_full']:,} chars "
+          f"({plain['prompt_reduction'] * 100:.0f}% smaller)")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the API against stubbed providers
+
+Boots the app in-process on SQLite (or a local PostgreSQL via
+--database-url), points every provider at fake_providers with a realistic
+latency profile, and has N virtual users replay the main user journey
+concurrently:
+
+    upload resume -> tailor -> analyze-all -> interview prep -> export (docx)
+    -> re-read tailored resume and interview prep
+
+Reports:
+- throughput (journeys/s, requests/s) and p50/p95/p99 latency per endpoint
+- event-loop lag of the serving loop (sampled every 10 ms) and peak RSS
+- request / token counts seen by each fake provider
+
+Results can be stored as JSON and compared with an earlier run.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --users 20 --iterations 3 --json load.json
+    python benchmarks/load_test.py --compare load.json
+    python benchmarks/load_test.py --database-url postgresql+asyncpg://localhost/talor_bench
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from cryptography.fernet import Fernet
+
+from fake_providers import FakeProviderServer, LatencyDistribution, ProviderProfile
+
+JOB_DESCRIPTION = """Senior Security Engineer - Acme Corp
+
+Acme is hiring a Senior Security Engineer to lead cloud security for our payments platform.
+Responsibilities: design zero-trust architecture across AWS, own detection and response,
+run threat modeling with product teams, automate compliance evidence (SOC 2, PCI DSS).
+Requirements: 6+ years in security engineering, Python, Terraform, Kubernetes, SIEM
+(Splunk), incident response leadership, excellent communication with executives.
+"""
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def summarize(values_ms: List[float]) -> Dict[str, float]:
+    values = sorted(values_ms)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "p99_ms": round(percentile(values, 99), 1),
+        "max_ms": round(values[-1], 1) if values else 0.0,
+        "mean_ms": round(statistics.fmean(values), 1) if values else 0.0,
+    }
+
+
+def build_resume_docx(index: int) -> bytes:
+    """A small but realistic resume document"""
+    from docx import Document
+
+    document = Document()
+    document.add_heading(f"Jordan Example {index}", level=0)
+    document.add_paragraph(f"jordan{index}@example.com | (555) 010-{index:04d} | Seattle, WA")
+    document.add_heading("Summary", level=1)
+    document.add_paragraph(
+        "Security engineer with 8 years of experience building detection pipelines, "
+        "leading incident response and rolling out zero-trust controls in AWS."
+    )
+    document.add_heading("Skills", level=1)
+    document.add_paragraph("Python, Terraform, Kubernetes, AWS, Splunk, Incident Response, Threat Modeling")
+    document.add_heading("Experience", level=1)
+    for company in ("Globex", "Initech", "Umbrella"):
+        document.add_paragraph(f"Security Engineer - {company} (2018 - 2024)")
+        for bullet in (
+            "Built SIEM detections covering 4,000+ workloads",
+            "Led 30+ incident investigations end to end",
+            "Automated SOC 2 evidence collection, saving 200 hours per audit",
+        ):
+            document.add_paragraph(bullet, style="List Bullet")
+    document.add_heading("Education", level=1)
+    document.add_paragraph("B.S. Computer Science, University of Washington")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class LoopLagMonitor:
+    """Samples how late a 10 ms sleep wakes up on the serving event loop"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples_ms: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples_ms.append(max(0.0, (loop.time() - expected) * 1000))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+
+class RSSMonitor:
+    """Peak resident set size of this process (and its export workers)"""
+
+    @staticmethod
+    def current_mb() -> float:
+        try:
+            with open("/proc/self/statm") as statm:
+                pages = int(statm.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+        except (OSError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def peak_mb() -> Dict[str, float]:
+        try:
+            import resource
+        except ImportError:  # not available on Windows
+            return {"self": 0.0, "children": 0.0}
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {
+            "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+            "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+        }
+
+
+class LoadTest:
+    """Virtual users replaying the user journey against the in-process app"""
+
+    def __init__(self, app, users: int, iterations: int):
+        import httpx
+
+        self.app = app
+        self.users = users
+        self.iterations = iterations
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False), base_url="http://loadtest", timeout=300
+        )
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.failures: Dict[str, str] = {}
+        self.journeys = 0
+        self.failed_journeys = 0
+
+    async def request(self, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.latencies[name].append((time.perf_counter() - start) * 1000)
+        self.statuses[name][response.status_code] += 1
+        if response.status_code >= 400:
+            self.failures.setdefault(name, f"{response.status_code}: {response.text[:300]}")
+            raise RuntimeError(f"{name} returned {response.status_code}")
+        return response
+
+    async def journey(self, user: int, iteration: int):
+        headers = {"X-User-ID": f"user_loadtest{user:04d}"}
+        upload = await self.request(
+            "POST /api/resumes/upload", "POST", "/api/resumes/upload", headers=headers,
+            files={"file": (f"resume_{user}_{iteration}.docx", build_resume_docx(user),
+                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document")},
+        )
+        resume_id = upload.json()["resume_id"]
+
+        tailored = await self.request(
+            "POST /api/tailor/tailor", "POST", "/api/tailor/tailor", headers=headers,
+            json={"base_resume_id": resume_id, "company": f"Acme {iteration}",
+                  "job_title": "Senior Security Engineer", "job_description": JOB_DESCRIPTION},
+        )
+        tailored_id = tailored.json()["tailored_resume_id"]
+
+        await self.request(
+            "POST /api/resume-analysis/analyze-all", "POST", "/api/resume-analysis/analyze-all",
+            headers=headers, json={"tailored_resume_id": tailored_id},
+        )
+        await self.request(
+            "POST /api/interview-prep/generate/{id}", "POST", f"/api/interview-prep/generate/{tailored_id}",
+            headers=headers,
+        )
+        await self.request(
+            "POST /api/resume-analysis/export", "POST", "/api/resume-analysis/export",
+            headers=headers, json={"tailored_resume_id": tailored_id, "format": "docx"},
+        )
+        await self.request("GET /api/tailor/tailored/{id}", "GET", f"/api/tailor/tailored/{tailored_id}",
+                           headers=headers)
+        await self.request("GET /api/interview-prep/{id}", "GET", f"/api/interview-prep/{tailored_id}",
+                           headers=headers)
+
+    async def user(self, user: int):
+        for iteration in range(self.iterations):
+            start = time.perf_counter()
+            try:
+                await self.journey(user, iteration)
+                self.latencies["journey"].append((time.perf_counter() - start) * 1000)
+                self.journeys += 1
+            except Exception as e:
+                self.failed_journeys += 1
+                if not isinstance(e, RuntimeError):
+                    self.failures.setdefault("journey", f"{type(e).__name__}: {e}")
+
+    async def run(self) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(*(self.user(u) for u in range(self.users)))
+        await self.client.aclose()
+        return time.perf_counter() - start
+
+
+async def run_load_test(args, server: FakeProviderServer) -> dict:
+    rss_before = RSSMonitor.current_mb()
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            # The app prints every pipeline step; keep the report readable
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+            stack.enter_context(contextlib.redirect_stderr(devnull))
+
+        # Settings are read when the app is imported: environment first
+        from app.main import app
+
+        await app.router.startup()
+        lag = LoopLagMonitor()
+        lag.start()
+        test = LoadTest(app, args.users, args.iterations)
+        elapsed = await test.run()
+        await lag.stop()
+        await app.router.shutdown()
+
+    # The app's own watchdog names what blocked the loop (last events only)
+    from app.utils.loop_monitor import get_loop_monitor
+    watchdog = get_loop_monitor().stats()
+    blocking: Dict[str, dict] = {}
+    for event in watchdog["recent_blocking_calls"]:
+        entry = blocking.setdefault(event["location"], {"count": 0, "max_ms": 0.0, "routes": set()})
+        entry["count"] += 1
+        entry["max_ms"] = max(entry["max_ms"], event["blocked_ms"])
+        entry["routes"].add(event["route"] or "background task")
+
+    requests = sum(len(v) for k, v in test.latencies.items() if k != "journey")
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "journeys": test.journeys,
+        "failed_journeys": test.failed_journeys,
+        "throughput": {
+            "journeys_per_s": round(test.journeys / elapsed, 3),
+            "requests_per_s": round(requests / elapsed, 2),
+        },
+        "endpoints": {
+            name: {**summarize(values), "statuses": dict(test.statuses.get(name, {}))}
+            for name, values in test.latencies.items()
+        },
+        "failures": test.failures,
+        "event_loop_lag": summarize(lag.samples_ms),
+        "blocking_calls": {
+            "total": watchdog["blocked_calls"],
+            "recent_by_location": {
+                location: {**entry, "routes": sorted(entry["routes"])}
+                for location, entry in sorted(blocking.items(), key=lambda item: -item[1]["max_ms"])
+            },
+        },
+        "rss_mb": {"before": round(rss_before, 1), "after": round(RSSMonitor.current_mb(), 1),
+                   "peak": RSSMonitor.peak_mb()},
+        "providers": server.stats(),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    results = report["results"]
+    print("=" * 60)
+    print("  LOAD TEST")
+    print("=" * 60)
+    config = report["config"]
+    print(f"  {config['users']} users x {config['iterations']} journeys, database {config['database']}")
+    print(f"  providers: latency {config['provider_latency']}, {config['tokens_per_second']:g} tok/s, "
+          f"error rate {config['error_rate']:g}")
+    print()
+    print(f"Journeys:   {results['journeys']} ok, {results['failed_journeys']} failed in {results['elapsed_s']} s")
+    print(f"Throughput: {results['throughput']['journeys_per_s']} journeys/s, "
+          f"{results['throughput']['requests_per_s']} requests/s")
+    print()
+
+    base_endpoints = (baseline or {}).get("results", {}).get("endpoints", {})
+    header = f"  {'endpoint':<42} {'n':>4} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header + ("   p95 vs baseline" if baseline else ""))
+    for name, stats in results["endpoints"].items():
+        line = f"  {name:<42} {stats['count']:>4} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        previous = base_endpoints.get(name)
+        if previous and previous.get("p95_ms"):
+            change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"   {change:+6.1f}%"
+        print(line)
+    print()
+
+    lag = results["event_loop_lag"]
+    print(f"Event-loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms "
+          f"({lag['count']} samples)")
+    blocking = results.get("blocking_calls")
+    if blocking and blocking["total"]:
+        print(f"Blocking calls: {blocking['total']} (slowest recent first)")
+        for location, entry in list(blocking["recent_by_location"].items())[:5]:
+            print(f"  {entry['max_ms']:>8.0f} ms x{entry['count']:<3} {location} ({', '.join(entry['routes'])})")
+    rss = results["rss_mb"]
+    print(f"RSS: {rss['before']} MB before, {rss['after']} MB after, peak {rss['peak']['self']} MB "
+          f"(export workers peak {rss['peak']['children']} MB)")
+    calls = ", ".join(f"{name} {stats['requests']}" for name, stats in results["providers"].items())
+    print(f"Provider calls: {calls}")
+
+    if results["failures"]:
+        print()
+        print("First failure per endpoint:")
+        for name, detail in results["failures"].items():
+            print(f"  {name}: {detail}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end load test against stubbed providers")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=2, help="Journeys per user")
+    parser.add_argument("--database-url", help="Database to use (default: a fresh SQLite file)")
+    parser.add_argument("--provider-latency", default="lognormal:400:1500",
+                        help="Fake provider latency spec, ms (see fake_providers.profile)")
+    parser.add_argument("--tokens-per-second", type=float, default=300, help="Fake LLM token rate")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake provider error rate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own output")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier --json results to compare p95 latencies with")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    json_path = Path(args.json_path).resolve() if args.json_path else None
+
+    workdir = tempfile.TemporaryDirectory(prefix="loadtest_")
+    # SQLite allows one writer; wait for the lock like a real deployment would rather than fail fast
+    database_url = args.database_url or f"sqlite+aiosqlite:///{workdir.name}/loadtest.db?timeout=60"
+
+    profile = lambda: ProviderProfile(
+        latency=LatencyDistribution.parse(args.provider_latency),
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    profiles = {"openai": profile(), "perplexity": profile(), "firecrawl": profile(), "screenshot": profile()}
+
+    with FakeProviderServer(profiles) as server:
+        os.environ.update(server.env())
+        os.environ.update({
+            "DATABASE_URL": database_url,
+            "TEST_MODE": "false",
+            "RATE_LIMIT_ENABLED": "false",
+            # Uploads are encrypted at rest; one key for the whole run
+            "FILE_ENCRYPTION_KEY": os.getenv("FILE_ENCRYPTION_KEY") or Fernet.generate_key().decode(),
+        })
+        # Uploads, logs and .env lookups stay inside the scratch directory
+        os.chdir(workdir.name)
+        results = asyncio.run(run_load_test(args, server))
+
+    report = {
+        "benchmark": "load_test",
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "users": args.users,
+            "iterations": args.iterations,
+            "database": database_url.split("://")[0],
+            "provider_latency": args.provider_latency,
+            "tokens_per_second": args.tokens_per_second,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    print_report(report, baseline)
+
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {json_path}")
+
+    workdir.cleanup()
+    return 0 if results["failed_journeys"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
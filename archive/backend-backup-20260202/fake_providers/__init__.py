@@ -0,0 +1,29 @@
+"""
+Fake providers - local stand-ins for the external APIs the backend calls
+
+ASGI apps implementing the parts of OpenAI (chat completions with JSON mode
+and streaming), Perplexity (sonar with citations), Firecrawl (v2 scrape /
+extract) and the screenshot API the services use, with configurable
+latency distributions, error rates and token rates. Point the backend at
+them through the *_BASE_URL / *_API_URL settings for offline throughput and
+concurrency testing. See fake_providers.server for how to run them.
+"""
+
+from fake_providers.chat import openai_router, perplexity_router
+from fake_providers.firecrawl_api import firecrawl_router
+from fake_providers.profile import LatencyDistribution, ProviderProfile, ProviderStats
+from fake_providers.screenshot_api import screenshot_router
+from fake_providers.server import FakeProviderServer, create_app, provider_env
+
+__all__ = [
+    "LatencyDistribution",
+    "ProviderProfile",
+    "ProviderStats",
+    "FakeProviderServer",
+    "create_app",
+    "provider_env",
+    "openai_router",
+    "perplexity_router",
+    "firecrawl_router",
+    "screenshot_router",
+]
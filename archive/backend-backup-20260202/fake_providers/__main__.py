@@ -0,0 +1,5 @@
+import sys
+
+from fake_providers.server import main
+
+sys.exit(main())
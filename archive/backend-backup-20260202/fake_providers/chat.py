@@ -0,0 +1,223 @@
+"""
+Fake chat-completions endpoints: OpenAI and Perplexity
+
+- OpenAI:     POST /v1/chat/completions
+- Perplexity: POST /chat/completions (same wire format plus citations and
+  search_results, like the sonar models)
+
+Both handle plain text, JSON mode (response_format json_object, or
+json_schema with a schema to satisfy) and streaming (SSE chunks paced at
+the profile's token rate, with usage when stream_options.include_usage is
+set). Injected errors use the OpenAI error body. 429s come back at once
+with Retry-After, other statuses after the latency sample.
+"""
+
+import asyncio
+import json
+import math
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from fake_providers.content import CHARS_PER_TOKEN, estimate_tokens, example_json, filler_text, from_schema
+from fake_providers.profile import ProviderProfile
+
+# A responder may return the completion text for a request (None = default content)
+Responder = Callable[[Dict[str, Any]], Optional[str]]
+
+# Streamed chunks are batched so a fast token rate does not mean thousands of sleeps
+_MIN_CHUNK_INTERVAL = 0.02
+
+_ERROR_TYPES = {
+    400: "invalid_request_error",
+    429: "rate_limit_exceeded",
+    500: "server_error",
+    503: "service_unavailable",
+}
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        # Multi-part (vision) messages: only the text parts count
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def error_response(status: int, message: str = "") -> JSONResponse:
+    kind = _ERROR_TYPES.get(status, "api_error")
+    headers = {"Retry-After": "1"} if status == 429 else None
+    return JSONResponse(
+        {"error": {"message": message or f"Injected {kind} from fake provider", "type": kind, "code": kind}},
+        status_code=status,
+        headers=headers,
+    )
+
+
+class ChatCompletions:
+    """Chat-completions handler for one fake provider"""
+
+    def __init__(
+        self,
+        profile: ProviderProfile,
+        default_model: str,
+        responder: Optional[Responder] = None,
+        extra_fields: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        self.profile = profile
+        self.default_model = default_model
+        self.responder = responder
+        self.extra_fields = extra_fields or dict
+
+    def completion_text(self, body: Dict[str, Any]) -> str:
+        if self.responder is not None:
+            text = self.responder(body)
+            if text is not None:
+                return text
+
+        rng = self.profile.rng
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = (response_format.get("json_schema") or {}).get("schema") or {}
+            return json.dumps(from_schema(schema, rng))
+        if response_format.get("type") == "json_object":
+            prompt = "\n".join(_message_text(m) for m in body.get("messages", []))
+            value = example_json(prompt)
+            return json.dumps(value if value is not None else {"result": filler_text(40, rng)})
+
+        limit = body.get("max_completion_tokens") or body.get("max_tokens") or self.profile.completion_tokens
+        return filler_text(min(limit, self.profile.completion_tokens), rng)
+
+    async def __call__(self, request: Request):
+        """Answer one chat-completions request"""
+        profile, stats = self.profile, self.profile.stats
+        stats.requests += 1
+        try:
+            body = await request.json()
+        except ValueError:
+            stats.errors += 1
+            return error_response(400, "Request body is not valid JSON")
+        if not body.get("messages"):
+            stats.errors += 1
+            return error_response(400, "messages is required")
+
+        status = profile.pick_error()
+        if status == 429:
+            stats.errors += 1
+            return error_response(status)
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        handed_off = False  # a started stream decrements in_flight itself
+        try:
+            await profile.wait()
+            if status is not None:
+                stats.errors += 1
+                return error_response(status)
+
+            prompt_tokens = sum(estimate_tokens(_message_text(m)) for m in body["messages"])
+            text = self.completion_text(body)
+            completion_tokens = estimate_tokens(text)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+            meta = {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "created": int(time.time()),
+                "model": body.get("model") or self.default_model,
+                **self.extra_fields(),
+            }
+
+            if body.get("stream"):
+                stats.streams += 1
+                include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                handed_off = True
+                return StreamingResponse(
+                    self._stream(text, meta, usage if include_usage else None),
+                    media_type="text/event-stream",
+                )
+
+            await asyncio.sleep(profile.generation_time(completion_tokens))
+            return JSONResponse({
+                **meta,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text, "refusal": None},
+                    "logprobs": None,
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+        finally:
+            if not handed_off:
+                stats.in_flight -= 1
+
+    async def _stream(self, text: str, meta: Dict[str, Any], usage: Optional[Dict[str, int]]):
+        def event(choices: List[dict], **fields) -> bytes:
+            chunk = {**meta, "object": "chat.completion.chunk", "choices": choices, **fields}
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        tokens_per_second = self.profile.tokens_per_second
+        if tokens_per_second > 0:
+            interval = max(_MIN_CHUNK_INTERVAL, 1 / tokens_per_second)
+            batch = max(1, math.ceil(tokens_per_second * interval))
+        else:
+            interval, batch = 0.0, 16
+        step = batch * CHARS_PER_TOKEN
+
+        try:
+            yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            for start in range(0, len(text), step):
+                if interval:
+                    await asyncio.sleep(interval)
+                piece = text[start:start + step]
+                yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if usage is not None:
+                yield event([], usage=usage)
+            yield b"data: [DONE]\n\n"
+        finally:
+            self.profile.stats.in_flight -= 1
+
+
+def openai_router(profile: ProviderProfile, responder: Optional[Responder] = None) -> APIRouter:
+    """OpenAI chat completions (base URL: <mount>/v1)"""
+    router = APIRouter()
+    handler = ChatCompletions(profile, "gpt-4.1-mini", responder)
+
+    @router.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        return await handler(request)
+
+    return router
+
+
+def perplexity_router(profile: ProviderProfile, responder: Optional[Responder] = None) -> APIRouter:
+    """Perplexity sonar chat completions with citations (base URL: <mount>)"""
+    router = APIRouter()
+
+    def citations() -> Dict[str, Any]:
+        rng = profile.rng
+        sources = [f"https://news.example.com/{rng.randrange(10 ** 6)}" for _ in range(5)]
+        return {
+            "citations": sources,
+            "search_results": [
+                {"title": filler_text(6, rng), "url": url, "date": "2026-10-01"} for url in sources
+            ],
+        }
+
+    handler = ChatCompletions(profile, "sonar", responder, extra_fields=citations)
+
+    @router.post("/chat/completions")
+    async def chat_completions(request: Request):
+        return await handler(request)
+
+    return router
@@ -0,0 +1,106 @@
+"""
+Generated response content for the fake providers
+
+Nothing here is meant to be read. It only has to be the right shape and
+size: filler text of a given token length, and JSON that parses (built
+from a JSON schema, or taken from the example the prompt asks for).
+"""
+
+import json
+import random
+from typing import Any, List, Optional
+
+_WORDS = (
+    "candidate led security engineering team cloud migration reduced incidents "
+    "stakeholders delivered roadmap strategy customers platform reliability "
+    "metrics improved automation compliance hiring mentored scalable data "
+    "interview role company values culture growth impact ownership launch"
+).split()
+
+# Rough OpenAI tokenizer ratio for English prose
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def filler_text(tokens: int, rng: random.Random) -> str:
+    """Prose of roughly `tokens` tokens (by the CHARS_PER_TOKEN estimate)"""
+    words: List[str] = []
+    length, target = 0, max(1, tokens) * CHARS_PER_TOKEN
+    while length < target:
+        word = rng.choice(_WORDS)
+        if len(words) % 14 == 0:
+            word = word.capitalize()
+        elif len(words) % 14 == 13:
+            word += "."
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def from_schema(schema: dict, rng: random.Random, defs: Optional[dict] = None, depth: int = 0) -> Any:
+    """A value that satisfies a (reasonably simple) JSON schema"""
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+    if depth > 12:
+        return None
+    if "$ref" in schema:
+        return from_schema(defs.get(schema["$ref"].split("/")[-1], {}), rng, defs, depth + 1)
+    for combinator in ("allOf", "anyOf", "oneOf"):
+        if schema.get(combinator):
+            return from_schema(schema[combinator][0], rng, defs, depth + 1)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object" or "properties" in schema:
+        return {
+            name: from_schema(prop, rng, defs, depth + 1)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 0), min(3, schema.get("maxItems", 3)))
+        return [from_schema(schema.get("items", {}), rng, defs, depth + 1) for _ in range(count)]
+    if kind == "string":
+        text = filler_text(8, rng)
+        min_length = schema.get("minLength", 0)
+        if len(text) < min_length:
+            text = (text + " ") * (min_length // len(text) + 1)
+        if "maxLength" in schema:
+            text = text[:schema["maxLength"]]
+        return text
+    if kind == "integer":
+        return int(max(schema.get("minimum", 1), schema.get("exclusiveMinimum", 0) + 1))
+    if kind == "number":
+        return float(max(schema.get("minimum", 1), schema.get("exclusiveMinimum", 0) + 1))
+    if kind == "boolean":
+        return True
+    return None
+
+
+def example_json(text: str) -> Optional[Any]:
+    """
+    The largest JSON object embedded in a prompt, if one parses
+
+    JSON-mode prompts usually show the exact structure they want back
+    ("Return JSON in this format: {...}"), so echoing it gives services a
+    response of the right shape.
+    """
+    best = None
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except ValueError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(value, dict) and (best is None or end - start > best[0]):
+            best = (end - start, value)
+        start = text.find("{", end)
+    return best[1] if best else None
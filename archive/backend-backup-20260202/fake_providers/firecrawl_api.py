@@ -0,0 +1,113 @@
+"""
+Fake Firecrawl v2 endpoints (base URL: server root; firecrawl-py joins
+"/v2/..." onto the host and drops any base path)
+
+- POST /v2/scrape        {url, formats: ["markdown", "html", {"type": "json", "schema": ...}]}
+- POST /v2/extract       {urls, prompt, schema} -> {id}
+- GET  /v2/extract/{id}  completed job with data built from the schema
+
+Response bodies follow the firecrawl-py v2 SDK ({success, data}). Errors
+come back as {success: false, error}.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from fake_providers.content import estimate_tokens, filler_text, from_schema
+from fake_providers.profile import ProviderProfile
+
+# Completed extract jobs kept for polling
+_MAX_EXTRACT_JOBS = 1000
+
+
+def _error(status: int, message: str = "") -> JSONResponse:
+    return JSONResponse(
+        {"success": False, "error": message or f"Injected {status} from fake provider"},
+        status_code=status,
+        headers={"Retry-After": "1"} if status == 429 else None,
+    )
+
+
+def _json_format(formats) -> Dict[str, Any]:
+    for fmt in formats or []:
+        if isinstance(fmt, dict) and fmt.get("type") == "json":
+            return fmt
+    return {}
+
+
+def firecrawl_router(profile: ProviderProfile) -> APIRouter:
+    router = APIRouter()
+    extract_jobs: Dict[str, Dict[str, Any]] = {}
+
+    async def respond(build) -> JSONResponse:
+        stats = profile.stats
+        stats.requests += 1
+        status = profile.pick_error()
+        if status == 429:
+            stats.errors += 1
+            return _error(status)
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            await profile.wait()
+            if status is not None:
+                stats.errors += 1
+                return _error(status)
+            return JSONResponse(build())
+        finally:
+            stats.in_flight -= 1
+
+    @router.post("/v2/scrape")
+    async def scrape(request: Request):
+        body = await request.json()
+        url = body.get("url")
+        if not url:
+            return _error(400, "url is required")
+        formats = body.get("formats") or ["markdown"]
+
+        def build():
+            rng = profile.rng
+            markdown = f"# {filler_text(6, rng)}\n\n{filler_text(profile.completion_tokens, rng)}"
+            profile.stats.completion_tokens += estimate_tokens(markdown)
+            data: Dict[str, Any] = {
+                "metadata": {"title": filler_text(6, rng), "sourceURL": url, "url": url, "statusCode": 200},
+            }
+            if "markdown" in formats:
+                data["markdown"] = markdown
+            if "html" in formats:
+                data["html"] = f"<html><body><article>{markdown}</article></body></html>"
+            json_format = _json_format(formats)
+            if json_format:
+                data["json"] = from_schema(json_format.get("schema") or {}, rng)
+            return {"success": True, "data": data}
+
+        return await respond(build)
+
+    @router.post("/v2/extract")
+    async def start_extract(request: Request):
+        body = await request.json()
+        if not body.get("urls"):
+            return _error(400, "urls is required")
+
+        def build():
+            job_id = str(uuid.uuid4())
+            if len(extract_jobs) >= _MAX_EXTRACT_JOBS:
+                extract_jobs.pop(next(iter(extract_jobs)))
+            extract_jobs[job_id] = from_schema(body.get("schema") or {}, profile.rng)
+            return {"success": True, "id": job_id}
+
+        return await respond(build)
+
+    @router.get("/v2/extract/{job_id}")
+    async def get_extract(job_id: str):
+        await asyncio.sleep(0)
+        if job_id not in extract_jobs:
+            return _error(404, "Extract job not found")
+        return {"success": True, "status": "completed", "data": extract_jobs[job_id]}
+
+    return router
@@ -0,0 +1,148 @@
+"""
+Provider profiles - latency, error and token-rate behaviour of a fake provider
+
+Latency specs (seconds are written as milliseconds):
+    "0"                      no delay
+    "fixed:800"              always 800 ms
+    "uniform:200:1500"       uniform between 200 and 1500 ms
+    "lognormal:800:2500"     log-normal with median 800 ms and p95 2500 ms
+                             (the long tail real LLM APIs show)
+
+Profiles can come from the environment, with a per-provider prefix falling
+back to the global FAKE_* value:
+    FAKE_OPENAI_LATENCY=lognormal:900:4000  FAKE_LATENCY=fixed:50
+    FAKE_OPENAI_TOKENS_PER_SECOND=60        FAKE_ERROR_RATE=0.02
+"""
+
+import asyncio
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+# z-score of the 95th percentile of a standard normal distribution
+_Z95 = 1.6448536269514722
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Latency in seconds, sampled per request"""
+
+    kind: str = "fixed"
+    a: float = 0.0  # fixed value / uniform low / lognormal median (seconds)
+    b: float = 0.0  # uniform high / lognormal p95 (seconds)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse a spec like "lognormal:800:2500" (milliseconds)"""
+        spec = (spec or "0").strip()
+        kind, *values = spec.split(":")
+        if not values:
+            # A bare number is a fixed latency
+            kind, values = "fixed", [kind]
+        try:
+            numbers = [float(v) / 1000 for v in values]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+
+        if kind == "fixed" and len(numbers) == 1:
+            return cls("fixed", numbers[0])
+        if kind in ("uniform", "lognormal") and len(numbers) == 2 and numbers[1] >= numbers[0] > 0:
+            return cls(kind, numbers[0], numbers[1])
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            sigma = math.log(self.b / self.a) / _Z95
+            return rng.lognormvariate(math.log(self.a), sigma)
+        return self.a
+
+    def __str__(self) -> str:
+        if self.kind == "fixed":
+            return f"fixed:{self.a * 1000:g}"
+        return f"{self.kind}:{self.a * 1000:g}:{self.b * 1000:g}"
+
+
+@dataclass
+class ProviderStats:
+    """Request counters of one fake provider"""
+
+    requests: int = 0
+    errors: int = 0
+    streams: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+@dataclass
+class ProviderProfile:
+    """How a fake provider behaves"""
+
+    # Time until the response (or the first streamed token) starts
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    # Output generation speed; 0 = the whole body is available at once
+    tokens_per_second: float = 0.0
+    # Fraction of requests answered with one of error_statuses
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    # Completion length when the request does not cap it lower (max_tokens)
+    completion_tokens: int = 400
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self.stats = ProviderStats()
+
+    @classmethod
+    def from_env(cls, prefix: str = "") -> "ProviderProfile":
+        """Profile from FAKE_<PREFIX>_* variables, falling back to FAKE_*"""
+
+        def env(name: str, default: str) -> str:
+            if prefix:
+                value = os.getenv(f"FAKE_{prefix.upper()}_{name}")
+                if value is not None:
+                    return value
+            return os.getenv(f"FAKE_{name}", default)
+
+        statuses = env("ERROR_STATUSES", "429,500,503")
+        seed = env("SEED", "")
+        return cls(
+            latency=LatencyDistribution.parse(env("LATENCY", "0")),
+            tokens_per_second=float(env("TOKENS_PER_SECOND", "0")),
+            error_rate=float(env("ERROR_RATE", "0")),
+            error_statuses=tuple(int(s) for s in statuses.split(",") if s.strip()),
+            completion_tokens=int(env("COMPLETION_TOKENS", "400")),
+            seed=int(seed) if seed else None,
+        )
+
+    def describe(self) -> str:
+        return (
+            f"latency {self.latency}, {self.tokens_per_second:g} tok/s, "
+            f"error rate {self.error_rate:g}, {self.completion_tokens} completion tokens"
+        )
+
+    async def wait(self):
+        """Sleep for one latency sample"""
+        delay = self.latency.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def generation_time(self, tokens: int) -> float:
+        """Seconds needed to generate tokens at tokens_per_second"""
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return tokens / self.tokens_per_second
+
+    def pick_error(self) -> Optional[int]:
+        """Status code of an injected error for this request, or None"""
+        if self.error_rate > 0 and self.error_statuses and self.rng.random() < self.error_rate:
+            return self.rng.choice(self.error_statuses)
+        return None
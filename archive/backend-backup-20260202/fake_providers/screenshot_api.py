@@ -0,0 +1,62 @@
+"""
+Fake screenshot API (GET /screenshot?url=...&token=...) returning a PNG
+
+Shaped like screenshotapi.net with output=image. The image is a plain
+1280x2000 PNG, built once, so vision calls get a real image to send on.
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from fake_providers.profile import ProviderProfile
+
+WIDTH, HEIGHT = 1280, 2000
+
+
+@lru_cache(maxsize=1)
+def screenshot_png() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    # 8-bit grayscale, filter byte 0 per row, light grey page with darker "text" rows
+    rows = b"".join(
+        b"\x00" + (b"\x60" if (y // 12) % 3 == 1 and y > 120 else b"\xf2") * WIDTH
+        for y in range(HEIGHT)
+    )
+    header = struct.pack(">IIBBBBB", WIDTH, HEIGHT, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def screenshot_router(profile: ProviderProfile) -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/screenshot")
+    async def screenshot(url: str = "", token: str = ""):
+        stats = profile.stats
+        stats.requests += 1
+        if not url:
+            stats.errors += 1
+            return Response(b"url is required", status_code=400, media_type="text/plain")
+
+        status = profile.pick_error()
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            await profile.wait()
+        finally:
+            stats.in_flight -= 1
+        if status is not None:
+            stats.errors += 1
+            return Response(f"Injected {status} from fake provider".encode(), status_code=status, media_type="text/plain")
+        return Response(screenshot_png(), media_type="image/png")
+
+    return router
@@ -0,0 +1,179 @@
+"""
+Combined fake-provider server
+
+One ASGI app serving every provider:
+
+    /openai/v1/chat/completions      OPENAI_BASE_URL=<server>/openai/v1
+    /perplexity/chat/completions     PERPLEXITY_BASE_URL=<server>/perplexity
+    /v2/scrape, /v2/extract          FIRECRAWL_API_URL=<server> (the SDK drops any base path)
+    /screenshot                      SCREENSHOT_API_URL=<server>/screenshot
+    /_stats                          request / error / token counters per provider
+
+Run it standalone:
+    python -m fake_providers --port 8900 --latency lognormal:800:3000 --tokens-per-second 80
+
+or in-process (load tests, benchmarks):
+    with FakeProviderServer(profiles) as server:
+        os.environ.update(server.env())   # before the app's settings are loaded
+"""
+
+import argparse
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+from fake_providers.chat import Responder, openai_router, perplexity_router
+from fake_providers.firecrawl_api import firecrawl_router
+from fake_providers.profile import LatencyDistribution, ProviderProfile
+from fake_providers.screenshot_api import screenshot_router
+
+PROVIDERS = ("openai", "perplexity", "firecrawl", "screenshot")
+
+
+def default_profiles() -> Dict[str, ProviderProfile]:
+    """Profiles from FAKE_<PROVIDER>_* / FAKE_* environment variables"""
+    return {name: ProviderProfile.from_env(name) for name in PROVIDERS}
+
+
+def create_app(
+    profiles: Optional[Dict[str, ProviderProfile]] = None,
+    openai_responder: Optional[Responder] = None,
+) -> FastAPI:
+    """ASGI app with every fake provider (missing profiles come from the environment)"""
+    profiles = {**default_profiles(), **(profiles or {})}
+    app = FastAPI(title="Fake providers", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.profiles = profiles
+
+    app.include_router(openai_router(profiles["openai"], openai_responder), prefix="/openai")
+    app.include_router(perplexity_router(profiles["perplexity"]), prefix="/perplexity")
+    app.include_router(firecrawl_router(profiles["firecrawl"]))
+    app.include_router(screenshot_router(profiles["screenshot"]))
+
+    @app.get("/_stats")
+    async def stats():
+        return {name: profile.stats.to_dict() for name, profile in profiles.items()}
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok"}
+
+    return app
+
+
+def provider_env(base_url: str) -> Dict[str, str]:
+    """Settings environment variables that point the backend at a fake-provider server"""
+    base_url = base_url.rstrip("/")
+    return {
+        "OPENAI_BASE_URL": f"{base_url}/openai/v1",
+        "PERPLEXITY_BASE_URL": f"{base_url}/perplexity",
+        "FIRECRAWL_API_URL": base_url,
+        "SCREENSHOT_API_URL": f"{base_url}/screenshot",
+        # Clients refuse to start without keys; the fake providers ignore them
+        "OPENAI_API_KEY": "sk-fake",
+        "PERPLEXITY_API_KEY": "pplx-fake",
+        "FIRECRAWL_API_KEY": "fc-fake",
+        "SCREENSHOT_API_KEY": "shot-fake",
+    }
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class FakeProviderServer:
+    """Runs the combined app with uvicorn on a background thread"""
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, ProviderProfile]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        openai_responder: Optional[Responder] = None,
+    ):
+        self.app = create_app(profiles, openai_responder)
+        self.host = host
+        self.port = port or _free_port(host)
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def profiles(self) -> Dict[str, ProviderProfile]:
+        return self.app.state.profiles
+
+    def env(self) -> Dict[str, str]:
+        return provider_env(self.base_url)
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: profile.stats.to_dict() for name, profile in self.profiles.items()}
+
+    def start(self, timeout: float = 10.0) -> "FakeProviderServer":
+        self.thread = threading.Thread(target=self.server.run, name="fake-providers", daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Fake provider server did not start on {self.base_url}")
+            time.sleep(0.02)
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        if self.thread is not None:
+            self.thread.join(timeout=10)
+            self.thread = None
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m fake_providers", description="Serve fake OpenAI / Perplexity / Firecrawl / screenshot APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", help='Latency for every provider, e.g. "lognormal:800:3000" (ms)')
+    parser.add_argument("--tokens-per-second", type=float, help="Token generation rate (0 = instant)")
+    parser.add_argument("--error-rate", type=float, help="Fraction of requests that fail")
+    parser.add_argument("--completion-tokens", type=int, help="Default completion length")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    profiles = default_profiles()
+    for profile in profiles.values():
+        if args.latency is not None:
+            profile.latency = LatencyDistribution.parse(args.latency)
+        if args.tokens_per_second is not None:
+            profile.tokens_per_second = args.tokens_per_second
+        if args.error_rate is not None:
+            profile.error_rate = args.error_rate
+        if args.completion_tokens is not None:
+            profile.completion_tokens = args.completion_tokens
+        if args.seed is not None:
+            profile.rng.seed(args.seed)
+
+    print("=" * 60)
+    print("  FAKE PROVIDERS")
+    print("=" * 60)
+    for name, profile in profiles.items():
+        print(f"  {name:<11} {profile.describe()}")
+    print()
+    print("Point the backend at this server with:")
+    for key, value in provider_env(f"http://{args.host}:{args.port}").items():
+        print(f"  export {key}={value}")
+    print()
+
+    uvicorn.run(create_app(profiles), host=args.host, port=args.port, log_level="warning")
+    return 0
@@ -0,0 +1,15 @@
+-- Migration: Store generated common questions on the interview prep
+-- Date: 2026-10-18
+-- Description: The common-questions set ({"questions": [...]}) used to live in
+-- analysis_cache, where it expired after 30 days; it is user content, kept with the prep
+
+ALTER TABLE interview_preps
+ADD COLUMN IF NOT EXISTS common_questions JSON;
+
+-- Carry over sets generated before this migration
+UPDATE interview_preps
+SET common_questions = (analysis_cache.result_data::jsonb -> 'result')::json
+FROM analysis_cache
+WHERE analysis_cache.tailored_resume_id = interview_preps.tailored_resume_id
+  AND analysis_cache.analysis_type = 'prep_common_questions'
+  AND interview_preps.common_questions IS NULL;
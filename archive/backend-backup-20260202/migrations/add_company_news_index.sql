@@ -0,0 +1,29 @@
+-- Migration: Add company news index
+-- Date: 2026-10-18
+-- Description: Per-company news articles indexed by published date, plus refresh watermarks
+
+CREATE TABLE IF NOT EXISTS company_news_articles (
+    id SERIAL PRIMARY KEY,
+    company_key VARCHAR(255) NOT NULL,
+    dedup_key VARCHAR(512) NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    source VARCHAR(255),
+    url TEXT,
+    published_date DATE NOT NULL,
+    category VARCHAR(50),
+    base_relevance INTEGER DEFAULT 5,
+    role_hits JSON,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_company_news_dedup UNIQUE (company_key, dedup_key)
+);
+
+-- Date-window reads per company
+CREATE INDEX IF NOT EXISTS idx_company_news_company_published ON company_news_articles(company_key, published_date);
+
+CREATE TABLE IF NOT EXISTS company_news_watermarks (
+    company_key VARCHAR(255) PRIMARY KEY,
+    newest_published DATE,
+    covered_from DATE,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
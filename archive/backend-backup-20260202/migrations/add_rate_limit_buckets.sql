@@ -0,0 +1,12 @@
+-- Migration: Add shared rate-limit bucket table
+-- Date: 2026-10-18
+-- Description: Token-bucket state for the central rate limiter, shared across API workers
+
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at DOUBLE PRECISION NOT NULL
+);
+
+-- Used to prune idle buckets
+CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated_at ON rate_limit_buckets(updated_at);
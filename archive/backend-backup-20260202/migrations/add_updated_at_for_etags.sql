@@ -0,0 +1,13 @@
+-- Migration: Add updated_at to tailored resumes and saved comparisons
+-- Date: 2026-10-18
+-- Description: Row versions for strong ETags on GET /api/saved-comparisons/{id}
+-- (conditional GETs are answered with 304 from ids and timestamps alone)
+
+ALTER TABLE tailored_resumes
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE saved_comparisons
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+UPDATE tailored_resumes SET updated_at = created_at WHERE created_at IS NOT NULL;
+UPDATE saved_comparisons SET updated_at = saved_at WHERE saved_at IS NOT NULL;
@@ -0,0 +1,11 @@
+-- Migration: Add view tracking columns
+-- Date: 2026-10-18
+-- Description: View counts for saved comparisons, last viewed / view count for interview preps
+-- (written in batches by the touch buffer, not on every read)
+
+ALTER TABLE saved_comparisons
+ADD COLUMN IF NOT EXISTS view_count INTEGER DEFAULT 0;
+
+ALTER TABLE interview_preps
+ADD COLUMN IF NOT EXISTS last_viewed_at TIMESTAMP,
+ADD COLUMN IF NOT EXISTS view_count INTEGER DEFAULT 0;
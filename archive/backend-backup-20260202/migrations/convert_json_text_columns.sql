@@ -0,0 +1,25 @@
+-- Migration: Convert JSON text columns to JSONB
+-- Date: 2026-10-18
+-- Description: Structured resume and comparison fields were JSON strings in TEXT columns and
+-- re-parsed on every read; store them as JSONB (decoded once by the driver, orjson serializer)
+-- Empty strings become NULL. Run in a transaction: any row holding invalid JSON aborts it.
+
+BEGIN;
+
+ALTER TABLE base_resumes
+ALTER COLUMN skills TYPE JSONB USING NULLIF(skills, '')::jsonb,
+ALTER COLUMN experience TYPE JSONB USING NULLIF(experience, '')::jsonb;
+
+ALTER TABLE tailored_resumes
+ALTER COLUMN tailored_skills TYPE JSONB USING NULLIF(tailored_skills, '')::jsonb,
+ALTER COLUMN tailored_experience TYPE JSONB USING NULLIF(tailored_experience, '')::jsonb;
+
+ALTER TABLE saved_comparisons
+ALTER COLUMN tags TYPE JSONB USING NULLIF(tags, '')::jsonb,
+ALTER COLUMN analysis_data TYPE JSONB USING NULLIF(analysis_data, '')::jsonb,
+ALTER COLUMN keywords_data TYPE JSONB USING NULLIF(keywords_data, '')::jsonb,
+ALTER COLUMN match_score_data TYPE JSONB USING NULLIF(match_score_data, '')::jsonb;
+
+-- Expression index from add_ai_analysis_to_saved_comparisons.sql is type-agnostic and remains valid
+
+COMMIT;
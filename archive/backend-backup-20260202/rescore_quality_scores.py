@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Re-score stored tailored resumes with QualityScorer
+
+Run after changing the scoring weights or rules. Tailored resumes are
+grouped by base resume and scored with QualityScorer.score_batch, so each
+base resume is processed once per group.
+
+Usage (uses DATABASE_URL like the app):
+    python rescore_quality_scores.py --dry-run
+    python rescore_quality_scores.py --weights completeness=0.3,customization=0.25,skills=0.2,experience=0.15,alignment=0.1
+"""
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+
+from sqlalchemy import select, update
+
+from app.database import AsyncSessionLocal
+from app.models.company import CompanyResearch
+from app.models.resume import BaseResume, TailoredResume
+from app.utils.quality_scorer import QualityScorer, DEFAULT_WEIGHTS
+from app.utils.json_codec import json_value
+
+
+def parse_weights(value: str) -> dict:
+    weights = dict(DEFAULT_WEIGHTS)
+    for pair in filter(None, value.split(",")):
+        name, _, weight = pair.partition("=")
+        if name.strip() not in DEFAULT_WEIGHTS:
+            raise SystemExit(f"Unknown component '{name}'. Expected one of: {', '.join(DEFAULT_WEIGHTS)}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+async def rescore(weights: dict, dry_run: bool, batch_size: int):
+    start = time.perf_counter()
+    changed = 0
+    total = 0
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(TailoredResume, BaseResume)
+            .join(BaseResume, TailoredResume.base_resume_id == BaseResume.id)
+            .where(TailoredResume.is_deleted == False)
+        )
+        rows = result.all()
+
+        research_result = await session.execute(
+            select(CompanyResearch.job_id, CompanyResearch.mission_values)
+        )
+        research_by_job = {job_id: text for job_id, text in research_result.all()}
+
+        groups = defaultdict(list)
+        bases = {}
+        for tailored, base in rows:
+            groups[base.id].append(tailored)
+            bases[base.id] = base
+
+        updates = []
+        for base_id, tailored_rows in groups.items():
+            base = bases[base_id]
+            base_resume_data = {
+                "summary": base.summary or "",
+                "skills": json_value(base.skills, []),
+            }
+            contents = [
+                {
+                    "summary": t.tailored_summary or "",
+                    "competencies": json_value(t.tailored_skills, []),
+                    "experience": json_value(t.tailored_experience, []),
+                    "alignment_statement": t.alignment_statement or "",
+                }
+                for t in tailored_rows
+            ]
+            research = [
+                {"research": research_by_job[t.job_id]} if research_by_job.get(t.job_id) else None
+                for t in tailored_rows
+            ]
+
+            scores = QualityScorer.score_batch(base_resume_data, contents, research, weights)
+
+            for tailored, score in zip(tailored_rows, scores):
+                total += 1
+                if tailored.quality_score is None or abs(tailored.quality_score - score) > 0.05:
+                    changed += 1
+                    updates.append({"row_id": tailored.id, "score": score})
+
+        print(f"Scored {total} tailored resumes across {len(groups)} base resumes "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms; {changed} changed")
+
+        if dry_run or not updates:
+            return
+
+        for i in range(0, len(updates), batch_size):
+            for item in updates[i:i + batch_size]:
+                await session.execute(
+                    update(TailoredResume)
+                    .where(TailoredResume.id == item["row_id"])
+                    .values(quality_score=item["score"])
+                )
+            await session.commit()
+            print(f"  Updated {min(i + batch_size, len(updates))}/{len(updates)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored tailored resumes")
+    parser.add_argument("--weights", default="", help="Component weights, e.g. skills=0.3,alignment=0.05")
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without writing them")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows updated per commit")
+    args = parser.parse_args()
+
+    weights = parse_weights(args.weights)
+
+    print("=" * 60)
+    print("  Re-scoring tailored resumes")
+    print("=" * 60)
+    print(f"Weights: {weights}")
+    if abs(sum(weights.values()) - 1.0) > 1e-6:
+        print(f"WARNING: weights sum to {sum(weights.values()):.2f}, not 1.0")
+
+    asyncio.run(rescore(weights, args.dry_run, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
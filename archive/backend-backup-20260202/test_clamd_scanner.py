@@ -0,0 +1,296 @@
+"""
+Test the clamd streaming scanner against a local fake clamd server
+Tests: clean / infected INSTREAM, session reuse, timeout budget, fallback,
+cancelled uploads releasing their clamd session
+"""
+
+import asyncio
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+EICAR = b"X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+
+
+class FakeClamd:
+    """Minimal clamd speaking IDSESSION / PING / INSTREAM / END over a UNIX socket"""
+
+    def __init__(self, socket_path: str, stall: bool = False):
+        self.socket_path = socket_path
+        self.stall = stall
+        self.connections = 0
+        self.scans = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        request_id = 0
+        try:
+            command = (await reader.readuntil(b"\0"))[:-1]
+            if command != b"zIDSESSION":
+                return
+            while True:
+                command = (await reader.readuntil(b"\0"))[:-1]
+                request_id += 1
+                if command == b"zEND":
+                    return
+                if command == b"zPING":
+                    writer.write(f"{request_id}: PONG\0".encode())
+                elif command == b"zINSTREAM":
+                    data = b""
+                    while True:
+                        (size,) = struct.unpack("!L", await reader.readexactly(4))
+                        if size == 0:
+                            break
+                        data += await reader.readexactly(size)
+                    self.scans += 1
+                    if self.stall:
+                        await asyncio.sleep(3600)
+                    if EICAR in data:
+                        writer.write(f"{request_id}: stream: Eicar-Test-Signature FOUND\0".encode())
+                    else:
+                        writer.write(f"{request_id}: stream: OK\0".encode())
+                else:
+                    writer.write(f"{request_id}: UNKNOWN COMMAND\0".encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def chunks_of(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def test_clean_and_infected(tmp: Path):
+    """Clean and infected streams get the right verdicts"""
+    print("=" * 80)
+    print("TEST 1: CLEAN AND INFECTED STREAMS")
+    print("=" * 80)
+
+    from app.utils.clamd_client import ClamdClient
+
+    server = FakeClamd(str(tmp / "clamd.sock"))
+    await server.start()
+    client = ClamdClient(socket_path=server.socket_path)
+    try:
+        clean = await client.scan_stream(chunks_of(b"%PDF-1.4 resume text " * 100))
+        infected = await client.scan_stream(chunks_of(b"header " + EICAR + b" trailer"))
+        print(f"  clean: {clean}")
+        print(f"  infected: {infected}")
+        return clean == (True, None) and infected == (False, "Eicar-Test-Signature")
+    finally:
+        await client.close()
+        await server.stop()
+
+
+async def test_session_reuse(tmp: Path):
+    """Sequential scans share one pooled session; concurrency is capped by pool_size"""
+    print("=" * 80)
+    print("TEST 2: POOLED SESSION REUSE")
+    print("=" * 80)
+
+    from app.utils.clamd_client import ClamdClient
+
+    server = FakeClamd(str(tmp / "clamd.sock"))
+    await server.start()
+    client = ClamdClient(socket_path=server.socket_path, pool_size=2)
+    try:
+        for _ in range(5):
+            await client.scan_stream(chunks_of(b"clean data"))
+        sequential_connections = server.connections
+
+        await asyncio.gather(*(client.scan_stream(chunks_of(b"clean data")) for _ in range(6)))
+        print(f"  connections after 5 sequential scans: {sequential_connections}")
+        print(f"  connections after 6 concurrent scans: {server.connections} (pool_size=2)")
+        print(f"  ping: {await client.ping()}")
+        return sequential_connections == 1 and server.connections == 2 and server.scans == 11
+    finally:
+        await client.close()
+        await server.stop()
+
+
+async def test_timeout_budget(tmp: Path):
+    """A clamd that never answers fails the scan within the budget"""
+    print("=" * 80)
+    print("TEST 3: TIMEOUT BUDGET")
+    print("=" * 80)
+
+    from app.utils.clamd_client import ClamdClient, ClamdError
+
+    server = FakeClamd(str(tmp / "clamd.sock"), stall=True)
+    await server.start()
+    client = ClamdClient(socket_path=server.socket_path, timeout=0.5)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        await client.scan_stream(chunks_of(b"clean data"))
+        print("  FAILED: scan returned")
+        return False
+    except ClamdError as e:
+        elapsed = loop.time() - started
+        print(f"  ClamdError after {elapsed:.2f}s: {e}")
+        return elapsed < 1.0
+    finally:
+        await client.close()
+        await server.stop()
+
+
+async def test_upload_scan_and_fallback(tmp: Path):
+    """UploadScan streams chunks to clamd, and falls back when clamd is unreachable"""
+    print("=" * 80)
+    print("TEST 4: UPLOAD SCAN AND FALLBACK")
+    print("=" * 80)
+
+    from app.utils.clamd_client import ClamdClient
+    from app.utils.virus_scanner import VirusScanner
+
+    server = FakeClamd(str(tmp / "clamd.sock"))
+    await server.start()
+    scanner = VirusScanner(clamd=ClamdClient(socket_path=server.socket_path))
+
+    infected_path = tmp / "infected.pdf"
+    infected_path.write_bytes(b"%PDF-1.4 " + EICAR)
+    upload = scanner.upload_scan()
+    for chunk in (b"%PDF-1.4 ", EICAR):
+        await upload.feed(chunk)
+    streamed = await upload.result(infected_path)
+    print(f"  streamed upload: {streamed}")
+    await scanner.clamd.close()
+    await server.stop()
+
+    fallback_calls = []
+
+    def fallback(file_path):
+        fallback_calls.append(file_path)
+        return True, None
+
+    unreachable = VirusScanner(
+        clamd=ClamdClient(socket_path=str(tmp / "missing.sock"), timeout=0.5),
+        fallback=fallback
+    )
+    upload = unreachable.upload_scan()
+    await upload.feed(b"%PDF-1.4 clean")
+    via_upload = await upload.result(infected_path)
+    via_file = await unreachable.scan_file_async(str(infected_path))
+    print(f"  unreachable clamd: upload={via_upload} file={via_file} fallback_calls={len(fallback_calls)}")
+
+    # Default fallback is basic validation, which rejects executables
+    exe_path = tmp / "payload.pdf"
+    exe_path.write_bytes(b"MZ" + b"\0" * 64)
+    basic = VirusScanner(clamd=ClamdClient(socket_path=str(tmp / "missing.sock"), timeout=0.5))
+    via_basic = await basic.scan_file_async(str(exe_path))
+    print(f"  basic validation fallback: {via_basic}")
+
+    return (
+        streamed == (False, "Eicar-Test-Signature")
+        and via_upload == (True, None)
+        and via_file == (True, None)
+        and len(fallback_calls) == 2
+        and via_basic == (False, "Executable file detected")
+    )
+
+
+class StalledUpload:
+    """UploadFile stand-in that sends one chunk, then stalls like a client gone quiet"""
+
+    filename = "resume.pdf"
+    size = None
+
+    def __init__(self):
+        self.sent = asyncio.Event()
+
+    async def read(self, size: int = -1) -> bytes:
+        if not self.sent.is_set():
+            self.sent.set()
+            return b"%PDF-1.4 partial upload"
+        await asyncio.sleep(3600)
+        return b""
+
+
+async def test_cancelled_upload_releases_session(tmp: Path):
+    """A request cancelled mid-upload releases its clamd session and partial file"""
+    print("=" * 80)
+    print("TEST 5: CANCELLED UPLOAD")
+    print("=" * 80)
+
+    from cryptography.fernet import Fernet
+
+    os.environ.setdefault("FILE_ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+    from app.utils.clamd_client import ClamdClient
+    from app.utils.file_handler import FileHandler
+    from app.utils.virus_scanner import VirusScanner
+
+    server = FakeClamd(str(tmp / "clamd.sock"))
+    await server.start()
+    handler = FileHandler(base_dir=str(tmp / "uploads"))
+    # One pooled session: a leaked stream would block every later scan
+    handler.virus_scanner = VirusScanner(clamd=ClamdClient(socket_path=server.socket_path, pool_size=1, timeout=1.0))
+    try:
+        upload = StalledUpload()
+        task = asyncio.create_task(handler.save_upload(upload))
+        await upload.sent.wait()
+        await asyncio.sleep(0.05)  # chunk written and streamed to clamd
+        task.cancel()
+        try:
+            await task
+            cancelled = False
+        except asyncio.CancelledError:
+            cancelled = True
+
+        leftovers = list((tmp / "uploads" / "resumes").iterdir())
+        verdict = await handler.virus_scanner.clamd.scan_stream(chunks_of(b"next upload"))
+        print(f"  cancelled: {cancelled}, partial files left: {leftovers}")
+        print(f"  next scan on the single pooled session: {verdict}")
+        return cancelled and leftovers == [] and verdict is not None
+    finally:
+        await handler.virus_scanner.clamd.close()
+        await server.stop()
+
+
+async def main():
+    """Run all clamd scanner tests"""
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results['clean_and_infected'] = await test_clean_and_infected(tmp)
+        results['session_reuse'] = await test_session_reuse(tmp)
+        results['timeout_budget'] = await test_timeout_budget(tmp)
+        results['upload_fallback'] = await test_upload_scan_and_fallback(tmp)
+        results['cancelled_upload'] = await test_cancelled_upload_releases_session(tmp)
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():20s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,258 @@
+"""
+Test the company news index behind NewsAggregatorService
+Tests: full fetch then fresh reads, incremental refresh from the watermark,
+empty refreshes advancing the watermark, failed refreshes leaving it alone,
+newsroom articles sharing their page URL stored separately
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/news_index.db")
+os.environ.setdefault("PERPLEXITY_API_KEY", "test-key")
+
+from app.services.company_news_store import company_news_key, get_company_news_store
+from app.services.news_aggregator_service import NewsAggregatorService
+
+COMPANY = "Acme Robotics"
+
+
+def days_ago(days: int) -> str:
+    return (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def article(title: str, published_date: str) -> dict:
+    return {
+        "title": title,
+        "summary": f"{title} - platform and infrastructure update",
+        "source": "Reuters",
+        "url": f"https://reuters.com/{title.lower().replace(' ', '-')}",
+        "published_date": published_date,
+        "relevance_score": 7,
+        "category": "news",
+        "impact_summary": "",
+    }
+
+
+class ScriptedNews(NewsAggregatorService):
+    """Aggregator whose fetches return queued results and record the window asked for"""
+
+    def __init__(self):
+        super().__init__()
+        self.queued = []
+        self.fetch_days = []
+
+    async def _fetch_news(self, company_name, industry, job_title, days_back, raise_errors=False):
+        self.fetch_days.append(days_back)
+        result = self.queued.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+async def watermark():
+    return await get_company_news_store().get_watermark(company_news_key(COMPANY))
+
+
+async def age_watermark(hours: float):
+    """Pretend the last refresh happened hours ago"""
+    from app.database import AsyncSessionLocal
+    from app.models.company_news import CompanyNewsWatermark
+
+    async with AsyncSessionLocal() as session:
+        row = await session.get(CompanyNewsWatermark, company_news_key(COMPANY))
+        row.refreshed_at = datetime.utcnow() - timedelta(hours=hours)
+        await session.commit()
+
+
+async def titles(service: ScriptedNews) -> list:
+    result = await service.aggregate_company_news(COMPANY, job_title="Platform Engineer")
+    return sorted(a["title"] for a in result["news_articles"])
+
+
+async def test_full_then_fresh():
+    """Test the first request fetches the whole window and the next one nothing"""
+    print("=" * 80)
+    print("TEST 1: FULL FETCH, THEN FRESH")
+    print("=" * 80)
+
+    service = ScriptedNews()
+    service.queued = [[article("Acme opens Austin plant", days_ago(10)), article("Old news", days_ago(120))]]
+    first = await titles(service)
+    second = await titles(service)
+    mark = await watermark()
+
+    print(f"  fetch windows: {service.fetch_days}")
+    print(f"  served: {first} then {second}")
+    print(f"  watermark: newest {mark.newest_published}, covered from {mark.covered_from}")
+
+    return (
+        service.fetch_days == [90]
+        and first == second == ["Acme opens Austin plant"]
+        and str(mark.newest_published) == days_ago(10)
+        and str(mark.covered_from) == days_ago(90)
+    )
+
+
+async def test_incremental_refresh():
+    """Test a stale index fetches only from the newest stored date, with a day of overlap"""
+    print("\n" + "=" * 80)
+    print("TEST 2: INCREMENTAL REFRESH")
+    print("=" * 80)
+
+    service = ScriptedNews()
+    await age_watermark(7)
+    service.queued = [[
+        article("Acme opens Austin plant", days_ago(10)),  # overlap, already stored
+        article("Acme ships new API", days_ago(2)),
+    ]]
+    served = await titles(service)
+    mark = await watermark()
+
+    print(f"  fetch windows: {service.fetch_days}")
+    print(f"  served: {served}")
+    print(f"  newest stored: {mark.newest_published}")
+
+    return (
+        service.fetch_days == [11]
+        and served == ["Acme opens Austin plant", "Acme ships new API"]
+        and str(mark.newest_published) == days_ago(2)
+    )
+
+
+async def test_empty_refresh_advances_watermark():
+    """Test a refresh that finds nothing new still counts as a refresh"""
+    print("\n" + "=" * 80)
+    print("TEST 3: EMPTY REFRESH")
+    print("=" * 80)
+
+    service = ScriptedNews()
+    await age_watermark(7)
+    service.queued = [[]]
+    await titles(service)
+    mark = await watermark()
+    age = datetime.utcnow() - mark.refreshed_at
+    served = await titles(service)
+
+    print(f"  fetch windows: {service.fetch_days}, refreshed {age.total_seconds():.1f}s ago")
+    print(f"  served: {served}")
+
+    return service.fetch_days == [3] and age < timedelta(minutes=1) and len(served) == 2
+
+
+async def test_failed_refresh_keeps_watermark():
+    """Test a failed search serves stored articles and retries on the next request"""
+    print("\n" + "=" * 80)
+    print("TEST 4: FAILED REFRESH")
+    print("=" * 80)
+
+    service = ScriptedNews()
+    await age_watermark(7)
+    service.queued = [RuntimeError("Perplexity search error: 503"), []]
+    served = await titles(service)
+    stale = datetime.utcnow() - (await watermark()).refreshed_at
+    await titles(service)
+
+    print(f"  served during outage: {served}")
+    print(f"  watermark age after failure: {stale}, fetch windows: {service.fetch_days}")
+
+    return len(served) == 2 and stale > timedelta(hours=6) and service.fetch_days == [3, 3]
+
+
+async def test_empty_full_fetch_covers_window():
+    """Test a company with no news at all is not re-fetched on every request"""
+    print("\n" + "=" * 80)
+    print("TEST 5: EMPTY FULL FETCH")
+    print("=" * 80)
+
+    service = ScriptedNews()
+    service.queued = [[]]
+    first = await service.aggregate_company_news("Quiet Holdings")
+    second = await service.aggregate_company_news("Quiet Holdings")
+    mark = await get_company_news_store().get_watermark(company_news_key("Quiet Holdings"))
+
+    print(f"  fetch windows: {service.fetch_days}, articles: {first['total_articles']}/{second['total_articles']}")
+    print(f"  watermark: newest {mark.newest_published}, covered from {mark.covered_from}")
+
+    return service.fetch_days == [90] and mark.newest_published is None and str(mark.covered_from) == days_ago(90)
+
+
+async def test_newsroom_articles_share_page_url():
+    """Test articles scraped from one newsroom page are stored as separate rows, on every refresh"""
+    print("\n" + "=" * 80)
+    print("TEST 6: NEWSROOM ARTICLES")
+    print("=" * 80)
+
+    store = get_company_news_store()
+    company_key = company_news_key("Newsroom Corp")
+    cutoff = (datetime.utcnow() - timedelta(days=90)).date()
+
+    def newsroom(title: str, days: int, url: str = "https://www.newsroomcorp.com/newsroom") -> dict:
+        return {**article(title, days_ago(days)), "url": url, "source": "Company Press Release"}
+
+    first = await store.store(company_key, [
+        newsroom(f"Newsroom Corp announces partnership number {i}", i + 3) for i in range(5)
+    ], covered_from=cutoff)
+    # Next refresh: one item seen before, one new, same page URL
+    second = await store.store(company_key, [
+        newsroom("Newsroom Corp announces partnership number 0", 3),
+        newsroom("Newsroom Corp opens a second headquarters", 1),
+    ])
+    # Two articles carrying one non-index URL (e.g. a press kit page) are kept apart too
+    third = await store.store(company_key, [
+        newsroom("Q3 results", 2, url="https://newsroomcorp.com/press-kit-2026"),
+        newsroom("Q3 investor letter", 2, url="https://newsroomcorp.com/press-kit-2026"),
+    ])
+    # A single article URL still dedups across differently worded titles
+    fourth = await store.store(company_key, [
+        newsroom("Newsroom Corp raises Series D", 2, url="https://reuters.com/newsroom-corp-series-d"),
+    ])
+    fifth = await store.store(company_key, [
+        newsroom("Newsroom Corp raises $200M Series D", 2, url="https://www.reuters.com/newsroom-corp-series-d?utm_source=x"),
+    ])
+    window = await store.window(company_key, cutoff)
+
+    print(f"  stored per refresh: {[first, second, third, fourth, fifth]}, window: {len(window)} articles")
+
+    return [first, second, third, fourth, fifth] == [5, 1, 2, 1, 0] and len(window) == 9
+
+
+async def main():
+    """Run all company news index tests"""
+    from app.database import init_db
+    await init_db()
+
+    results = {
+        'full_then_fresh': await test_full_then_fresh(),
+        'incremental_refresh': await test_incremental_refresh(),
+        'empty_refresh': await test_empty_refresh_advances_watermark(),
+        'failed_refresh': await test_failed_refresh_keeps_watermark(),
+        'empty_full_fetch': await test_empty_full_fetch_covers_window(),
+        'newsroom_articles': await test_newsroom_articles_share_page_url(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,179 @@
+"""
+Test the rendered export cache
+Tests: concurrent requests sharing one render, renders too large to cache
+still shared, failed renders raised to every waiter and retried, a
+cancelled request not aborting the render for the others, LRU eviction
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.export_cache import ExportCache, content_key
+
+
+class CountingRenderer:
+    """Blocking render (like python-docx) that records how often it ran"""
+
+    def __init__(self, data: bytes = b"PK docx bytes", seconds: float = 0.1, fail: bool = False):
+        self.data = data
+        self.seconds = seconds
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> bytes:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.seconds)
+        if self.fail:
+            raise RuntimeError("template missing")
+        return self.data
+
+
+async def test_concurrent_dedup():
+    """Test concurrent requests for one key render once; later requests hit the cache"""
+    print("=" * 80)
+    print("TEST 1: CONCURRENT DEDUP")
+    print("=" * 80)
+
+    cache = ExportCache(max_bytes=1024 * 1024)
+    key = content_key("docx", {"resume_id": 1, "summary": "Data engineer"})
+    renderer = CountingRenderer()
+
+    results = await asyncio.gather(*(cache.get_or_render(key, renderer) for _ in range(10)))
+    later = await cache.get_or_render(key, renderer)
+
+    hits = [hit for _, hit in results]
+    print(f"  renders: {renderer.calls}, cache_hit flags: {hits}")
+    print(f"  later request: hit={later[1]}, in-flight renders left: {len(cache._renders)}, stats: {cache.stats()}")
+
+    return (
+        renderer.calls == 1
+        and hits.count(False) == 1
+        and all(data == renderer.data for data, _ in results)
+        and later == (renderer.data, True)
+        and cache._renders == {}
+    )
+
+
+async def test_waves_of_waiters():
+    """Test requests arriving while a render finishes never start a second one"""
+    print("\n" + "=" * 80)
+    print("TEST 2: WAVES OF WAITERS (UNCACHEABLE RENDER)")
+    print("=" * 80)
+
+    # Larger than the whole cache: nothing is stored, so only the shared render prevents re-renders
+    cache = ExportCache(max_bytes=4)
+    key = content_key("pdf", {"resume_id": 2})
+    renderer = CountingRenderer(data=b"%PDF-1.4 too large to cache", seconds=0.1)
+
+    first_wave = [asyncio.create_task(cache.get_or_render(key, renderer)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    second_wave = [asyncio.create_task(cache.get_or_render(key, renderer)) for _ in range(5)]
+    results = await asyncio.gather(*first_wave, *second_wave)
+
+    print(f"  renders for 10 overlapping requests: {renderer.calls}, cached entries: {cache.stats()['entries']}")
+
+    after = await cache.get_or_render(key, renderer)
+    print(f"  renders after a later request: {renderer.calls} (hit={after[1]})")
+
+    return renderer.calls == 2 and all(data == renderer.data for data, _ in results) and after[1] is False
+
+
+async def test_failure_shared_and_retried():
+    """Test a failed render reaches every waiter and the next request renders again"""
+    print("\n" + "=" * 80)
+    print("TEST 3: FAILED RENDER")
+    print("=" * 80)
+
+    cache = ExportCache(max_bytes=1024 * 1024)
+    key = content_key("docx", {"resume_id": 3})
+    renderer = CountingRenderer(fail=True)
+
+    results = await asyncio.gather(*(cache.get_or_render(key, renderer) for _ in range(4)), return_exceptions=True)
+    errors = [str(r) for r in results if isinstance(r, RuntimeError)]
+    renderer.fail = False
+    retried = await cache.get_or_render(key, renderer)
+
+    print(f"  errors: {errors}, renders: {renderer.calls}, retry: {retried}")
+
+    return len(errors) == 4 and renderer.calls == 2 and retried == (renderer.data, False)
+
+
+async def test_cancelled_request():
+    """Test cancelling the request that started a render does not cancel it for the others"""
+    print("\n" + "=" * 80)
+    print("TEST 4: CANCELLED REQUEST")
+    print("=" * 80)
+
+    cache = ExportCache(max_bytes=1024 * 1024)
+    key = content_key("docx", {"resume_id": 4})
+    renderer = CountingRenderer(seconds=0.15)
+
+    starter = asyncio.create_task(cache.get_or_render(key, renderer))
+    await asyncio.sleep(0.02)
+    waiter = asyncio.create_task(cache.get_or_render(key, renderer))
+    await asyncio.sleep(0.02)
+    starter.cancel()
+
+    data, hit = await waiter
+    print(f"  starter cancelled: {starter.cancelled()}, waiter got {len(data)} bytes (hit={hit}), renders: {renderer.calls}")
+    print(f"  cached afterwards: {cache.get(key) is not None}")
+
+    return starter.cancelled() and data == renderer.data and renderer.calls == 1 and cache.get(key) == renderer.data
+
+
+async def test_lru_eviction():
+    """Test the cache stays within max_bytes, evicting least recently used entries"""
+    print("\n" + "=" * 80)
+    print("TEST 5: LRU EVICTION")
+    print("=" * 80)
+
+    cache = ExportCache(max_bytes=30)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"y" * 10)
+    cache.put("c", b"z" * 10)
+    cache.get("a")  # a is now most recently used
+    cache.put("d", b"w" * 10)
+
+    kept = [key for key in "abcd" if cache.get(key) is not None]
+    print(f"  kept: {kept}, stats: {cache.stats()}")
+
+    return kept == ["a", "c", "d"] and cache.stats()["bytes"] == 30
+
+
+async def main():
+    """Run all export cache tests"""
+    results = {
+        'concurrent_dedup': await test_concurrent_dedup(),
+        'waves_of_waiters': await test_waves_of_waiters(),
+        'failed_render': await test_failure_shared_and_retried(),
+        'cancelled_request': await test_cancelled_request(),
+        'lru_eviction': await test_lru_eviction(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
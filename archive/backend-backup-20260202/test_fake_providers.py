@@ -0,0 +1,175 @@
+"""
+Test the fake provider server with the real SDK clients
+Tests: latency distributions, OpenAI JSON mode / streaming, error injection,
+Perplexity citations, Firecrawl scrape / extract, backend settings wiring
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openai import AsyncOpenAI, InternalServerError
+
+from fake_providers import FakeProviderServer, LatencyDistribution, ProviderProfile
+
+
+def test_latency_distributions():
+    """Test latency spec parsing and the log-normal percentiles"""
+    print("=" * 80)
+    print("TEST 1: LATENCY DISTRIBUTIONS")
+    print("=" * 80)
+
+    rng = random.Random(0)
+    lognormal = LatencyDistribution.parse("lognormal:800:2500")
+    samples = sorted(lognormal.sample(rng) for _ in range(20000))
+    p50, p95 = samples[10000], samples[19000]
+    uniform = [LatencyDistribution.parse("uniform:100:200").sample(rng) for _ in range(1000)]
+    print(f"  lognormal:800:2500 -> p50 {p50:.3f}s p95 {p95:.3f}s")
+    print(f"  uniform:100:200    -> min {min(uniform):.3f}s max {max(uniform):.3f}s")
+
+    invalid = 0
+    for spec in ("lognormal:800", "uniform:5:1", "slow"):
+        try:
+            LatencyDistribution.parse(spec)
+        except ValueError:
+            invalid += 1
+    print(f"  invalid specs rejected: {invalid}/3")
+
+    return (
+        abs(p50 - 0.8) < 0.05 and abs(p95 - 2.5) < 0.2
+        and 0.1 <= min(uniform) and max(uniform) <= 0.2
+        and LatencyDistribution.parse("250").sample(rng) == 0.25
+        and invalid == 3
+    )
+
+
+async def test_openai(server: FakeProviderServer):
+    """Test JSON mode, streaming pace and injected errors"""
+    print("\n" + "=" * 80)
+    print("TEST 2: OPENAI CHAT COMPLETIONS")
+    print("=" * 80)
+
+    client = AsyncOpenAI(api_key="sk-fake", base_url=server.env()["OPENAI_BASE_URL"], max_retries=0)
+
+    prompt = 'Return JSON in this format: {"questions": [{"id": "q1", "answer": "..."}], "score": 0}'
+    response = await client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=[{"role": "system", "content": prompt}, {"role": "user", "content": "Go"}],
+        response_format={"type": "json_object"},
+    )
+    echoed = json.loads(response.choices[0].message.content)
+    print(f"  json_object: {echoed}")
+
+    schema = {"type": "object", "properties": {"tags": {"type": "array", "items": {"type": "string"}, "minItems": 2}},
+              "required": ["tags"]}
+    response = await client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=[{"role": "user", "content": "Tag this"}],
+        response_format={"type": "json_schema", "json_schema": {"name": "tags", "schema": schema}},
+    )
+    tags = json.loads(response.choices[0].message.content)["tags"]
+    print(f"  json_schema: {len(tags)} tags")
+
+    # 100 completion tokens at 200 tok/s after 50 ms: ~0.55 s total, first token after ~0.07 s
+    start = time.perf_counter()
+    first_token, chunks, usage = None, 0, None
+    stream = await client.chat.completions.create(
+        model="gpt-4.1-mini",
+        messages=[{"role": "user", "content": "Write"}],
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            first_token = first_token or time.perf_counter() - start
+            chunks += 1
+        if chunk.usage:
+            usage = chunk.usage
+    total = time.perf_counter() - start
+    print(f"  stream: first token {first_token:.3f}s, total {total:.3f}s, {chunks} chunks, {usage.completion_tokens} tokens")
+
+    server.profiles["openai"].error_rate = 1.0
+    server.profiles["openai"].error_statuses = (500,)
+    try:
+        await client.chat.completions.create(model="gpt-4.1-mini", messages=[{"role": "user", "content": "x"}])
+        injected = False
+    except InternalServerError:
+        injected = True
+    server.profiles["openai"].error_rate = 0.0
+    print(f"  injected 500 raised by SDK: {injected}")
+
+    return (
+        echoed == {"questions": [{"id": "q1", "answer": "..."}], "score": 0}
+        and len(tags) >= 2
+        and first_token < 0.25 and 0.4 < total < 1.5 and chunks > 5
+        and 90 <= usage.completion_tokens <= 110
+        and injected
+    )
+
+
+async def test_backend_services(server: FakeProviderServer):
+    """Test the backend's Perplexity and Firecrawl clients through the settings URLs"""
+    print("\n" + "=" * 80)
+    print("TEST 3: BACKEND SERVICES AGAINST FAKE PROVIDERS")
+    print("=" * 80)
+
+    from app.services.firecrawl_client import FirecrawlClient
+    from app.services.perplexity_client import PerplexityClient
+
+    research = await PerplexityClient().research_with_citations("Acme Corp recent news")
+    print(f"  perplexity: {len(research['citations'])} citations")
+
+    markdown = await FirecrawlClient().scrape_page("https://example.com/careers/123")
+    print(f"  firecrawl scrape: {len(markdown)} characters")
+
+    stats = server.stats()
+    print(f"  requests seen: perplexity {stats['perplexity']['requests']}, firecrawl {stats['firecrawl']['requests']}")
+
+    return (
+        len(research["citations"]) == 5
+        and markdown.startswith("# ")
+        and stats["perplexity"]["requests"] == 1
+        and stats["firecrawl"]["requests"] == 1
+    )
+
+
+async def main():
+    """Run all fake provider tests"""
+    results = {'latency_distributions': test_latency_distributions()}
+
+    profiles = {
+        "openai": ProviderProfile(latency=LatencyDistribution.parse("fixed:50"), tokens_per_second=200,
+                                  completion_tokens=100, seed=1),
+    }
+    with FakeProviderServer(profiles) as server:
+        # Settings are read on first import of app.config
+        os.environ.update(server.env())
+        os.environ["TEST_MODE"] = "false"
+        results['openai'] = await test_openai(server)
+        results['backend_services'] = await test_backend_services(server)
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
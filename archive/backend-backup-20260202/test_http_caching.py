@@ -0,0 +1,169 @@
+"""
+Test response compression and conditional GET helpers
+Tests: encoding negotiation, gzip threshold, streaming passthrough, ETag / 304
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+from app.utils.http_cache import row_etag, not_modified, cache_headers
+from app.utils.json_codec import ORJSONResponse
+
+LARGE = {"items": [{"id": i, "text": "interview prep section " * 4} for i in range(200)]}
+ETAG = row_etag("interview_prep", 7, "2026-10-18T12:00:00")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    # Like SecurityHeadersMiddleware: BaseHTTPMiddleware re-chunks every response body
+    @app.middleware("http")
+    async def passthrough(request: Request, call_next):
+        return await call_next(request)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large(request: Request):
+        cached = not_modified(request, ETAG)
+        if cached is not None:
+            return cached
+        return ORJSONResponse(LARGE, headers=cache_headers(ETAG))
+
+    @app.get("/small")
+    async def small():
+        return ORJSONResponse({"success": True})
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield (f'{{"line": {i}}}\n' * 200).encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+def test_negotiation():
+    """Test Accept-Encoding negotiation"""
+    print("=" * 80)
+    print("TEST 1: ENCODING NEGOTIATION")
+    print("=" * 80)
+
+    cases = [
+        ("gzip, deflate, br", True, "br"),
+        ("gzip, deflate, br", False, "gzip"),
+        ("br;q=0.5, gzip;q=0.9", True, "gzip"),
+        ("gzip;q=0", True, None),
+        ("*", False, "gzip"),
+        ("identity", True, None),
+        ("", True, None),
+    ]
+    ok = True
+    for header, brotli_available, expected in cases:
+        got = negotiate_encoding(header, brotli_available)
+        print(f"  {header!r:28} brotli={brotli_available!s:5} -> {got}")
+        ok = ok and got == expected
+    return ok
+
+
+def test_compression(client: TestClient):
+    """Test gzip above the threshold, small and streaming bodies untouched"""
+    print("\n" + "=" * 80)
+    print("TEST 2: COMPRESSION THRESHOLD AND STREAMING")
+    print("=" * 80)
+
+    large = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    encoded = large.headers.get("content-encoding")
+    print(f"  large: encoding={encoded} etag={large.headers.get('etag')} vary={large.headers.get('vary')}")
+    print(f"  large: {len(large.content)} bytes decoded, {large.headers['content-length']} bytes on the wire")
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    print(f"  small: encoding={small.headers.get('content-encoding')}")
+
+    stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    print(f"  stream: encoding={stream.headers.get('content-encoding')} lines={stream.text.count(chr(10))}")
+
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    print(f"  identity: encoding={identity.headers.get('content-encoding')} etag={identity.headers.get('etag')}")
+
+    return (
+        encoded == "gzip"
+        and large.json() == LARGE
+        and large.headers["etag"] == ETAG[:-1] + '-gzip"'
+        and "Accept-Encoding" in large.headers.get("vary", "")
+        and small.headers.get("content-encoding") is None
+        and stream.headers.get("content-encoding") is None
+        and stream.text.count("\n") == 600
+        and identity.headers.get("content-encoding") is None
+        and identity.headers["etag"] == ETAG
+    )
+
+
+def test_conditional_get(client: TestClient):
+    """Test If-None-Match with plain and encoded ETags"""
+    print("\n" + "=" * 80)
+    print("TEST 3: CONDITIONAL GET")
+    print("=" * 80)
+
+    encoded_etag = client.get("/large", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    statuses = {
+        "encoded etag": client.get("/large", headers={"If-None-Match": encoded_etag}).status_code,
+        "plain etag": client.get("/large", headers={"If-None-Match": ETAG}).status_code,
+        "weak etag": client.get("/large", headers={"If-None-Match": f"W/{ETAG}"}).status_code,
+        "list": client.get("/large", headers={"If-None-Match": f'"other", {ETAG}'}).status_code,
+        "stale": client.get("/large", headers={"If-None-Match": '"stale"'}).status_code,
+    }
+    for name, status in statuses.items():
+        print(f"  {name:14} -> {status}")
+
+    not_modified_response = client.get("/large", headers={"If-None-Match": ETAG, "Accept-Encoding": "gzip"})
+    print(f"  304 body: {len(not_modified_response.content)} bytes, etag={not_modified_response.headers.get('etag')}")
+
+    changed = row_etag("interview_prep", 7, "2026-10-18T12:00:01")
+    print(f"  etag changes with updated_at: {changed != ETAG}")
+
+    return (
+        statuses == {"encoded etag": 304, "plain etag": 304, "weak etag": 304, "list": 304, "stale": 200}
+        and not_modified_response.content == b""
+        and not_modified_response.headers.get("content-encoding") is None
+        and changed != ETAG
+    )
+
+
+def main():
+    """Run all HTTP caching tests"""
+    client = TestClient(build_app())
+    results = {
+        'negotiation': test_negotiation(),
+        'compression': test_compression(client),
+        'conditional_get': test_conditional_get(client),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():20s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
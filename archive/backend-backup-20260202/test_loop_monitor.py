@@ -0,0 +1,252 @@
+"""
+Test the event-loop lag monitor and blocking-call detector
+Tests: blocking call caught with route and stack, off-loop work ignored,
+strict mode failing the run, lag on the admin metrics endpoint, profiler
+span hooks never blamed for a blocking call they wrap
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from app.middleware.request_context import RequestContextMiddleware
+from app.utils.loop_monitor import BlockingCallError, LoopMonitor
+
+
+def parse_pdf_synchronously():
+    """Stands in for sync library work called straight from an async route"""
+    time.sleep(0.3)
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/blocking")
+    async def blocking():
+        parse_pdf_synchronously()
+        return {"ok": True}
+
+    @app.get("/offloaded")
+    async def offloaded():
+        await asyncio.to_thread(parse_pdf_synchronously)
+        await asyncio.sleep(0.1)
+        return {"ok": True}
+
+    return app
+
+
+async def test_blocking_call_detected():
+    """Test a sync call inside an async route is reported with its route and stack"""
+    print("=" * 80)
+    print("TEST 1: BLOCKING CALL DETECTED")
+    print("=" * 80)
+
+    monitor = LoopMonitor(threshold_ms=100, interval_ms=20)
+    monitor.start()
+    await asyncio.sleep(0.1)
+
+    transport = httpx.ASGITransport(app=create_test_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/blocking")
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    stats = monitor.stats()
+    event = monitor.events[0] if monitor.events else {}
+    print(f"  status: {response.status_code}, blocked calls: {stats['blocked_calls']}")
+    print(f"  event: {event.get('blocked_ms')} ms in {event.get('route')} at {event.get('location')}")
+    print(f"  lag: {stats['lag_ms']}")
+
+    return (
+        response.status_code == 200
+        and stats["blocked_calls"] == 1
+        and event["route"] == "GET /blocking"
+        and "parse_pdf_synchronously" in event["location"]
+        and any("time.sleep" in line for line in event["stack"])
+        and 250 <= event["blocked_ms"] < 1000
+        and stats["lag_ms"]["max"] >= 250
+    )
+
+
+async def test_offloaded_work_ignored():
+    """Test work moved off the loop does not count as blocking"""
+    print("\n" + "=" * 80)
+    print("TEST 2: OFFLOADED WORK IGNORED")
+    print("=" * 80)
+
+    monitor = LoopMonitor(threshold_ms=100, interval_ms=20)
+    monitor.start()
+
+    transport = httpx.ASGITransport(app=create_test_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.get("/offloaded") for _ in range(5)))
+    await monitor.stop()
+
+    stats = monitor.stats()
+    print(f"  statuses: {[r.status_code for r in responses]}")
+    print(f"  blocked calls: {stats['blocked_calls']}, lag: {stats['lag_ms']} over {stats['samples']} samples")
+
+    return (
+        all(r.status_code == 200 for r in responses)
+        and stats["blocked_calls"] == 0
+        and stats["samples"] >= 10
+        and stats["lag_ms"]["p99"] < 100
+    )
+
+
+async def test_strict_mode():
+    """Test a strict monitor fails on stop and a clean one does not"""
+    print("\n" + "=" * 80)
+    print("TEST 3: STRICT MODE")
+    print("=" * 80)
+
+    clean = LoopMonitor(threshold_ms=100, interval_ms=20, strict=True)
+    clean.start()
+    await asyncio.sleep(0.1)
+    await clean.stop()
+    print("  clean run stopped without error")
+
+    monitor = LoopMonitor(threshold_ms=100, interval_ms=20, strict=True)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    parse_pdf_synchronously()
+    await asyncio.sleep(0.05)
+    try:
+        await monitor.stop()
+        message = None
+    except BlockingCallError as e:
+        message = str(e)
+    print(f"  blocking run raised: {message!r}")
+
+    return message is not None and "background task" in message and "parse_pdf_synchronously" in message
+
+
+async def test_admin_metrics():
+    """Test the app starts the monitor and reports lag on /api/admin/metrics"""
+    print("\n" + "=" * 80)
+    print("TEST 4: ADMIN METRICS ENDPOINT")
+    print("=" * 80)
+
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        await asyncio.sleep(0.3)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/admin/metrics")
+    finally:
+        await app.router.shutdown()
+
+    data = response.json()
+    event_loop = data.get("event_loop", {})
+    print(f"  status: {response.status_code}")
+    print(f"  event_loop: running={event_loop.get('running')} samples={event_loop.get('samples')} lag={event_loop.get('lag_ms')}")
+
+    return (
+        response.status_code == 200
+        and event_loop.get("running") is True
+        and event_loop.get("samples", 0) > 0
+        and set(event_loop.get("lag_ms", {})) == {"p50", "p95", "p99", "max"}
+        and "export_cache" in data
+    )
+
+
+class SlowJobBoard(BaseHTTPRequestHandler):
+    """Job posting server that takes 300 ms to answer"""
+
+    def do_GET(self):
+        time.sleep(0.3)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_job_posting_synchronously(url: str):
+    """A sync HTTP call from an async route (the bug to report)"""
+    with httpx.Client() as client:
+        client.get(url)
+
+
+async def test_profiler_hooks_not_blamed():
+    """Test a blocking HTTP call is blamed on the app frame, not the profiler's send wrapper"""
+    print("\n" + "=" * 80)
+    print("TEST 5: PROFILER HOOKS NOT BLAMED")
+    print("=" * 80)
+
+    from app.database import engine
+    from app.utils.profiler import RequestProfiler
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowJobBoard)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/jobs/1"
+
+    profiler = RequestProfiler(token="profile-secret")
+    profiler.start(engine)  # token set: httpx send is wrapped by the span hooks
+    wrapped_by = httpx.Client.send.__module__
+    monitor = LoopMonitor(threshold_ms=100, interval_ms=20)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    try:
+        fetch_job_posting_synchronously(url)
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+        await profiler.stop()
+        server.shutdown()
+
+    event = monitor.events[0] if monitor.events else {}
+    print(f"  httpx send wrapped by: {wrapped_by}, restored after stop: {httpx.Client.send.__module__}")
+    print(f"  event at {event.get('location')}")
+
+    return (
+        wrapped_by == "app.utils.profiler"
+        and httpx.Client.send.__module__ == "httpx._client"
+        and "fetch_job_posting_synchronously" in event.get("location", "")
+        and any("profiler.py" in line for line in event.get("stack", []))
+    )
+
+
+async def main():
+    """Run all loop monitor tests"""
+    results = {
+        'blocking_call_detected': await test_blocking_call_detected(),
+        'offloaded_work_ignored': await test_offloaded_work_ignored(),
+        'strict_mode': await test_strict_mode(),
+        'admin_metrics': await test_admin_metrics(),
+        'profiler_not_blamed': await test_profiler_hooks_not_blamed(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
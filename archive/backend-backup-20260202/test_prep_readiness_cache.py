@@ -0,0 +1,241 @@
+"""
+Test the per-prep memoized readiness score and values alignment
+Tests: readiness kept current by practice saves (new questions, repeat
+sessions, STAR stories), concurrent saves without lost increments, values
+alignment computed once per input and recomputed when an input changes,
+the intelligence bundle served only to the prep's owner
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+from fastapi import HTTPException
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/prep_cache.db?timeout=60")
+
+import app.routes.interview_prep as prep_routes
+from app.database import AsyncSessionLocal, init_db
+from app.models.interview_prep import InterviewPrep
+from app.models.job import Job
+from app.models.resume import BaseResume, TailoredResume
+from app.services.prep_analysis_cache import READINESS, get_prep_cached
+
+USER_ID = "user_readiness"
+
+PREP_DATA = {
+    "company_profile": {"overview": "Acme builds warehouse robots"},
+    "role_analysis": {"summary": "Platform engineering"},
+    "values_and_culture": {"stated_values": [{"name": "Ownership"}, {"name": "Customer obsession"}]},
+}
+
+
+async def create_prep() -> int:
+    async with AsyncSessionLocal() as db:
+        base = BaseResume(filename="resume.docx", file_path="/tmp/resume.docx", session_user_id=USER_ID)
+        job = Job(url=f"https://jobs.example.com/{os.urandom(4).hex()}", company="Acme", title="Platform Engineer",
+                  description="Build the fleet platform")
+        db.add_all([base, job])
+        await db.flush()
+        tailored = TailoredResume(base_resume_id=base.id, job_id=job.id, session_user_id=USER_ID,
+                                  tailored_summary="Shipped robotics platforms")
+        db.add(tailored)
+        await db.flush()
+        prep = InterviewPrep(tailored_resume_id=tailored.id, prep_data=PREP_DATA)
+        db.add(prep)
+        await db.commit()
+        return prep.id
+
+
+async def readiness(prep_id: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        return (await prep_routes.get_readiness_score(prep_id, x_user_id=USER_ID, db=db))["data"]
+
+
+async def stored_practice(prep_id: int) -> tuple:
+    """(practice stored with the readiness score, practice aggregated from the responses)"""
+    async with AsyncSessionLocal() as db:
+        prep = await db.get(InterviewPrep, prep_id)
+        state = await get_prep_cached(db, prep.tailored_resume_id, READINESS)
+        return state["practice"], await prep_routes._practice_stats(db, prep_id)
+
+
+async def practice(prep_id: int, question: str, seconds: int = None):
+    async with AsyncSessionLocal() as db:
+        await prep_routes.save_practice_response(
+            prep_routes.SavePracticeResponseRequest(
+                interview_prep_id=prep_id, question_text=question, practice_duration_seconds=seconds
+            ),
+            db=db
+        )
+
+
+async def test_practice_updates_readiness():
+    """Test practice saves keep the stored readiness equal to the aggregates"""
+    print("=" * 80)
+    print("TEST 1: READINESS FOLLOWS PRACTICE")
+    print("=" * 80)
+
+    prep_id = await create_prep()
+    before = await readiness(prep_id)
+
+    await practice(prep_id, "Tell me about yourself", seconds=90)
+    await practice(prep_id, "Tell me about yourself", seconds=120)  # repeat session, longer take
+    async with AsyncSessionLocal() as db:
+        await prep_routes.save_star_story_for_question(
+            prep_routes.SaveStarStoryForQuestionRequest(
+                interview_prep_id=prep_id, question_id=3, question_text="Describe a conflict",
+                question_type="behavioral", star_story={"situation": "Outage"}
+            ),
+            x_user_id=USER_ID, db=db
+        )
+
+    stored, aggregated = await stored_practice(prep_id)
+    after = await readiness(prep_id)
+    print(f"  stored practice: {stored}")
+    print(f"  aggregated:      {aggregated}")
+    print(f"  strengths before: {before['strengths']}")
+    print(f"  strengths after:  {after['strengths']}")
+
+    return (
+        stored == aggregated == {"questions_practiced": 2, "practice_sessions": 3, "practice_seconds": 120}
+        and "Practiced 2 questions" in after["strengths"]
+    )
+
+
+async def test_concurrent_practice():
+    """Test concurrent saves for one prep lose no increments"""
+    print("\n" + "=" * 80)
+    print("TEST 2: CONCURRENT PRACTICE SAVES")
+    print("=" * 80)
+
+    prep_id = await create_prep()
+    await readiness(prep_id)
+
+    await asyncio.gather(*(practice(prep_id, f"Question {i}", seconds=30) for i in range(8)))
+
+    stored, aggregated = await stored_practice(prep_id)
+    print(f"  stored practice: {stored}")
+    print(f"  aggregated:      {aggregated}")
+
+    return stored == aggregated == {"questions_practiced": 8, "practice_sessions": 8, "practice_seconds": 240}
+
+
+async def test_values_alignment_memoized():
+    """Test values alignment is generated once per input set"""
+    print("\n" + "=" * 80)
+    print("TEST 3: VALUES ALIGNMENT MEMOIZATION")
+    print("=" * 80)
+
+    calls = []
+
+    async def scorecard(self, stated_values, candidate_background, job_description, company_name):
+        calls.append(candidate_background)
+        return {
+            "overall_culture_fit": 8.0,
+            "value_matches": [
+                {"value": "Ownership", "match_percentage": 85, "your_evidence": candidate_background},
+                {"value": "Customer obsession", "match_percentage": 40},
+            ],
+        }
+
+    original = prep_routes.InterviewIntelligenceService.generate_values_alignment_scorecard
+    prep_routes.InterviewIntelligenceService.generate_values_alignment_scorecard = scorecard
+    try:
+        prep_id = await create_prep()
+
+        async def alignment():
+            async with AsyncSessionLocal() as db:
+                return (await prep_routes.get_values_alignment(prep_id, x_user_id=USER_ID, db=db))["data"]
+
+        first = await alignment()
+        second = await alignment()
+
+        async with AsyncSessionLocal() as db:
+            prep = await db.get(InterviewPrep, prep_id)
+            tailored = await db.get(TailoredResume, prep.tailored_resume_id)
+            tailored.tailored_summary = "Led the robotics fleet migration"
+            await db.commit()
+        third = await alignment()
+    finally:
+        prep_routes.InterviewIntelligenceService.generate_values_alignment_scorecard = original
+
+    print(f"  generations: {len(calls)} ({calls})")
+    print(f"  score: {first['alignment_score']}, matched: {[v['value'] for v in first['matched_values']]}, "
+          f"gaps: {[v['value'] for v in first['value_gaps']]}")
+
+    return (
+        len(calls) == 2
+        and first == second
+        and first["alignment_score"] == 80
+        and third["matched_values"][0]["candidate_evidence"] == "Led the robotics fleet migration"
+    )
+
+
+async def test_intelligence_bundle_ownership():
+    """Test the intelligence bundle requires X-User-ID and is only served to the prep's owner"""
+    print("\n" + "=" * 80)
+    print("TEST 4: INTELLIGENCE BUNDLE OWNERSHIP")
+    print("=" * 80)
+
+    calls = []
+
+    async def bundle(self, content_items, company_research, job_description, job_title, company_name, content_type):
+        calls.append(content_type)
+        return {"scored_items": [], "talking_points": [], "job_alignment": {}}
+
+    async def status(user_id):
+        async with AsyncSessionLocal() as db:
+            try:
+                await prep_routes.get_intelligence_bundle(prep_id, x_user_id=user_id, db=db, _rate_limit=None)
+                return 200
+            except HTTPException as e:
+                return e.status_code
+
+    original = prep_routes.InterviewIntelligenceService.generate_intelligence_bundle
+    prep_routes.InterviewIntelligenceService.generate_intelligence_bundle = bundle
+    try:
+        prep_id = await create_prep()
+        statuses = [await status(None), await status("someone_else"), await status(USER_ID)]
+    finally:
+        prep_routes.InterviewIntelligenceService.generate_intelligence_bundle = original
+
+    print(f"  no header / other user / owner: {statuses}, generations: {len(calls)}")
+
+    return statuses == [400, 404, 200] and len(calls) == 1
+
+
+async def main():
+    """Run all prep readiness cache tests"""
+    await init_db()
+
+    results = {
+        'practice_updates': await test_practice_updates_readiness(),
+        'concurrent_practice': await test_concurrent_practice(),
+        'values_alignment': await test_values_alignment_memoized(),
+        'bundle_ownership': await test_intelligence_bundle_ownership(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,272 @@
+"""
+Test the cost-weighted rate limiter
+Tests: client IP from trusted X-Forwarded-For hops, per-IP enforcement
+across rotating X-User-ID values, 429 with Retry-After, all-or-nothing
+charging (memory and SQL stores), no bucket state for rejected requests,
+bounded memory store, scheduled pruning of the shared table
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException, Request, Response
+
+from app.middleware.rate_limit import Charge, MemoryBucketStore, RateLimit, RateLimiter, SQLBucketStore
+
+
+def make_request(user_id: str = None, forwarded_for: str = None, client: str = "10.0.0.1") -> Request:
+    headers = []
+    if user_id:
+        headers.append((b"x-user-id", user_id.encode()))
+    if forwarded_for:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/tailor/tailor",
+        "headers": headers,
+        "client": (client, 50000),
+        "query_string": b"",
+    })
+
+
+def make_limiter(ip_multiplier: float = 2, trusted_proxies: int = 1) -> RateLimiter:
+    limiter = RateLimiter()
+    limiter.enabled = True
+    limiter.shared_store = None  # memory store
+    limiter.ip_multiplier = ip_multiplier
+    limiter.trusted_proxies = trusted_proxies
+    return limiter
+
+
+async def attempt(limiter: RateLimiter, request: Request, limit: RateLimit, cost: float = 0):
+    """(status, headers) of one limited request"""
+    response = Response()
+    try:
+        await limiter.check(request, limit, cost=cost, response=response)
+        return 200, dict(response.headers)
+    except HTTPException as e:
+        return e.status_code, e.headers or {}
+
+
+def test_client_ip():
+    """Test only proxy-appended X-Forwarded-For entries are trusted"""
+    print("=" * 80)
+    print("TEST 1: CLIENT IP")
+    print("=" * 80)
+
+    one_proxy = make_limiter(trusted_proxies=1)
+    two_proxies = make_limiter(trusted_proxies=2)
+    no_proxy = make_limiter(trusted_proxies=0)
+
+    spoofed = make_request(forwarded_for="6.6.6.6, 203.0.113.7")
+    results = {
+        "spoofed leftmost, 1 proxy": one_proxy.get_client_ip(spoofed),
+        "2 proxies": two_proxies.get_client_ip(make_request(forwarded_for="6.6.6.6, 203.0.113.7, 10.1.1.1")),
+        "short header, 2 proxies": two_proxies.get_client_ip(make_request(forwarded_for="203.0.113.7")),
+        "no header": one_proxy.get_client_ip(make_request()),
+        "header ignored, 0 proxies": no_proxy.get_client_ip(spoofed),
+    }
+    for name, ip in results.items():
+        print(f"  {name}: {ip}")
+
+    return results == {
+        "spoofed leftmost, 1 proxy": "203.0.113.7",
+        "2 proxies": "203.0.113.7",
+        "short header, 2 proxies": "203.0.113.7",
+        "no header": "10.0.0.1",
+        "header ignored, 0 proxies": "10.0.0.1",
+    }
+
+
+async def test_per_ip_enforcement():
+    """Test rotating X-User-ID values cannot get past the per-IP bucket"""
+    print("\n" + "=" * 80)
+    print("TEST 2: PER-IP ENFORCEMENT")
+    print("=" * 80)
+
+    limiter = make_limiter(ip_multiplier=2)
+    limit = RateLimit.parse("tailor_resume", "3/minute")
+
+    statuses = []
+    for i in range(8):
+        # A fresh X-User-ID and a fresh spoofed leftmost hop on every request
+        request = make_request(user_id=f"user_rotating{i}", forwarded_for=f"6.6.6.{i}, 203.0.113.7")
+        status, headers = await attempt(limiter, request, limit)
+        statuses.append(status)
+    print(f"  rotating users from one IP: {statuses}")
+
+    other_ip, _ = await attempt(limiter, make_request(user_id="user_other", forwarded_for="198.51.100.2"), limit)
+    print(f"  different IP: {other_ip}")
+
+    # Per-user limit still applies on its own
+    same_user = [
+        (await attempt(limiter, make_request(user_id="user_same", forwarded_for="198.51.100.3"), limit))[0]
+        for _ in range(4)
+    ]
+    print(f"  one user from a fresh IP: {same_user}")
+
+    return statuses == [200] * 6 + [429] * 2 and other_ip == 200 and same_user == [200, 200, 200, 429]
+
+
+async def test_retry_after():
+    """Test a rejected request is a 429 with a usable Retry-After"""
+    print("\n" + "=" * 80)
+    print("TEST 3: 429 AND RETRY-AFTER")
+    print("=" * 80)
+
+    limiter = make_limiter()
+    limit = RateLimit.parse("upload_resume", "2/minute")
+    request = make_request(user_id="user_retry")
+
+    results = [await attempt(limiter, request, limit) for _ in range(3)]
+    for status, headers in results:
+        print(f"  {status} {headers}")
+
+    status, headers = results[-1]
+    ok_headers = results[0][1]
+    return (
+        [r[0] for r in results] == [200, 200, 429]
+        and ok_headers.get("x-ratelimit-limit") == "2"
+        and ok_headers.get("x-ratelimit-remaining") == "1"
+        and 1 <= int(headers.get("Retry-After", 0)) <= 60
+    )
+
+
+async def test_budget_rejection_consumes_nothing():
+    """Test a request refused by the LLM budget keeps its endpoint token"""
+    print("\n" + "=" * 80)
+    print("TEST 4: ALL-OR-NOTHING CHARGING")
+    print("=" * 80)
+
+    limiter = make_limiter()
+    limiter.llm_budget = RateLimit.parse("llm", "100/hour")
+    limit = RateLimit.parse("tailor_resume", "5/minute")
+    request = make_request(user_id="user_budget")
+
+    first = await attempt(limiter, request, limit, cost=80)
+    refused = await attempt(limiter, request, limit, cost=80)
+    cheap = await attempt(limiter, request, limit, cost=10)
+    print(f"  cost 80: {first[0]}, cost 80 again: {refused[0]} (Retry-After {refused[1].get('Retry-After')})")
+    print(f"  cost 10 afterwards: {cheap[0]}, endpoint remaining {cheap[1].get('x-ratelimit-remaining')}, "
+          f"budget remaining {cheap[1].get('x-ratelimit-budget-remaining')}")
+
+    # SQL store: same rule inside one transaction
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/rate_limit.db")
+    from app.database import init_db
+    await init_db()
+    store = SQLBucketStore()
+    small = RateLimit.parse("llm", "10/hour")
+    wide = RateLimit.parse("endpoint", "5/hour")
+    charges = [Charge("endpoint:user_sql", wide, 1), Charge("llm:user_sql", small, 8)]
+    sql_first = await store.take_all(charges, 1000.0)
+    sql_refused = await store.take_all(charges, 1000.0)
+    sql_after = await store.take_all([charges[0]], 1000.0)
+    print(f"  sql: {sql_first}, refused {sql_refused}, endpoint alone {sql_after}")
+
+    memory = MemoryBucketStore()
+    mem_first = await memory.take_all(charges, 1000.0)
+    mem_refused = await memory.take_all(charges, 1000.0)
+    print(f"  memory: {mem_first}, refused {mem_refused}")
+
+    return (
+        first[0] == 200 and refused[0] == 429 and cheap[0] == 200
+        and cheap[1].get("x-ratelimit-remaining") == "3"
+        and sql_first == (True, [4.0, 2.0])
+        and sql_refused == (False, [4.0, 2.0])
+        and sql_after == (True, [3.0])
+        and mem_first == (True, [4.0, 2.0])
+        and mem_refused == (False, [4.0, 2.0])
+    )
+
+
+async def test_rejections_write_nothing():
+    """Test rejected requests create no buckets, the memory store stays bounded and idle rows are pruned"""
+    print("\n" + "=" * 80)
+    print("TEST 5: BOUNDED BUCKET STATE")
+    print("=" * 80)
+
+    from sqlalchemy import func, select
+
+    from app.database import AsyncSessionLocal
+    from app.models.rate_limit import RateLimitBucket
+
+    async def sql_rows(prefix: str) -> int:
+        async with AsyncSessionLocal() as session:
+            return await session.scalar(
+                select(func.count()).select_from(RateLimitBucket).where(RateLimitBucket.key.like(f"{prefix}%"))
+            )
+
+    # Each request is refused by an exhausted shared bucket while naming a fresh one
+    exhausted = RateLimit.parse("llm", "1/hour")
+    per_user = RateLimit.parse("flood", "5/hour")
+    memory = MemoryBucketStore(max_buckets=100)
+    store = SQLBucketStore()
+    for backend in (memory, store):
+        await backend.take_all([Charge("llm:flood_ip", exhausted, 1)], 2000.0)
+    for i in range(300):
+        charges = [Charge(f"flood:user_{i}", per_user, 1), Charge("llm:flood_ip", exhausted, 1)]
+        await memory.take_all(charges, 2000.0)
+        await store.take_all(charges, 2000.0)
+    rejected_memory, rejected_sql = len(memory), await sql_rows("flood:")
+
+    # Allowed requests beyond capacity evict the least recently charged buckets
+    for i in range(300):
+        await memory.take_all([Charge(f"flood:user_{i}", per_user, 1)], 2001.0 + i)
+    await memory.take_all([Charge("flood:user_250", per_user, 1)], 2400.0)
+    lru = len(memory), "flood:user_199" in memory._buckets, "flood:user_200" in memory._buckets
+    print(f"  buckets after 300 rejections: memory {rejected_memory}, sql {rejected_sql}")
+    print(f"  memory buckets after 300 allowed keys: {lru[0]}, oldest kept/evicted: {lru[1:]}")
+
+    # Scheduled pruning removes rows idle for a day
+    await store.take_all([Charge("flood:idle", per_user, 1)], 1000.0)
+    limiter = make_limiter()
+    limiter.shared_store = store
+    limiter.prune_interval = 0.05
+    limiter.start()
+    await asyncio.sleep(0.1)
+    await limiter.stop()
+    idle_left = await sql_rows("flood:idle")
+    print(f"  idle rows left after the pruner ran: {idle_left}")
+
+    return (
+        rejected_memory == 1 and rejected_sql == 0
+        and lru == (100, False, True)
+        and idle_left == 0 and limiter._pruner is None
+    )
+
+
+async def main():
+    """Run all rate limiter tests"""
+    results = {
+        'client_ip': test_client_ip(),
+        'per_ip_enforcement': await test_per_ip_enforcement(),
+        'retry_after': await test_retry_after(),
+        'all_or_nothing': await test_budget_rejection_consumes_nothing(),
+        'bounded_buckets': await test_rejections_write_nothing(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,253 @@
+"""
+Test the per-request sampling profiler
+Tests: header / sampling-rate gating, loop samples attributed to the
+profiled request (child tasks included), stage spans, profiles listed and
+served as speedscope under /api/admin/profiles, hooks installed only while
+profiling is enabled
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Profiling settings, in place before the settings are first loaded
+os.environ["PROFILING_TOKEN"] = "profile-secret"
+os.environ["PROFILING_INTERVAL_MS"] = "2"
+
+import httpx
+from cryptography.fernet import Fernet
+from fastapi import FastAPI
+
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import RequestProfiler, get_request_profiler, profile_span
+from benchmarks.load_test import build_resume_docx
+from fake_providers import FakeProviderServer, LatencyDistribution, ProviderProfile
+
+
+def rank_keywords_slowly(seconds: float) -> int:
+    """CPU work on the event loop, which the sampler should see"""
+    deadline = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+    return count
+
+
+async def score_section(seconds: float) -> int:
+    return rank_keywords_slowly(seconds)
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/work")
+    async def work():
+        # Child tasks: samples from them belong to this request too
+        await asyncio.gather(score_section(0.1), score_section(0.1))
+        with profile_span("render", "docx"):
+            await asyncio.to_thread(time.sleep, 0.05)
+        return {"ok": True}
+
+    return app
+
+
+def test_gating():
+    """Test the header token and sampling rate decide what gets profiled"""
+    print("=" * 80)
+    print("TEST 1: PROFILING GATES")
+    print("=" * 80)
+
+    profiler = RequestProfiler(token="secret", sample_rate=0.0)
+    decisions = {
+        "matching token": profiler.should_profile("secret"),
+        "wrong token": profiler.should_profile("guess"),
+        "no token": profiler.should_profile(None),
+    }
+    no_token_configured = RequestProfiler(token="", sample_rate=0.0).should_profile("")
+    sampled = RequestProfiler(sample_rate=1.0).should_profile(None)
+    half = RequestProfiler(sample_rate=0.5)
+    share = sum(1 for _ in range(2000) if half.should_profile(None)) / 2000
+
+    for name, decision in decisions.items():
+        print(f"  {name}: {decision}")
+    print(f"  empty PROFILING_TOKEN: {no_token_configured}, rate 1.0: {sampled}, rate 0.5 share: {share:.2f}")
+
+    return (
+        decisions == {"matching token": "header", "wrong token": None, "no token": None}
+        and no_token_configured is None
+        and sampled == "sampled"
+        and 0.4 < share < 0.6
+    )
+
+
+async def test_samples_and_spans():
+    """Test loop samples land in the profiled request and spans are recorded"""
+    print("\n" + "=" * 80)
+    print("TEST 2: SAMPLES AND SPANS")
+    print("=" * 80)
+
+    profiler = get_request_profiler()
+    profiler.start()
+    transport = httpx.ASGITransport(app=create_test_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        plain = await client.get("/work")
+        profiled = await client.get("/work", headers={"X-Profile-Token": "profile-secret"})
+    await profiler.stop()
+
+    profile_id = profiled.headers.get("x-profile-id")
+    profile = profiler.get(profile_id) if profile_id else None
+    if profile is None:
+        print(f"  no profile stored (headers: {dict(profiled.headers)})")
+        return False
+
+    speedscope = profile.speedscope()
+    frames = speedscope["shared"]["frames"]
+    sampled = speedscope["profiles"][0]
+    hot = {frames[sample[-1]]["name"] for sample in sampled["samples"] if sample}
+    print(f"  unprofiled response has profile id: {'x-profile-id' in plain.headers}")
+    print(f"  profile {profile.id}: {profile.duration_ms} ms, {profile.sample_count} samples, "
+          f"{sampled['endValue']:.0f} ms sampled")
+    print(f"  leaf functions: {sorted(hot)}")
+    print(f"  stages: {profile.stage_totals()}")
+
+    render = profile.stage_totals().get("render", {})
+    return (
+        "x-profile-id" not in plain.headers
+        and len(profiler.profiles) == 1
+        and profile.status == 200
+        and "rank_keywords_slowly" in hot
+        and 120 <= sampled["endValue"] <= profile.duration_ms
+        and render.get("count") == 1 and render.get("total_ms", 0) >= 45
+    )
+
+
+async def test_admin_profiles():
+    """Test a real upload is profiled with DB and LLM spans and listed by the admin API"""
+    print("\n" + "=" * 80)
+    print("TEST 3: ADMIN PROFILES API")
+    print("=" * 80)
+
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            upload = await client.post(
+                "/api/resumes/upload",
+                headers={"X-User-ID": "user_profiled", "X-Profile-Token": "profile-secret"},
+                files={"file": ("resume.docx", build_resume_docx(1),
+                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document")},
+            )
+            listing = await client.get("/api/admin/profiles")
+            profile_id = upload.headers.get("x-profile-id", "missing")
+            detail = await client.get(f"/api/admin/profiles/{profile_id}")
+            download = await client.get(f"/api/admin/profiles/{profile_id}/speedscope")
+            missing = await client.get("/api/admin/profiles/does-not-exist")
+            sampling = await client.post("/api/admin/profiles/sampling", json={"sample_rate": 0.25})
+            invalid = await client.post("/api/admin/profiles/sampling", json={"sample_rate": 2})
+    finally:
+        await app.router.shutdown()
+
+    profiles = listing.json().get("profiles", [])
+    stages = detail.json().get("stages", {}) if detail.status_code == 200 else {}
+    print(f"  upload: {upload.status_code}, profile id {profile_id}")
+    print(f"  listed: {[(p['method'], p['path'], p['trigger']) for p in profiles]}")
+    print(f"  stages: {stages}")
+    print(f"  speedscope download: {download.status_code} {download.headers.get('content-disposition')}")
+    print(f"  missing profile: {missing.status_code}, sampling: {sampling.json()}, invalid rate: {invalid.status_code}")
+
+    return (
+        upload.status_code == 200
+        and profiles[0]["id"] == profile_id  # newest first
+        and profiles[0]["trigger"] == "header"
+        and stages.get("db", {}).get("count", 0) > 0
+        and stages.get("llm", {}).get("count", 0) > 0
+        and download.status_code == 200
+        and download.json()["profiles"][0]["type"] == "sampled"
+        and missing.status_code == 404
+        and sampling.json() == {"sample_rate": 0.25}
+        and invalid.status_code == 422
+    )
+
+
+async def test_hooks_only_while_enabled():
+    """Test a disabled profiler leaves the loop and HTTP clients alone until sampling is turned on"""
+    print("\n" + "=" * 80)
+    print("TEST 4: HOOKS ONLY WHILE ENABLED")
+    print("=" * 80)
+
+    from app.database import engine
+
+    loop = asyncio.get_running_loop()
+    original_factory, original_send = loop.get_task_factory(), httpx.AsyncClient.send
+
+    def hooked() -> tuple:
+        return loop.get_task_factory() is not original_factory, httpx.AsyncClient.send is not original_send
+
+    profiler = RequestProfiler(token="", sample_rate=0.0)
+    profiler.start(engine)
+    disabled = hooked()
+    profiler.set_sample_rate(0.5)  # what POST /api/admin/profiles/sampling does
+    sampling = hooked()
+    profiler.set_sample_rate(0.0)
+    switched_off = hooked()
+    profiler.set_sample_rate(1.0)
+    await profiler.stop()
+    stopped = hooked()
+
+    print(f"  (task factory, httpx send) hooked - disabled: {disabled}, sampling on: {sampling}, "
+          f"sampling off: {switched_off}, stopped: {stopped}")
+
+    return disabled == switched_off == stopped == (False, False) and sampling == (True, True)
+
+
+async def main():
+    """Run all request profiler tests"""
+    workdir = tempfile.TemporaryDirectory()
+    profiles = {"openai": ProviderProfile(latency=LatencyDistribution.parse("fixed:20"), tokens_per_second=0)}
+    with FakeProviderServer(profiles) as server:
+        # Before anything loads the settings
+        os.environ.update(server.env())
+        os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{workdir.name}/profiler.db")
+        os.environ["FILE_ENCRYPTION_KEY"] = Fernet.generate_key().decode()
+        os.environ["TEST_MODE"] = "false"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        cwd = os.getcwd()
+        os.chdir(workdir.name)  # uploads/ and logs/ are relative to the working directory
+        try:
+            results = {
+                'gating': test_gating(),
+                'samples_and_spans': await test_samples_and_spans(),
+                'admin_profiles': await test_admin_profiles(),
+                'hooks_only_enabled': await test_hooks_only_while_enabled(),
+            }
+        finally:
+            os.chdir(cwd)
+    workdir.cleanup()
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
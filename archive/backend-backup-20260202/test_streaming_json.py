@@ -0,0 +1,247 @@
+"""
+Test incremental JSON parsing of streamed LLM output and per-section repair
+Tests: escapes split across chunks, truncated output, trailing commas,
+an invalid section repaired while the plan streams, pending repairs
+cancelled when the stream fails
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.streaming_json import StreamingObjectParser
+
+
+def feed_in_chunks(parser: StreamingObjectParser, text: str, size: int) -> list:
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return members
+
+
+def test_split_escapes():
+    """Test escapes and quotes split across chunk boundaries decode like json.loads"""
+    print("=" * 80)
+    print("TEST 1: ESCAPES SPLIT ACROSS CHUNKS")
+    print("=" * 80)
+
+    plan = {
+        "profile_summary": 'Said "ship it" \\ twice, caf\u00e9 {not a brace}, [not a list]',
+        "target_roles": [{"title": "Data \"Platform\" Engineer", "notes": "a\\\\b\\n"}],
+        "path": "C:\\\\tools\\\\",
+        "unicode": "\u2603 snow",
+    }
+    text = json.dumps(plan, indent=2)
+    escaped = json.dumps(plan, ensure_ascii=True)  # \\uXXXX escapes to split as well
+
+    ok = True
+    for source in (text, escaped):
+        for size in (1, 2, 3, 7):
+            parser = StreamingObjectParser()
+            members = feed_in_chunks(parser, source, size)
+            parser.close()
+            if dict(members) != plan or [key for key, _ in members] != list(plan):
+                print(f"  mismatch at chunk size {size}: {members}")
+                ok = False
+    print(f"  all chunk sizes decoded {len(plan)} members identically: {ok}")
+    return ok
+
+
+def test_truncated_output():
+    """Test complete sections survive a cut-off response and close() reports it"""
+    print("\n" + "=" * 80)
+    print("TEST 2: TRUNCATED OUTPUT")
+    print("=" * 80)
+
+    text = '{"profile_summary": "Analyst to engineer", "target_roles": [{"title": "Data Eng'
+    parser = StreamingObjectParser()
+    members = feed_in_chunks(parser, text, 5)
+    try:
+        parser.close()
+        error = None
+    except ValueError as e:
+        error = str(e)
+
+    print(f"  members before the cut: {members}")
+    print(f"  done: {parser.done}, close(): {error}")
+
+    return members == [("profile_summary", "Analyst to engineer")] and not parser.done and error is not None
+
+
+def test_trailing_commas():
+    """Test a trailing comma after the last section is accepted, one inside a section is not"""
+    print("\n" + "=" * 80)
+    print("TEST 3: TRAILING COMMAS")
+    print("=" * 80)
+
+    parser = StreamingObjectParser()
+    top_level = parser.feed('{"a": 1, "b": [1, 2],}')
+    print(f"  top level: {top_level}, done: {parser.done}")
+
+    nested = StreamingObjectParser()
+    try:
+        nested_members = nested.feed('{"a": 1, "b": [1, 2,], "c": 3}')
+        nested_error = None
+    except ValueError as e:
+        nested_members = nested.members
+        nested_error = str(e)
+    print(f"  inside a section: members before the error {nested_members}, error: {nested_error}")
+
+    return (
+        top_level == [("a", 1), ("b", [1, 2])] and parser.done
+        and nested_members == [("a", 1)] and nested_error is not None
+    )
+
+
+class FakeCompletions:
+    """Streams the plan text, then answers section repairs"""
+
+    def __init__(self, plan_text: str, fail_after: int = None, repair_delay: float = 0.0):
+        self.plan_text = plan_text
+        self.fail_after = fail_after
+        self.repair_delay = repair_delay
+        self.repairs = []
+        self.cancelled = []
+
+    async def create(self, stream: bool = False, messages=None, **kwargs):
+        if stream:
+            return self._stream()
+        section = re.search(r'of the form \{"([a-z_]+)"', messages[-1]["content"]).group(1)
+        self.repairs.append(section)
+        try:
+            await asyncio.sleep(self.repair_delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(section)
+            raise
+        content = json.dumps({section: {"ok": True, "repaired": True}})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def _stream(self):
+        for i in range(0, len(self.plan_text), 16):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("stream reset by peer")
+            await asyncio.sleep(0)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.plan_text[i:i + 16]))])
+
+
+def make_service(completions: FakeCompletions):
+    """CareerPathSynthesisService on the fake client; a section is valid when it is {"ok": true, ...}"""
+    from app.schemas.career_plan import ValidationError as SchemaValidationError, ValidationResult
+    from app.services.career_path_synthesis_service import CareerPathSynthesisService
+
+    service = CareerPathSynthesisService.__new__(CareerPathSynthesisService)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service.model = "fake"
+    service._build_synthesis_prompt = lambda intake, research: "prompt"
+
+    def validate_section(section, value):
+        if isinstance(value, dict) and value.get("ok"):
+            return []
+        return [SchemaValidationError(field=section, error="not ok", expected="object", received=value)]
+
+    def validate_plan(plan):
+        errors = [e for section, value in plan.items() for e in validate_section(section, value)]
+        return ValidationResult(valid=not errors, errors=errors)
+
+    service._validate_section = validate_section
+    service._validate_plan = validate_plan
+    return service
+
+
+def plan_text(broken: str) -> str:
+    from app.schemas.career_plan import CareerPlan
+
+    plan = {
+        section: ("needs work" if section == broken else {"ok": True})
+        for section, field in CareerPlan.model_fields.items()
+        if field.is_required()
+    }
+    return json.dumps(plan)
+
+
+async def test_section_repair():
+    """Test an invalid section is repaired on its own and merged into the plan"""
+    print("\n" + "=" * 80)
+    print("TEST 4: SECTION REPAIR")
+    print("=" * 80)
+
+    completions = FakeCompletions(plan_text(broken="skills_analysis"))
+    service = make_service(completions)
+    result = await service.generate_career_plan(intake=SimpleNamespace(
+        current_role_title="Data Analyst", target_role_interest="Data Engineer"
+    ), research_data={})
+
+    plan = result.get("plan", {})
+    print(f"  success: {result.get('success')}, repaired: {result.get('repaired')}")
+    print(f"  repair calls: {completions.repairs}")
+    print(f"  skills_analysis: {plan.get('skills_analysis')}")
+
+    return (
+        result.get("success") is True
+        and result.get("repaired") is True
+        and completions.repairs == ["skills_analysis"]
+        and plan.get("skills_analysis") == {"ok": True, "repaired": True}
+    )
+
+
+async def test_stream_failure_cancels_repairs():
+    """Test repairs started before the stream failed are cancelled, not left running"""
+    print("\n" + "=" * 80)
+    print("TEST 5: STREAM FAILURE CANCELS REPAIRS")
+    print("=" * 80)
+
+    text = plan_text(broken="profile_summary")
+    completions = FakeCompletions(text, fail_after=len(text) // 2, repair_delay=30)
+    service = make_service(completions)
+    result = await service.generate_career_plan(intake=SimpleNamespace(
+        current_role_title="Data Analyst", target_role_interest="Data Engineer"
+    ), research_data={})
+    await asyncio.sleep(0)  # let the cancellation reach the repair
+
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    print(f"  result: {result}")
+    print(f"  repairs started: {completions.repairs}, cancelled: {completions.cancelled}, tasks left: {len(pending)}")
+
+    return (
+        result.get("success") is False
+        and completions.repairs == ["profile_summary"]
+        and completions.cancelled == ["profile_summary"]
+        and not pending
+    )
+
+
+async def main():
+    """Run all streaming JSON tests"""
+    results = {
+        'split_escapes': test_split_escapes(),
+        'truncated_output': test_truncated_output(),
+        'trailing_commas': test_trailing_commas(),
+        'section_repair': await test_section_repair(),
+        'stream_failure': await test_stream_failure_cancels_repairs(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
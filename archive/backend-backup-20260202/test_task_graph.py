@@ -0,0 +1,192 @@
+"""
+Test the async task graph used by interview question generation
+Tests: dependency ordering and inputs, independent steps overlapping,
+cancel-on-failure, registration errors, tech stack cacheability
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.task_graph import TaskGraph
+
+
+async def test_ordering():
+    """Test a step starts after its dependencies and receives their results"""
+    print("=" * 80)
+    print("TEST 1: DEPENDENCY ORDERING")
+    print("=" * 80)
+
+    events = []
+
+    async def tech_stack():
+        events.append("tech_stack start")
+        await asyncio.sleep(0.1)
+        events.append("tech_stack end")
+        return ["Python", "AWS"]
+
+    async def behavioral():
+        events.append("behavioral start")
+        await asyncio.sleep(0.02)
+        return ["Tell me about a conflict"]
+
+    async def technical(tech_stack, behavioral):
+        events.append("technical start")
+        return {"stack": tech_stack, "after": len(behavioral)}
+
+    graph = TaskGraph()
+    graph.add("tech_stack", tech_stack)
+    graph.add("behavioral", behavioral)
+    graph.add("technical", technical, after=["tech_stack", "behavioral"])
+    results, timings = await graph.run()
+
+    print(f"  events: {events}")
+    print(f"  technical: {results['technical']}")
+    print(f"  timings: {timings}")
+
+    steps = timings["steps"]
+    return (
+        results["technical"] == {"stack": ["Python", "AWS"], "after": 1}
+        and events.index("technical start") > events.index("tech_stack end")
+        and steps["technical"]["start_ms"] >= steps["tech_stack"]["duration_ms"]
+        and all(step["status"] == "ok" for step in steps.values())
+    )
+
+
+async def test_concurrency():
+    """Test independent steps run at the same time"""
+    print("\n" + "=" * 80)
+    print("TEST 2: INDEPENDENT STEPS OVERLAP")
+    print("=" * 80)
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return True
+
+    graph = TaskGraph()
+    for name in ("research", "behavioral", "news"):
+        graph.add(name, slow)
+    started = time.perf_counter()
+    results, timings = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    print(f"  3 x 200 ms steps took {elapsed * 1000:.0f} ms (graph total {timings['total_ms']} ms)")
+
+    return all(results.values()) and elapsed < 0.35
+
+
+async def test_cancel_on_failure():
+    """Test a failing step cancels running steps and skips its dependents"""
+    print("\n" + "=" * 80)
+    print("TEST 3: CANCEL ON FAILURE")
+    print("=" * 80)
+
+    finished = []
+
+    async def research():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("perplexity unavailable")
+
+    async def behavioral():
+        await asyncio.sleep(1.0)
+        finished.append("behavioral")
+
+    async def technical(research):
+        finished.append("technical")
+
+    graph = TaskGraph()
+    graph.add("research", research)
+    graph.add("behavioral", behavioral)
+    graph.add("technical", technical, after=["research"])
+
+    started = time.perf_counter()
+    try:
+        await graph.run()
+        error = None
+    except RuntimeError as e:
+        error = str(e)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.05)
+
+    print(f"  raised: {error!r} after {elapsed * 1000:.0f} ms, finished steps: {finished}")
+
+    return error == "perplexity unavailable" and elapsed < 0.5 and finished == []
+
+
+def test_registration_errors():
+    """Test duplicate and unknown dependencies are rejected at add time"""
+    print("\n" + "=" * 80)
+    print("TEST 4: REGISTRATION ERRORS")
+    print("=" * 80)
+
+    async def step():
+        return None
+
+    graph = TaskGraph().add("a", step)
+    rejected = 0
+    for name, after in (("a", ()), ("b", ("missing",))):
+        try:
+            graph.add(name, step, after=after)
+        except ValueError as e:
+            print(f"  rejected: {e}")
+            rejected += 1
+
+    return rejected == 2
+
+
+def test_tech_stack_cacheability():
+    """Test only researched, non-empty tech stacks are cached"""
+    print("\n" + "=" * 80)
+    print("TEST 5: TECH STACK CACHEABILITY")
+    print("=" * 80)
+
+    from app.services.interview_questions_generator import tech_stack_is_cacheable
+
+    cases = {
+        "researched": ({"tech_stack": ["Go"], "sources": [], "source": "research"}, True),
+        "stored before source marker": ({"frameworks": ["React"]}, True),
+        "job description fallback": ({"tech_stack": ["Go"], "source": "job_description"}, False),
+        "all empty": ({"tech_stack": [], "tools_and_platforms": [], "sources": [{"url": "x"}]}, False),
+        "missing": ({}, False),
+    }
+    ok = True
+    for name, (stack, expected) in cases.items():
+        result = tech_stack_is_cacheable(stack)
+        print(f"  {name}: {result}")
+        ok = ok and result == expected
+    return ok
+
+
+async def main():
+    """Run all task graph tests"""
+    results = {
+        'ordering': await test_ordering(),
+        'concurrency': await test_concurrency(),
+        'cancel_on_failure': await test_cancel_on_failure(),
+        'registration_errors': test_registration_errors(),
+        'tech_stack_cacheability': test_tech_stack_cacheability(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
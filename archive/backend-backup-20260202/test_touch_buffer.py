@@ -0,0 +1,209 @@
+"""
+Test the write-behind touch buffer used for view tracking
+Tests: repeated touches of one row coalesced into a single UPDATE (latest
+timestamp, summed count, updated_at untouched), failed flushes keeping
+their touches, close() flushing what is pending
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/touch_buffer.db")
+
+from sqlalchemy import event
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.interview_prep import InterviewPrep
+from app.models.job import Job
+from app.models.resume import BaseResume, TailoredResume
+from app.services import touch_buffer as touch_buffer_module
+from app.services.touch_buffer import TouchBuffer
+
+UPDATED_AT = datetime(2026, 1, 5, 9, 30)
+
+
+async def create_preps(count: int) -> list:
+    """Interview preps with 5 earlier views and a known updated_at"""
+    async with AsyncSessionLocal() as db:
+        base = BaseResume(filename="resume.docx", file_path="/tmp/resume.docx", session_user_id="user_views")
+        db.add(base)
+        await db.flush()
+        preps = []
+        for i in range(count):
+            job = Job(url=f"https://jobs.example.com/{os.urandom(4).hex()}", company="Acme", title=f"Role {i}")
+            db.add(job)
+            await db.flush()
+            tailored = TailoredResume(base_resume_id=base.id, job_id=job.id, session_user_id="user_views")
+            db.add(tailored)
+            await db.flush()
+            prep = InterviewPrep(tailored_resume_id=tailored.id, prep_data={}, view_count=5, updated_at=UPDATED_AT)
+            db.add(prep)
+            preps.append(prep)
+        await db.commit()
+        return [prep.id for prep in preps]
+
+
+async def load(prep_id: int) -> InterviewPrep:
+    async with AsyncSessionLocal() as db:
+        return await db.get(InterviewPrep, prep_id)
+
+
+class StatementCounter:
+    """Counts UPDATE statements sent to the database"""
+
+    def __init__(self):
+        self.updates = []
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE"):
+            self.updates.append(statement)
+
+
+async def test_coalesced_flush():
+    """Test several touches of one row are written by one UPDATE with the latest timestamp and summed count"""
+    print("=" * 80)
+    print("TEST 1: COALESCED FLUSH")
+    print("=" * 80)
+
+    hot, cold = await create_preps(2)
+    buffer = TouchBuffer(InterviewPrep, flush_interval=3600)
+    base = datetime(2026, 2, 1, 12, 0)
+    latest = base + timedelta(minutes=9)
+
+    # Out of order on purpose: the latest timestamp wins, not the last recorded
+    buffer.touch(hot, at=base + timedelta(minutes=3))
+    buffer.touch(hot, at=latest)
+    buffer.touch(hot, at=base + timedelta(minutes=1))
+    buffer.touch(hot, at=base + timedelta(minutes=5), count=2)
+    buffer.touch(cold, at=base)
+    pending_before = buffer.pending
+
+    with StatementCounter() as counter:
+        written = await buffer.flush()
+    await buffer.close()
+
+    hot_row, cold_row = await load(hot), await load(cold)
+    print(f"  pending rows before flush: {pending_before}, rows written: {written}, UPDATE statements: {len(counter.updates)}")
+    print(f"  hot row: last_viewed_at {hot_row.last_viewed_at}, view_count {hot_row.view_count}, updated_at {hot_row.updated_at}")
+    print(f"  cold row: last_viewed_at {cold_row.last_viewed_at}, view_count {cold_row.view_count}")
+
+    return (
+        pending_before == 2
+        and written == 2
+        and len(counter.updates) == 1
+        and hot_row.last_viewed_at == latest
+        and hot_row.view_count == 5 + 5
+        and hot_row.updated_at == UPDATED_AT
+        and cold_row.last_viewed_at == base
+        and cold_row.view_count == 5 + 1
+        and cold_row.updated_at == UPDATED_AT
+        and buffer.pending == 0
+    )
+
+
+async def test_failed_flush_keeps_touches():
+    """Test a failed flush puts its touches back, merged with touches recorded meanwhile"""
+    print("\n" + "=" * 80)
+    print("TEST 2: FAILED FLUSH")
+    print("=" * 80)
+
+    (prep_id,) = await create_preps(1)
+    buffer = TouchBuffer(InterviewPrep, flush_interval=3600)
+    first = datetime(2026, 3, 1, 8, 0)
+    buffer.touch(prep_id, at=first, count=2)
+
+    class FailingSession:
+        async def __aenter__(self):
+            # A view arrives while the write is in flight
+            buffer.touch(prep_id, at=first + timedelta(minutes=1))
+            raise ConnectionError("database unavailable")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    original = touch_buffer_module.AsyncSessionLocal
+    touch_buffer_module.AsyncSessionLocal = FailingSession
+    try:
+        await buffer.flush()
+        failed = False
+    except ConnectionError:
+        failed = True
+    finally:
+        touch_buffer_module.AsyncSessionLocal = original
+
+    pending = dict(buffer._pending)
+    await buffer.close()
+    row = await load(prep_id)
+    print(f"  flush raised: {failed}, pending after failure: {pending}")
+    print(f"  after close(): last_viewed_at {row.last_viewed_at}, view_count {row.view_count}")
+
+    return (
+        failed
+        and pending == {prep_id: (first + timedelta(minutes=1), 3)}
+        and row.last_viewed_at == first + timedelta(minutes=1)
+        and row.view_count == 5 + 3
+        and row.updated_at == UPDATED_AT
+    )
+
+
+async def test_background_flush():
+    """Test touches are flushed by the background task without an explicit flush"""
+    print("\n" + "=" * 80)
+    print("TEST 3: BACKGROUND FLUSH")
+    print("=" * 80)
+
+    (prep_id,) = await create_preps(1)
+    buffer = TouchBuffer(InterviewPrep, flush_interval=0.05)
+    for _ in range(4):
+        buffer.touch(prep_id)
+    await asyncio.sleep(0.3)
+
+    row = await load(prep_id)
+    print(f"  flushes: {buffer.flushes}, pending: {buffer.pending}, view_count {row.view_count}")
+    await buffer.close()
+
+    return buffer.flushes == 1 and buffer.pending == 0 and row.view_count == 5 + 4
+
+
+async def main():
+    """Run all touch buffer tests"""
+    await init_db()
+
+    results = {
+        'coalesced_flush': await test_coalesced_flush(),
+        'failed_flush': await test_failed_flush_keeps_touches(),
+        'background_flush': await test_background_flush(),
+    }
+
+    # Summary
+    print("\n" + "#" * 80)
+    print("# TEST SUMMARY")
+    print("#" * 80)
+    print()
+
+    for test_name, result in results.items():
+        status = "PASS" if result else "FAIL"
+        print(f"{test_name.upper():25s} : {status}")
+
+    failed = sum(1 for r in results.values() if not r)
+    print(f"\nPASSED: {len(results) - failed}/{len(results)}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())